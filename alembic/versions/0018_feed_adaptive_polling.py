@@ -0,0 +1,48 @@
+"""Add adaptive polling state to feeds
+
+Revision ID: 0018_feed_adaptive_polling
+Revises: 0017_job_schedule_owner_optional
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0018_feed_adaptive_polling"
+down_revision = "0017_job_schedule_owner_optional"
+branch_labels = None
+depends_on = None
+
+
+def _json_server_default(bind) -> sa.sql.elements.TextClause:
+    if bind.dialect.name == "postgresql":
+        return sa.text("'{}'::jsonb")
+    return sa.text("'{}'")
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    op.add_column(
+        "feed",
+        sa.Column("next_poll_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index(op.f("ix_feed_next_poll_at"), "feed", ["next_poll_at"])
+    op.add_column(
+        "feed",
+        sa.Column(
+            "poll_stats",
+            sa.JSON(),
+            nullable=False,
+            server_default=_json_server_default(bind),
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("feed", "poll_stats")
+    op.drop_index(op.f("ix_feed_next_poll_at"), table_name="feed")
+    op.drop_column("feed", "next_poll_at")
@@ -0,0 +1,41 @@
+"""Store feed freshness hints captured at fetch time
+
+Revision ID: 0019_feed_fetch_hints
+Revises: 0018_feed_adaptive_polling
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0019_feed_fetch_hints"
+down_revision = "0018_feed_adaptive_polling"
+branch_labels = None
+depends_on = None
+
+
+def _json_server_default(bind) -> sa.sql.elements.TextClause:
+    if bind.dialect.name == "postgresql":
+        return sa.text("'{}'::jsonb")
+    return sa.text("'{}'")
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    op.add_column(
+        "feed",
+        sa.Column(
+            "fetch_hints",
+            sa.JSON(),
+            nullable=False,
+            server_default=_json_server_default(bind),
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("feed", "fetch_hints")
@@ -0,0 +1,63 @@
+"""Track feed poll health
+
+Revision ID: 0020_feed_health
+Revises: 0019_feed_fetch_hints
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0020_feed_health"
+down_revision = "0019_feed_fetch_hints"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "feed",
+        sa.Column(
+            "health_status",
+            sa.String(length=20),
+            nullable=False,
+            server_default="healthy",
+        ),
+    )
+    op.create_index(op.f("ix_feed_health_status"), "feed", ["health_status"])
+    op.add_column(
+        "feed",
+        sa.Column(
+            "consecutive_failures",
+            sa.Integer(),
+            nullable=False,
+            server_default="0",
+        ),
+    )
+    op.add_column(
+        "feed",
+        sa.Column("last_success_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.add_column(
+        "feed",
+        sa.Column("last_error_class", sa.String(length=50), nullable=True),
+    )
+    op.add_column("feed", sa.Column("last_error", sa.Text(), nullable=True))
+    op.add_column(
+        "feed",
+        sa.Column("last_error_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("feed", "last_error_at")
+    op.drop_column("feed", "last_error")
+    op.drop_column("feed", "last_error_class")
+    op.drop_column("feed", "last_success_at")
+    op.drop_column("feed", "consecutive_failures")
+    op.drop_index(op.f("ix_feed_health_status"), table_name="feed")
+    op.drop_column("feed", "health_status")
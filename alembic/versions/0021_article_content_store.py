@@ -0,0 +1,132 @@
+"""Move bookmark article HTML into a content-addressed store
+
+Revision ID: 0021_article_content_store
+Revises: 0020_feed_health
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+from datetime import datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0021_article_content_store"
+down_revision = "0020_feed_health"
+branch_labels = None
+depends_on = None
+
+_BATCH_SIZE = 500
+
+bookmark_table = sa.table(
+    "bookmark",
+    sa.column("id", sa.String(length=255)),
+    sa.column("raw_html_content", sa.Text()),
+    sa.column("content_hash", sa.String(length=64)),
+)
+
+article_content_table = sa.table(
+    "article_content",
+    sa.column("content_hash", sa.String(length=64)),
+    sa.column("compression", sa.String(length=10)),
+    sa.column("data", sa.LargeBinary()),
+    sa.column("original_size", sa.Integer()),
+    sa.column("stored_size", sa.Integer()),
+    sa.column("created_at", sa.DateTime(timezone=True)),
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "article_content",
+        sa.Column("content_hash", sa.String(length=64), primary_key=True),
+        sa.Column(
+            "compression",
+            sa.String(length=10),
+            nullable=False,
+            server_default="gzip",
+        ),
+        sa.Column("data", sa.LargeBinary(), nullable=False),
+        sa.Column("original_size", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("stored_size", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.add_column(
+        "bookmark",
+        sa.Column("content_hash", sa.String(length=64), nullable=True),
+    )
+    op.create_index(op.f("ix_bookmark_content_hash"), "bookmark", ["content_hash"])
+
+    bind = op.get_bind()
+    known_hashes = set()
+    while True:
+        rows = list(
+            bind.execute(
+                sa.select(bookmark_table.c.id, bookmark_table.c.raw_html_content)
+                .where(bookmark_table.c.raw_html_content.isnot(None))
+                .limit(_BATCH_SIZE)
+            ).mappings()
+        )
+        if not rows:
+            break
+        for row in rows:
+            html = row["raw_html_content"] or ""
+            content_hash = None
+            if html:
+                encoded = html.encode("utf-8")
+                content_hash = hashlib.sha256(encoded).hexdigest()
+                if content_hash not in known_hashes:
+                    data = gzip.compress(encoded)
+                    compression = "gzip"
+                    if len(data) >= len(encoded):
+                        data, compression = encoded, "none"
+                    bind.execute(
+                        sa.insert(article_content_table).values(
+                            content_hash=content_hash,
+                            compression=compression,
+                            data=data,
+                            original_size=len(encoded),
+                            stored_size=len(data),
+                            created_at=datetime.now(timezone.utc),
+                        )
+                    )
+                    known_hashes.add(content_hash)
+            bind.execute(
+                sa.update(bookmark_table)
+                .where(bookmark_table.c.id == row["id"])
+                .values(content_hash=content_hash, raw_html_content=None)
+            )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    rows = list(
+        bind.execute(
+            sa.select(
+                article_content_table.c.content_hash,
+                article_content_table.c.compression,
+                article_content_table.c.data,
+            )
+        ).mappings()
+    )
+    for row in rows:
+        data = row["data"]
+        if row["compression"] == "gzip":
+            data = gzip.decompress(data)
+        elif row["compression"] != "none":
+            raise RuntimeError(
+                f"Cannot downgrade {row['compression']}-compressed article content"
+            )
+        bind.execute(
+            sa.update(bookmark_table)
+            .where(bookmark_table.c.content_hash == row["content_hash"])
+            .values(raw_html_content=data.decode("utf-8"))
+        )
+    op.drop_index(op.f("ix_bookmark_content_hash"), table_name="bookmark")
+    op.drop_column("bookmark", "content_hash")
+    op.drop_table("article_content")
@@ -0,0 +1,34 @@
+"""Add per-site paywall indicators to siteconfig
+
+Revision ID: 0022_siteconfig_paywall_indicators
+Revises: 0021_article_content_store
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0022_siteconfig_paywall_indicators"
+down_revision = "0021_article_content_store"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "siteconfig",
+        sa.Column(
+            "paywall_indicators",
+            sa.JSON(),
+            nullable=True,
+            server_default="[]",
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("siteconfig", "paywall_indicators")
@@ -0,0 +1,34 @@
+"""Persist sanitized article variants keyed by sanitizer rules
+
+Revision ID: 0023_article_content_variants
+Revises: 0022_siteconfig_paywall_indicators
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0023_article_content_variants"
+down_revision = "0022_siteconfig_paywall_indicators"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "article_content_variant",
+        sa.Column("source_hash", sa.String(length=64), nullable=False),
+        sa.Column("variant", sa.String(length=20), nullable=False),
+        sa.Column("rules_version", sa.String(length=64), nullable=False),
+        sa.Column("content_hash", sa.String(length=64), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("source_hash", "variant", "rules_version"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("article_content_variant")
@@ -0,0 +1,39 @@
+"""Add main-content extraction toggles to siteconfig and feed
+
+Revision ID: 0024_main_content_extraction
+Revises: 0023_article_content_variants
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0024_main_content_extraction"
+down_revision = "0023_article_content_variants"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "siteconfig",
+        sa.Column(
+            "extract_main_content",
+            sa.Boolean(),
+            nullable=False,
+            server_default=sa.false(),
+        ),
+    )
+    op.add_column(
+        "feed",
+        sa.Column("extract_main_content", sa.Boolean(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("feed", "extract_main_content")
+    op.drop_column("siteconfig", "extract_main_content")
@@ -0,0 +1,115 @@
+"""Add the publication outbox used to select bookmarks awaiting publication
+
+Revision ID: 0025_publication_outbox
+Revises: 0024_main_content_extraction
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0025_publication_outbox"
+down_revision = "0024_main_content_extraction"
+branch_labels = None
+depends_on = None
+
+
+def _parse_datetime(value):
+    if not isinstance(value, str) or not value.strip():
+        return None
+    cleaned = value.strip()
+    if cleaned.endswith("Z"):
+        cleaned = cleaned[:-1] + "+00:00"
+    try:
+        parsed = datetime.fromisoformat(cleaned)
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def upgrade() -> None:
+    outbox = op.create_table(
+        "publication_outbox",
+        sa.Column("bookmark_id", sa.String(), nullable=False),
+        sa.Column("owner_user_id", sa.String(), nullable=True),
+        sa.Column("feed_id", sa.String(), nullable=True),
+        sa.Column("credential_id", sa.String(), nullable=True),
+        sa.Column("status", sa.String(length=20), nullable=False, server_default="pending"),
+        sa.Column("is_paywalled", sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column("enqueued_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("ingested_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("last_attempt_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["bookmark_id"], ["bookmark.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("bookmark_id"),
+    )
+    op.create_index(
+        "ix_publication_outbox_pending",
+        "publication_outbox",
+        ["owner_user_id", "status", "enqueued_at"],
+    )
+    op.create_index(
+        op.f("ix_publication_outbox_feed_id"), "publication_outbox", ["feed_id"]
+    )
+    op.create_index(
+        op.f("ix_publication_outbox_credential_id"),
+        "publication_outbox",
+        ["credential_id"],
+    )
+
+    bookmark = sa.table(
+        "bookmark",
+        sa.column("id", sa.String()),
+        sa.column("owner_user_id", sa.String()),
+        sa.column("feed_id", sa.String()),
+        sa.column("rss_entry", sa.JSON()),
+        sa.column("publication_flags", sa.JSON()),
+        sa.column("publication_statuses", sa.JSON()),
+    )
+    bind = op.get_bind()
+    now = datetime.now(timezone.utc)
+    rows = []
+    result = bind.execute(
+        sa.select(
+            bookmark.c.id,
+            bookmark.c.owner_user_id,
+            bookmark.c.feed_id,
+            bookmark.c.rss_entry,
+            bookmark.c.publication_flags,
+            bookmark.c.publication_statuses,
+        )
+    )
+    for record in result:
+        flags = (record.publication_flags or {}).get("instapaper") or {}
+        if not flags.get("should_publish"):
+            continue
+        statuses = (record.publication_statuses or {}).get("instapaper") or {}
+        rows.append(
+            {
+                "bookmark_id": record.id,
+                "owner_user_id": record.owner_user_id,
+                "feed_id": record.feed_id,
+                "credential_id": str(flags["credential_id"]) if flags.get("credential_id") else None,
+                "status": str(statuses.get("status") or "pending").lower(),
+                "is_paywalled": bool(flags.get("is_paywalled")),
+                "enqueued_at": _parse_datetime(flags.get("created_at") or flags.get("last_seen_at"))
+                or now,
+                "ingested_at": _parse_datetime((record.rss_entry or {}).get("ingested_at")),
+                "attempts": 0,
+            }
+        )
+    for start in range(0, len(rows), 1000):
+        op.bulk_insert(outbox, rows[start : start + 1000])
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_publication_outbox_credential_id"), table_name="publication_outbox")
+    op.drop_index(op.f("ix_publication_outbox_feed_id"), table_name="publication_outbox")
+    op.drop_index("ix_publication_outbox_pending", table_name="publication_outbox")
+    op.drop_table("publication_outbox")
@@ -0,0 +1,34 @@
+"""Add the job item ledger used to resume retried jobs
+
+Revision ID: 0026_job_item_ledger
+Revises: 0025_publication_outbox
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0026_job_item_ledger"
+down_revision = "0025_publication_outbox"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "job_item",
+        sa.Column("job_id", sa.String(), nullable=False),
+        sa.Column("item_key", sa.String(), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("result", sa.JSON(), nullable=True),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("job_id", "item_key"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("job_item")
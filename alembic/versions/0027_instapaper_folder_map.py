@@ -0,0 +1,41 @@
+"""Persist the Instapaper folder mapping synced for each credential
+
+Revision ID: 0027_instapaper_folder_map
+Revises: 0026_job_item_ledger
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0027_instapaper_folder_map"
+down_revision = "0026_job_item_ledger"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "instapaper_folder_map",
+        sa.Column("credential_id", sa.String(), nullable=False),
+        sa.Column("owner_user_id", sa.String(), nullable=True),
+        sa.Column("mapping", sa.JSON(), nullable=True),
+        sa.Column("synced_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("credential_id"),
+    )
+    op.create_index(
+        op.f("ix_instapaper_folder_map_owner_user_id"),
+        "instapaper_folder_map",
+        ["owner_user_id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        op.f("ix_instapaper_folder_map_owner_user_id"), table_name="instapaper_folder_map"
+    )
+    op.drop_table("instapaper_folder_map")
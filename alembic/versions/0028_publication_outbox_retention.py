@@ -0,0 +1,99 @@
+"""Track published time and Instapaper id in the outbox for retention purges
+
+Revision ID: 0028_publication_outbox_retention
+Revises: 0027_instapaper_folder_map
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0028_publication_outbox_retention"
+down_revision = "0027_instapaper_folder_map"
+branch_labels = None
+depends_on = None
+
+
+def _parse_datetime(value):
+    if isinstance(value, datetime):
+        parsed = value
+    elif isinstance(value, str) and value.strip():
+        cleaned = value.strip()
+        if cleaned.endswith("Z"):
+            cleaned = cleaned[:-1] + "+00:00"
+        try:
+            parsed = datetime.fromisoformat(cleaned)
+        except ValueError:
+            return None
+    else:
+        return None
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def upgrade() -> None:
+    op.add_column(
+        "publication_outbox",
+        sa.Column("published_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.add_column(
+        "publication_outbox",
+        sa.Column("instapaper_bookmark_id", sa.String(), nullable=True),
+    )
+    op.create_index(
+        "ix_publication_outbox_retention",
+        "publication_outbox",
+        ["owner_user_id", "status", "published_at"],
+    )
+
+    outbox = sa.table(
+        "publication_outbox",
+        sa.column("bookmark_id", sa.String()),
+        sa.column("status", sa.String()),
+        sa.column("published_at", sa.DateTime(timezone=True)),
+        sa.column("instapaper_bookmark_id", sa.String()),
+    )
+    bookmark = sa.table(
+        "bookmark",
+        sa.column("id", sa.String()),
+        sa.column("instapaper_bookmark_id", sa.String()),
+        sa.column("published_at", sa.DateTime(timezone=True)),
+        sa.column("publication_statuses", sa.JSON()),
+    )
+    bind = op.get_bind()
+    result = bind.execute(
+        sa.select(
+            bookmark.c.id,
+            bookmark.c.instapaper_bookmark_id,
+            bookmark.c.published_at,
+            bookmark.c.publication_statuses,
+        )
+        .select_from(bookmark.join(outbox, outbox.c.bookmark_id == bookmark.c.id))
+        .where(outbox.c.status == "published")
+    )
+    for record in result.fetchall():
+        statuses = (record.publication_statuses or {}).get("instapaper") or {}
+        remote_id = statuses.get("bookmark_id") or record.instapaper_bookmark_id
+        bind.execute(
+            outbox.update()
+            .where(outbox.c.bookmark_id == record.id)
+            .values(
+                published_at=_parse_datetime(
+                    statuses.get("published_at") or record.published_at
+                ),
+                instapaper_bookmark_id=str(remote_id) if remote_id else None,
+            )
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_publication_outbox_retention", table_name="publication_outbox")
+    op.drop_column("publication_outbox", "instapaper_bookmark_id")
+    op.drop_column("publication_outbox", "published_at")
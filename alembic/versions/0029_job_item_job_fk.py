@@ -0,0 +1,44 @@
+"""Tie job item ledger rows to their job
+
+Revision ID: 0029_job_item_job_fk
+Revises: 0028_publication_outbox_retention
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0029_job_item_job_fk"
+down_revision = "0028_publication_outbox_retention"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    job = sa.table("job", sa.column("id", sa.String()), sa.column("status", sa.String()))
+    job_item = sa.table("job_item", sa.column("job_id", sa.String()))
+    # Drop rows left behind by deleted jobs and by jobs that failed for good.
+    op.execute(
+        job_item.delete().where(
+            ~job_item.c.job_id.in_(
+                sa.select(job.c.id).where(job.c.status.in_(("queued", "in_progress")))
+            )
+        )
+    )
+    with op.batch_alter_table("job_item") as batch_op:
+        batch_op.create_foreign_key(
+            "fk_job_item_job_id_job",
+            "job",
+            ["job_id"],
+            ["id"],
+            ondelete="CASCADE",
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("job_item") as batch_op:
+        batch_op.drop_constraint("fk_job_item_job_id_job", type_="foreignkey")
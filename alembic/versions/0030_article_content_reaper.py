@@ -0,0 +1,57 @@
+"""Index variant content hashes and drop unreferenced article content
+
+Revision ID: 0030_article_content_reaper
+Revises: 0029_job_item_job_fk
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0030_article_content_reaper"
+down_revision = "0029_job_item_job_fk"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        op.f("ix_article_content_variant_content_hash"),
+        "article_content_variant",
+        ["content_hash"],
+    )
+
+    bookmark = sa.table("bookmark", sa.column("content_hash", sa.String()))
+    content = sa.table("article_content", sa.column("content_hash", sa.String()))
+    variant = sa.table(
+        "article_content_variant",
+        sa.column("source_hash", sa.String()),
+        sa.column("content_hash", sa.String()),
+    )
+    referenced = sa.select(bookmark.c.content_hash).where(
+        bookmark.c.content_hash.isnot(None)
+    )
+    # Drop content left behind by bookmarks deleted before the reaper existed.
+    op.execute(variant.delete().where(~variant.c.source_hash.in_(referenced)))
+    op.execute(
+        content.delete().where(
+            ~content.c.content_hash.in_(referenced),
+            ~content.c.content_hash.in_(sa.select(variant.c.source_hash)),
+            ~content.c.content_hash.in_(
+                sa.select(variant.c.content_hash).where(
+                    variant.c.content_hash.isnot(None)
+                )
+            ),
+        )
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        op.f("ix_article_content_variant_content_hash"),
+        table_name="article_content_variant",
+    )
@@ -0,0 +1,389 @@
+"""Content-addressed storage for article HTML.
+
+Article bodies are stored once per distinct document in ``article_content``,
+keyed by the SHA-256 of the UTF-8 text and compressed with zstd when the
+``zstandard`` package is installed (gzip otherwise).  Bookmarks reference the
+body through ``Bookmark.content_hash`` so the same article ingested by many
+users is stored once and bookmark rows stay small.
+
+Sanitized publish and preview forms are stored the same way and indexed in
+``article_content_variant`` by source hash and sanitizer rules version, so
+each is computed once per distinct article and rule set.
+
+Content is reference counted by the bookmarks pointing at it: code that
+deletes bookmarks or replaces their content passes the released hashes to
+:func:`purge_unreferenced_article_content`, which drops bodies and variants
+no bookmark uses any more.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import os
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import delete, or_, select
+from sqlmodel import Session
+
+from .models import ArticleContent, ArticleContentVariant, Bookmark
+from .services.html_sanitization import (
+    DEFAULT_SANITIZING_CRITERIA,
+    preview_rules_version,
+    publish_rules_version,
+    sanitize_for_preview,
+    sanitize_html_content,
+)
+
+try:  # pragma: no cover - optional dependency
+    import zstandard as _zstd
+except ImportError:  # pragma: no cover - exercised when zstandard is absent
+    _zstd = None
+
+
+def _compress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        return _zstd.ZstdCompressor(level=10).compress(data)
+    if codec == "gzip":
+        return gzip.compress(data, compresslevel=6)
+    return data
+
+
+def _decompress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        if _zstd is None:
+            raise RuntimeError("zstandard is required to read zstd article content")
+        return _zstd.ZstdDecompressor().decompress(data)
+    if codec == "gzip":
+        return gzip.decompress(data)
+    return data
+
+
+def preferred_compression() -> str:
+    """Codec used for new content: ``ARTICLE_CONTENT_COMPRESSION`` or the best available."""
+
+    configured = (os.getenv("ARTICLE_CONTENT_COMPRESSION") or "").strip().lower()
+    if configured in {"gzip", "none"}:
+        return configured
+    if configured == "zstd" or not configured:
+        return "zstd" if _zstd is not None else "gzip"
+    return "gzip"
+
+
+PUBLISH_VARIANT = "publish"
+PREVIEW_VARIANT = "preview"
+
+
+def _insert_ignoring_duplicates(session: Session, model, values: Dict[str, object]) -> None:
+    table = model.__table__
+    key_columns = [column.name for column in table.primary_key.columns]
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:  # pragma: no cover - other backends are not deployed
+        identity = tuple(values[name] for name in key_columns)
+        if session.get(model, identity if len(identity) > 1 else identity[0]) is None:
+            session.add(model(**values))
+        return
+    session.execute(
+        insert(table).values(**values).on_conflict_do_nothing(index_elements=key_columns)
+    )
+
+
+def store_article_html(session: Session, html: Optional[str]) -> Optional[str]:
+    """Store ``html`` in the current transaction and return its content hash.
+
+    Content that is already stored is not rewritten, so concurrent writers of
+    the same document converge on a single row.
+    """
+
+    if not html:
+        return None
+    encoded = html.encode("utf-8")
+    digest = hashlib.sha256(encoded).hexdigest()
+    if session.get(ArticleContent, digest) is not None:
+        return digest
+    codec = preferred_compression()
+    data = _compress(encoded, codec)
+    if len(data) >= len(encoded):
+        codec, data = "none", encoded
+    _insert_ignoring_duplicates(
+        session,
+        ArticleContent,
+        {
+            "content_hash": digest,
+            "compression": codec,
+            "data": data,
+            "original_size": len(encoded),
+            "stored_size": len(data),
+            "created_at": datetime.now(timezone.utc),
+        },
+    )
+    return digest
+
+
+def _decode(record: ArticleContent) -> str:
+    return _decompress(record.data, record.compression).decode("utf-8")
+
+
+def load_article_html(session: Session, content_hash: Optional[str]) -> Optional[str]:
+    if not content_hash:
+        return None
+    record = session.get(ArticleContent, content_hash)
+    return _decode(record) if record is not None else None
+
+
+def load_article_html_many(
+    session: Session, content_hashes: Iterable[Optional[str]]
+) -> Dict[str, str]:
+    """Return ``{content_hash: html}`` for the given hashes in one query."""
+
+    wanted = {value for value in content_hashes if value}
+    if not wanted:
+        return {}
+    records = session.execute(
+        select(ArticleContent).where(ArticleContent.content_hash.in_(wanted))
+    ).scalars()
+    return {record.content_hash: _decode(record) for record in records}
+
+
+def get_bookmark_html(session: Session, bookmark: Bookmark) -> Optional[str]:
+    """Return the article HTML for ``bookmark``, falling back to legacy inline content."""
+
+    if bookmark.raw_html_content:
+        return bookmark.raw_html_content
+    return load_article_html(session, bookmark.content_hash)
+
+
+def set_bookmark_html(session: Session, bookmark: Bookmark, html: Optional[str]) -> bool:
+    """Point ``bookmark`` at ``html`` in the store; return ``True`` when it changed."""
+
+    if not html:
+        return False
+    digest = store_article_html(session, html)
+    if digest == bookmark.content_hash and not bookmark.raw_html_content:
+        return False
+    previous_hash = bookmark.content_hash
+    bookmark.content_hash = digest
+    bookmark.raw_html_content = None
+    if previous_hash and previous_hash != digest:
+        session.add(bookmark)
+        purge_unreferenced_article_content(session, [previous_hash])
+    return True
+
+
+def _hashes_in_use(session: Session, content_hashes: Set[str]) -> Set[str]:
+    """Hashes among ``content_hashes`` still referenced by a bookmark or variant."""
+
+    wanted = list(content_hashes)
+    in_use = set(
+        session.execute(
+            select(Bookmark.content_hash).where(Bookmark.content_hash.in_(wanted))
+        ).scalars()
+    )
+    for source_hash, content_hash in session.execute(
+        select(ArticleContentVariant.source_hash, ArticleContentVariant.content_hash).where(
+            or_(
+                ArticleContentVariant.source_hash.in_(wanted),
+                ArticleContentVariant.content_hash.in_(wanted),
+            )
+        )
+    ):
+        in_use.update((source_hash, content_hash))
+    return in_use & content_hashes
+
+
+def purge_unreferenced_article_content(
+    session: Session, content_hashes: Iterable[Optional[str]]
+) -> int:
+    """Delete stored articles among ``content_hashes`` that no bookmark uses.
+
+    Call with the hashes of bookmarks that were just deleted or pointed at
+    new content; pending deletes in ``session`` are flushed first.  The
+    variants of each released article go with it, and so does variant
+    content nothing else references.  Returns the number of
+    ``article_content`` rows deleted in the current transaction.
+    """
+
+    candidates = {value for value in content_hashes if value}
+    if not candidates:
+        return 0
+    session.flush()
+    released = candidates - set(
+        session.execute(
+            select(Bookmark.content_hash).where(Bookmark.content_hash.in_(list(candidates)))
+        ).scalars()
+    )
+    if not released:
+        return 0
+    variant_hashes = {
+        value
+        for value in session.execute(
+            select(ArticleContentVariant.content_hash).where(
+                ArticleContentVariant.source_hash.in_(list(released))
+            )
+        ).scalars()
+        if value
+    }
+    session.execute(
+        delete(ArticleContentVariant).where(
+            ArticleContentVariant.source_hash.in_(list(released))
+        )
+    )
+    removable = released | variant_hashes
+    removable -= _hashes_in_use(session, removable)
+    if not removable:
+        return 0
+    session.execute(
+        delete(ArticleContent).where(ArticleContent.content_hash.in_(list(removable)))
+    )
+    return len(removable)
+
+
+def load_or_build_variant(
+    session: Session,
+    source_hash: Optional[str],
+    *,
+    variant: str,
+    rules_version: str,
+    build: Callable[[str], Optional[str]],
+) -> Optional[str]:
+    """Return the ``variant`` of stored article ``source_hash`` under ``rules_version``.
+
+    The variant is built from the source HTML with ``build`` and persisted in
+    the current transaction the first time it is requested.  Returns ``None``
+    when the source content is unknown.
+    """
+
+    if not source_hash:
+        return None
+    record = session.get(ArticleContentVariant, (source_hash, variant, rules_version))
+    if record is not None:
+        if not record.content_hash:
+            return ""
+        stored = load_article_html(session, record.content_hash)
+        if stored is not None:
+            return stored
+    source_html = load_article_html(session, source_hash)
+    if source_html is None:
+        return None
+    built = build(source_html) or ""
+    _insert_ignoring_duplicates(
+        session,
+        ArticleContentVariant,
+        {
+            "source_hash": source_hash,
+            "variant": variant,
+            "rules_version": rules_version,
+            "content_hash": store_article_html(session, built),
+            "created_at": datetime.now(timezone.utc),
+        },
+    )
+    return built
+
+
+def load_or_build_publish_variant(
+    session: Session, source_hash: Optional[str], criteria: Optional[List[str]]
+) -> Optional[str]:
+    selectors = list(criteria or DEFAULT_SANITIZING_CRITERIA)
+    return load_or_build_variant(
+        session,
+        source_hash,
+        variant=PUBLISH_VARIANT,
+        rules_version=publish_rules_version(selectors),
+        build=lambda html: sanitize_html_content(html, selectors),
+    )
+
+
+def load_or_build_preview_variant(
+    session: Session, source_hash: Optional[str]
+) -> Optional[str]:
+    return load_or_build_variant(
+        session,
+        source_hash,
+        variant=PREVIEW_VARIANT,
+        rules_version=preview_rules_version(),
+        build=sanitize_for_preview,
+    )
+
+
+def precompute_article_variants(session: Session, source_hash: Optional[str]) -> None:
+    """Build the default publish and preview variants for newly stored content."""
+
+    load_or_build_publish_variant(session, source_hash, None)
+    load_or_build_preview_variant(session, source_hash)
+
+
+def bookmark_publish_sanitizer(
+    session: Session, bookmark: Bookmark
+) -> Optional[Callable[[str, List[str]], Optional[str]]]:
+    """Return a sanitizer serving ``bookmark``'s persisted publish variant.
+
+    Bookmarks with legacy inline HTML have no stored source and return
+    ``None`` so the caller sanitizes on the fly.
+    """
+
+    if bookmark.raw_html_content or not bookmark.content_hash:
+        return None
+    source_hash = bookmark.content_hash
+
+    def _sanitize(html: str, criteria: List[str]) -> Optional[str]:
+        result = load_or_build_publish_variant(session, source_hash, criteria)
+        return result if result is not None else sanitize_html_content(html, criteria)
+
+    return _sanitize
+
+
+def prepare_bookmark_publish_sanitizer(
+    session: Session, bookmark: Bookmark, html: Optional[str]
+) -> Optional[Callable[[str, List[str]], Optional[str]]]:
+    """Like :func:`bookmark_publish_sanitizer`, resolved before publishing.
+
+    The default-criteria variant is loaded now so the returned sanitizer
+    does not touch ``session`` and may run on another thread; other criteria
+    are sanitized on the fly.
+    """
+
+    sanitizer = bookmark_publish_sanitizer(session, bookmark)
+    if sanitizer is None or not html:
+        return None
+    default_criteria = list(DEFAULT_SANITIZING_CRITERIA)
+    prepared = sanitizer(html, default_criteria)
+
+    def _sanitize(source: str, criteria: List[str]) -> Optional[str]:
+        if list(criteria) == default_criteria and source == html:
+            return prepared
+        return sanitize_html_content(source, criteria)
+
+    return _sanitize
+
+
+def get_bookmark_preview_html(session: Session, bookmark: Bookmark) -> str:
+    if not bookmark.raw_html_content and bookmark.content_hash:
+        preview = load_or_build_preview_variant(session, bookmark.content_hash)
+        if preview is not None:
+            return preview
+    return sanitize_for_preview(bookmark.raw_html_content)
+
+
+__all__ = [
+    "PREVIEW_VARIANT",
+    "PUBLISH_VARIANT",
+    "bookmark_publish_sanitizer",
+    "get_bookmark_preview_html",
+    "load_or_build_preview_variant",
+    "load_or_build_publish_variant",
+    "load_or_build_variant",
+    "precompute_article_variants",
+    "prepare_bookmark_publish_sanitizer",
+    "get_bookmark_html",
+    "load_article_html",
+    "load_article_html_many",
+    "preferred_compression",
+    "purge_unreferenced_article_content",
+    "set_bookmark_html",
+    "store_article_html",
+]
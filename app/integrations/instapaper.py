@@ -18,6 +18,7 @@ from sqlmodel import select
 from ..db import get_session_ctx
 from ..models import Credential
 from ..security.crypto import decrypt_dict
+from ..util.json_files import load_json_file
 
 
 logger = logging.getLogger(__name__)
@@ -61,11 +62,8 @@ def resolve_config_dir(explicit: Optional[str] = None) -> str:
 
 def _load_instapaper_app_creds_from_file(config_dir: Optional[str] = None) -> Dict[str, Any]:
     path = Path(resolve_config_dir(config_dir)) / "instapaper_app_creds.json"
-    if not path.exists():
-        return {}
     try:
-        with path.open("r", encoding="utf-8") as fp:
-            return json.load(fp)
+        return load_json_file(str(path))
     except (OSError, json.JSONDecodeError):
         logger.exception("Failed to load instapaper_app_creds.json from %s", path)
         return {}
@@ -1,4 +1,4 @@
-from .registry import register_handler, get_handler, known_job_types
+from .registry import NonRetryableJobError, register_handler, get_handler, known_job_types
 
 # Ensure built-in job handlers are registered when the package is imported.
 # These imports have side effects that populate the registry.
@@ -9,6 +9,7 @@ from . import retention as _retention  # noqa: F401
 from . import rss as _rss  # noqa: F401
 
 __all__ = [
+    "NonRetryableJobError",
     "register_handler",
     "get_handler",
     "known_job_types",
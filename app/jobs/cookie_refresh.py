@@ -0,0 +1,253 @@
+"""Proactive re-login for site-login pairs whose cookies are about to expire.
+
+``Cookie.expiry_hint`` records the earliest expiry among a pair's stored
+cookies.  Pairs expiring within ``COOKIE_REFRESH_HORIZON`` get a ``login``
+job before an ``rss_poll`` runs into the expired session.  Jobs are spread
+over the time left before expiry, preferring the off-peak hours configured in
+``COOKIE_REFRESH_OFF_PEAK_HOURS``, so refreshes do not pile up at one tick.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Set, Tuple
+
+from sqlalchemy import and_, func, or_
+from sqlmodel import Session, select
+
+from ..models import Cookie, Job
+from .scheduler import _ensure_utc, parse_frequency
+from .util_subpaperflux import format_site_login_pair_id
+
+logger = logging.getLogger(__name__)
+
+_TRUE_VALUES = {"1", "true", "yes", "on"}
+
+_DEFAULT_HORIZON = "6h"
+_DEFAULT_MIN_INTERVAL = "1h"
+_DEFAULT_MAX_LOGINS = 100
+# Logins are scheduled to finish this long before the cookies expire.
+_EXPIRY_MARGIN = timedelta(minutes=15)
+
+
+def is_cookie_refresh_enabled() -> bool:
+    value = os.getenv("COOKIE_REFRESH_SCHEDULING")
+    if value is None:
+        return False
+    return value.strip().lower() in _TRUE_VALUES
+
+
+def _interval_from_env(name: str, default: str) -> timedelta:
+    raw = os.getenv(name) or default
+    try:
+        return parse_frequency(raw)
+    except ValueError:
+        logger.warning("Invalid %s value %r; using %s", name, raw, default)
+        return parse_frequency(default)
+
+
+def _max_logins() -> int:
+    try:
+        value = int(os.getenv("COOKIE_REFRESH_MAX_LOGINS", str(_DEFAULT_MAX_LOGINS)))
+    except ValueError:
+        return _DEFAULT_MAX_LOGINS
+    return value if value > 0 else _DEFAULT_MAX_LOGINS
+
+
+def off_peak_hours() -> Optional[Tuple[int, int]]:
+    """Return the ``(start, end)`` UTC hours of ``COOKIE_REFRESH_OFF_PEAK_HOURS``.
+
+    The value is written ``start-end`` (for example ``1-5``); the window may
+    wrap past midnight (``22-4``).  ``None`` when unset or invalid.
+    """
+
+    raw = (os.getenv("COOKIE_REFRESH_OFF_PEAK_HOURS") or "").strip()
+    if not raw:
+        return None
+    try:
+        start_text, end_text = raw.split("-", 1)
+        start, end = int(start_text) % 24, int(end_text) % 24
+    except ValueError:
+        logger.warning("Invalid COOKIE_REFRESH_OFF_PEAK_HOURS value %r", raw)
+        return None
+    return (start, end) if start != end else None
+
+
+def _off_peak_window(
+    earliest: datetime, latest: datetime, hours: Tuple[int, int]
+) -> Optional[Tuple[datetime, datetime]]:
+    """First off-peak window overlapping ``[earliest, latest]``, clipped to it."""
+
+    start_hour, end_hour = hours
+    day = earliest.replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=1)
+    while day <= latest:
+        window_start = day + timedelta(hours=start_hour)
+        window_end = day + timedelta(hours=end_hour)
+        if window_end <= window_start:
+            window_end += timedelta(days=1)
+        if window_end > earliest and window_start < latest:
+            return max(window_start, earliest), min(window_end, latest)
+        day += timedelta(days=1)
+    return None
+
+
+def _spread_fraction(pair_id: str) -> float:
+    digest = hashlib.sha256(pair_id.encode("utf-8")).digest()
+    return int.from_bytes(digest[:4], "big") / 2**32
+
+
+def plan_refresh_time(
+    pair_id: str, expires_at: datetime, *, now: datetime
+) -> datetime:
+    """Pick when to log ``pair_id`` in again before ``expires_at``.
+
+    The slot is a stable point in the off-peak window before expiry when
+    there is one, otherwise between now and expiry.  Already expired pairs
+    are refreshed immediately.
+    """
+
+    latest = expires_at - _EXPIRY_MARGIN
+    if latest <= now:
+        return now
+    window = (now, latest)
+    hours = off_peak_hours()
+    if hours is not None:
+        window = _off_peak_window(now, latest, hours) or window
+    start, end = window
+    return start + (end - start) * _spread_fraction(pair_id)
+
+
+def _pending_login_pairs(session: Session, *, attempted_since: datetime) -> Set[str]:
+    """Pairs with a queued or running login, or one attempted since ``attempted_since``.
+
+    Counting recent attempts whatever their outcome keeps a pair whose login
+    keeps failing from getting a new job on every tick.
+    """
+
+    pending: Set[str] = set()
+    stmt = (
+        select(Job)
+        .where(Job.type == "login")
+        .where(
+            or_(
+                Job.status.in_(("queued", "in_progress")),
+                func.coalesce(Job.run_at, Job.created_at) >= attempted_since,
+            )
+        )
+    )
+    for job in session.exec(stmt).all():
+        payload = job.payload or {}
+        pair = payload.get("site_login_pair")
+        if not pair and payload.get("credential_id") and payload.get("site_config_id"):
+            pair = format_site_login_pair_id(
+                str(payload["credential_id"]), str(payload["site_config_id"])
+            )
+        if pair:
+            pending.add(str(pair))
+    return pending
+
+
+def _refresh_job(
+    cookie: Cookie, pending: Set[str], now: datetime, min_interval: timedelta
+) -> Optional[Job]:
+    """Build the login job refreshing ``cookie``'s pair, or ``None`` to skip it."""
+
+    pair_id = format_site_login_pair_id(cookie.credential_id, cookie.site_config_id)
+    if pair_id in pending:
+        return None
+    last_refresh = None
+    if cookie.last_refresh:
+        try:
+            last_refresh = _ensure_utc(datetime.fromisoformat(cookie.last_refresh))
+        except ValueError:
+            last_refresh = None
+    if last_refresh is not None and now - last_refresh < min_interval:
+        return None
+    expires_at = datetime.fromtimestamp(float(cookie.expiry_hint), tz=timezone.utc)
+    run_at = plan_refresh_time(pair_id, expires_at, now=now)
+    return Job(
+        type="login",
+        payload={"site_login_pair": pair_id},
+        status="queued",
+        owner_user_id=cookie.owner_user_id,
+        available_at=run_at.timestamp(),
+        details={
+            "proactive_refresh": True,
+            "expiry_hint": expires_at.isoformat(),
+            "scheduled_for": run_at.isoformat(),
+        },
+    )
+
+
+def enqueue_cookie_refresh_logins(
+    session: Session,
+    *,
+    now: Optional[datetime] = None,
+) -> List[Job]:
+    """Enqueue ``login`` jobs for pairs whose cookies expire within the horizon.
+
+    Pairs that already have a queued or running login, or whose cookies were
+    refreshed or whose login was attempted within
+    ``COOKIE_REFRESH_MIN_INTERVAL``, are skipped without counting towards
+    ``COOKIE_REFRESH_MAX_LOGINS``.
+    """
+
+    effective_now = _ensure_utc(now or datetime.now(timezone.utc))
+    horizon = _interval_from_env("COOKIE_REFRESH_HORIZON", _DEFAULT_HORIZON)
+    min_interval = _interval_from_env("COOKIE_REFRESH_MIN_INTERVAL", _DEFAULT_MIN_INTERVAL)
+
+    max_logins = _max_logins()
+    base = (
+        select(Cookie)
+        .where(Cookie.expiry_hint.is_not(None))
+        .where(Cookie.expiry_hint <= (effective_now + horizon).timestamp())
+        .order_by(Cookie.expiry_hint.asc(), Cookie.id)
+    )
+    pending: Optional[Set[str]] = None
+    enqueued: List[Job] = []
+    last_key: Optional[Tuple[float, str]] = None
+    # Page through candidates in expiry order so pairs that are pending or
+    # backed off do not use up the quota meant for the ones behind them.
+    while len(enqueued) < max_logins:
+        stmt = base
+        if last_key is not None:
+            last_expiry, last_id = last_key
+            stmt = stmt.where(
+                or_(
+                    Cookie.expiry_hint > last_expiry,
+                    and_(Cookie.expiry_hint == last_expiry, Cookie.id > last_id),
+                )
+            )
+        candidates = session.exec(stmt.limit(max_logins)).all()
+        if not candidates:
+            break
+        last_key = (candidates[-1].expiry_hint, candidates[-1].id)
+        if pending is None:
+            pending = _pending_login_pairs(
+                session, attempted_since=effective_now - min_interval
+            )
+        for cookie in candidates:
+            if len(enqueued) >= max_logins:
+                break
+            job = _refresh_job(cookie, pending, effective_now, min_interval)
+            if job is None:
+                continue
+            session.add(job)
+            enqueued.append(job)
+            pending.add(job.payload["site_login_pair"])
+        if len(candidates) < max_logins:
+            break
+    if enqueued:
+        session.flush()
+    return enqueued
+
+
+__all__ = [
+    "enqueue_cookie_refresh_logins",
+    "is_cookie_refresh_enabled",
+    "off_peak_hours",
+    "plan_refresh_time",
+]
@@ -0,0 +1,582 @@
+"""Per-feed poll planning for scheduled ``rss_poll`` jobs.
+
+Each completed poll records how many new entries arrived and how far apart
+they were published.  From those observations the feed gets an adaptive poll
+interval, bounded by operator-configured limits, and a ``next_poll_at``
+timestamp that scheduled polls consult before fetching, together with the
+freshness hints the feed server published on its last response.  Failed polls
+update the feed's health, back its schedule off exponentially and suspend it
+once failures persist.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import requests
+from sqlalchemy import or_
+from sqlmodel import Session, select
+
+from ..models import Feed, Job, JobSchedule
+from ..services.feed_fetch_hints import next_useful_fetch
+from ..services.subpaperflux_rss import FeedParseError
+from .scheduler import _ensure_utc, _for_update_kwargs, parse_frequency
+
+logger = logging.getLogger(__name__)
+
+_TRUE_VALUES = {"1", "true", "yes", "on"}
+
+_DEFAULT_MIN_INTERVAL = "5m"
+_DEFAULT_MAX_INTERVAL = "1d"
+_BACKOFF_FACTOR = 1.5
+_EWMA_ALPHA = 0.3
+# Scheduled polls that arrive slightly before ``next_poll_at`` still run so a
+# feed whose interval matches its schedule frequency is not skipped every
+# other tick because of worker latency.
+_DUE_GRACE_FRACTION = 0.1
+_DUE_GRACE_MIN_SECONDS = 30
+
+_DEFAULT_FEED_BATCH_SIZE = 50
+_DEFAULT_FEED_DISPATCH_LIMIT = 1000
+_DEFAULT_FEED_DISPATCH_LEASE = "15m"
+
+# Scheduled job types whose polls feed-driven scheduling takes over.
+FEED_DRIVEN_JOB_TYPES = ("rss_poll", "rss_poll_batch")
+
+_DEFAULT_SUSPEND_AFTER = 10
+_DEFAULT_MAX_BACKOFF = "7d"
+PERMANENT_ERROR_CLASSES = frozenset({"http_gone", "parse"})
+
+
+def is_adaptive_polling_enabled() -> bool:
+    value = os.getenv("RSS_ADAPTIVE_POLLING")
+    if value is None or not value.strip():
+        return True
+    return value.strip().lower() in _TRUE_VALUES
+
+
+def is_fetch_hints_enabled() -> bool:
+    value = os.getenv("RSS_HONOR_FETCH_HINTS")
+    if value is None or not value.strip():
+        return True
+    return value.strip().lower() in _TRUE_VALUES
+
+
+def is_feed_driven_scheduling_enabled() -> bool:
+    value = os.getenv("RSS_FEED_DRIVEN_SCHEDULING")
+    if value is None:
+        return False
+    return value.strip().lower() in _TRUE_VALUES
+
+
+def _int_from_env(name: str, default: int) -> int:
+    try:
+        value = int(os.getenv(name, str(default)))
+    except (TypeError, ValueError):
+        return default
+    return value if value > 0 else default
+
+
+def _interval_from_env(name: str, default: str) -> int:
+    raw = os.getenv(name) or default
+    try:
+        return int(parse_frequency(raw).total_seconds())
+    except ValueError:
+        logger.warning("Invalid %s value %r; using %s", name, raw, default)
+        return int(parse_frequency(default).total_seconds())
+
+
+def adaptive_interval_bounds() -> Tuple[int, int]:
+    """Return the ``(min, max)`` adaptive poll interval in seconds."""
+
+    minimum = _interval_from_env("RSS_POLL_MIN_INTERVAL", _DEFAULT_MIN_INTERVAL)
+    maximum = _interval_from_env("RSS_POLL_MAX_INTERVAL", _DEFAULT_MAX_INTERVAL)
+    if maximum < minimum:
+        maximum = minimum
+    return minimum, maximum
+
+
+def base_interval_seconds(feed: Feed) -> int:
+    try:
+        return int(parse_frequency(feed.poll_frequency or "1h").total_seconds())
+    except ValueError:
+        return 3600
+
+
+def _parse_iso(value: Any) -> Optional[datetime]:
+    if isinstance(value, datetime):
+        return _ensure_utc(value)
+    if not isinstance(value, str) or not value.strip():
+        return None
+    text = value.strip()
+    if text.endswith("Z"):
+        text = text[:-1] + "+00:00"
+    try:
+        return _ensure_utc(datetime.fromisoformat(text))
+    except ValueError:
+        return None
+
+
+def _ewma(previous: Optional[float], sample: float) -> float:
+    if previous is None:
+        return float(sample)
+    return (1 - _EWMA_ALPHA) * float(previous) + _EWMA_ALPHA * float(sample)
+
+
+def compute_poll_interval(
+    *,
+    current_interval: int,
+    new_items: int,
+    interarrival_seconds: Optional[float],
+    bounds: Tuple[int, int],
+) -> int:
+    """Return the next poll interval for a feed.
+
+    Empty polls back off multiplicatively, but never beyond the typical gap
+    between entries once one is known.  Polls that found several entries
+    tighten the interval so roughly one new entry arrives per poll.
+    """
+
+    minimum, maximum = bounds
+    interval = float(max(current_interval, 1))
+    if new_items <= 0:
+        candidate = interval * _BACKOFF_FACTOR
+        if interarrival_seconds:
+            candidate = min(candidate, max(interval, interarrival_seconds))
+    else:
+        candidate = interval / new_items
+        if interarrival_seconds:
+            candidate = min(candidate, max(interarrival_seconds, minimum))
+    return int(min(max(candidate, minimum), maximum))
+
+
+def record_poll_observation(
+    feed: Feed,
+    *,
+    new_items: int,
+    entry_times: Iterable[datetime],
+    polled_at: datetime,
+) -> Dict[str, Any]:
+    """Update ``feed.poll_stats`` and ``feed.next_poll_at`` after a poll."""
+
+    polled_at = _ensure_utc(polled_at)
+    stats = dict(feed.poll_stats or {})
+    base_interval = base_interval_seconds(feed)
+
+    times: List[datetime] = sorted(_ensure_utc(value) for value in entry_times)
+    last_entry_at = _parse_iso(stats.get("last_entry_at"))
+    if last_entry_at is not None:
+        times = [value for value in times if value > last_entry_at]
+        timeline = [last_entry_at, *times]
+    else:
+        timeline = list(times)
+
+    interarrival = stats.get("interarrival_seconds")
+    gaps = [
+        (later - earlier).total_seconds()
+        for earlier, later in zip(timeline, timeline[1:])
+        if later > earlier
+    ]
+    if gaps:
+        interarrival = _ewma(interarrival, sum(gaps) / len(gaps))
+    if timeline:
+        stats["last_entry_at"] = timeline[-1].isoformat()
+
+    stats["polls"] = int(stats.get("polls") or 0) + 1
+    stats["new_items_avg"] = round(
+        _ewma(stats.get("new_items_avg"), max(new_items, 0)), 4
+    )
+    stats["empty_polls"] = (
+        int(stats.get("empty_polls") or 0) + 1 if new_items <= 0 else 0
+    )
+    if interarrival is not None:
+        stats["interarrival_seconds"] = round(float(interarrival), 1)
+
+    if is_adaptive_polling_enabled():
+        interval = compute_poll_interval(
+            current_interval=int(stats.get("interval_seconds") or base_interval),
+            new_items=new_items,
+            interarrival_seconds=stats.get("interarrival_seconds"),
+            bounds=adaptive_interval_bounds(),
+        )
+    else:
+        interval = base_interval
+    stats["interval_seconds"] = interval
+    stats["last_polled_at"] = polled_at.isoformat()
+
+    feed.poll_stats = stats
+    feed.next_poll_at = polled_at + timedelta(seconds=interval)
+    return stats
+
+
+def _suspend_threshold() -> int:
+    raw = os.getenv("RSS_FEED_SUSPEND_AFTER", str(_DEFAULT_SUSPEND_AFTER))
+    try:
+        return max(int(raw), 0)
+    except (TypeError, ValueError):
+        return _DEFAULT_SUSPEND_AFTER
+
+
+def classify_poll_error(exc: BaseException) -> str:
+    """Map a poll failure onto a coarse, stable error class."""
+
+    if isinstance(exc, FeedParseError):
+        return "parse"
+    if isinstance(exc, requests.HTTPError):
+        status_code = getattr(getattr(exc, "response", None), "status_code", None)
+        if status_code in (404, 410):
+            return "http_gone"
+        if status_code in (401, 403):
+            return "http_auth"
+        if status_code == 429:
+            return "http_rate_limited"
+        if isinstance(status_code, int) and status_code >= 500:
+            return "http_server"
+        return "http_client"
+    if isinstance(exc, (requests.ConnectionError, requests.Timeout)):
+        return "network"
+    if isinstance(exc, requests.RequestException):
+        return "http_client"
+    return "error"
+
+
+def is_permanent_error_class(error_class: str) -> bool:
+    """Errors that an immediate retry of the same job cannot fix."""
+
+    return error_class in PERMANENT_ERROR_CLASSES
+
+
+def record_poll_success(feed: Feed, *, polled_at: datetime) -> None:
+    feed.health_status = "healthy"
+    feed.consecutive_failures = 0
+    feed.last_success_at = polled_at
+
+
+def record_poll_failure(
+    feed: Feed,
+    exc: BaseException,
+    *,
+    failed_at: datetime,
+    count_failure: bool = True,
+) -> str:
+    """Record a failed poll and back off scheduling for the feed.
+
+    Returns the error class.  ``count_failure`` is false for worker retries
+    of a job whose failure was already counted.
+    """
+
+    failed_at = _ensure_utc(failed_at)
+    error_class = classify_poll_error(exc)
+    feed.last_error_class = error_class
+    feed.last_error = str(exc)[:500]
+    feed.last_error_at = failed_at
+    if count_failure:
+        feed.consecutive_failures = int(feed.consecutive_failures or 0) + 1
+
+    failures = max(int(feed.consecutive_failures or 0), 1)
+    threshold = _suspend_threshold()
+    if threshold and failures >= threshold:
+        feed.health_status = "suspended"
+    else:
+        feed.health_status = "degraded"
+
+    _, maximum = adaptive_interval_bounds()
+    backoff_cap = max(
+        _interval_from_env("RSS_FEED_MAX_BACKOFF", _DEFAULT_MAX_BACKOFF), maximum
+    )
+    delay = min(base_interval_seconds(feed) * (2 ** (failures - 1)), backoff_cap)
+    feed.next_poll_at = failed_at + timedelta(seconds=delay)
+    return error_class
+
+
+def reset_feed_health(feed: Feed) -> None:
+    """Give a feed a clean slate, e.g. after its URL is corrected."""
+
+    feed.health_status = "healthy"
+    feed.consecutive_failures = 0
+    feed.last_error_class = None
+    feed.last_error = None
+    feed.last_error_at = None
+    feed.next_poll_at = None
+
+
+def reset_adaptive_interval(feed: Feed) -> None:
+    """Forget the learned interval, e.g. after the feed URL or frequency changes."""
+
+    stats = dict(feed.poll_stats or {})
+    stats.pop("interval_seconds", None)
+    feed.poll_stats = stats
+    feed.next_poll_at = None
+    feed.fetch_hints = {}
+
+
+def scheduled_poll_skip_details(
+    feed: Feed,
+    *,
+    now: Optional[datetime] = None,
+) -> Optional[Dict[str, Any]]:
+    """Return job details describing why a scheduled poll can be skipped.
+
+    Suspended and backing-off feeds are skipped first; server freshness hints
+    (HTTP caching headers, RSS ``ttl``/``skipHours``/``skipDays``) take
+    precedence over the adaptive interval.
+    """
+
+    effective_now = _ensure_utc(now or datetime.now(timezone.utc))
+    if feed.health_status == "suspended":
+        return {
+            "skipped": True,
+            "reason": "suspended",
+            "feed_id": feed.id,
+            "consecutive_failures": feed.consecutive_failures,
+            "last_error_class": feed.last_error_class,
+        }
+    if (
+        feed.consecutive_failures
+        and feed.next_poll_at is not None
+        and _ensure_utc(feed.next_poll_at) > effective_now
+    ):
+        return {
+            "skipped": True,
+            "reason": "failure_backoff",
+            "feed_id": feed.id,
+            "next_poll_at": _ensure_utc(feed.next_poll_at).isoformat(),
+            "consecutive_failures": feed.consecutive_failures,
+            "last_error_class": feed.last_error_class,
+        }
+    if is_fetch_hints_enabled():
+        _, maximum = adaptive_interval_bounds()
+        hinted = next_useful_fetch(
+            feed.fetch_hints,
+            now=effective_now,
+            max_delay=timedelta(seconds=maximum),
+        )
+        if hinted is not None:
+            not_before, reason = hinted
+            return {
+                "skipped": True,
+                "reason": reason,
+                "feed_id": feed.id,
+                "next_poll_at": not_before.isoformat(),
+            }
+
+    if not is_adaptive_polling_enabled() or feed.next_poll_at is None:
+        return None
+    next_poll_at = _ensure_utc(feed.next_poll_at)
+    interval = int((feed.poll_stats or {}).get("interval_seconds") or 0)
+    grace = max(_DUE_GRACE_MIN_SECONDS, interval * _DUE_GRACE_FRACTION)
+    if (next_poll_at - effective_now).total_seconds() <= grace:
+        return None
+    return {
+        "skipped": True,
+        "reason": "adaptive_interval",
+        "feed_id": feed.id,
+        "next_poll_at": next_poll_at.isoformat(),
+        "interval_seconds": interval or None,
+    }
+
+
+def _pending_poll_feed_ids(session: Session) -> Set[str]:
+    """Feeds named by a queued or running ``rss_poll`` or ``rss_poll_batch`` job."""
+
+    stmt = (
+        select(Job.type, Job.payload)
+        .where(Job.type.in_(FEED_DRIVEN_JOB_TYPES))
+        .where(Job.status.in_(("queued", "in_progress")))
+    )
+    pending: Set[str] = set()
+    for job_type, payload in session.exec(stmt).all():
+        payload = payload or {}
+        if job_type == "rss_poll":
+            if payload.get("feed_id"):
+                pending.add(str(payload["feed_id"]))
+        else:
+            pending.update(str(feed_id) for feed_id in payload.get("feed_ids") or [])
+    return pending
+
+
+def _schedule_feed_ids(
+    schedule: JobSchedule, owner_feed_ids: Dict[Optional[str], List[str]]
+) -> List[str]:
+    payload = schedule.payload or {}
+    if schedule.job_type == "rss_poll":
+        return [str(payload["feed_id"])] if payload.get("feed_id") else []
+    if payload.get("feed_ids"):
+        return [str(feed_id) for feed_id in payload["feed_ids"]]
+    if payload.get("all_feeds"):
+        return owner_feed_ids.get(schedule.owner_user_id, [])
+    return []
+
+
+def _feed_schedule_policy(
+    session: Session, feeds: Iterable[Feed]
+) -> Tuple[Set[str], Dict[str, str]]:
+    """Return the feeds whose RSS schedules are all paused, and feed credentials.
+
+    A feed covered by RSS poll schedules is polled only while one of them is
+    active, with the Instapaper credential of an active schedule (a per-feed
+    ``rss_poll`` schedule wins over a batch schedule).  Feeds without any RSS
+    poll schedule are polled without a credential.
+    """
+
+    owner_feed_ids: Dict[Optional[str], List[str]] = {}
+    for feed in feeds:
+        owner_feed_ids.setdefault(feed.owner_user_id, []).append(feed.id)
+    if not owner_feed_ids:
+        return set(), {}
+    owner_filters = []
+    owners = [owner for owner in owner_feed_ids if owner is not None]
+    if owners:
+        owner_filters.append(JobSchedule.owner_user_id.in_(owners))
+    if None in owner_feed_ids:
+        owner_filters.append(JobSchedule.owner_user_id.is_(None))
+    stmt = (
+        select(JobSchedule)
+        .where(JobSchedule.job_type.in_(FEED_DRIVEN_JOB_TYPES))
+        .where(or_(*owner_filters))
+    )
+    schedules = sorted(
+        session.exec(stmt).all(),
+        key=lambda schedule: (schedule.job_type != "rss_poll", schedule.id),
+    )
+
+    scheduled: Set[str] = set()
+    active: Set[str] = set()
+    credentials: Dict[str, str] = {}
+    for schedule in schedules:
+        feed_ids = _schedule_feed_ids(schedule, owner_feed_ids)
+        scheduled.update(feed_ids)
+        if not schedule.is_active:
+            continue
+        active.update(feed_ids)
+        instapaper_id = (schedule.payload or {}).get("instapaper_id")
+        if instapaper_id:
+            for feed_id in feed_ids:
+                credentials.setdefault(feed_id, str(instapaper_id))
+    return scheduled - active, credentials
+
+
+def enqueue_due_feed_polls(
+    session: Session,
+    *,
+    now: Optional[datetime] = None,
+) -> List[Job]:
+    """Enqueue ``rss_poll_batch`` jobs for feeds whose poll is due.
+
+    A feed is due once ``next_poll_at`` (its last poll plus its poll
+    frequency, adaptive interval or failure back-off) has passed, or when it
+    has never been polled.  Feeds whose RSS poll schedules are all paused are
+    not polled, and feeds already in a queued or running poll job are not
+    dispatched again.  Due feeds are grouped per owner and Instapaper
+    credential into batches.  Dispatched feeds are leased by pushing
+    ``next_poll_at`` forward so later ticks do not select them again while
+    the batch is pending; the poll itself then records the real next due
+    time.
+    """
+
+    effective_now = _ensure_utc(now or datetime.now(timezone.utc))
+    batch_size = _int_from_env("RSS_FEED_DRIVEN_BATCH_SIZE", _DEFAULT_FEED_BATCH_SIZE)
+    limit = _int_from_env("RSS_FEED_DRIVEN_MAX_FEEDS", _DEFAULT_FEED_DISPATCH_LIMIT)
+    lease = timedelta(
+        seconds=_interval_from_env("RSS_FEED_DRIVEN_LEASE", _DEFAULT_FEED_DISPATCH_LEASE)
+    )
+
+    stmt = (
+        select(Feed)
+        .where(or_(Feed.next_poll_at.is_(None), Feed.next_poll_at <= effective_now))
+        .where(Feed.health_status != "suspended")
+        .order_by(Feed.next_poll_at.asc().nulls_first(), Feed.id)
+        .limit(limit)
+    )
+    for_update_kwargs = _for_update_kwargs(session)
+    if for_update_kwargs:
+        stmt = stmt.with_for_update(**for_update_kwargs)
+
+    feeds = session.exec(stmt).all()
+    pending = _pending_poll_feed_ids(session) if feeds else set()
+    paused, credentials = _feed_schedule_policy(session, feeds)
+
+    groups: Dict[Tuple[Optional[str], Optional[str]], List[str]] = {}
+    for feed in feeds:
+        if feed.id in paused:
+            # Check again once the feed's own interval has passed.
+            feed.next_poll_at = effective_now + timedelta(seconds=base_interval_seconds(feed))
+            session.add(feed)
+            continue
+        if feed.id in pending:
+            feed.next_poll_at = effective_now + lease
+            session.add(feed)
+            continue
+        skip = scheduled_poll_skip_details(feed, now=effective_now)
+        if skip and skip.get("next_poll_at"):
+            # The server asked us not to refetch yet; move the due time.
+            feed.next_poll_at = _parse_iso(skip["next_poll_at"])
+            session.add(feed)
+            continue
+        groups.setdefault((feed.owner_user_id, credentials.get(feed.id)), []).append(feed.id)
+        feed.next_poll_at = effective_now + lease
+        session.add(feed)
+
+    enqueued: List[Job] = []
+    for (owner_user_id, instapaper_id), feed_ids in groups.items():
+        for start in range(0, len(feed_ids), batch_size):
+            payload: Dict[str, Any] = {"feed_ids": feed_ids[start : start + batch_size]}
+            if instapaper_id:
+                payload["instapaper_id"] = instapaper_id
+            job = Job(
+                type="rss_poll_batch",
+                payload=payload,
+                status="queued",
+                owner_user_id=owner_user_id,
+                details={"feed_driven": True},
+            )
+            session.add(job)
+            enqueued.append(job)
+    if enqueued:
+        session.flush()
+    return enqueued
+
+
+def pull_schedule_forward(
+    session: Session,
+    schedule_id: Optional[str],
+    next_poll_at: Optional[datetime],
+) -> bool:
+    """Move a schedule's ``next_run_at`` earlier when the feed is due sooner."""
+
+    if not schedule_id or next_poll_at is None or not is_adaptive_polling_enabled():
+        return False
+    schedule = session.get(JobSchedule, schedule_id)
+    if schedule is None or not schedule.is_active or schedule.next_run_at is None:
+        return False
+    target = _ensure_utc(next_poll_at)
+    if _ensure_utc(schedule.next_run_at) <= target:
+        return False
+    schedule.next_run_at = target
+    session.add(schedule)
+    return True
+
+
+__all__ = [
+    "FEED_DRIVEN_JOB_TYPES",
+    "PERMANENT_ERROR_CLASSES",
+    "adaptive_interval_bounds",
+    "base_interval_seconds",
+    "classify_poll_error",
+    "compute_poll_interval",
+    "enqueue_due_feed_polls",
+    "is_adaptive_polling_enabled",
+    "is_feed_driven_scheduling_enabled",
+    "is_fetch_hints_enabled",
+    "is_permanent_error_class",
+    "pull_schedule_forward",
+    "record_poll_failure",
+    "record_poll_observation",
+    "record_poll_success",
+    "reset_adaptive_interval",
+    "reset_feed_health",
+    "scheduled_poll_skip_details",
+]
@@ -0,0 +1,101 @@
+"""Per-item progress ledger for long-running jobs.
+
+Handlers that work through many items (bookmarks to publish, feed entries to
+store, bookmarks to purge) record every finished item in ``job_item`` in the
+same transaction as the item's own changes, committing every
+``JOB_CHECKPOINT_SIZE`` items.  When the worker retries the job after an
+error or crash, the handler loads the ledger and skips recorded items, so a
+retry neither repeats finished work nor loses its results.  The worker drops
+a job's ledger once the job is done or has failed for good.
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete
+from sqlmodel import select
+
+from ..models import JobItem
+
+_DEFAULT_CHECKPOINT_SIZE = 100
+
+
+def job_checkpoint_size() -> int:
+    """Items a handler records between commits (``JOB_CHECKPOINT_SIZE``)."""
+
+    try:
+        value = int(os.getenv("JOB_CHECKPOINT_SIZE", _DEFAULT_CHECKPOINT_SIZE))
+    except (TypeError, ValueError):
+        return _DEFAULT_CHECKPOINT_SIZE
+    return value if value > 0 else _DEFAULT_CHECKPOINT_SIZE
+
+
+class JobItemLedger:
+    """Items of one job that earlier attempts already completed."""
+
+    def __init__(self, job_id: str, items: Iterable[JobItem] = ()) -> None:
+        self.job_id = job_id
+        self._items: Dict[str, Tuple[str, Dict[str, Any]]] = {
+            item.item_key: (item.status, dict(item.result or {})) for item in items
+        }
+
+    @classmethod
+    def load(cls, session, job_id: str) -> "JobItemLedger":
+        stmt = (
+            select(JobItem)
+            .where(JobItem.job_id == job_id)
+            .order_by(JobItem.completed_at, JobItem.item_key)
+        )
+        return cls(job_id, session.exec(stmt).all())
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Return ``(status, result)`` recorded for ``key``."""
+
+        return self._items.get(key)
+
+    def items(self, prefix: str = "") -> List[Tuple[str, str, Dict[str, Any]]]:
+        """Return ``(key, status, result)`` in completion order."""
+
+        return [
+            (key, status, result)
+            for key, (status, result) in self._items.items()
+            if key.startswith(prefix)
+        ]
+
+    def record(
+        self,
+        session,
+        key: str,
+        status: str,
+        result: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Add ``key`` to ``session``; it is persisted by the caller's commit."""
+
+        payload = dict(result or {})
+        existing = (
+            session.get(JobItem, (self.job_id, key)) if key in self._items else None
+        )
+        if existing is None:
+            session.add(
+                JobItem(job_id=self.job_id, item_key=key, status=status, result=payload)
+            )
+        else:
+            existing.status = status
+            existing.result = payload
+            session.add(existing)
+        self._items[key] = (status, payload)
+
+
+def clear_job_items(session, job_id: str) -> None:
+    session.exec(delete(JobItem).where(JobItem.job_id == job_id))
+
+
+__all__ = ["JobItemLedger", "clear_job_items", "job_checkpoint_size"]
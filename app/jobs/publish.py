@@ -3,6 +3,7 @@ import logging
 from typing import Any, Dict, List, Optional
 
 from ..audit import record_audit_log
+from ..content_store import get_bookmark_html, prepare_bookmark_publish_sanitizer
 from ..db import get_session_ctx
 from ..jobs import register_handler
 from ..models import (
@@ -11,8 +12,16 @@ from ..models import (
     Job as JobModel,
     JobSchedule as JobScheduleModel,
 )
+from .ledger import JobItemLedger
+from .publish_slots import (
+    publish_concurrency,
+    publish_result_batch_size,
+    run_publish_slots,
+)
 from .util_subpaperflux import (
     apply_publication_result,
+    build_publish_context,
+    count_pending_instapaper_bookmarks,
     get_ordered_feed_tag_ids,
     iter_pending_instapaper_bookmarks,
     publish_url,
@@ -100,6 +109,24 @@ def handle_publish(*, job_id: str, owner_user_id: str | None, payload: dict) ->
         tag_name_cache: Dict[str, Optional[str]] = {}
         folder_map: Optional[Dict[str, Optional[str]]] = None
 
+        # Bookmarks handled by an earlier attempt of this job are not retried.
+        ledger = JobItemLedger.load(session, job_id)
+        published_entries: List[Dict[str, Any]] = []
+        failed_entries: List[Dict[str, Any]] = []
+        for _, status, entry in ledger.items():
+            if status == "published":
+                published_entries.append(entry)
+            else:
+                failed_entries.append(entry)
+        if ledger:
+            logging.info(
+                "[job:%s] Resuming publish; %d bookmark(s) handled by earlier attempts",
+                job_id,
+                len(ledger),
+            )
+            if limit is not None:
+                limit = max(limit - len(ledger), 0)
+
         pending = iter_pending_instapaper_bookmarks(
             session,
             owner_user_id=owner_user_id,
@@ -107,7 +134,9 @@ def handle_publish(*, job_id: str, owner_user_id: str | None, payload: dict) ->
             feed_id=feed_id,
             limit=limit,
             include_paywalled=include_paywalled,
+            exclude_bookmark_ids=[key for key, _, _ in ledger.items()],
         )
+        result["attempted"] = len(ledger) + len(pending)
         if not pending:
             logging.info(
                 "[job:%s] No pending bookmarks for instapaper=%s feed=%s",
@@ -115,42 +144,27 @@ def handle_publish(*, job_id: str, owner_user_id: str | None, payload: dict) ->
                 instapaper_id,
                 feed_for_log,
             )
-            return {**result, "remaining": 0}
-
-        result["attempted"] = len(pending)
-        published_entries: List[Dict[str, Any]] = []
-        failed_entries: List[Dict[str, Any]] = []
-
-        for bookmark in pending:
-            if not bookmark.url:
-                error = ValueError("bookmark missing URL")
-                instapaper_status, instapaper_flags = apply_publication_result(
-                    bookmark,
-                    instapaper_id=str(instapaper_id),
-                    job_id=job_id,
-                    error=error,
-                )
-                failed_entries.append(
-                    {"bookmark_id": bookmark.id, "error": str(error)}
-                )
-                record_audit_log(
+            remaining = 0
+            if ledger:
+                remaining = count_pending_instapaper_bookmarks(
                     session,
-                    entity_type="bookmark",
-                    entity_id=bookmark.id,
-                    action="update",
-                    owner_user_id=bookmark.owner_user_id,
-                    actor_user_id=owner_user_id,
-                    details={
-                        "job_id": job_id,
-                        "source": "publish_job",
-                        "publication_status": instapaper_status,
-                        "publication_flags": instapaper_flags,
-                        "error": str(error),
-                    },
+                    owner_user_id=owner_user_id,
+                    instapaper_id=str(instapaper_id),
+                    feed_id=feed_id,
                 )
-                session.add(bookmark)
-                continue
+            return {
+                **result,
+                "published": published_entries,
+                "failed": failed_entries,
+                "remaining": remaining,
+            }
+
+        publish_context = build_publish_context(
+            str(instapaper_id), owner_user_id, config_dir=config_dir
+        )
 
+        def _prepare(bookmark) -> Dict[str, Any]:
+            nonlocal folder_map
             feed: Optional[FeedModel] = None
             feed_key = str(bookmark.feed_id) if bookmark.feed_id else None
             if feed_key:
@@ -190,89 +204,109 @@ def handle_publish(*, job_id: str, owner_user_id: str | None, payload: dict) ->
             folder_name: Optional[str] = None
             if folder is not None:
                 folder_name = folder.name
-                if folder_map is None:
+                if folder_map is None or folder.id not in folder_map:
                     folder_map = sync_instapaper_folders(
                         session,
                         instapaper_credential_id=str(instapaper_id),
                         owner_user_id=owner_user_id,
                         config_dir=config_dir,
+                        required_folder_ids=[folder.id],
                     )
-                session.refresh(folder)
                 remote_folder_id = (folder_map or {}).get(folder.id) or folder.instapaper_folder_id
 
-            try:
-                publish_res = publish_url(
-                    str(instapaper_id),
-                    bookmark.url,
-                    title=bookmark.title,
-                    tags=tag_names if tag_names else None,
-                    folder=folder_name,
-                    folder_id=remote_folder_id,
-                    owner_user_id=owner_user_id,
-                    config_dir=config_dir,
-                    raw_html_content=bookmark.raw_html_content,
-                )
-                instapaper_status, instapaper_flags = apply_publication_result(
-                    bookmark,
-                    instapaper_id=str(instapaper_id),
-                    job_id=job_id,
-                    result=publish_res,
-                )
-                published_entries.append(
-                    {
-                        "bookmark_id": bookmark.id,
-                        "instapaper_bookmark_id": instapaper_status.get("bookmark_id"),
-                        "deduped": bool(instapaper_status.get("deduped")),
-                    }
-                )
-                record_audit_log(
-                    session,
-                    entity_type="bookmark",
-                    entity_id=bookmark.id,
-                    action="update",
-                    owner_user_id=bookmark.owner_user_id,
-                    actor_user_id=owner_user_id,
-                    details={
-                        "job_id": job_id,
-                        "source": "publish_job",
-                        "publication_status": instapaper_status,
-                        "publication_flags": instapaper_flags,
-                        "result": publish_res,
-                    },
-                )
-            except Exception as exc:  # noqa: BLE001
-                logging.exception(
-                    "[job:%s] Failed to publish bookmark=%s", job_id, bookmark.id
-                )
-                instapaper_status, instapaper_flags = apply_publication_result(
-                    bookmark,
-                    instapaper_id=str(instapaper_id),
-                    job_id=job_id,
-                    error=exc,
-                )
-                failed_entries.append(
-                    {"bookmark_id": bookmark.id, "error": str(exc)}
-                )
-                record_audit_log(
-                    session,
-                    entity_type="bookmark",
-                    entity_id=bookmark.id,
-                    action="update",
-                    owner_user_id=bookmark.owner_user_id,
-                    actor_user_id=owner_user_id,
-                    details={
-                        "job_id": job_id,
-                        "source": "publish_job",
-                        "publication_status": instapaper_status,
-                        "publication_flags": instapaper_flags,
-                        "error": str(exc),
-                    },
-                )
+            raw_html_content = get_bookmark_html(session, bookmark)
+            return {
+                "title": bookmark.title,
+                "tags": tag_names if tag_names else None,
+                "folder": folder_name,
+                "folder_id": remote_folder_id,
+                "owner_user_id": owner_user_id,
+                "config_dir": config_dir,
+                "raw_html_content": raw_html_content,
+                "sanitizer": prepare_bookmark_publish_sanitizer(
+                    session, bookmark, raw_html_content
+                ),
+                "context": publish_context,
+            }
+
+        def _publish(bookmark, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+            return publish_url(str(instapaper_id), bookmark.url, **kwargs)
+
+        def _record(bookmark, publish_res=None, error: Optional[BaseException] = None) -> None:
+            instapaper_status, instapaper_flags = apply_publication_result(
+                bookmark,
+                instapaper_id=str(instapaper_id),
+                job_id=job_id,
+                result=publish_res if error is None else None,
+                error=error,
+                session=session,
+            )
+            details: Dict[str, Any] = {
+                "job_id": job_id,
+                "source": "publish_job",
+                "publication_status": instapaper_status,
+                "publication_flags": instapaper_flags,
+            }
+            if error is None:
+                entry = {
+                    "bookmark_id": bookmark.id,
+                    "instapaper_bookmark_id": instapaper_status.get("bookmark_id"),
+                    "deduped": bool(instapaper_status.get("deduped")),
+                }
+                published_entries.append(entry)
+                ledger.record(session, bookmark.id, "published", entry)
+                details["result"] = publish_res
+            else:
+                entry = {"bookmark_id": bookmark.id, "error": str(error)}
+                failed_entries.append(entry)
+                ledger.record(session, bookmark.id, "failed", entry)
+                details["error"] = str(error)
+            record_audit_log(
+                session,
+                entity_type="bookmark",
+                entity_id=bookmark.id,
+                action="update",
+                owner_user_id=bookmark.owner_user_id,
+                actor_user_id=owner_user_id,
+                details=details,
+            )
             session.add(bookmark)
 
+        try:
+            publish_context.prefetch_dedupe(bookmark.url for bookmark in pending)
+
+            publishable = []
+            for bookmark in pending:
+                if not bookmark.url:
+                    _record(bookmark, error=ValueError("bookmark missing URL"))
+                    continue
+                publishable.append(bookmark)
+
+            batch_size = publish_result_batch_size()
+            recorded = 0
+            for bookmark, publish_res, error in run_publish_slots(
+                publishable,
+                lane=lambda bookmark: str(bookmark.feed_id or ""),
+                prepare=_prepare,
+                publish=_publish,
+                concurrency=publish_concurrency(payload),
+            ):
+                if error is not None:
+                    logging.error(
+                        "[job:%s] Failed to publish bookmark=%s",
+                        job_id,
+                        bookmark.id,
+                        exc_info=error,
+                    )
+                _record(bookmark, publish_res, error)
+                recorded += 1
+                if recorded % batch_size == 0:
+                    session.commit()
+        finally:
+            publish_context.close()
         session.commit()
 
-        remaining = iter_pending_instapaper_bookmarks(
+        remaining = count_pending_instapaper_bookmarks(
             session,
             owner_user_id=owner_user_id,
             instapaper_id=str(instapaper_id),
@@ -281,7 +315,7 @@ def handle_publish(*, job_id: str, owner_user_id: str | None, payload: dict) ->
 
     result["published"] = published_entries
     result["failed"] = failed_entries
-    result["remaining"] = len(remaining)
+    result["remaining"] = remaining
 
     logging.info(
         "[job:%s] Publish summary attempted=%s published=%s failed=%s remaining=%s",
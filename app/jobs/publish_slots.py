@@ -0,0 +1,122 @@
+"""Concurrent publish slots for the ``publish`` job.
+
+A backlog is published by up to ``PUBLISH_CONCURRENCY`` requests in flight
+(default 1, one at a time).  Bookmarks are split into lanes, one per feed;
+a lane never has more than one request in flight, so each feed's bookmarks
+reach Instapaper in the order they were queued.  Idle slots are given to the
+lane whose next bookmark is oldest.  All slots share the credential's rate
+limit through :data:`app.util.ratelimit.limiter`.
+"""
+
+from __future__ import annotations
+
+import heapq
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+_MAX_CONCURRENCY = 16
+_DEFAULT_BULK_CONCURRENCY = 4
+_DEFAULT_RESULT_BATCH_SIZE = 25
+
+
+def _positive_int(raw: Any, default: int) -> int:
+    try:
+        value = int(raw)
+    except (TypeError, ValueError):
+        return default
+    return value if value > 0 else default
+
+
+def _concurrency(payload: Optional[Dict[str, Any]], env_name: str, default: int) -> int:
+    raw = (payload or {}).get("concurrency")
+    if raw in (None, ""):
+        raw = os.getenv(env_name)
+    return min(_positive_int(raw, default), _MAX_CONCURRENCY)
+
+
+def publish_concurrency(payload: Optional[Dict[str, Any]] = None) -> int:
+    """Slots for one job: the payload's ``concurrency`` or ``PUBLISH_CONCURRENCY``."""
+
+    return _concurrency(payload, "PUBLISH_CONCURRENCY", 1)
+
+
+def bulk_publish_concurrency(body: Optional[Dict[str, Any]] = None) -> int:
+    """Requests in flight for one bulk publish (``BULK_PUBLISH_CONCURRENCY``)."""
+
+    return _concurrency(body, "BULK_PUBLISH_CONCURRENCY", _DEFAULT_BULK_CONCURRENCY)
+
+
+def publish_result_batch_size() -> int:
+    """Results applied to bookmarks between commits (``PUBLISH_RESULT_BATCH_SIZE``)."""
+
+    return _positive_int(
+        os.getenv("PUBLISH_RESULT_BATCH_SIZE"), _DEFAULT_RESULT_BATCH_SIZE
+    )
+
+
+def _call(publish: Callable[[T, Any], Any], item: T, prepared: Any):
+    try:
+        return publish(item, prepared), None
+    except Exception as exc:  # noqa: BLE001
+        return None, exc
+
+
+def run_publish_slots(
+    items: Iterable[T],
+    *,
+    lane: Callable[[T], str],
+    prepare: Callable[[T], Any],
+    publish: Callable[[T, Any], Any],
+    concurrency: int,
+) -> Iterator[Tuple[T, Any, Optional[BaseException]]]:
+    """Publish ``items`` and yield ``(item, result, error)`` as each finishes.
+
+    ``prepare`` runs on the calling thread right before an item is handed to
+    a slot, so it may use the caller's database session; ``publish`` runs on
+    a worker thread with what ``prepare`` returned.  Errors raised by
+    ``publish`` are yielded, errors raised by ``prepare`` propagate.  With a
+    single slot items are published in order on the calling thread.
+    """
+
+    ordered: List[T] = list(items)
+    if concurrency <= 1:
+        for item in ordered:
+            result, error = _call(publish, item, prepare(item))
+            yield item, result, error
+        return
+
+    lanes: Dict[str, Deque[Tuple[int, T]]] = {}
+    for index, item in enumerate(ordered):
+        lanes.setdefault(lane(item), deque()).append((index, item))
+    ready = [(queue[0][0], key) for key, queue in lanes.items()]
+    heapq.heapify(ready)
+
+    with ThreadPoolExecutor(
+        max_workers=concurrency, thread_name_prefix="publish-slot"
+    ) as pool:
+        in_flight: Dict[Any, Tuple[str, T]] = {}
+        while ready or in_flight:
+            while ready and len(in_flight) < concurrency:
+                _, key = heapq.heappop(ready)
+                _, item = lanes[key].popleft()
+                in_flight[pool.submit(_call, publish, item, prepare(item))] = (key, item)
+            done, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+            for future in done:
+                key, item = in_flight.pop(future)
+                queue = lanes[key]
+                if queue:
+                    heapq.heappush(ready, (queue[0][0], key))
+                result, error = future.result()
+                yield item, result, error
+
+
+__all__ = [
+    "bulk_publish_concurrency",
+    "publish_concurrency",
+    "publish_result_batch_size",
+    "run_publish_slots",
+]
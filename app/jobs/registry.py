@@ -6,6 +6,10 @@ class JobHandler(Protocol):
         """Handle a job by ID with given payload and owner context."""
 
 
+class NonRetryableJobError(RuntimeError):
+    """Raised by handlers when retrying the job cannot succeed."""
+
+
 _REGISTRY: Dict[str, JobHandler] = {}
 
 
@@ -1,17 +1,25 @@
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
+from sqlalchemy import and_, delete, or_
 from sqlmodel import select
 
 from ..audit import record_audit_log
+from ..content_store import purge_unreferenced_article_content
 from ..integrations.instapaper import (
     INSTAPAPER_BOOKMARKS_DELETE_URL,
     get_instapaper_oauth_session_for_credential,
 )
 from ..jobs import register_handler
 from ..db import get_session_ctx
-from ..models import Bookmark
+from .ledger import JobItemLedger, job_checkpoint_size
+from ..models import Bookmark, PublicationOutbox
+
+_DEFAULT_CONCURRENCY = 4
+_MAX_CONCURRENCY = 16
 
 
 def _seconds_from_spec(spec: str) -> int:
@@ -22,52 +30,82 @@ def _seconds_from_spec(spec: str) -> int:
     return v if u == "s" else v * 60 if u == "m" else v * 3600 if u == "h" else v * 86400
 
 
-def _parse_datetime(value: Any) -> Optional[datetime]:
-    if isinstance(value, datetime):
-        dt = value
-    elif isinstance(value, str):
-        cleaned = value.strip()
-        if cleaned.endswith("Z"):
-            cleaned = cleaned[:-1] + "+00:00"
-        try:
-            dt = datetime.fromisoformat(cleaned)
-        except ValueError:
-            return None
-    else:
-        return None
-    if dt.tzinfo is None:
-        return dt.replace(tzinfo=timezone.utc)
-    return dt
-
-
-def _extract_instapaper_publication(
-    bookmark: Bookmark,
-    *,
-    credential_id: str,
-) -> Optional[Tuple[str, datetime, Dict[str, Any], Dict[str, Any]]]:
-    flags = (bookmark.publication_flags or {}).get("instapaper") or {}
-    if not flags.get("should_publish"):
-        return None
-    flag_cred = flags.get("credential_id")
-    if flag_cred and flag_cred != credential_id:
-        return None
+def retention_concurrency(payload: Optional[Dict[str, Any]] = None) -> int:
+    """Instapaper deletes in flight: the payload's ``concurrency`` or ``RETENTION_CONCURRENCY``."""
 
-    statuses = bookmark.publication_statuses or {}
-    instapaper_status = statuses.get("instapaper") or {}
-    if instapaper_status.get("status") != "published":
-        return None
+    raw = (payload or {}).get("concurrency")
+    if raw in (None, ""):
+        raw = os.getenv("RETENTION_CONCURRENCY")
+    try:
+        value = int(raw)
+    except (TypeError, ValueError):
+        return _DEFAULT_CONCURRENCY
+    return min(value, _MAX_CONCURRENCY) if value > 0 else _DEFAULT_CONCURRENCY
 
-    bookmark_id = instapaper_status.get("bookmark_id") or bookmark.instapaper_bookmark_id
-    if not bookmark_id:
-        return None
 
-    published_ts = _parse_datetime(
-        instapaper_status.get("published_at") or bookmark.published_at
+def _candidate_chunks(
+    session,
+    *,
+    owner_user_id: Optional[str],
+    instapaper_id: str,
+    feed_id: Optional[str],
+    cutoff: datetime,
+    chunk_size: int,
+):
+    """Yield published bookmarks older than ``cutoff`` in chunks.
+
+    Candidates come from ``ix_publication_outbox_retention`` and are paged by
+    ``(published_at, bookmark_id)``, so bookmarks deleted between chunks do
+    not shift the pages.  Only the columns the purge needs are loaded.
+    """
+
+    stmt = (
+        select(
+            PublicationOutbox.bookmark_id,
+            PublicationOutbox.published_at,
+            PublicationOutbox.instapaper_bookmark_id,
+            Bookmark.owner_user_id,
+            Bookmark.instapaper_bookmark_id,
+            Bookmark.publication_statuses,
+            Bookmark.publication_flags,
+            Bookmark.content_hash,
+        )
+        .join(Bookmark, Bookmark.id == PublicationOutbox.bookmark_id)
+        .where(PublicationOutbox.owner_user_id == owner_user_id)
+        .where(PublicationOutbox.status == "published")
+        .where(PublicationOutbox.published_at <= cutoff)
+        .where(PublicationOutbox.instapaper_bookmark_id.is_not(None))
+        .where(
+            or_(
+                PublicationOutbox.credential_id == str(instapaper_id),
+                PublicationOutbox.credential_id.is_(None),
+            )
+        )
     )
-    if not published_ts:
-        return None
-
-    return str(bookmark_id), published_ts, instapaper_status, flags
+    if feed_id:
+        stmt = stmt.where(PublicationOutbox.feed_id == feed_id)
+    stmt = stmt.order_by(PublicationOutbox.published_at, PublicationOutbox.bookmark_id)
+
+    last: Optional[Tuple[datetime, str]] = None
+    while True:
+        page = stmt
+        if last is not None:
+            page = page.where(
+                or_(
+                    PublicationOutbox.published_at > last[0],
+                    and_(
+                        PublicationOutbox.published_at == last[0],
+                        PublicationOutbox.bookmark_id > last[1],
+                    ),
+                )
+            )
+        rows = session.exec(page.limit(chunk_size)).all()
+        if not rows:
+            return
+        last = (rows[-1][1], rows[-1][0])
+        yield rows
+        if len(rows) < chunk_size:
+            return
 
 
 def handle_retention(*, job_id: str, owner_user_id: str | None, payload: dict) -> Dict[str, Any]:
@@ -88,60 +126,96 @@ def handle_retention(*, job_id: str, owner_user_id: str | None, payload: dict) -
         cutoff.isoformat(),
     )
 
-    # Collect candidate bookmarks from DB
+    # Bookmarks purged by an earlier attempt of this job are gone already;
+    # they are only counted.
     with get_session_ctx() as session:
-        stmt = select(Bookmark).where(Bookmark.owner_user_id == owner_user_id)
-        if feed_id:
-            stmt = stmt.where(Bookmark.feed_id == feed_id)
-        rows = session.exec(stmt).all()
+        ledger = JobItemLedger.load(session, job_id)
+    deleted = len(ledger)
 
     # Build OAuth session
     oauth = get_instapaper_oauth_session_for_credential(instapaper_id, owner_user_id)
     if oauth is None:
         logging.warning("[job:%s] No Instapaper credentials or app creds found; skipping retention.", job_id)
-        return {"deleted_count": 0}
-
-    # Delete older bookmarks in Instapaper then remove from DB
-    to_delete = []
-    for b in rows:
-        extraction = _extract_instapaper_publication(b, credential_id=instapaper_id)
-        if not extraction:
-            continue
-        bookmark_id, published_ts, instapaper_status, instapaper_flags = extraction
-        if published_ts <= cutoff:
-            to_delete.append((b, bookmark_id, instapaper_status, instapaper_flags))
-
-    deleted = 0
+        return {"deleted_count": deleted}
+
     from ..util.ratelimit import limiter
-    with get_session_ctx() as session:
-        for db_bookmark, bookmark_id, instapaper_status, instapaper_flags in to_delete:
-            try:
-                limiter.wait("instapaper")
-                resp = oauth.post(INSTAPAPER_BOOKMARKS_DELETE_URL, data={"bookmark_id": bookmark_id})
-                resp.raise_for_status()
-                persistent = session.get(Bookmark, db_bookmark.id)
-                if persistent:
-                    record_audit_log(
-                        session,
-                        entity_type="bookmark",
-                        entity_id=persistent.id,
-                        action="delete",
-                        owner_user_id=persistent.owner_user_id,
-                        actor_user_id=owner_user_id,
-                        details={
-                            "instapaper_bookmark_id": persistent.instapaper_bookmark_id,
-                            "job_id": job_id,
-                            "source": "retention_job",
-                            "cutoff": cutoff.isoformat(),
-                            "publication_status": instapaper_status,
-                            "publication_flags": instapaper_flags,
-                        },
+
+    def _delete_remote(bookmark_id: str) -> Optional[BaseException]:
+        try:
+            limiter.wait(f"instapaper:{instapaper_id}")
+            resp = oauth.post(INSTAPAPER_BOOKMARKS_DELETE_URL, data={"bookmark_id": bookmark_id})
+            resp.raise_for_status()
+        except Exception as exc:  # noqa: BLE001
+            return exc
+        return None
+
+    # Delete each chunk in Instapaper concurrently, then remove the purged
+    # bookmarks, their outbox rows and article content and add audit entries
+    # in one transaction.
+    concurrency = retention_concurrency(payload)
+    with get_session_ctx() as session, ThreadPoolExecutor(
+        max_workers=concurrency, thread_name_prefix="retention"
+    ) as pool:
+        for rows in _candidate_chunks(
+            session,
+            owner_user_id=owner_user_id,
+            instapaper_id=instapaper_id,
+            feed_id=feed_id,
+            cutoff=cutoff,
+            chunk_size=job_checkpoint_size(),
+        ):
+            remote_ids = [str(row[2]) for row in rows]
+            purged: List[str] = []
+            released_hashes: List[str] = []
+            for row, error in zip(rows, pool.map(_delete_remote, remote_ids)):
+                (
+                    bookmark_id,
+                    _,
+                    remote_id,
+                    bookmark_owner,
+                    local_remote_id,
+                    statuses,
+                    flags,
+                    content_hash,
+                ) = row
+                if error is not None:
+                    logging.warning(
+                        "[job:%s] Failed to delete bookmark %s: %s", job_id, remote_id, error
                     )
-                    session.delete(persistent)
-                    session.commit()
-                    deleted += 1
-            except Exception as e:  # noqa: BLE001
-                logging.warning("[job:%s] Failed to delete bookmark %s: %s", job_id, bookmark_id, e)
+                    continue
+                record_audit_log(
+                    session,
+                    entity_type="bookmark",
+                    entity_id=bookmark_id,
+                    action="delete",
+                    owner_user_id=bookmark_owner,
+                    actor_user_id=owner_user_id,
+                    details={
+                        "instapaper_bookmark_id": local_remote_id,
+                        "job_id": job_id,
+                        "source": "retention_job",
+                        "cutoff": cutoff.isoformat(),
+                        "publication_status": (statuses or {}).get("instapaper") or {},
+                        "publication_flags": (flags or {}).get("instapaper") or {},
+                    },
+                )
+                ledger.record(
+                    session,
+                    bookmark_id,
+                    "deleted",
+                    {"instapaper_bookmark_id": remote_id},
+                )
+                purged.append(bookmark_id)
+                if content_hash:
+                    released_hashes.append(content_hash)
+            if purged:
+                session.exec(
+                    delete(PublicationOutbox).where(PublicationOutbox.bookmark_id.in_(purged))
+                )
+                session.exec(delete(Bookmark).where(Bookmark.id.in_(purged)))
+                purge_unreferenced_article_content(session, released_hashes)
+            session.commit()
+            deleted += len(purged)
 
     logging.info("[job:%s] Retention purge deleted %d bookmarks", job_id, deleted)
     return {"deleted_count": deleted}
@@ -1,9 +1,67 @@
+import contextvars
 import logging
-from typing import Any, Dict
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
 
-from ..jobs import register_handler
+import requests
+from requests.adapters import HTTPAdapter
+from sqlmodel import select
+
+from ..db import get_session_ctx
+from ..jobs import NonRetryableJobError, register_handler
 from ..jobs.validation import scrub_legacy_schedule_payload
-from .util_subpaperflux import poll_rss_and_publish
+from ..models import Feed as FeedModel, Job as JobModel
+from ..services.subpaperflux_rss import FeedParseError
+from .feed_polling import (
+    classify_poll_error,
+    is_permanent_error_class,
+    pull_schedule_forward,
+    record_poll_failure,
+    scheduled_poll_skip_details,
+)
+from .ledger import JobItemLedger
+from .util_subpaperflux import (
+    fetch_rss_poll,
+    load_instapaper_poll_credentials,
+    poll_rss_and_publish,
+    prepare_rss_poll,
+    rss_poll_ledger_key,
+    store_rss_poll,
+)
+
+_DEFAULT_BATCH_CONCURRENCY = 8
+_MAX_BATCH_CONCURRENCY = 64
+
+
+def _is_health_error(exc: Exception) -> bool:
+    # Missing or foreign feeds are configuration errors, not feed health.
+    return not isinstance(exc, ValueError) or isinstance(exc, FeedParseError)
+
+
+def _record_failure(job_id: str, feed_id: str, exc: Exception, *, count_failure: bool) -> str:
+    with get_session_ctx() as session:
+        feed = session.get(FeedModel, feed_id)
+        if not feed:
+            return classify_poll_error(exc)
+        error_class = record_poll_failure(
+            feed,
+            exc,
+            failed_at=datetime.now(timezone.utc),
+            count_failure=count_failure,
+        )
+        session.add(feed)
+        session.commit()
+        logging.warning(
+            "[job:%s] RSS poll for feed %s failed (%s); %d consecutive failure(s), status=%s",
+            job_id,
+            feed_id,
+            error_class,
+            feed.consecutive_failures,
+            feed.health_status,
+        )
+        return error_class
 
 
 def handle_rss_poll(*, job_id: str, owner_user_id: str | None, payload: dict) -> Dict[str, Any]:
@@ -14,13 +72,58 @@ def handle_rss_poll(*, job_id: str, owner_user_id: str | None, payload: dict) ->
 
     if not (sanitized_payload.get("feed_id")):
         raise ValueError("feed_id is required")
+    feed_id = sanitized_payload["feed_id"]
+
+    # Scheduled polls defer to the feed's health, freshness hints and adaptive
+    # interval; manual polls always fetch.
+    with get_session_ctx() as session:
+        job_record = session.get(JobModel, job_id)
+        schedule_id = None
+        previous_attempts = 0
+        if job_record:
+            previous_attempts = job_record.attempts or 0
+            if isinstance(job_record.details, dict):
+                schedule_id = job_record.details.get("schedule_id") or None
+        ledger = JobItemLedger.load(session, job_id)
+        stored_poll = ledger.get(rss_poll_ledger_key(feed_id))
+        if stored_poll is not None:
+            logging.info(
+                "[job:%s] RSS poll for feed %s was stored by an earlier attempt",
+                job_id,
+                feed_id,
+            )
+            return stored_poll[1]
+        if schedule_id:
+            feed = session.get(FeedModel, feed_id)
+            skip = scheduled_poll_skip_details(feed) if feed else None
+            if skip:
+                logging.info(
+                    "[job:%s] Skipping RSS poll for feed %s (%s, next_poll_at=%s)",
+                    job_id,
+                    feed_id,
+                    skip["reason"],
+                    skip.get("next_poll_at"),
+                )
+                return skip
+
     instapaper_id = sanitized_payload.get("instapaper_id") or None
     # Feed-level configuration determines paywall/authentication behavior.
-    res = poll_rss_and_publish(
-        instapaper_id=instapaper_id,
-        feed_id=sanitized_payload["feed_id"],
-        owner_user_id=owner_user_id,
-    )
+    try:
+        res = poll_rss_and_publish(
+            instapaper_id=instapaper_id,
+            feed_id=feed_id,
+            owner_user_id=owner_user_id,
+            ledger=ledger,
+        )
+    except Exception as exc:  # noqa: BLE001
+        if not _is_health_error(exc):
+            raise
+        error_class = _record_failure(
+            job_id, feed_id, exc, count_failure=previous_attempts == 0
+        )
+        if is_permanent_error_class(error_class):
+            raise NonRetryableJobError(f"{error_class}: {exc}") from exc
+        raise
     logging.info(
         "[job:%s] RSS poll stored %d/%d entries (duplicates=%d)",
         job_id,
@@ -28,7 +131,175 @@ def handle_rss_poll(*, job_id: str, owner_user_id: str | None, payload: dict) ->
         res.get("total"),
         res.get("duplicates", 0),
     )
+
+    if schedule_id:
+        with get_session_ctx() as session:
+            feed = session.get(FeedModel, feed_id)
+            if feed and pull_schedule_forward(session, schedule_id, feed.next_poll_at):
+                session.commit()
     return res
 
 
+def _batch_concurrency() -> int:
+    raw = os.getenv("RSS_BATCH_CONCURRENCY", str(_DEFAULT_BATCH_CONCURRENCY))
+    try:
+        value = int(raw)
+    except (TypeError, ValueError):
+        return _DEFAULT_BATCH_CONCURRENCY
+    return min(max(value, 1), _MAX_BATCH_CONCURRENCY)
+
+
+def _build_http_session(pool_size: int) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _batch_feed_ids(owner_user_id: Optional[str], payload: Dict[str, Any]) -> List[str]:
+    raw_ids = payload.get("feed_ids")
+    if raw_ids:
+        seen: set[str] = set()
+        feed_ids: List[str] = []
+        for raw in raw_ids:
+            text = str(raw).strip()
+            if text and text not in seen:
+                seen.add(text)
+                feed_ids.append(text)
+        return feed_ids
+    if not payload.get("all_feeds"):
+        raise ValueError("feed_ids or all_feeds is required")
+    with get_session_ctx() as session:
+        stmt = select(FeedModel.id)
+        if owner_user_id is None:
+            stmt = stmt.where(FeedModel.owner_user_id.is_(None))
+        else:
+            stmt = stmt.where(FeedModel.owner_user_id == owner_user_id)
+        return list(session.exec(stmt.order_by(FeedModel.id)).all())
+
+
+def handle_rss_poll_batch(
+    *, job_id: str, owner_user_id: str | None, payload: dict
+) -> Dict[str, Any]:
+    # Expected payload: {"feed_ids": [str], "all_feeds": bool, "instapaper_id": str | None}
+    sanitized_payload = scrub_legacy_schedule_payload(payload)
+    feed_ids = _batch_feed_ids(owner_user_id, sanitized_payload)
+    instapaper_id = sanitized_payload.get("instapaper_id") or None
+
+    outcomes: Dict[str, Dict[str, Any]] = {}
+    with get_session_ctx() as session:
+        job_record = session.get(JobModel, job_id)
+        previous_attempts = (job_record.attempts or 0) if job_record else 0
+        scheduled = bool(
+            job_record
+            and isinstance(job_record.details, dict)
+            and job_record.details.get("schedule_id")
+        )
+        # Feeds stored by an earlier attempt of this job are not polled again.
+        ledger = JobItemLedger.load(session, job_id)
+        due_ids = []
+        for feed_id in feed_ids:
+            stored_poll = ledger.get(rss_poll_ledger_key(feed_id))
+            if stored_poll is not None:
+                outcomes[feed_id] = {"status": "polled", **stored_poll[1]}
+            else:
+                due_ids.append(feed_id)
+        if scheduled and feed_ids:
+            feeds = {
+                feed.id: feed
+                for feed in session.exec(
+                    select(FeedModel).where(FeedModel.id.in_(feed_ids))
+                ).all()
+            }
+            pending_ids, due_ids = due_ids, []
+            for feed_id in pending_ids:
+                feed = feeds.get(feed_id)
+                skip = scheduled_poll_skip_details(feed) if feed else None
+                if skip:
+                    outcomes[feed_id] = {"status": "skipped", **skip}
+                else:
+                    due_ids.append(feed_id)
+
+    def _fail(feed_id: str, exc: Exception) -> None:
+        outcome: Dict[str, Any] = {"status": "failed", "error": str(exc)[:500]}
+        if _is_health_error(exc):
+            outcome["error_class"] = _record_failure(
+                job_id, feed_id, exc, count_failure=previous_attempts == 0
+            )
+        outcomes[feed_id] = outcome
+
+    # Credentials and config files are resolved once for the whole batch.
+    instapaper_credentials = load_instapaper_poll_credentials(instapaper_id, owner_user_id)
+    plans = []
+    for feed_id in due_ids:
+        try:
+            plans.append(
+                prepare_rss_poll(
+                    instapaper_id=instapaper_id,
+                    feed_id=feed_id,
+                    owner_user_id=owner_user_id,
+                    instapaper_credentials=instapaper_credentials,
+                )
+            )
+        except Exception as exc:  # noqa: BLE001
+            _fail(feed_id, exc)
+
+    concurrency = min(_batch_concurrency(), max(len(plans), 1))
+    http_session = _build_http_session(concurrency)
+    try:
+        with ThreadPoolExecutor(
+            max_workers=concurrency, thread_name_prefix="rss-batch"
+        ) as executor:
+            futures = {
+                executor.submit(
+                    contextvars.copy_context().run,
+                    fetch_rss_poll,
+                    plan,
+                    http_session=http_session,
+                ): plan
+                for plan in plans
+            }
+            # Fetches run concurrently; each feed is stored from this thread
+            # as soon as its fetch completes.
+            for future in as_completed(futures):
+                plan = futures[future]
+                try:
+                    result = store_rss_poll(plan, future.result(), ledger=ledger)
+                except Exception as exc:  # noqa: BLE001
+                    _fail(plan.feed_id, exc)
+                    continue
+                outcomes[plan.feed_id] = {"status": "polled", **result}
+    finally:
+        http_session.close()
+
+    summary: Dict[str, Any] = {
+        "feeds": len(feed_ids),
+        "polled": 0,
+        "skipped": 0,
+        "failed": 0,
+        "stored": 0,
+        "duplicates": 0,
+        "total": 0,
+    }
+    for outcome in outcomes.values():
+        status = outcome["status"]
+        summary[status] += 1
+        if status == "polled":
+            for key in ("stored", "duplicates", "total"):
+                summary[key] += int(outcome.get(key) or 0)
+    summary["outcomes"] = {feed_id: outcomes[feed_id] for feed_id in feed_ids if feed_id in outcomes}
+    logging.info(
+        "[job:%s] RSS batch polled %d/%d feeds (skipped=%d, failed=%d, stored=%d)",
+        job_id,
+        summary["polled"],
+        summary["feeds"],
+        summary["skipped"],
+        summary["failed"],
+        summary["stored"],
+    )
+    return summary
+
+
 register_handler("rss_poll", handle_rss_poll)
+register_handler("rss_poll_batch", handle_rss_poll_batch)
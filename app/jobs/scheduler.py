@@ -3,7 +3,7 @@ from __future__ import annotations
 import logging
 import re
 from datetime import datetime, timedelta, timezone
-from typing import List, Optional
+from typing import Iterable, List, Optional
 
 from sqlalchemy.exc import PendingRollbackError
 from sqlmodel import Session, select
@@ -81,8 +81,12 @@ def enqueue_due_schedules(
     session: Session,
     *,
     now: Optional[datetime] = None,
+    exclude_job_types: Iterable[str] = (),
 ) -> List[Job]:
-    """Enqueue jobs for schedules whose ``next_run_at`` is due."""
+    """Enqueue jobs for schedules whose ``next_run_at`` is due.
+
+    Schedules of ``exclude_job_types`` are left untouched.
+    """
 
     effective_now = _ensure_utc(now or datetime.now(timezone.utc))
 
@@ -93,6 +97,9 @@ def enqueue_due_schedules(
         .where(JobSchedule.next_run_at <= effective_now)
         .order_by(JobSchedule.next_run_at, JobSchedule.id)
     )
+    excluded = list(exclude_job_types)
+    if excluded:
+        stmt = stmt.where(JobSchedule.job_type.not_in(excluded))
 
     for_update_kwargs = _for_update_kwargs(session)
     if for_update_kwargs:
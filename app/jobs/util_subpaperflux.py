@@ -2,13 +2,22 @@ import json
 import logging
 import math
 import os
-from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional, Sequence, Tuple
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 from urllib.parse import parse_qsl
 
+from sqlalchemy import delete, func, or_
 from sqlmodel import select
 
 from ..audit import record_audit_log
+from ..content_store import (
+    precompute_article_variants,
+    set_bookmark_html,
+    store_article_html,
+)
 from ..db import get_session_ctx
 from ..integrations.instapaper import get_instapaper_oauth_session_for_credential
 from ..models import (
@@ -18,10 +27,18 @@ from ..models import (
     Feed as FeedModel,
     FeedTagLink as FeedTagLinkModel,
     Folder as FolderModel,
+    InstapaperFolderMap as InstapaperFolderMapModel,
+    PublicationOutbox as PublicationOutboxModel,
     SiteConfig as SiteConfigModel,
     SiteLoginType,
     Tag as TagModel,
 )
+from ..security.credential_cache import (
+    CredentialSnapshot,
+    get_credential_by_id,
+    get_credential_by_kind,
+    snapshot_credential,
+)
 from ..security.crypto import decrypt_dict, encrypt_dict, is_encrypted
 from ..services import (
     subpaperflux_instapaper,
@@ -29,6 +46,9 @@ from ..services import (
     subpaperflux_miniflux,
     subpaperflux_rss,
 )
+from ..util.json_files import load_json_file
+from .feed_polling import record_poll_observation, record_poll_success
+from .ledger import JobItemLedger, job_checkpoint_size
 
 
 class CookieAuthenticationError(RuntimeError):
@@ -428,10 +448,7 @@ def _ensure_api_logging_patch(spf_module: Any) -> None:
 
 
 def _load_json(path: str) -> Dict[str, Any]:
-    if not os.path.exists(path):
-        return {}
-    with open(path, "r") as f:
-        return json.load(f)
+    return load_json_file(path)
 
 
 def resolve_config_dir(explicit: Optional[str] = None) -> str:
@@ -579,41 +596,39 @@ def _get_db_credential(
 ) -> Optional[Dict[str, Any]]:
     if not credential_id:
         return None
-    with get_session_ctx() as session:
-        rec = session.get(CredentialModel, credential_id)
-        if rec and (rec.owner_user_id == owner_user_id):
-            try:
-                return decrypt_dict(rec.data or {})
-            except Exception:
-                return {}
+
+    def _load() -> Optional[CredentialSnapshot]:
+        with get_session_ctx() as session:
+            rec = session.get(CredentialModel, credential_id)
+            return snapshot_credential(rec) if rec else None
+
+    snapshot = get_credential_by_id(credential_id, owner_user_id, _load)
+    if snapshot and snapshot.owner_user_id == owner_user_id:
+        return snapshot.data
     return None
 
 
 def _get_db_credential_by_kind(
     kind: str, owner_user_id: Optional[str]
 ) -> Optional[Dict[str, Any]]:
-    with get_session_ctx() as session:
-        # Prefer user-scoped record, then global (owner_user_id is NULL)
-        stmt_user = select(CredentialModel).where(
-            (CredentialModel.kind == kind)
-            & (CredentialModel.owner_user_id == owner_user_id)
-        )
-        rec = session.exec(stmt_user).first()
-        if rec:
-            try:
-                return decrypt_dict(rec.data or {})
-            except Exception:
-                return {}
-        stmt_global = select(CredentialModel).where(
-            (CredentialModel.kind == kind) & (CredentialModel.owner_user_id.is_(None))
-        )
-        rec2 = session.exec(stmt_global).first()
-        if rec2:
-            try:
-                return decrypt_dict(rec2.data or {})
-            except Exception:
-                return {}
-    return None
+    def _load() -> Optional[CredentialSnapshot]:
+        with get_session_ctx() as session:
+            # Prefer user-scoped record, then global (owner_user_id is NULL)
+            stmt_user = select(CredentialModel).where(
+                (CredentialModel.kind == kind)
+                & (CredentialModel.owner_user_id == owner_user_id)
+            )
+            rec = session.exec(stmt_user).first()
+            if rec is None:
+                stmt_global = select(CredentialModel).where(
+                    (CredentialModel.kind == kind)
+                    & (CredentialModel.owner_user_id.is_(None))
+                )
+                rec = session.exec(stmt_global).first()
+            return snapshot_credential(rec) if rec else None
+
+    snapshot = get_credential_by_kind(kind, owner_user_id, _load)
+    return snapshot.data if snapshot else None
 
 
 def _resolve_site_login_context(
@@ -641,7 +656,14 @@ def _resolve_site_login_context(
     site_config_id: Optional[str] = None
     login_type: str = SiteLoginType.SELENIUM.value
     with get_session_ctx() as session:
-        cred_record = session.get(CredentialModel, site_login_credential_id)
+
+        def _load_credential() -> Optional[CredentialSnapshot]:
+            rec = session.get(CredentialModel, site_login_credential_id)
+            return snapshot_credential(rec) if rec else None
+
+        cred_record = get_credential_by_id(
+            site_login_credential_id, owner_user_id, _load_credential
+        )
         if cred_record is not None:
             if cred_record.kind != "site_login":
                 raise ValueError("credential must be of kind 'site_login'")
@@ -649,10 +671,7 @@ def _resolve_site_login_context(
                 raise ValueError(
                     "site_login credential does not belong to requesting user"
                 )
-            try:
-                credential_data = decrypt_dict(cred_record.data or {})
-            except Exception:
-                credential_data = {}
+            credential_data = cred_record.data
             site_config_id = cred_record.site_config_id or site_config_id
         if not credential_data:
             credential_data = creds_file.get(site_login_credential_id) or {}
@@ -680,6 +699,8 @@ def _resolve_site_login_context(
                 "success_text_class": sc_record.success_text_class or "",
                 "expected_success_text": sc_record.expected_success_text or "",
                 "required_cookies": list(sc_record.required_cookies or []),
+                "paywall_indicators": list(sc_record.paywall_indicators or []),
+                "extract_main_content": bool(sc_record.extract_main_content),
             }
             login_type = site_config["login_type"] or SiteLoginType.SELENIUM.value
             if site_config["login_type"] == SiteLoginType.SELENIUM.value:
@@ -977,6 +998,7 @@ def perform_login_and_save_cookies(
             )
             session.add(new)
         session.commit()
+    invalidate_cookie_cache(pair_id)
     logging.info("Saved cookies to DB for pair=%s", pair_id)
     logging.info(
         "Saved %s cookies for site_config=%s via %s login",
@@ -1015,66 +1037,181 @@ def _decode_cookie_blob(blob: Optional[Any]) -> List[Dict[str, Any]]:
     return []
 
 
-def _get_cookies_for_pair(
-    credential_id: str, site_config_id: str
-) -> List[Dict[str, Any]]:
-    if not credential_id or not site_config_id:
-        return []
+@dataclass(frozen=True)
+class _StoredCookieState:
+    """Decoded cookies of a site-login pair and the site's cookie policy.
+
+    ``version`` is the row's ``last_refresh``, which every write of the
+    pair's cookies bumps.
+    """
+
+    cookies: Tuple[Dict[str, Any], ...]
+    cookies_to_store_names: Tuple[str, ...]
+    required_cookie_names: Tuple[str, ...]
+    version: Optional[str] = None
+
+
+_DEFAULT_COOKIE_CACHE_TTL = 300.0
+_cookie_cache: Dict[Tuple[str, Optional[str]], Tuple[float, _StoredCookieState]] = {}
+_cookie_cache_lock = threading.Lock()
+
+
+def _cookie_cache_ttl() -> float:
+    raw = os.getenv("COOKIE_CACHE_TTL")
+    if raw is None or not raw.strip():
+        return _DEFAULT_COOKIE_CACHE_TTL
+    try:
+        return max(float(raw), 0.0)
+    except ValueError:
+        logging.warning("Invalid COOKIE_CACHE_TTL value %r", raw)
+        return _DEFAULT_COOKIE_CACHE_TTL
+
+
+def invalidate_cookie_cache(site_login_pair_id: Optional[str] = None) -> None:
+    """Forget cached cookies of ``site_login_pair_id``, or of every pair when omitted."""
+
+    with _cookie_cache_lock:
+        if site_login_pair_id is None:
+            _cookie_cache.clear()
+            return
+        for key in [key for key in _cookie_cache if key[0] == site_login_pair_id]:
+            del _cookie_cache[key]
+
+
+def _site_cookie_policy(sc_record) -> Tuple[List[str], List[str]]:
+    """Return the ``(cookies_to_store, required_cookies)`` names of a site config."""
+
+    if not sc_record:
+        return [], []
+    selenium_cfg = sc_record.selenium_config or {}
+    selenium_cookies = []
+    if isinstance(selenium_cfg, dict):
+        selenium_cookies = list(selenium_cfg.get("cookies_to_store") or [])
+
+    api_cfg = sc_record.api_config or {}
+    api_cookies: List[str] = []
+    if isinstance(api_cfg, dict):
+        api_cookies = list(api_cfg.get("cookies_to_store") or [])
+        if not api_cookies:
+            cookie_map = api_cfg.get("cookies") or {}
+            if isinstance(cookie_map, dict):
+                api_cookies = list(cookie_map.keys())
+
+    combined_cookies: List[str] = []
+    for name in selenium_cookies + api_cookies:
+        if name and name not in combined_cookies:
+            combined_cookies.append(name)
+
+    required_cookie_names = list(sc_record.required_cookies or [])
+    if not required_cookie_names:
+        required_cookie_names = list(combined_cookies)
+    return combined_cookies, required_cookie_names
+
+
+def _load_stored_cookie_state(
+    credential_id: str, site_config_id: str, owner_user_id: Optional[str]
+) -> Optional[_StoredCookieState]:
     with get_session_ctx() as session:
+        cred = session.get(CredentialModel, credential_id)
+        if not cred or cred.kind != "site_login":
+            return None
+        if owner_user_id is not None and cred.owner_user_id != owner_user_id:
+            return None
+        if cred.site_config_id and cred.site_config_id != site_config_id:
+            raise ValueError("site_login_pair references mismatched site config")
+        cookies_to_store_names, required_cookie_names = _site_cookie_policy(
+            session.get(SiteConfigModel, site_config_id)
+        )
         stmt = select(CookieModel).where(
             (CookieModel.credential_id == credential_id)
             & (CookieModel.site_config_id == site_config_id)
         )
         rec = session.exec(stmt).first()
-        if not rec:
-            return []
-        return _decode_cookie_blob(rec.encrypted_cookies)
+        cookies = _decode_cookie_blob(rec.encrypted_cookies) if rec else []
+        version = rec.last_refresh if rec else None
+    if not cookies:
+        return None
+    return _StoredCookieState(
+        cookies=tuple(cookies),
+        cookies_to_store_names=tuple(cookies_to_store_names),
+        required_cookie_names=tuple(required_cookie_names),
+        version=version,
+    )
+
+
+def _stored_cookie_version(
+    credential_id: str, site_config_id: str
+) -> Tuple[bool, Optional[str]]:
+    """Return whether the pair has a cookie row and that row's ``last_refresh``."""
+
+    with get_session_ctx() as session:
+        stmt = select(CookieModel.id, CookieModel.last_refresh).where(
+            (CookieModel.credential_id == credential_id)
+            & (CookieModel.site_config_id == site_config_id)
+        )
+        row = session.exec(stmt).first()
+    if row is None:
+        return False, None
+    return True, row[1]
+
+
+def _stored_cookie_state(
+    site_login_pair_id: str,
+    credential_id: str,
+    site_config_id: str,
+    owner_user_id: Optional[str],
+) -> Optional[_StoredCookieState]:
+    """Return the pair's stored cookies, cached for ``COOKIE_CACHE_TTL`` seconds.
+
+    Entries are dropped whenever this process saves, merges or invalidates the
+    pair's cookies, and each hit is checked against the row's ``last_refresh``
+    so writes and deletes made by other processes are picked up too.  Pairs
+    without usable cookies are not cached so a login running elsewhere is
+    picked up on the next poll.
+    """
+
+    ttl = _cookie_cache_ttl()
+    key = (site_login_pair_id, owner_user_id)
+    now = time.monotonic()
+    if ttl > 0:
+        with _cookie_cache_lock:
+            cached = _cookie_cache.get(key)
+        if cached is not None and cached[0] > now:
+            exists, version = _stored_cookie_version(credential_id, site_config_id)
+            if exists and version == cached[1].version:
+                return cached[1]
+            with _cookie_cache_lock:
+                _cookie_cache.pop(key, None)
+    state = _load_stored_cookie_state(credential_id, site_config_id, owner_user_id)
+    if state is not None and ttl > 0:
+        with _cookie_cache_lock:
+            _cookie_cache[key] = (now + ttl, state)
+    return state
 
 
 def get_cookies_for_site_login_pair(
     site_login_pair_id: str, owner_user_id: Optional[str]
 ) -> List[Dict[str, Any]]:
+    cookies, _ = _get_cookies_and_version(site_login_pair_id, owner_user_id)
+    return cookies
+
+
+def _get_cookies_and_version(
+    site_login_pair_id: str, owner_user_id: Optional[str]
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Return the pair's usable cookies and the version they were read at."""
+
     if not site_login_pair_id:
-        return []
+        return [], None
     credential_id, site_config_id = parse_site_login_pair_id(site_login_pair_id)
-    required_cookie_names: List[str] = []
-    cookies_to_store_names: List[str] = []
-    with get_session_ctx() as session:
-        cred = session.get(CredentialModel, credential_id)
-        if not cred or cred.kind != "site_login":
-            return []
-        if owner_user_id is not None and cred.owner_user_id != owner_user_id:
-            return []
-        if cred.site_config_id and cred.site_config_id != site_config_id:
-            raise ValueError("site_login_pair references mismatched site config")
-        sc_record = session.get(SiteConfigModel, site_config_id)
-        if sc_record:
-            selenium_cfg = sc_record.selenium_config or {}
-            selenium_cookies = []
-            if isinstance(selenium_cfg, dict):
-                selenium_cookies = list(selenium_cfg.get("cookies_to_store") or [])
-
-            api_cfg = sc_record.api_config or {}
-            api_cookies: List[str] = []
-            if isinstance(api_cfg, dict):
-                api_cookies = list(api_cfg.get("cookies_to_store") or [])
-                if not api_cookies:
-                    cookie_map = api_cfg.get("cookies") or {}
-                    if isinstance(cookie_map, dict):
-                        api_cookies = list(cookie_map.keys())
-
-            combined_cookies: List[str] = []
-            for name in selenium_cookies + api_cookies:
-                if name and name not in combined_cookies:
-                    combined_cookies.append(name)
-
-            cookies_to_store_names = combined_cookies
-            required_cookie_names = list(sc_record.required_cookies or [])
-            if not required_cookie_names:
-                required_cookie_names = list(cookies_to_store_names)
-    cookies = _get_cookies_for_pair(credential_id, site_config_id)
-    if not cookies:
-        return []
+    state = _stored_cookie_state(
+        site_login_pair_id, credential_id, site_config_id, owner_user_id
+    )
+    if state is None:
+        return [], None
+    cookies = [dict(cookie) for cookie in state.cookies]
+    cookies_to_store_names = list(state.cookies_to_store_names)
+    required_cookie_names = list(state.required_cookie_names)
     filtered = _filter_unexpired_cookies(cookies)
     if cookies and not filtered:
         raise CookieAuthenticationError(
@@ -1155,18 +1292,27 @@ def get_cookies_for_site_login_pair(
                 site_login_pair_id=site_login_pair_id,
             )
 
-    return sanitized
+    return sanitized, state.version
 
 
 def invalidate_cookies_for_site_login_pair(
-    site_login_pair_id: str, owner_user_id: Optional[str] = None
+    site_login_pair_id: str,
+    owner_user_id: Optional[str] = None,
+    *,
+    loaded_version: Optional[str] = None,
 ) -> bool:
-    """Delete stored cookies for the provided site login pair."""
+    """Delete stored cookies for the provided site login pair.
+
+    With ``loaded_version`` (the ``last_refresh`` the caller's cookies were
+    read at) the row is kept when it has been refreshed since, so a stale
+    session cannot throw away cookies a newer login stored.
+    """
 
     if not site_login_pair_id:
         return False
 
     credential_id, site_config_id = parse_site_login_pair_id(site_login_pair_id)
+    invalidate_cookie_cache(site_login_pair_id)
 
     with get_session_ctx() as session:
         stmt = select(CookieModel).where(
@@ -1175,17 +1321,121 @@ def invalidate_cookies_for_site_login_pair(
         )
         if owner_user_id is not None:
             stmt = stmt.where(CookieModel.owner_user_id == owner_user_id)
+        # Locked so a merge cannot refresh the row between the check and delete.
+        stmt = stmt.with_for_update()
         record = session.exec(stmt).first()
         if not record:
             return False
+        if loaded_version is not None and record.last_refresh != loaded_version:
+            logging.info(
+                "Kept cookies for site_login_pair=%s refreshed after they were loaded",
+                site_login_pair_id,
+            )
+            return False
 
         session.delete(record)
         session.commit()
+    invalidate_cookie_cache(site_login_pair_id)
 
     logging.info("Invalidated cookies for site_login_pair=%s", site_login_pair_id)
     return True
 
 
+def _same_cookie(stored: Dict[str, Any], refreshed: Dict[str, Any]) -> bool:
+    if stored.get("name") != refreshed.get("name"):
+        return False
+    stored_domain = str(stored.get("domain") or "").lstrip(".").lower()
+    refreshed_domain = str(refreshed.get("domain") or "").lstrip(".").lower()
+    if stored_domain and refreshed_domain and stored_domain != refreshed_domain:
+        return False
+    return (stored.get("path") or "/") == (refreshed.get("path") or "/")
+
+
+def update_cookies_for_site_login_pair(
+    site_login_pair_id: str,
+    owner_user_id: Optional[str],
+    refreshed_cookies: List[Dict[str, Any]],
+) -> bool:
+    """Merge cookies refreshed by site responses into the stored cookie row.
+
+    Matching cookies take the new value and expiry; new cookies are added
+    only when the site config names them in ``cookies_to_store`` or
+    ``required_cookies``, so tracking cookies set by article responses are
+    not kept.  The row's ``expiry_hint`` (from the named cookies when the
+    site config names any) and ``last_refresh`` are updated.  Nothing is
+    written when the pair has no stored cookies, for example because they
+    were invalidated while the poll was running.
+    """
+
+    return (
+        _merge_refreshed_cookies(site_login_pair_id, owner_user_id, refreshed_cookies)
+        is not None
+    )
+
+
+def _merge_refreshed_cookies(
+    site_login_pair_id: str,
+    owner_user_id: Optional[str],
+    refreshed_cookies: List[Dict[str, Any]],
+) -> Optional[str]:
+    """Merge ``refreshed_cookies`` and return the row's new ``last_refresh``."""
+
+    if not site_login_pair_id or not refreshed_cookies:
+        return None
+
+    credential_id, site_config_id = parse_site_login_pair_id(site_login_pair_id)
+
+    with get_session_ctx() as session:
+        stmt = select(CookieModel).where(
+            (CookieModel.credential_id == credential_id)
+            & (CookieModel.site_config_id == site_config_id)
+        )
+        if owner_user_id is not None:
+            stmt = stmt.where(CookieModel.owner_user_id == owner_user_id)
+        # Lock the row so concurrent merges do not overwrite each other.
+        stmt = stmt.with_for_update()
+        record = session.exec(stmt).first()
+        if not record:
+            return None
+
+        cookies_to_store_names, required_cookie_names = _site_cookie_policy(
+            session.get(SiteConfigModel, site_config_id)
+        )
+        tracked_names = set(cookies_to_store_names) | set(required_cookie_names)
+        cookies = _decode_cookie_blob(record.encrypted_cookies)
+        for refreshed in refreshed_cookies:
+            if not isinstance(refreshed, dict) or not refreshed.get("name"):
+                continue
+            match = next((c for c in cookies if _same_cookie(c, refreshed)), None)
+            if match is None:
+                if refreshed["name"] in tracked_names:
+                    cookies.append(_normalize_cookie_record(dict(refreshed)))
+                continue
+            match["value"] = refreshed.get("value")
+            match.pop("expires", None)
+            expiry = _normalize_cookie_expiry_value(refreshed.get("expiry"))
+            if expiry is not None:
+                match["expiry"] = expiry
+            else:
+                match.pop("expiry", None)
+
+        record.encrypted_cookies = json.dumps(encrypt_dict({"cookies": cookies}))
+        tracked_cookies = [c for c in cookies if c.get("name") in tracked_names]
+        record.expiry_hint = _compute_expiry_hint(tracked_cookies or cookies)
+        refreshed_at = datetime.now(timezone.utc).isoformat()
+        record.last_refresh = refreshed_at
+        session.add(record)
+        session.commit()
+    invalidate_cookie_cache(site_login_pair_id)
+
+    logging.info(
+        "Persisted %s refreshed cookies for site_login_pair=%s",
+        len(refreshed_cookies),
+        site_login_pair_id,
+    )
+    return refreshed_at
+
+
 def parse_lookback_to_seconds(s: str) -> int:
     import re
 
@@ -1196,6 +1446,51 @@ def parse_lookback_to_seconds(s: str) -> int:
     )
 
 
+@dataclass
+class RssPollPlan:
+    """Everything needed to fetch and store one feed poll.
+
+    Building the plan touches the database and config files; fetching only
+    talks to the network, so many plans can be fetched concurrently.
+    """
+
+    feed_id: str
+    feed_url: str
+    owner_user_id: Optional[str]
+    instapaper_id: Optional[str]
+    is_paywalled: bool
+    state: Dict[str, Any]
+    fetch_kwargs: Dict[str, Any]
+
+
+def load_instapaper_poll_credentials(
+    instapaper_id: Optional[str],
+    owner_user_id: Optional[str],
+    *,
+    config_dir: Optional[str] = None,
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Return ``(instapaper_config, app_creds)`` for RSS polling."""
+
+    if not instapaper_id:
+        return {}, {}
+    resolved_dir = config_dir or resolve_config_dir()
+    app_creds_file = (
+        _load_json(os.path.join(resolved_dir, "instapaper_app_creds.json")) or {}
+    )
+    credentials_file = _load_json(os.path.join(resolved_dir, "credentials.json"))
+    instapaper_cfg_file = {}
+    if isinstance(credentials_file, dict):
+        instapaper_cfg_file = credentials_file.get(instapaper_id) or {}
+    instapaper_cfg = (
+        _get_db_credential(instapaper_id, owner_user_id) or instapaper_cfg_file
+    )
+    app_creds = (
+        _get_db_credential_by_kind("instapaper_app", owner_user_id)
+        or app_creds_file
+    )
+    return instapaper_cfg, app_creds
+
+
 def poll_rss_and_publish(
     *,
     instapaper_id: Optional[str] = None,
@@ -1205,26 +1500,43 @@ def poll_rss_and_publish(
     rss_requires_auth: Optional[bool] = None,
     site_login_pair_id: Optional[str] = None,
     owner_user_id: Optional[str] = None,
+    http_session: Any = None,
+    ledger: Optional[JobItemLedger] = None,
 ) -> Dict[str, int]:
+    plan = prepare_rss_poll(
+        instapaper_id=instapaper_id,
+        feed_id=feed_id,
+        lookback=lookback,
+        is_paywalled=is_paywalled,
+        rss_requires_auth=rss_requires_auth,
+        site_login_pair_id=site_login_pair_id,
+        owner_user_id=owner_user_id,
+    )
+    new_entries = fetch_rss_poll(plan, http_session=http_session)
+    return store_rss_poll(plan, new_entries, ledger=ledger)
+
+
+def prepare_rss_poll(
+    *,
+    instapaper_id: Optional[str] = None,
+    feed_id: str,
+    lookback: Optional[str] = None,
+    is_paywalled: Optional[bool] = None,
+    rss_requires_auth: Optional[bool] = None,
+    site_login_pair_id: Optional[str] = None,
+    owner_user_id: Optional[str] = None,
+    instapaper_credentials: Optional[Tuple[Dict[str, Any], Dict[str, Any]]] = None,
+) -> RssPollPlan:
     from datetime import datetime, timezone, timedelta
 
     resolved_dir = resolve_config_dir()
     instapaper_cfg: Dict[str, Any] = {}
     app_creds: Dict[str, Any] = {}
-    if instapaper_id:
-        app_creds_file = (
-            _load_json(os.path.join(resolved_dir, "instapaper_app_creds.json")) or {}
-        )
-        credentials_file = _load_json(os.path.join(resolved_dir, "credentials.json"))
-        instapaper_cfg_file = {}
-        if isinstance(credentials_file, dict):
-            instapaper_cfg_file = credentials_file.get(instapaper_id) or {}
-        instapaper_cfg = (
-            _get_db_credential(instapaper_id, owner_user_id) or instapaper_cfg_file
-        )
-        app_creds = (
-            _get_db_credential_by_kind("instapaper_app", owner_user_id)
-            or app_creds_file
+    if instapaper_credentials is not None:
+        instapaper_cfg, app_creds = instapaper_credentials
+    elif instapaper_id:
+        instapaper_cfg, app_creds = load_instapaper_poll_credentials(
+            instapaper_id, owner_user_id, config_dir=resolved_dir
         )
 
     feed_site_header_sources: List[Any] = []
@@ -1239,15 +1551,19 @@ def poll_rss_and_publish(
         feed_lookback = feed.initial_lookback_period or "24h"
         feed_is_paywalled = feed.is_paywalled
         feed_requires_auth = feed.rss_requires_auth
+        feed_extract_main_content = feed.extract_main_content
         feed_site_config_id = feed.site_config_id
         feed_site_login_credential_id = feed.site_login_credential_id
         feed_last_poll_at = feed.last_rss_poll_at
+        feed_fetch_hints = dict(feed.fetch_hints or {})
         feed_site_config = None
         if feed_site_config_id:
             sc = session.get(SiteConfigModel, feed_site_config_id)
             if sc:
                 feed_site_config = {
                     "sanitizing_criteria": sc.cookies_to_store or [],
+                    "paywall_indicators": list(sc.paywall_indicators or []),
+                    "extract_main_content": bool(sc.extract_main_content),
                 }
                 feed_site_header_sources = _collect_header_sources_from_model(sc)
 
@@ -1279,6 +1595,7 @@ def poll_rss_and_publish(
             "initial_lookback_period": effective_lookback,
             "is_paywalled": effective_is_paywalled,
             "rss_requires_auth": effective_requires_auth,
+            "extract_main_content": feed_extract_main_content,
         }
     )
 
@@ -1298,12 +1615,14 @@ def poll_rss_and_publish(
         "force_run": False,
         "force_sync_and_purge": False,
         "bookmarks": {},
+        "fetch_hints": feed_fetch_hints,
     }
 
     # Site config (for sanitization hints)
     site_cfg = None
     site_header_sources: List[Any] = []
     cookies: List[Dict[str, Any]] = []
+    cookie_version: Optional[str] = None
     if site_login_pair_id:
         _, resolved_site_config_id, resolved_login_type, _, resolved_site_config = (
             _resolve_site_login_context(
@@ -1319,11 +1638,19 @@ def poll_rss_and_publish(
             ) or []
         site_cfg = {
             "sanitizing_criteria": cookies_to_store,
+            "paywall_indicators": list(
+                resolved_site_config.get("paywall_indicators") or []
+            ),
+            "extract_main_content": bool(
+                resolved_site_config.get("extract_main_content")
+            ),
         }
         site_header_sources = _collect_header_sources_from_site_dict(
             resolved_site_config
         )
-        cookies = get_cookies_for_site_login_pair(site_login_pair_id, owner_user_id)
+        cookies, cookie_version = _get_cookies_and_version(
+            site_login_pair_id, owner_user_id
+        )
     elif feed_site_config:
         site_cfg = feed_site_config
         cookies = []
@@ -1342,41 +1669,120 @@ def poll_rss_and_publish(
     header_overrides = subpaperflux_rss.merge_header_overrides(*header_candidates)
 
     cookie_invalidator = None
+    cookie_updater = None
     if site_login_pair_id:
+        # Cookies this poll merged count as the ones it loaded; anything newer
+        # came from another login and is not thrown away on a paywall hit.
+        loaded_cookie_version = {"value": cookie_version}
+
         def _invalidate_cookies(exc: Exception) -> None:
             reason = getattr(exc, "indicator", None)
+            source = getattr(exc, "rule_source", None)
+            detail = ""
+            if reason:
+                detail = f" (indicator={reason}, source={source})" if source else f" (indicator={reason})"
             logging.info(
                 "Invalidating cookies for pair=%s after paywall detection%s",
                 site_login_pair_id,
-                f" (indicator={reason})" if reason else "",
+                detail,
             )
             invalidate_cookies_for_site_login_pair(
-                site_login_pair_id, owner_user_id
+                site_login_pair_id,
+                owner_user_id,
+                loaded_version=loaded_cookie_version["value"],
             )
 
         cookie_invalidator = _invalidate_cookies
 
-    new_entries = subpaperflux_rss.get_new_rss_entries(
-        config_file=os.path.join(resolved_dir, "adhoc.ini"),
+        def _update_cookies(refreshed: List[Dict[str, Any]]) -> None:
+            refreshed_at = _merge_refreshed_cookies(
+                site_login_pair_id, owner_user_id, refreshed
+            )
+            if refreshed_at is not None:
+                loaded_cookie_version["value"] = refreshed_at
+
+        cookie_updater = _update_cookies
+
+    return RssPollPlan(
+        feed_id=feed_id,
         feed_url=feed_url,
-        instapaper_config=instapaper_cfg,
-        app_creds=app_creds,
-        rss_feed_config=rss_ini,
-        instapaper_ini_config=instapaper_ini,
-        cookies=cookies,
+        owner_user_id=owner_user_id,
+        instapaper_id=instapaper_id,
+        is_paywalled=bool(effective_is_paywalled),
         state=state,
-        site_config=site_cfg,
-        header_overrides=header_overrides,
-        cookie_invalidator=cookie_invalidator,
+        fetch_kwargs={
+            "config_file": os.path.join(resolved_dir, "adhoc.ini"),
+            "feed_url": feed_url,
+            "instapaper_config": instapaper_cfg,
+            "app_creds": app_creds,
+            "rss_feed_config": rss_ini,
+            "instapaper_ini_config": instapaper_ini,
+            "cookies": cookies,
+            "state": state,
+            "site_config": site_cfg,
+            "header_overrides": header_overrides,
+            "cookie_invalidator": cookie_invalidator,
+            "cookie_updater": cookie_updater,
+        },
     )
 
+
+def fetch_rss_poll(plan: RssPollPlan, *, http_session: Any = None) -> List[Dict[str, Any]]:
+    """Fetch the feed for ``plan``; safe to call from worker threads."""
+
+    kwargs = dict(plan.fetch_kwargs)
+    if http_session is not None:
+        kwargs["http_session"] = http_session
+    return subpaperflux_rss.get_new_rss_entries(**kwargs)
+
+
+def rss_poll_ledger_key(feed_id: str) -> str:
+    """Ledger key recording that the poll of ``feed_id`` was stored."""
+
+    return f"feed:{feed_id}"
+
+
+def store_rss_poll(
+    plan: RssPollPlan,
+    new_entries: List[Dict[str, Any]],
+    *,
+    ledger: Optional[JobItemLedger] = None,
+) -> Dict[str, int]:
+    """Upsert fetched entries as bookmarks and record the poll on the feed.
+
+    Without a ledger all bookmarks for the poll are written in a single
+    transaction.  With one, entries are committed in checkpoints together
+    with their ledger records, and entries stored by an earlier attempt of
+    the job are skipped but still counted.
+    """
+
+    feed_id = plan.feed_id
+    feed_url = plan.feed_url
+    owner_user_id = plan.owner_user_id
+    instapaper_id = plan.instapaper_id
+    effective_is_paywalled = plan.is_paywalled
+    state = plan.state
+
     stored = 0
     duplicates = 0
     total_entries = len(new_entries)
 
     poll_completed_at = datetime.now(timezone.utc)
+    entry_times: List[datetime] = []
+    checkpoint_size = job_checkpoint_size()
+    handled = 0
 
     with get_session_ctx() as session:
+
+        def _checkpoint(entry_key: str, status: str) -> None:
+            nonlocal handled
+            if ledger is None:
+                return
+            ledger.record(session, entry_key, status)
+            handled += 1
+            if handled % checkpoint_size == 0:
+                session.commit()
+
         for entry in new_entries:
             url = entry.get("url")
             if not url:
@@ -1390,6 +1796,17 @@ def poll_rss_and_publish(
                     published_at_value = datetime.fromisoformat(published_at_value)
                 except Exception:
                     published_at_value = None
+            if isinstance(published_at_value, datetime):
+                entry_times.append(published_at_value)
+
+            entry_key = f"entry:{feed_id}:{url}"
+            recorded = ledger.get(entry_key) if ledger is not None else None
+            if recorded is not None:
+                if recorded[0] == "stored":
+                    stored += 1
+                else:
+                    duplicates += 1
+                continue
 
             rss_entry_metadata = entry.get("rss_entry_metadata") or {}
             feed_meta = rss_entry_metadata.get("feed") or {}
@@ -1426,10 +1843,8 @@ def poll_rss_and_publish(
                     existing.rss_entry = merged_metadata
                     changed = True
 
-                if raw_html_content and raw_html_content != (
-                    existing.raw_html_content or ""
-                ):
-                    existing.raw_html_content = raw_html_content
+                if set_bookmark_html(session, existing, raw_html_content):
+                    precompute_article_variants(session, existing.content_hash)
                     changed = True
 
                 publication_statuses, publication_flags = _merge_publication_structures(
@@ -1451,7 +1866,8 @@ def poll_rss_and_publish(
 
                 if changed:
                     session.add(existing)
-                    session.commit()
+                    sync_publication_outbox(session, existing)
+                _checkpoint(entry_key, "duplicate")
                 continue
 
             publication_statuses, publication_flags = _merge_publication_structures(
@@ -1463,6 +1879,8 @@ def poll_rss_and_publish(
                 raw_html_content=raw_html_content,
             )
 
+            content_hash = store_article_html(session, raw_html_content)
+            precompute_article_variants(session, content_hash)
             bm = BookmarkModel(
                 owner_user_id=owner_user_id,
                 instapaper_bookmark_id=None,
@@ -1472,11 +1890,12 @@ def poll_rss_and_publish(
                 feed_id=feed_id,
                 published_at=published_at_value,
                 rss_entry=rss_entry_metadata,
-                raw_html_content=raw_html_content,
+                content_hash=content_hash,
                 publication_statuses=publication_statuses,
                 publication_flags=publication_flags,
             )
             session.add(bm)
+            sync_publication_outbox(session, bm)
             record_audit_log(
                 session,
                 entity_type="bookmark",
@@ -1491,16 +1910,27 @@ def poll_rss_and_publish(
                     "publication_flags": publication_flags,
                 },
             )
-            session.commit()
             stored += 1
+            _checkpoint(entry_key, "stored")
 
         feed_record = session.get(FeedModel, feed_id)
         if feed_record:
             feed_record.last_rss_poll_at = poll_completed_at
+            record_poll_success(feed_record, polled_at=poll_completed_at)
+            feed_record.fetch_hints = state.get("fetch_hints") or {}
+            record_poll_observation(
+                feed_record,
+                new_items=total_entries,
+                entry_times=entry_times,
+                polled_at=poll_completed_at,
+            )
             session.add(feed_record)
-            session.commit()
+        result = {"stored": stored, "duplicates": duplicates, "total": total_entries}
+        if ledger is not None:
+            ledger.record(session, rss_poll_ledger_key(feed_id), "done", result)
+        session.commit()
 
-    return {"stored": stored, "duplicates": duplicates, "total": total_entries}
+    return result
 
 
 def get_instapaper_oauth_session(owner_user_id: Optional[str]):
@@ -1609,6 +2039,26 @@ def get_ordered_feed_tag_ids(session, feed_id: Optional[str]) -> List[str]:
     return ordered
 
 
+def get_ordered_feed_tag_ids_many(
+    session, feed_ids: Iterable[str]
+) -> Dict[str, List[str]]:
+    """Return ``{feed_id: ordered tag ids}`` for ``feed_ids`` in one query."""
+
+    wanted = sorted({str(feed_id) for feed_id in feed_ids if feed_id})
+    ordered: Dict[str, List[str]] = {feed_id: [] for feed_id in wanted}
+    if not wanted:
+        return ordered
+    stmt = (
+        select(FeedTagLinkModel)
+        .where(FeedTagLinkModel.feed_id.in_(wanted))
+        .order_by(FeedTagLinkModel.feed_id, FeedTagLinkModel.position.asc())
+    )
+    for row in session.exec(stmt).all():
+        if row.tag_id:
+            ordered[str(row.feed_id)].append(str(row.tag_id))
+    return ordered
+
+
 def translate_tag_ids_to_names(
     session,
     owner_user_id: Optional[str],
@@ -1667,6 +2117,58 @@ def resolve_effective_folder(
     return folder
 
 
+_DEFAULT_FOLDER_MAP_TTL = 3600.0
+
+
+def _folder_map_ttl() -> float:
+    raw = os.getenv("INSTAPAPER_FOLDER_MAP_TTL")
+    if raw is None or not raw.strip():
+        return _DEFAULT_FOLDER_MAP_TTL
+    try:
+        return max(float(raw), 0.0)
+    except ValueError:
+        logging.warning("Invalid INSTAPAPER_FOLDER_MAP_TTL value %r", raw)
+        return _DEFAULT_FOLDER_MAP_TTL
+
+
+def invalidate_instapaper_folder_maps(session, owner_user_id: Optional[str]) -> None:
+    """Drop the stored folder mappings of ``owner_user_id``.
+
+    Called when a local folder is created, renamed or deleted so the next
+    publish resyncs with Instapaper.  The caller commits.
+    """
+
+    stmt = delete(InstapaperFolderMapModel)
+    if owner_user_id is None:
+        stmt = stmt.where(InstapaperFolderMapModel.owner_user_id.is_(None))
+    else:
+        stmt = stmt.where(InstapaperFolderMapModel.owner_user_id == owner_user_id)
+    session.exec(stmt)
+
+
+def _stored_folder_map(
+    session,
+    instapaper_credential_id: str,
+    owner_user_id: Optional[str],
+    required_folder_ids: Sequence[str],
+) -> Optional[Dict[str, Optional[str]]]:
+    ttl = _folder_map_ttl()
+    if ttl <= 0:
+        return None
+    record = session.get(InstapaperFolderMapModel, instapaper_credential_id)
+    if record is None or record.owner_user_id != owner_user_id:
+        return None
+    synced_at = record.synced_at
+    if synced_at.tzinfo is None:
+        synced_at = synced_at.replace(tzinfo=timezone.utc)
+    if synced_at + timedelta(seconds=ttl) <= datetime.now(timezone.utc):
+        return None
+    mapping = dict(record.mapping or {})
+    if any(folder_id not in mapping for folder_id in required_folder_ids):
+        return None
+    return mapping
+
+
 def sync_instapaper_folders(
     session,
     *,
@@ -1674,7 +2176,22 @@ def sync_instapaper_folders(
     owner_user_id: Optional[str],
     config_dir: Optional[str] = None,
     timeout: int = 10,
+    required_folder_ids: Sequence[str] = (),
 ) -> Dict[str, Optional[str]]:
+    """Map local folder ids to Instapaper folder ids, creating missing folders.
+
+    The mapping is stored per credential and reused for
+    ``INSTAPAPER_FOLDER_MAP_TTL`` seconds unless it lacks one of
+    ``required_folder_ids``; local folder changes drop it through
+    :func:`invalidate_instapaper_folder_maps`.
+    """
+
+    stored = _stored_folder_map(
+        session, str(instapaper_credential_id), owner_user_id, required_folder_ids
+    )
+    if stored is not None:
+        return stored
+
     oauth = get_instapaper_oauth_session_for_credential(
         instapaper_credential_id,
         owner_user_id,
@@ -1757,6 +2274,14 @@ def sync_instapaper_folders(
     for folder in local_folders:
         mapping.setdefault(folder.id, folder.instapaper_folder_id)
 
+    record = session.get(InstapaperFolderMapModel, str(instapaper_credential_id))
+    if record is None:
+        record = InstapaperFolderMapModel(credential_id=str(instapaper_credential_id))
+    record.owner_user_id = owner_user_id
+    record.mapping = dict(mapping)
+    record.synced_at = datetime.now(timezone.utc)
+    session.add(record)
+
     return mapping
 
 
@@ -1797,17 +2322,107 @@ def push_miniflux_cookies(
     }
 
 
-def publish_url(
+def _publish_dedupe_window() -> int:
+    try:
+        return int(os.getenv("PUBLISH_DEDUPE_WINDOW_SEC", "86400"))
+    except Exception:
+        return 86400
+
+
+def _recent_bookmarks_by_url(
+    owner_user_id: str, urls: Sequence[str], window_sec: int
+) -> Dict[str, Optional[str]]:
+    """Map each of ``urls`` with a bookmark in the dedupe window to its Instapaper id."""
+
+    since = datetime.now(timezone.utc) - timedelta(seconds=window_sec)
+    found: Dict[str, Optional[str]] = {}
+    with get_session_ctx() as session:
+        stmt = select(BookmarkModel).where(
+            (BookmarkModel.owner_user_id == owner_user_id)
+            & (BookmarkModel.url.in_(list(urls)))
+            & (
+                (BookmarkModel.published_at.is_(None))
+                | (BookmarkModel.published_at >= since)
+            )
+        )
+        for bookmark in session.exec(stmt).all():
+            found.setdefault(bookmark.url, bookmark.instapaper_bookmark_id)
+    return found
+
+
+@dataclass
+class PublishContext:
+    """Instapaper state shared by every bookmark of one publish run.
+
+    Credentials are resolved once, a single OAuth client (and its pooled
+    HTTP connections) is reused for every request, and the dedupe lookup can
+    be answered from one query made up front with :meth:`prefetch_dedupe`.
+    """
+
+    instapaper_id: str
+    owner_user_id: Optional[str]
+    instapaper_cfg: Dict[str, Any]
+    app_creds: Dict[str, Any]
+    dedupe_window_sec: int
+    _oauth: Any = field(default=None, repr=False)
+    _prefetched_urls: Optional[set] = field(default=None, repr=False)
+    _recent_bookmark_ids: Dict[str, Optional[str]] = field(default_factory=dict, repr=False)
+    _lock: Any = field(default_factory=threading.Lock, repr=False)
+
+    def oauth_session(self):
+        with self._lock:
+            if self._oauth is None:
+                from requests_oauthlib import OAuth1Session
+
+                self._oauth = OAuth1Session(
+                    self.app_creds.get("consumer_key"),
+                    client_secret=self.app_creds.get("consumer_secret"),
+                    resource_owner_key=self.instapaper_cfg.get("oauth_token"),
+                    resource_owner_secret=self.instapaper_cfg.get("oauth_token_secret"),
+                )
+            return self._oauth
+
+    def prefetch_dedupe(self, urls) -> None:
+        """Answer the dedupe check for ``urls`` with one query."""
+
+        if not self.owner_user_id or self.dedupe_window_sec <= 0:
+            return
+        wanted = sorted({url for url in urls if url})
+        if not wanted:
+            return
+        found = _recent_bookmarks_by_url(
+            self.owner_user_id, wanted, self.dedupe_window_sec
+        )
+        if self._prefetched_urls is None:
+            self._prefetched_urls = set()
+        self._prefetched_urls.update(wanted)
+        self._recent_bookmark_ids.update(found)
+
+    def find_recent_publication(self, url: str) -> Tuple[bool, Optional[str]]:
+        """Return whether ``url`` was seen within the dedupe window, and its bookmark id."""
+
+        if not self.owner_user_id or self.dedupe_window_sec <= 0:
+            return False, None
+        if self._prefetched_urls is not None and url in self._prefetched_urls:
+            if url in self._recent_bookmark_ids:
+                return True, self._recent_bookmark_ids[url]
+            return False, None
+        found = _recent_bookmarks_by_url(self.owner_user_id, [url], self.dedupe_window_sec)
+        if url in found:
+            return True, found[url]
+        return False, None
+
+    def close(self) -> None:
+        if self._oauth is not None:
+            self._oauth.close()
+            self._oauth = None
+
+
+def build_publish_context(
     instapaper_id: str,
-    url: str,
-    title: Optional[str] = None,
-    folder: Optional[str] = None,
-    folder_id: Optional[str] = None,
-    tags: Optional[List[str]] = None,
-    owner_user_id: Optional[str] = None,
+    owner_user_id: Optional[str],
     config_dir: Optional[str] = None,
-    raw_html_content: Optional[str] = None,
-) -> Dict[str, Any]:
+) -> PublishContext:
     resolved_dir = resolve_config_dir(config_dir)
     creds = _load_json(os.path.join(resolved_dir, "credentials.json"))
     app_creds_file = _load_json(os.path.join(resolved_dir, "instapaper_app_creds.json"))
@@ -1820,6 +2435,38 @@ def publish_url(
     app_creds = (
         _get_db_credential_by_kind("instapaper_app", owner_user_id) or app_creds_file
     )
+    return PublishContext(
+        instapaper_id=instapaper_id,
+        owner_user_id=owner_user_id,
+        instapaper_cfg=instapaper_cfg,
+        app_creds=app_creds or {},
+        dedupe_window_sec=_publish_dedupe_window(),
+    )
+
+
+def publish_url(
+    instapaper_id: str,
+    url: str,
+    title: Optional[str] = None,
+    folder: Optional[str] = None,
+    folder_id: Optional[str] = None,
+    tags: Optional[List[str]] = None,
+    owner_user_id: Optional[str] = None,
+    config_dir: Optional[str] = None,
+    raw_html_content: Optional[str] = None,
+    sanitizer: Optional[Callable[[str, List[str]], Optional[str]]] = None,
+    context: Optional[PublishContext] = None,
+) -> Dict[str, Any]:
+    """Publish ``url`` to Instapaper.
+
+    Callers publishing many URLs for the same credential pass a
+    :class:`PublishContext` from :func:`build_publish_context`; without one
+    the credentials are resolved and a client is created for this call.
+    """
+
+    owns_context = context is None
+    if context is None:
+        context = build_publish_context(instapaper_id, owner_user_id, config_dir)
 
     instapaper_ini_config = IniSection(
         {
@@ -1835,47 +2482,35 @@ def publish_url(
 
     from ..util.ratelimit import limiter
 
-    limiter.wait("instapaper")
-    # Idempotency check for direct publish
     try:
-        window_sec = int(os.getenv("PUBLISH_DEDUPE_WINDOW_SEC", "86400"))
-    except Exception:
-        window_sec = 86400
-    if owner_user_id and window_sec > 0:
-        from datetime import datetime, timezone, timedelta
-
-        since = datetime.now(timezone.utc) - timedelta(seconds=window_sec)
-        with get_session_ctx() as session:
-            from sqlmodel import select
-
-            stmt = select(BookmarkModel).where(
-                (BookmarkModel.owner_user_id == owner_user_id)
-                & (BookmarkModel.url == url)
-                & (
-                    (BookmarkModel.published_at.is_(None))
-                    | (BookmarkModel.published_at >= since)
-                )
-            )
-            exists = session.exec(stmt).first()
-            if exists:
-                return {
-                    "bookmark_id": exists.instapaper_bookmark_id,
-                    "title": title,
-                    "content_location": None,
-                    "deduped": True,
-                }
+        # Publishes share one request budget per Instapaper credential.
+        limiter.wait(f"instapaper:{context.instapaper_id}")
+        # Idempotency check for direct publish
+        deduped, existing_bookmark_id = context.find_recent_publication(url)
+        if deduped:
+            return {
+                "bookmark_id": existing_bookmark_id,
+                "title": title,
+                "content_location": None,
+                "deduped": True,
+            }
 
-    result = subpaperflux_instapaper.publish_to_instapaper(
-        instapaper_cfg,
-        app_creds,
-        url,
-        title,
-        raw_html_content=raw_html_content,
-        categories_from_feed=[],
-        instapaper_ini_config=instapaper_ini_config,
-        site_config=None,
-        resolve_final_url=True,
-    )
+        result = subpaperflux_instapaper.publish_to_instapaper(
+            context.instapaper_cfg,
+            context.app_creds,
+            url,
+            title,
+            raw_html_content=raw_html_content,
+            categories_from_feed=[],
+            instapaper_ini_config=instapaper_ini_config,
+            site_config=None,
+            resolve_final_url=True,
+            sanitizer=sanitizer,
+            oauth_factory=context.oauth_session,
+        )
+    finally:
+        if owns_context:
+            context.close()
     if not result:
         raise RuntimeError("Instapaper publish failed")
     result["deduped"] = False
@@ -1901,13 +2536,80 @@ def _parse_iso_datetime(value: Any) -> Optional[datetime]:
     return None
 
 
-def _publication_sort_key(bookmark: BookmarkModel) -> Tuple[str, str, str, str]:
+def sync_publication_outbox(
+    session, bookmark: BookmarkModel, *, attempted: bool = False
+) -> None:
+    """Bring ``bookmark``'s publication outbox row in line with its flags.
+
+    Call after changing ``publication_flags`` or ``publication_statuses``;
+    ``attempted`` records a publish attempt.
+    """
+
     flags = (bookmark.publication_flags or {}).get("instapaper") or {}
-    rss_entry = bookmark.rss_entry or {}
-    created = str(flags.get("created_at") or flags.get("last_seen_at") or "")
-    ingested = str(rss_entry.get("ingested_at") or "")
-    published = bookmark.published_at.isoformat() if bookmark.published_at else ""
-    return (created, ingested, published, bookmark.id or "")
+    entry = session.get(PublicationOutboxModel, bookmark.id)
+    if not flags.get("should_publish"):
+        if entry is not None:
+            session.delete(entry)
+        return
+    now = datetime.now(timezone.utc)
+    if entry is None:
+        entry = PublicationOutboxModel(
+            bookmark_id=bookmark.id,
+            enqueued_at=_parse_iso_datetime(
+                flags.get("created_at") or flags.get("last_seen_at")
+            )
+            or now,
+        )
+    statuses = (bookmark.publication_statuses or {}).get("instapaper") or {}
+    credential_id = flags.get("credential_id")
+    entry.owner_user_id = bookmark.owner_user_id
+    entry.feed_id = bookmark.feed_id
+    entry.credential_id = str(credential_id) if credential_id else None
+    entry.status = str(statuses.get("status") or "pending").lower()
+    entry.is_paywalled = bool(flags.get("is_paywalled"))
+    entry.ingested_at = _parse_iso_datetime((bookmark.rss_entry or {}).get("ingested_at"))
+    entry.published_at = None
+    entry.instapaper_bookmark_id = None
+    if entry.status == "published":
+        published_at = _parse_iso_datetime(
+            statuses.get("published_at") or bookmark.published_at
+        )
+        entry.published_at = published_at.astimezone(timezone.utc) if published_at else None
+        remote_id = statuses.get("bookmark_id") or bookmark.instapaper_bookmark_id
+        entry.instapaper_bookmark_id = str(remote_id) if remote_id else None
+    if attempted:
+        entry.attempts = (entry.attempts or 0) + 1
+        entry.last_attempt_at = now
+    session.add(entry)
+
+
+def _pending_outbox_query(
+    stmt,
+    *,
+    owner_user_id: Optional[str],
+    instapaper_id: str,
+    feed_id: Optional[str],
+    include_paywalled: Optional[bool],
+):
+    stmt = (
+        stmt.join(
+            PublicationOutboxModel,
+            PublicationOutboxModel.bookmark_id == BookmarkModel.id,
+        )
+        .where(PublicationOutboxModel.owner_user_id == owner_user_id)
+        .where(PublicationOutboxModel.status != "published")
+        .where(
+            or_(
+                PublicationOutboxModel.credential_id == str(instapaper_id),
+                PublicationOutboxModel.credential_id.is_(None),
+            )
+        )
+    )
+    if feed_id is not None:
+        stmt = stmt.where(PublicationOutboxModel.feed_id == feed_id)
+    if include_paywalled is not None:
+        stmt = stmt.where(PublicationOutboxModel.is_paywalled == bool(include_paywalled))
+    return stmt
 
 
 def iter_pending_instapaper_bookmarks(
@@ -1918,38 +2620,52 @@ def iter_pending_instapaper_bookmarks(
     feed_id: Optional[str],
     limit: Optional[int] = None,
     include_paywalled: Optional[bool] = None,
+    exclude_bookmark_ids: Optional[Iterable[str]] = None,
 ) -> List[BookmarkModel]:
-    stmt = select(BookmarkModel).where(BookmarkModel.owner_user_id == owner_user_id)
-    if feed_id is not None:
-        stmt = stmt.where(BookmarkModel.feed_id == feed_id)
-    rows = session.exec(stmt).all()
-    pending: List[BookmarkModel] = []
-    for bookmark in rows:
-        flags = (bookmark.publication_flags or {}).get("instapaper") or {}
-        if not flags.get("should_publish"):
-            continue
-        credential_id = flags.get("credential_id")
-        if credential_id and str(credential_id) != str(instapaper_id):
-            continue
-        if (
-            include_paywalled is not None
-            and bool(flags.get("is_paywalled")) != include_paywalled
-        ):
-            continue
-        statuses = (bookmark.publication_statuses or {}).get("instapaper") or {}
-        status_value = str(statuses.get("status") or "pending").lower()
-        if status_value == "published":
-            continue
-        pending.append(bookmark)
-    pending.sort(key=_publication_sort_key)
+    """Return bookmarks awaiting publication, oldest enqueued first."""
+
+    stmt = _pending_outbox_query(
+        select(BookmarkModel),
+        owner_user_id=owner_user_id,
+        instapaper_id=instapaper_id,
+        feed_id=feed_id,
+        include_paywalled=include_paywalled,
+    )
+    excluded = list(exclude_bookmark_ids or ())
+    if excluded:
+        stmt = stmt.where(PublicationOutboxModel.bookmark_id.notin_(excluded))
+    stmt = stmt.order_by(
+        PublicationOutboxModel.enqueued_at,
+        PublicationOutboxModel.ingested_at.nulls_first(),
+        BookmarkModel.published_at.nulls_first(),
+        PublicationOutboxModel.bookmark_id,
+    )
     if limit is not None:
         try:
             parsed_limit = int(limit)
         except (TypeError, ValueError):
             parsed_limit = None
         if parsed_limit is not None and parsed_limit >= 0:
-            pending = pending[:parsed_limit]
-    return pending
+            stmt = stmt.limit(parsed_limit)
+    return list(session.exec(stmt).all())
+
+
+def count_pending_instapaper_bookmarks(
+    session,
+    *,
+    owner_user_id: Optional[str],
+    instapaper_id: str,
+    feed_id: Optional[str],
+    include_paywalled: Optional[bool] = None,
+) -> int:
+    stmt = _pending_outbox_query(
+        select(func.count()).select_from(BookmarkModel),
+        owner_user_id=owner_user_id,
+        instapaper_id=instapaper_id,
+        feed_id=feed_id,
+        include_paywalled=include_paywalled,
+    )
+    return int(session.exec(stmt).one())
 
 
 def apply_publication_result(
@@ -1959,6 +2675,7 @@ def apply_publication_result(
     job_id: str,
     result: Optional[Dict[str, Any]] = None,
     error: Optional[BaseException] = None,
+    session=None,
 ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
     now = datetime.now(timezone.utc)
     now_iso = now.isoformat()
@@ -2007,6 +2724,8 @@ def apply_publication_result(
     flags["instapaper"] = instapaper_flags
     bookmark.publication_statuses = statuses
     bookmark.publication_flags = flags
+    if session is not None:
+        sync_publication_outbox(session, bookmark, attempted=True)
 
     return instapaper_status, instapaper_flags
 INSTAPAPER_FOLDERS_LIST_URL = "https://www.instapaper.com/api/1.1/folders/list"
@@ -7,6 +7,10 @@ RequiredField = Union[str, Sequence[str]]
 LEGACY_SCHEDULE_PAYLOAD_KEYS = {"lookback"}
 
 
+# Job types that poll feeds and inherit authentication from the feed itself.
+FEED_POLL_JOB_TYPES = {"rss_poll", "rss_poll_batch"}
+
+
 PAYLOAD_KEY_ALIASES = {
     "feedId": "feed_id",
     "feedIds": "feed_ids",
@@ -14,6 +18,7 @@ PAYLOAD_KEY_ALIASES = {
     "instapaperCredentialId": "instapaper_credential_id",
     "minifluxId": "miniflux_id",
     "olderThan": "older_than",
+    "allFeeds": "all_feeds",
     "credentialId": "credential_id",
     "siteConfigId": "site_config_id",
     "siteLoginPair": "site_login_pair",
@@ -45,6 +50,7 @@ REQUIRED_FIELDS: Dict[str, List[RequiredField]] = {
     "login": [],
     "miniflux_refresh": ["miniflux_id", "feed_ids", "site_login_pair"],
     "rss_poll": ["feed_id"],
+    "rss_poll_batch": [("feed_ids", "all_feeds")],
     "publish": ["instapaper_id"],
     "retention": ["older_than", "instapaper_credential_id"],
 }
@@ -94,6 +100,25 @@ def validate_job(job_type: str, payload: dict) -> Dict:
 
         if not pair_value and not (credential_id and site_config_id):
             missing.append("site_login_pair")
+    if job_type == "rss_poll_batch":
+        feed_ids_value = sanitized_payload.get("feed_ids")
+        all_feeds = bool(sanitized_payload.get("all_feeds"))
+        normalized_feed_ids: List[str] = []
+        if isinstance(feed_ids_value, (list, tuple)):
+            for raw in feed_ids_value:
+                text = str(raw).strip()
+                if text:
+                    normalized_feed_ids.append(text)
+        if normalized_feed_ids:
+            sanitized_payload["feed_ids"] = normalized_feed_ids
+        else:
+            sanitized_payload.pop("feed_ids", None)
+            if not all_feeds and "feed_ids" not in missing:
+                missing.append("feed_ids")
+        if all_feeds:
+            sanitized_payload["all_feeds"] = True
+        else:
+            sanitized_payload.pop("all_feeds", None)
     if job_type == "publish":
         tags_value = sanitized_payload.get("tags")
         if tags_value is not None:
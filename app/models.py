@@ -8,10 +8,13 @@ from sqlalchemy import (
     CheckConstraint,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
+    LargeBinary,
     String,
     Text,
     UniqueConstraint,
+    false,
 )
 from sqlmodel import SQLModel, Field, Column, Relationship
 from datetime import datetime, timezone
@@ -237,6 +240,14 @@ class SiteConfig(SQLModel, table=True):
         default_factory=list,
         sa_column=Column(JSON, nullable=True, server_default="[]"),
     )
+    paywall_indicators: List[str] = Field(
+        default_factory=list,
+        sa_column=Column(JSON, nullable=True, server_default="[]"),
+    )
+    extract_main_content: bool = Field(
+        default=False,
+        sa_column=Column(Boolean, nullable=False, server_default=false()),
+    )
     login_type: SiteLoginType = Field(
         default=SiteLoginType.SELENIUM,
         sa_column=Column(
@@ -257,6 +268,7 @@ class SiteConfig(SQLModel, table=True):
 
     def __init__(self, **data: Any):  # type: ignore[override]
         required_cookies = data.pop("required_cookies", None)
+        paywall_indicators = data.pop("paywall_indicators", None)
         selenium_config = data.pop("selenium_config", None)
         api_config = data.pop("api_config", None)
         legacy_fields = {}
@@ -271,6 +283,7 @@ class SiteConfig(SQLModel, table=True):
                 legacy_fields[key] = data.pop(key)
         super().__init__(**data)
         self.required_cookies = list(required_cookies or [])
+        self.paywall_indicators = list(paywall_indicators or [])
         merged_config: Dict[str, Any] = dict(selenium_config or {})
         if legacy_fields:
             merged_config.update(legacy_fields)
@@ -373,12 +386,55 @@ class Feed(SQLModel, table=True):
     initial_lookback_period: Optional[str] = None
     is_paywalled: bool = False
     rss_requires_auth: bool = False
+    # ``None`` inherits the site config's ``extract_main_content``.
+    extract_main_content: Optional[bool] = Field(
+        default=None,
+        sa_column=Column(Boolean, nullable=True),
+    )
     site_config_id: Optional[str] = Field(default=None, index=True)
     owner_user_id: Optional[str] = Field(default=None, index=True)
     last_rss_poll_at: Optional[datetime] = Field(
         default=None,
         sa_column=Column(DateTime(timezone=True), nullable=True),
     )
+    next_poll_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(DateTime(timezone=True), nullable=True, index=True),
+    )
+    poll_stats: Dict = Field(
+        default_factory=dict,
+        sa_column=Column(JSON, nullable=False, server_default="{}"),
+    )
+    fetch_hints: Dict = Field(
+        default_factory=dict,
+        sa_column=Column(JSON, nullable=False, server_default="{}"),
+    )
+    health_status: str = Field(
+        default="healthy",
+        sa_column=Column(
+            String(length=20), nullable=False, server_default="healthy", index=True
+        ),
+    )  # healthy|degraded|suspended
+    consecutive_failures: int = Field(
+        default=0,
+        sa_column=Column(Integer, nullable=False, server_default="0"),
+    )
+    last_success_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(DateTime(timezone=True), nullable=True),
+    )
+    last_error_class: Optional[str] = Field(
+        default=None,
+        sa_column=Column(String(length=50), nullable=True),
+    )
+    last_error: Optional[str] = Field(
+        default=None,
+        sa_column=Column(Text, nullable=True),
+    )
+    last_error_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(DateTime(timezone=True), nullable=True),
+    )
     site_login_credential_id: Optional[str] = Field(
         default=None,
         sa_column=Column(
@@ -421,7 +477,7 @@ class Credential(SQLModel, table=True):
 class Job(SQLModel, table=True):
     __tablename__ = "job"
     id: str = Field(default_factory=lambda: gen_id("job"), primary_key=True)
-    type: str  # login|miniflux_refresh|rss_poll|publish|retention
+    type: str  # login|miniflux_refresh|rss_poll|rss_poll_batch|publish|retention
     payload: Dict = Field(default_factory=dict, sa_column=Column(JSON))
     status: str = Field(default="queued", index=True)
     owner_user_id: Optional[str] = Field(default=None, index=True)
@@ -440,6 +496,30 @@ class Job(SQLModel, table=True):
     )
 
 
+class JobItem(SQLModel, table=True):
+    """Completed item of a job, committed together with the item's changes.
+
+    Retried jobs skip items recorded here; rows are removed once the job is
+    done or has failed for good.
+    """
+
+    __tablename__ = "job_item"
+
+    job_id: str = Field(
+        sa_column=Column(
+            ForeignKey("job.id", ondelete="CASCADE"),
+            primary_key=True,
+        )
+    )
+    item_key: str = Field(sa_column=Column(String, primary_key=True))
+    status: str = Field(sa_column=Column(String(20), nullable=False))
+    result: Dict = Field(default_factory=dict, sa_column=Column(JSON))
+    completed_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(DateTime(timezone=True), nullable=False),
+    )
+
+
 class JobSchedule(SQLModel, table=True):
     __tablename__ = "job_schedule"
     __table_args__ = (
@@ -537,10 +617,15 @@ class Bookmark(SQLModel, table=True):
         default_factory=dict,
         sa_column=Column(JSON, nullable=False),
     )
+    # Legacy inline article HTML; new content lives in ArticleContent.
     raw_html_content: Optional[str] = Field(
         default=None,
         sa_column=Column(Text, nullable=True),
     )
+    content_hash: Optional[str] = Field(
+        default=None,
+        sa_column=Column(String(64), nullable=True, index=True),
+    )
     publication_statuses: Dict = Field(
         default_factory=dict,
         sa_column=Column(JSON, nullable=False),
@@ -551,6 +636,129 @@ class Bookmark(SQLModel, table=True):
     )
 
 
+class ArticleContent(SQLModel, table=True):
+    """Compressed article HTML keyed by the SHA-256 of its text."""
+
+    __tablename__ = "article_content"
+
+    content_hash: str = Field(
+        sa_column=Column(String(64), primary_key=True),
+    )
+    compression: str = Field(
+        default="gzip",
+        sa_column=Column(String(10), nullable=False, server_default="gzip"),
+    )
+    data: bytes = Field(sa_column=Column(LargeBinary, nullable=False))
+    original_size: int = Field(
+        default=0,
+        sa_column=Column(Integer, nullable=False, server_default="0"),
+    )
+    stored_size: int = Field(
+        default=0,
+        sa_column=Column(Integer, nullable=False, server_default="0"),
+    )
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(DateTime(timezone=True), nullable=False),
+    )
+
+
+class ArticleContentVariant(SQLModel, table=True):
+    """A derived form of stored article HTML built under a given rule set."""
+
+    __tablename__ = "article_content_variant"
+
+    source_hash: str = Field(sa_column=Column(String(64), primary_key=True))
+    variant: str = Field(sa_column=Column(String(20), primary_key=True))
+    rules_version: str = Field(sa_column=Column(String(64), primary_key=True))
+    content_hash: Optional[str] = Field(
+        default=None,
+        sa_column=Column(String(64), nullable=True, index=True),
+    )
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(DateTime(timezone=True), nullable=False),
+    )
+
+
+class PublicationOutbox(SQLModel, table=True):
+    """Instapaper publication state of a bookmark, indexed for the publish job.
+
+    Mirrors the ``instapaper`` entries of ``Bookmark.publication_flags`` and
+    ``Bookmark.publication_statuses`` for bookmarks flagged ``should_publish``.
+    """
+
+    __tablename__ = "publication_outbox"
+    __table_args__ = (
+        Index(
+            "ix_publication_outbox_pending",
+            "owner_user_id",
+            "status",
+            "enqueued_at",
+        ),
+        Index(
+            "ix_publication_outbox_retention",
+            "owner_user_id",
+            "status",
+            "published_at",
+        ),
+    )
+
+    bookmark_id: str = Field(
+        sa_column=Column(
+            ForeignKey("bookmark.id", ondelete="CASCADE"),
+            primary_key=True,
+        )
+    )
+    owner_user_id: Optional[str] = Field(
+        default=None,
+        sa_column=Column(String, nullable=True),
+    )
+    feed_id: Optional[str] = Field(
+        default=None,
+        sa_column=Column(String, nullable=True, index=True),
+    )
+    # ``None`` when the bookmark may be published with any credential.
+    credential_id: Optional[str] = Field(
+        default=None,
+        sa_column=Column(String, nullable=True, index=True),
+    )
+    status: str = Field(
+        default="pending",
+        sa_column=Column(String(20), nullable=False, server_default="pending"),
+    )
+    is_paywalled: bool = Field(
+        default=False,
+        sa_column=Column(Boolean, nullable=False, server_default=false()),
+    )
+    enqueued_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(DateTime(timezone=True), nullable=False),
+    )
+    # Tie-breaker for bookmarks enqueued at the same moment.
+    ingested_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(DateTime(timezone=True), nullable=True),
+    )
+    attempts: int = Field(
+        default=0,
+        sa_column=Column(Integer, nullable=False, server_default="0"),
+    )
+    last_attempt_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(DateTime(timezone=True), nullable=True),
+    )
+    # Set once published; selected by the retention job.
+    published_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(DateTime(timezone=True), nullable=True),
+    )
+    instapaper_bookmark_id: Optional[str] = Field(
+        default=None,
+        sa_column=Column(String, nullable=True),
+    )
+
+
 class Tag(SQLModel, table=True):
     __tablename__ = "tag"
     __table_args__ = (
@@ -611,6 +819,27 @@ class Folder(SQLModel, table=True):
     instapaper_folder_id: Optional[str] = Field(default=None, index=True)
 
 
+class InstapaperFolderMap(SQLModel, table=True):
+    """Last local-to-Instapaper folder mapping synced for a credential.
+
+    Keyed by credential id, which may also name a legacy ``credentials.json``
+    entry, so there is no foreign key.
+    """
+
+    __tablename__ = "instapaper_folder_map"
+
+    credential_id: str = Field(sa_column=Column(String, primary_key=True))
+    owner_user_id: Optional[str] = Field(
+        default=None,
+        sa_column=Column(String, nullable=True, index=True),
+    )
+    mapping: Dict = Field(default_factory=dict, sa_column=Column(JSON))
+    synced_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(DateTime(timezone=True), nullable=False),
+    )
+
+
 class BookmarkTagLink(SQLModel, table=True):
     __tablename__ = "bookmark_tag_link"
 
@@ -676,6 +905,9 @@ __all__ = [
     "Job",
     "Cookie",
     "Bookmark",
+    "ArticleContent",
+    "ArticleContentVariant",
+    "PublicationOutbox",
     "Tag",
     "FeedTagLink",
     "Folder",
@@ -59,6 +59,12 @@ API_TOKENS_ISSUED_COUNTER = Counter(
     "API tokens issued",
 )
 
+CREDENTIAL_CACHE_COUNTER = Counter(
+    "credential_cache_requests_total",
+    "Decrypted credential cache lookups",
+    ["result"],
+)
+
 
 def increment_user_login() -> None:
     USER_LOGINS_COUNTER.inc()
@@ -76,6 +82,10 @@ def increment_api_tokens_issued() -> None:
     API_TOKENS_ISSUED_COUNTER.inc()
 
 
+def increment_credential_cache_request(result: str) -> None:
+    CREDENTIAL_CACHE_COUNTER.labels(result=result).inc()
+
+
 async def metrics_endpoint(_: Request) -> Response:
     return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
 
@@ -5,13 +5,11 @@ import logging
 import os
 import re
 import shlex
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any, AsyncGenerator, Dict, Iterable, List, Optional
 from uuid import uuid4
 
-from bleach.sanitizer import Cleaner
-from bs4 import BeautifulSoup, Doctype
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from fastapi.responses import HTMLResponse, StreamingResponse
 from sqlalchemy import or_, literal
@@ -25,6 +23,13 @@ from ..auth import (
 )
 from ..auth.oidc import get_current_user
 from ..config import is_user_mgmt_enforce_enabled
+from ..content_store import (
+    get_bookmark_html,
+    get_bookmark_preview_html,
+    load_article_html_many,
+    prepare_bookmark_publish_sanitizer,
+    purge_unreferenced_article_content,
+)
 from ..db import get_session
 from ..db import is_postgres
 from ..models import (
@@ -37,9 +42,13 @@ from ..models import (
     JobSchedule,
     Tag,
 )
+from ..jobs.publish_slots import bulk_publish_concurrency
 from ..jobs.util_subpaperflux import (
+    PublishContext,
+    build_publish_context,
     get_instapaper_oauth_session,
-    get_ordered_feed_tag_ids,
+    get_ordered_feed_tag_ids_many,
+    invalidate_instapaper_folder_maps,
     publish_url,
     resolve_effective_folder,
     sync_instapaper_folders,
@@ -66,64 +75,6 @@ router = APIRouter(prefix="/bookmarks", tags=["bookmarks"])
 
 ALLOWED_REGEX_FLAGS = {"i"}
 
-_ALLOWED_PREVIEW_TAGS = {
-    "a",
-    "abbr",
-    "b",
-    "blockquote",
-    "br",
-    "code",
-    "div",
-    "em",
-    "figcaption",
-    "figure",
-    "h1",
-    "h2",
-    "h3",
-    "h4",
-    "h5",
-    "h6",
-    "hr",
-    "i",
-    "img",
-    "li",
-    "ol",
-    "p",
-    "pre",
-    "section",
-    "small",
-    "span",
-    "strong",
-    "sub",
-    "sup",
-    "table",
-    "tbody",
-    "td",
-    "th",
-    "thead",
-    "tr",
-    "ul",
-}
-
-_ALLOWED_PREVIEW_ATTRS = {
-    "a": ["href", "title"],
-    "abbr": ["title"],
-    "img": ["alt", "title", "src"],
-    "td": ["colspan", "rowspan"],
-    "th": ["colspan", "rowspan", "scope"],
-}
-
-_ALLOWED_PREVIEW_PROTOCOLS = ["http", "https", "mailto", "tel"]
-
-_PREVIEW_CLEANER = Cleaner(
-    tags=sorted(_ALLOWED_PREVIEW_TAGS),
-    attributes=_ALLOWED_PREVIEW_ATTRS,
-    protocols=_ALLOWED_PREVIEW_PROTOCOLS,
-    strip=True,
-    strip_comments=True,
-)
-
-
 def _get_request_user_id(current_user) -> Optional[str]:
     if current_user is None:
         return None
@@ -232,23 +183,6 @@ def _require_owner_or_permission(
         status.HTTP_403_FORBIDDEN,
         detail=forbidden_detail or "Forbidden",
     )
-def _sanitize_html_content(html: str) -> str:
-    if not html:
-        return ""
-    soup = BeautifulSoup(html, "html.parser")
-    for element in list(soup.contents):
-        if isinstance(element, Doctype):
-            element.extract()
-    body = soup.body
-    if body:
-        content = body.decode_contents()
-        fragment = content if content else ""
-    else:
-        fragment = soup.decode()
-    cleaned = _PREVIEW_CLEANER.clean(fragment)
-    return cleaned.strip()
-
-
 @dataclass
 class RegexFilter:
     field: str  # "title", "url", or "both"
@@ -579,6 +513,9 @@ def list_bookmarks(
         end = start + size
         rows = rows_filtered[start:end]
 
+    stored_html = load_article_html_many(
+        session, (r.content_hash for r in rows if not r.raw_html_content)
+    )
     items = []
     for r in rows:
         raw_dt = getattr(r, "published_at", None)
@@ -598,7 +535,7 @@ def list_bookmarks(
                 feed_id=r.feed_id,
                 published_at=dt,
                 rss_entry=r.rss_entry or {},
-                raw_html_content=r.raw_html_content,
+                raw_html_content=r.raw_html_content or stored_html.get(r.content_hash or ""),
                 publication_statuses=r.publication_statuses or {},
                 publication_flags=r.publication_flags or {},
             )
@@ -677,6 +614,7 @@ def delete_bookmark(bookmark_id: str, current_user=Depends(get_current_user), se
         },
     )
     session.delete(bm)
+    purge_unreferenced_article_content(session, [bm.content_hash])
     session.commit()
     return None
 
@@ -855,6 +793,7 @@ def create_folder(
         instapaper_folder_id=instapaper_folder_id,
     )
     session.add(record)
+    invalidate_instapaper_folder_maps(session, user_id)
     try:
         session.commit()
     except IntegrityError as exc:  # pragma: no cover - defensive
@@ -911,6 +850,7 @@ def update_folder(
             instapaper_folder_id = instapaper_folder_id.strip() or None
         folder.instapaper_folder_id = instapaper_folder_id
     session.add(folder)
+    invalidate_instapaper_folder_maps(session, owner_id)
     session.commit()
     session.refresh(folder)
     return _folder_to_out(folder)
@@ -977,6 +917,7 @@ def delete_folder(folder_id: str, current_user=Depends(get_current_user), sessio
         session.add(job)
 
     session.delete(folder)
+    invalidate_instapaper_folder_maps(session, owner_id)
     session.commit()
     return None
 
@@ -1003,9 +944,11 @@ def preview_bookmark(
         attempted_action="preview",
         permission=PERMISSION_READ_BOOKMARKS,
     )
-    if not bm.raw_html_content:
+    if not bm.raw_html_content and not bm.content_hash:
         raise HTTPException(status_code=404, detail="No content available for preview")
-    sanitized = _sanitize_html_content(bm.raw_html_content)
+    sanitized = get_bookmark_preview_html(session, bm)
+    # Persist a preview variant built on first request.
+    session.commit()
     return HTMLResponse(content=sanitized or "")
 
 
@@ -1039,7 +982,7 @@ def get_bookmark(bookmark_id: str, current_user=Depends(get_current_user), sessi
         feed_id=bm.feed_id,
         published_at=published_str,
         rss_entry=bm.rss_entry or {},
-        raw_html_content=bm.raw_html_content,
+        raw_html_content=get_bookmark_html(session, bm),
         publication_statuses=bm.publication_statuses or {},
         publication_flags=bm.publication_flags or {},
     )
@@ -1203,6 +1146,209 @@ def _encode_event(payload: dict) -> str:
     return json.dumps(payload, ensure_ascii=False) + "\n"
 
 
+_BULK_PUBLISH_HTML_BATCH = 50
+
+
+@dataclass
+class _BulkPublishEntry:
+    item_id: str
+    url: Optional[str] = None
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+    # Bookmark whose stored article HTML still has to be loaded.
+    html_source: Optional[Bookmark] = None
+
+
+def _plan_bulk_publish(
+    session,
+    *,
+    user_id: str,
+    items: List[dict],
+    config_dir: str,
+    instapaper_id: str,
+    publish_context: PublishContext,
+) -> List[_BulkPublishEntry]:
+    """Resolve the publish arguments of every item with batched queries.
+
+    Bookmarks, feeds, feed tags, tag names and folders are each loaded with
+    one query and the Instapaper folder mapping is synced once.  Article
+    HTML is loaded later, in batches, by :func:`_load_bulk_publish_html`.
+    """
+
+    bookmark_ids = {
+        str(value)
+        for item in items
+        if (value := item.get("bookmark_id") or item.get("bookmarkId"))
+    }
+    bookmarks: Dict[str, Bookmark] = {}
+    if bookmark_ids:
+        for bookmark in session.exec(select(Bookmark).where(Bookmark.id.in_(bookmark_ids))).all():
+            if bookmark.owner_user_id == user_id:
+                bookmarks[bookmark.id] = bookmark
+
+    def _item_feed_id(item: dict) -> Optional[str]:
+        feed_identifier = item.get("feed_id") or item.get("feedId")
+        if feed_identifier is None:
+            bookmark = bookmarks.get(str(item.get("bookmark_id") or item.get("bookmarkId")))
+            if bookmark and bookmark.feed_id:
+                feed_identifier = bookmark.feed_id
+        if feed_identifier in (None, ""):
+            return None
+        return str(feed_identifier).strip() or None
+
+    feed_ids = {feed_id for item in items if (feed_id := _item_feed_id(item))}
+    feeds: Dict[str, Feed] = {}
+    if feed_ids:
+        stmt = select(Feed).where(Feed.id.in_(feed_ids) & (Feed.owner_user_id == user_id))
+        feeds = {feed.id: feed for feed in session.exec(stmt).all()}
+    feed_tag_ids = get_ordered_feed_tag_ids_many(session, feeds)
+
+    tag_name_cache: Dict[str, Optional[str]] = {}
+    all_tag_ids = [tag_id for tag_ids in feed_tag_ids.values() for tag_id in tag_ids]
+    for item in items:
+        all_tag_ids.extend(_normalise_tag_ids(item.get("tag_ids") or item.get("tagIds")) or [])
+    translate_tag_ids_to_names(session, user_id, all_tag_ids, cache=tag_name_cache)
+
+    folder_ids = {feed.folder_id for feed in feeds.values() if feed.folder_id}
+    for item in items:
+        override = item.get("folder_id") or item.get("folderId")
+        if override not in (None, "") and str(override).strip():
+            folder_ids.add(str(override).strip())
+    folder_cache: Dict[str, Optional[Folder]] = {folder_id: None for folder_id in folder_ids}
+    if folder_ids:
+        for folder in session.exec(select(Folder).where(Folder.id.in_(folder_ids))).all():
+            folder_cache[folder.id] = folder
+
+    entries: List[_BulkPublishEntry] = []
+    entry_folders: List[Optional[Folder]] = []
+    for index, item in enumerate(items, start=1):
+        entry = _BulkPublishEntry(item_id=str(item.get("id") or index))
+        entries.append(entry)
+        entry_folders.append(None)
+
+        bookmark: Optional[Bookmark] = None
+        bookmark_identifier = item.get("bookmark_id") or item.get("bookmarkId")
+        if bookmark_identifier:
+            bookmark = bookmarks.get(str(bookmark_identifier))
+            if bookmark is None:
+                entry.error = "Bookmark not found or unauthorized"
+                continue
+
+        raw_url = item.get("url")
+        url = raw_url.strip() if isinstance(raw_url, str) else None
+        if not url and bookmark and isinstance(bookmark.url, str):
+            url = bookmark.url
+        if not url:
+            entry.error = "Missing URL"
+            continue
+        entry.url = url
+
+        publish_kwargs = entry.kwargs
+        publish_kwargs.update(
+            {"owner_user_id": user_id, "config_dir": config_dir, "context": publish_context}
+        )
+
+        raw_title = item.get("title")
+        title = raw_title.strip() if isinstance(raw_title, str) else None
+        if not title and bookmark and isinstance(bookmark.title, str):
+            title = bookmark.title
+        if title:
+            publish_kwargs["title"] = title
+
+        raw_html = item.get("raw_html_content") or item.get("rawHtmlContent")
+        if not raw_html and bookmark:
+            entry.html_source = bookmark
+        elif isinstance(raw_html, str) and raw_html:
+            publish_kwargs["raw_html_content"] = raw_html
+
+        feed_id = _item_feed_id(item)
+        feed = feeds.get(feed_id) if feed_id else None
+
+        combined_tag_ids: List[str] = list(feed_tag_ids.get(feed.id, [])) if feed else []
+        combined_tag_ids.extend(
+            _normalise_tag_ids(item.get("tag_ids") or item.get("tagIds")) or []
+        )
+        tag_names = translate_tag_ids_to_names(
+            session,
+            user_id,
+            combined_tag_ids,
+            cache=tag_name_cache,
+        )
+        direct_tag_names = _normalise_tags(item.get("tags"))
+        if direct_tag_names:
+            for name in direct_tag_names:
+                if name not in tag_names:
+                    tag_names.append(name)
+        if tag_names:
+            publish_kwargs["tags"] = tag_names
+
+        folder_override = item.get("folder_id") or item.get("folderId")
+        if folder_override not in (None, ""):
+            folder_override = str(folder_override).strip() or None
+        else:
+            folder_override = None
+        folder = resolve_effective_folder(
+            session,
+            feed=feed,
+            schedule_folder_id=folder_override,
+            cache=folder_cache,
+        )
+        if folder and folder.owner_user_id != user_id:
+            folder = None
+        if folder:
+            publish_kwargs["folder"] = folder.name
+            entry_folders[-1] = folder
+        else:
+            raw_folder_name = item.get("folder")
+            if isinstance(raw_folder_name, str) and raw_folder_name.strip():
+                publish_kwargs["folder"] = raw_folder_name.strip()
+
+    used_folders = {folder.id: folder for folder in entry_folders if folder is not None}
+    if used_folders:
+        folder_map = sync_instapaper_folders(
+            session,
+            instapaper_credential_id=str(instapaper_id),
+            owner_user_id=user_id,
+            config_dir=config_dir,
+            required_folder_ids=sorted(used_folders),
+        )
+        for entry, folder in zip(entries, entry_folders):
+            if folder is None:
+                continue
+            remote_folder_id = (folder_map or {}).get(folder.id) or folder.instapaper_folder_id
+            if remote_folder_id:
+                entry.kwargs["folder_id"] = remote_folder_id
+    session.commit()
+    return entries
+
+
+def _load_bulk_publish_html(session, entries: List[_BulkPublishEntry]) -> None:
+    """Attach stored article HTML and its publish variant to ``entries``."""
+
+    pending = [entry for entry in entries if entry.html_source is not None]
+    if not pending:
+        return
+    stored_html = load_article_html_many(
+        session,
+        (
+            entry.html_source.content_hash
+            for entry in pending
+            if not entry.html_source.raw_html_content
+        ),
+    )
+    for entry in pending:
+        bookmark = entry.html_source
+        entry.html_source = None
+        raw_html = bookmark.raw_html_content or stored_html.get(bookmark.content_hash or "")
+        if not raw_html:
+            continue
+        entry.kwargs["raw_html_content"] = raw_html
+        sanitizer = prepare_bookmark_publish_sanitizer(session, bookmark, raw_html)
+        if sanitizer is not None:
+            entry.kwargs["sanitizer"] = sanitizer
+    session.commit()
+
+
 async def _bulk_publish_event_stream(
     *,
     request: Request,
@@ -1211,182 +1357,99 @@ async def _bulk_publish_event_stream(
     config_dir: str,
     instapaper_id: str,
     session,
+    concurrency: int = 1,
 ) -> AsyncGenerator[str, None]:
+    """Publish ``items`` and stream NDJSON events in completion order.
+
+    Everything touching ``session`` runs on worker threads one call at a
+    time; up to ``concurrency`` ``publish_url`` calls are in flight and share
+    the credential's rate limit.
+    """
+
     success = 0
     failed = 0
-    feed_cache: Dict[str, Optional[Feed]] = {}
-    feed_tag_cache: Dict[str, List[str]] = {}
-    folder_cache: Dict[str, Optional[Folder]] = {}
-    tag_name_cache: Dict[str, Optional[str]] = {}
-    folder_map: Optional[Dict[str, Optional[str]]] = None
+    publish_context: Optional[PublishContext] = None
+    in_flight: Dict["asyncio.Future[Any]", _BulkPublishEntry] = {}
+
+    def _open_publish_context() -> PublishContext:
+        context = build_publish_context(instapaper_id, user_id, config_dir=config_dir)
+        context.prefetch_dedupe(
+            item["url"].strip() for item in items if isinstance(item.get("url"), str)
+        )
+        return context
+
+    def _outcome_event(entry: _BulkPublishEntry, future: "asyncio.Future[Any]") -> dict:
+        nonlocal success, failed
+        exc = future.exception()
+        if exc is not None:
+            logging.error(
+                "Bulk publish failed for url=%s user=%s",
+                entry.url,
+                user_id,
+                exc_info=exc,
+            )
+            failed += 1
+            return {"type": "item", "id": entry.item_id, "status": "failure", "message": str(exc)}
+        success += 1
+        event_payload = {"type": "item", "id": entry.item_id, "status": "success"}
+        result = future.result()
+        if isinstance(result, dict):
+            event_payload["result"] = result
+        return event_payload
 
     yield _encode_event({"type": "start", "total": len(items)})
     try:
-        for index, item in enumerate(items, start=1):
-            if await request.is_disconnected():
-                logging.info("Client disconnected from bulk publish stream user=%s", user_id)
-                return
-            item_id = str(item.get("id") or index)
-            yield _encode_event({"type": "item", "id": item_id, "status": "pending"})
-
-            bookmark: Optional[Bookmark] = None
-            bookmark_identifier = item.get("bookmark_id") or item.get("bookmarkId")
-            if bookmark_identifier:
-                bookmark = session.get(Bookmark, str(bookmark_identifier))
-                if not bookmark or bookmark.owner_user_id != user_id:
+        publish_context = await asyncio.to_thread(_open_publish_context)
+        entries = await asyncio.to_thread(
+            _plan_bulk_publish,
+            session,
+            user_id=user_id,
+            items=items,
+            config_dir=config_dir,
+            instapaper_id=instapaper_id,
+            publish_context=publish_context,
+        )
+        next_index = 0
+        disconnected = False
+        while next_index < len(entries) or in_flight:
+            while not disconnected and next_index < len(entries) and len(in_flight) < concurrency:
+                if await request.is_disconnected():
+                    logging.info("Client disconnected from bulk publish stream user=%s", user_id)
+                    disconnected = True
+                    break
+                entry = entries[next_index]
+                if next_index % _BULK_PUBLISH_HTML_BATCH == 0:
+                    await asyncio.to_thread(
+                        _load_bulk_publish_html,
+                        session,
+                        entries[next_index : next_index + _BULK_PUBLISH_HTML_BATCH],
+                    )
+                next_index += 1
+                yield _encode_event({"type": "item", "id": entry.item_id, "status": "pending"})
+                if entry.error is not None:
                     failed += 1
                     yield _encode_event(
                         {
                             "type": "item",
-                            "id": item_id,
+                            "id": entry.item_id,
                             "status": "failure",
-                            "message": "Bookmark not found or unauthorized",
+                            "message": entry.error,
                         }
                     )
                     continue
-
-            raw_url = item.get("url")
-            url = raw_url.strip() if isinstance(raw_url, str) else None
-            if not url and bookmark and isinstance(bookmark.url, str):
-                url = bookmark.url
-            if not url:
-                failed += 1
-                yield _encode_event(
-                    {
-                        "type": "item",
-                        "id": item_id,
-                        "status": "failure",
-                        "message": "Missing URL",
-                    }
+                future = asyncio.ensure_future(
+                    asyncio.to_thread(publish_url, str(instapaper_id), entry.url, **entry.kwargs)
                 )
+                in_flight[future] = entry
+            if not in_flight:
+                if disconnected:
+                    return
                 continue
-
-            publish_kwargs: Dict[str, Any] = {
-                "owner_user_id": user_id,
-                "config_dir": config_dir,
-            }
-
-            raw_title = item.get("title")
-            title = raw_title.strip() if isinstance(raw_title, str) else None
-            if not title and bookmark and isinstance(bookmark.title, str):
-                title = bookmark.title
-            if title:
-                publish_kwargs["title"] = title
-
-            raw_html = item.get("raw_html_content") or item.get("rawHtmlContent")
-            if not raw_html and bookmark and isinstance(bookmark.raw_html_content, str):
-                raw_html = bookmark.raw_html_content
-            if isinstance(raw_html, str) and raw_html:
-                publish_kwargs["raw_html_content"] = raw_html
-
-            feed_identifier = item.get("feed_id") or item.get("feedId")
-            if feed_identifier is None and bookmark and bookmark.feed_id:
-                feed_identifier = bookmark.feed_id
-            feed_id = str(feed_identifier).strip() if feed_identifier not in (None, "") else None
-
-            feed: Optional[Feed] = None
-            if feed_id:
-                if feed_id in feed_cache:
-                    feed = feed_cache[feed_id]
-                else:
-                    candidate = session.get(Feed, feed_id)
-                    if candidate and candidate.owner_user_id == user_id:
-                        feed = candidate
-                    feed_cache[feed_id] = feed
-
-            feed_tag_ids: List[str] = []
-            if feed and feed.id:
-                cached_ids = feed_tag_cache.get(feed.id)
-                if cached_ids is None:
-                    cached_ids = get_ordered_feed_tag_ids(session, feed.id)
-                    feed_tag_cache[feed.id] = cached_ids
-                feed_tag_ids = list(cached_ids)
-
-            item_tag_ids = _normalise_tag_ids(item.get("tag_ids") or item.get("tagIds")) or []
-
-            combined_tag_ids: List[str] = []
-            if feed_tag_ids:
-                combined_tag_ids.extend(feed_tag_ids)
-            if item_tag_ids:
-                combined_tag_ids.extend(item_tag_ids)
-
-            tag_names = translate_tag_ids_to_names(
-                session,
-                user_id,
-                combined_tag_ids,
-                cache=tag_name_cache,
-            )
-
-            direct_tag_names = _normalise_tags(item.get("tags"))
-            if direct_tag_names:
-                for name in direct_tag_names:
-                    if name not in tag_names:
-                        tag_names.append(name)
-
-            folder_override = item.get("folder_id") or item.get("folderId")
-            if folder_override not in (None, ""):
-                folder_override = str(folder_override).strip() or None
-            else:
-                folder_override = None
-
-            folder = resolve_effective_folder(
-                session,
-                feed=feed,
-                schedule_folder_id=folder_override,
-                cache=folder_cache,
-            )
-            if folder and folder.owner_user_id != user_id:
-                folder = None
-            folder_name: Optional[str] = None
-            remote_folder_id: Optional[str] = None
-            if folder:
-                folder_name = folder.name
-                if folder_map is None:
-                    folder_map = sync_instapaper_folders(
-                        session,
-                        instapaper_credential_id=str(instapaper_id),
-                        owner_user_id=user_id,
-                        config_dir=config_dir,
-                    )
-                session.refresh(folder)
-                remote_folder_id = (folder_map or {}).get(folder.id) or folder.instapaper_folder_id
-            else:
-                raw_folder_name = item.get("folder")
-                if isinstance(raw_folder_name, str) and raw_folder_name.strip():
-                    folder_name = raw_folder_name.strip()
-
-            if folder_name:
-                publish_kwargs["folder"] = folder_name
-            if remote_folder_id:
-                publish_kwargs["folder_id"] = remote_folder_id
-            if tag_names:
-                publish_kwargs["tags"] = tag_names
-
-            try:
-                result = await asyncio.to_thread(
-                    publish_url,
-                    str(instapaper_id),
-                    url,
-                    **publish_kwargs,
-                )
-            except Exception as exc:  # noqa: BLE001 - surface raw error to caller
-                logging.exception("Bulk publish failed for url=%s user=%s", url, user_id)
-                failed += 1
-                yield _encode_event(
-                    {
-                        "type": "item",
-                        "id": item_id,
-                        "status": "failure",
-                        "message": str(exc),
-                    }
-                )
-                continue
-
-            success += 1
-            event_payload = {"type": "item", "id": item_id, "status": "success"}
-            if isinstance(result, dict):
-                event_payload["result"] = result
-            yield _encode_event(event_payload)
+            done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                yield _encode_event(_outcome_event(in_flight.pop(future), future))
+        if disconnected:
+            return
     except asyncio.CancelledError:  # pragma: no cover - handled by server internals
         logging.info("Bulk publish stream cancelled for user=%s", user_id)
         raise
@@ -1394,6 +1457,11 @@ async def _bulk_publish_event_stream(
         logging.exception("Bulk publish stream aborted for user=%s", user_id)
         yield _encode_event({"type": "error", "message": str(exc)})
         return
+    finally:
+        for future in in_flight:
+            future.cancel()
+        if publish_context is not None:
+            publish_context.close()
 
     yield _encode_event({"type": "complete", "success": success, "failed": failed})
 
@@ -1433,6 +1501,7 @@ async def bulk_publish_bookmarks(
         config_dir=config_dir,
         instapaper_id=str(instapaper_id),
         session=session,
+        concurrency=bulk_publish_concurrency(body),
     )
     headers = {"Cache-Control": "no-cache"}
     return StreamingResponse(stream, media_type="application/x-ndjson", headers=headers)
@@ -1451,6 +1520,7 @@ def bulk_delete_bookmarks(
     actor_id = _get_request_user_id(current_user)
     enforcement_enabled = is_user_mgmt_enforce_enabled()
     oauth_cache: dict[str, Optional[object]] = {} if delete_remote else {}
+    released_hashes: List[Optional[str]] = []
     for bid in ids:
         bm = session.get(Bookmark, str(bid))
         if not bm:
@@ -1499,5 +1569,7 @@ def bulk_delete_bookmarks(
             },
         )
         session.delete(bm)
+        released_hashes.append(bm.content_hash)
+    purge_unreferenced_article_content(session, released_hashes)
     session.commit()
     return None
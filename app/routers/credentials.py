@@ -19,8 +19,10 @@ from ..auth.permissions import (
 from ..schemas import Credential as CredentialSchema
 from ..db import get_session
 from ..models import Credential as CredentialModel, SiteConfig as SiteConfigModel
+from ..security.credential_cache import invalidate_credential
 from ..security.crypto import encrypt_dict, decrypt_dict, is_encrypted
 from ..security.csrf import csrf_protect
+from ..util.json_files import load_json_file
 from ..util.quotas import enforce_user_quota
 from ..integrations.instapaper import (
     InstapaperTokenResponse,
@@ -126,11 +128,8 @@ class InstapaperLoginRequest(BaseModel):
 def _load_instapaper_app_creds_from_file(config_dir: Optional[str] = None) -> dict:
     resolved_dir = resolve_config_dir(config_dir)
     path = Path(resolved_dir) / "instapaper_app_creds.json"
-    if not path.exists():
-        return {}
     try:
-        with path.open("r", encoding="utf-8") as fp:
-            return json.load(fp)
+        return load_json_file(str(path))
     except (OSError, json.JSONDecodeError):
         logging.exception("Failed to load instapaper_app_creds.json from %s", path)
         return {}
@@ -263,6 +262,7 @@ def create_credential(body: CredentialSchema, current_user=Depends(get_current_u
         },
     )
     session.commit()
+    invalidate_credential(model.id, kind=model.kind)
     session.refresh(model)
     # Return masked plaintext view
     plain = decrypt_dict(model.data or {})
@@ -353,6 +353,7 @@ def create_instapaper_credential_from_login(
         },
     )
     session.commit()
+    invalidate_credential(model.id, kind=model.kind)
     session.refresh(model)
 
     return CredentialSchema(
@@ -398,8 +399,10 @@ def delete_credential(cred_id: str, current_user=Depends(get_current_user), sess
         actor_user_id=current_user["sub"],
         details={"kind": model.kind, "description": model.description},
     )
+    kind = model.kind
     session.delete(model)
     session.commit()
+    invalidate_credential(cred_id, kind=kind)
     return None
 
 
@@ -509,6 +512,7 @@ def update_credential(cred_id: str, body: CredentialSchema, current_user=Depends
         },
     )
     session.commit()
+    invalidate_credential(model.id, kind=model.kind)
     session.refresh(model)
     plain = decrypt_dict(model.data or {})
     return CredentialSchema(
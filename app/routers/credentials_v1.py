@@ -20,6 +20,7 @@ from ..schemas import (
     Credential as CredentialSchema,
     SiteLoginCookiesOut,
 )
+from ..security.credential_cache import invalidate_credential
 from ..security.crypto import decrypt_dict, encrypt_dict, is_encrypted
 from ..security.csrf import csrf_protect
 from ..integrations.instapaper import get_instapaper_tokens
@@ -143,6 +144,7 @@ def create_credential_v1(
     )
 
     session.commit()
+    invalidate_credential(model.id, kind=model.kind)
     session.refresh(model)
 
     plain = decrypt_dict(model.data or {})
@@ -236,6 +238,7 @@ def create_instapaper_credential_from_login_v1(
     )
 
     session.commit()
+    invalidate_credential(model.id, kind=model.kind)
     session.refresh(model)
 
     return CredentialSchema(
@@ -501,6 +504,7 @@ def update_credential_v1(
     )
 
     session.commit()
+    invalidate_credential(model.id, kind=model.kind)
     session.refresh(model)
 
     plain = decrypt_dict(model.data or {})
@@ -559,8 +563,10 @@ def delete_credential_v1(
         details={"kind": model.kind, "description": model.description},
     )
 
+    kind = model.kind
     session.delete(model)
     session.commit()
+    invalidate_credential(cred_id, kind=kind)
 
     return None
 
@@ -634,6 +640,7 @@ def copy_credential(
     )
 
     session.commit()
+    invalidate_credential(cloned.id, kind=cloned.kind)
     session.refresh(cloned)
 
     return CredentialSchema(
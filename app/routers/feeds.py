@@ -11,6 +11,7 @@ from ..auth import (
 )
 from ..schemas import Feed as FeedSchema
 from ..db import get_session
+from ..jobs.feed_polling import reset_adaptive_interval, reset_feed_health
 from ..models import (
     Credential as CredentialModel,
     Feed as FeedModel,
@@ -323,6 +324,7 @@ def _feed_to_schema(
         initial_lookback_period=feed.initial_lookback_period,
         is_paywalled=feed.is_paywalled,
         rss_requires_auth=feed.rss_requires_auth,
+        extract_main_content=feed.extract_main_content,
         site_config_id=feed.site_config_id,
         owner_user_id=feed.owner_user_id,
         site_login_credential_id=feed.site_login_credential_id,
@@ -447,12 +449,17 @@ def update_feed(feed_id: str, body: FeedSchema, current_user=Depends(get_current
             )
         model.owner_user_id = new_owner
     # Update allowed fields
+    if model.url != str(body.url):
+        reset_feed_health(model)
+    if model.url != str(body.url) or model.poll_frequency != body.poll_frequency:
+        reset_adaptive_interval(model)
     model.url = str(body.url)
     model.poll_frequency = body.poll_frequency
     if lookback_specified and not has_polled:
         model.initial_lookback_period = body.initial_lookback_period
     model.is_paywalled = body.is_paywalled
     model.rss_requires_auth = body.rss_requires_auth
+    model.extract_main_content = body.extract_main_content
     normalized_site_config_id, normalized_credential_id = _validate_site_login_configuration(
         session,
         current_user,
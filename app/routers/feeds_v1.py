@@ -8,6 +8,7 @@ from ..auth.oidc import get_current_user
 from ..auth import PERMISSION_READ_BOOKMARKS, has_permission
 from ..config import is_user_mgmt_enforce_enabled
 from ..db import get_session
+from ..jobs.feed_polling import reset_adaptive_interval, reset_feed_health
 from ..models import Feed as FeedModel
 from ..schemas import Feed as FeedSchema
 from ..schemas import FeedsPage, FeedOut
@@ -34,7 +35,16 @@ def _feed_to_out(
     tag_map: Optional[dict[str, List[str]]] = None,
 ) -> FeedOut:
     payload = _feed_to_schema(session, model, tag_map=tag_map).model_dump(mode="json")
-    return FeedOut(**payload)
+    # Polling state is server-managed, so it is only part of the response.
+    return FeedOut(
+        **payload,
+        next_poll_at=model.next_poll_at,
+        health_status=model.health_status or "healthy",
+        consecutive_failures=model.consecutive_failures or 0,
+        last_success_at=model.last_success_at,
+        last_error_class=model.last_error_class,
+        last_error_at=model.last_error_at,
+    )
 
 
 @router.get("", response_model=FeedsPage, summary="List feeds")
@@ -45,6 +55,10 @@ def list_feeds_v1(
         None,
         description="Filter by one or more owner ids. Repeat the parameter for multiple owners.",
     ),
+    health_status: Optional[str] = Query(
+        None,
+        description="Filter by feed health: healthy, degraded or suspended.",
+    ),
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=200),
 ):
@@ -130,6 +144,8 @@ def list_feeds_v1(
             stmt = stmt.where(filters[0])
         else:
             stmt = stmt.where(or_(*filters))
+        if health_status:
+            stmt = stmt.where(FeedModel.health_status == health_status.strip().lower())
         records = session.exec(stmt).all()
     else:
         records = []
@@ -301,12 +317,17 @@ def update_feed_v1(
             )
         model.owner_user_id = new_owner
 
+    if model.url != str(body.url):
+        reset_feed_health(model)
+    if model.url != str(body.url) or model.poll_frequency != body.poll_frequency:
+        reset_adaptive_interval(model)
     model.url = str(body.url)
     model.poll_frequency = body.poll_frequency
     if lookback_specified and not has_polled:
         model.initial_lookback_period = body.initial_lookback_period
     model.is_paywalled = body.is_paywalled
     model.rss_requires_auth = body.rss_requires_auth
+    model.extract_main_content = body.extract_main_content
 
     normalized_site_config_id, normalized_credential_id = _validate_site_login_configuration(
         session,
@@ -13,7 +13,11 @@ from ..db import get_session
 from ..jobs import known_job_types
 from ..jobs.scheduler import parse_frequency
 from ..jobs.util_subpaperflux import parse_site_login_pair_id
-from ..jobs.validation import scrub_legacy_schedule_payload, validate_job
+from ..jobs.validation import (
+    FEED_POLL_JOB_TYPES,
+    scrub_legacy_schedule_payload,
+    validate_job,
+)
 from ..models import Folder, Job, JobSchedule, Tag
 from ..schemas import (
     JobOut,
@@ -366,7 +370,7 @@ def create_job_schedule(
     _ensure_unique_schedule_name(session, owner_id, body.schedule_name)
 
     payload = scrub_legacy_schedule_payload(body.payload)
-    if body.job_type == "rss_poll":
+    if body.job_type in FEED_POLL_JOB_TYPES:
         payload.pop("site_login_pair", None)
     if body.tags is not None:
         payload["tags"] = body.tags
@@ -466,7 +470,7 @@ def update_job_schedule(
     if folder_update is not _SENTINEL:
         base_payload["folder_id"] = folder_update
 
-    if prospective_job_type == "rss_poll":
+    if prospective_job_type in FEED_POLL_JOB_TYPES:
         base_payload.pop("site_login_pair", None)
 
     normalized_tags, normalized_folder_id = _normalize_schedule_targets(base_payload)
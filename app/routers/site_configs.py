@@ -99,6 +99,7 @@ def _serialize_site_config(model: SiteConfigModel) -> SiteConfigSchema:
     payload["success_text_class"] = payload.get("success_text_class") or ""
     payload["expected_success_text"] = payload.get("expected_success_text") or ""
     payload["required_cookies"] = list(payload.get("required_cookies") or [])
+    payload["paywall_indicators"] = list(payload.get("paywall_indicators") or [])
     return _site_config_adapter.validate_python(payload)
 
 
@@ -164,6 +165,7 @@ def create_site_config(body: SiteConfigSchema, current_user=Depends(get_current_
     payload["success_text_class"] = payload.get("success_text_class") or ""
     payload["expected_success_text"] = payload.get("expected_success_text") or ""
     payload["required_cookies"] = list(payload.get("required_cookies") or [])
+    payload["paywall_indicators"] = list(payload.get("paywall_indicators") or [])
     model = SiteConfigModel(
         **payload,
         login_type=login_type,
@@ -242,10 +244,12 @@ def update_site_config(config_id: str, body: SiteConfigSchema, current_user=Depe
         "success_text_class",
         "expected_success_text",
         "required_cookies",
+        "paywall_indicators",
+        "extract_main_content",
     ):
         if field in update_payload:
             value = update_payload[field]
-            if field == "required_cookies":
+            if field in {"required_cookies", "paywall_indicators"}:
                 value = list(value or [])
             setattr(model, field, value)
 
@@ -436,6 +436,7 @@ def create_site_config_v1(
     payload["success_text_class"] = payload.get("success_text_class") or ""
     payload["expected_success_text"] = payload.get("expected_success_text") or ""
     payload["required_cookies"] = list(payload.get("required_cookies") or [])
+    payload["paywall_indicators"] = list(payload.get("paywall_indicators") or [])
 
     model = SiteConfigModel(
         **payload,
@@ -577,10 +578,12 @@ def update_site_config_v1(
         "success_text_class",
         "expected_success_text",
         "required_cookies",
+        "paywall_indicators",
+        "extract_main_content",
     ):
         if field in update_payload:
             value = update_payload[field]
-            if field == "required_cookies":
+            if field in {"required_cookies", "paywall_indicators"}:
                 value = list(value or [])
             setattr(model, field, value)
 
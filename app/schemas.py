@@ -15,7 +15,11 @@ from pydantic import (
 from pydantic_core import PydanticCustomError
 
 from .jobs.scheduler import parse_frequency
-from .jobs.validation import scrub_legacy_schedule_payload, validate_job
+from .jobs.validation import (
+    FEED_POLL_JOB_TYPES,
+    scrub_legacy_schedule_payload,
+    validate_job,
+)
 
 
 def _merge_site_login_pair_from_fields(model: Any, payload: Dict[str, Any]) -> None:
@@ -150,6 +154,8 @@ class SiteConfigBase(BaseModel):
     success_text_class: str = ""
     expected_success_text: str = ""
     required_cookies: List[str] = Field(default_factory=list)
+    paywall_indicators: List[str] = Field(default_factory=list)
+    extract_main_content: bool = False
 
 
 class SiteConfigCreateBase(SiteConfigBase):
@@ -232,6 +238,7 @@ class Feed(BaseModel):
     initial_lookback_period: Optional[str] = None
     is_paywalled: bool = False
     rss_requires_auth: bool = False
+    extract_main_content: Optional[bool] = None
     site_config_id: Optional[str] = None
     owner_user_id: Optional[str] = None
     site_login_credential_id: Optional[str] = None
@@ -278,7 +285,7 @@ class Credential(BaseModel):
 
 
 class JobRequest(BaseModel):
-    type: str  # login|miniflux_refresh|rss_poll|publish|retention
+    type: str  # login|miniflux_refresh|rss_poll|rss_poll_batch|publish|retention
     payload: dict
 
 
@@ -426,7 +433,7 @@ class JobScheduleCreate(BaseModel):
     @model_validator(mode="after")
     def _validate_payload(self) -> "JobScheduleCreate":
         combined_payload = dict(self.payload or {})
-        if self.job_type == "rss_poll":
+        if self.job_type in FEED_POLL_JOB_TYPES:
             _reject_site_login_pair_fields(self, combined_payload)
         else:
             _merge_site_login_pair_from_fields(self, combined_payload)
@@ -519,7 +526,7 @@ class JobScheduleUpdate(BaseModel):
     def _validate_payload(self) -> "JobScheduleUpdate":
         provided_job_type = self.job_type
         combined_payload = dict(self.payload or {})
-        if provided_job_type == "rss_poll":
+        if provided_job_type in FEED_POLL_JOB_TYPES:
             _reject_site_login_pair_fields(self, combined_payload)
         else:
             _merge_site_login_pair_from_fields(self, combined_payload)
@@ -627,12 +634,19 @@ class FeedOut(BaseModel):
     initial_lookback_period: Optional[str] = None
     is_paywalled: bool = False
     rss_requires_auth: bool = False
+    extract_main_content: Optional[bool] = None
     site_config_id: Optional[str] = None
     owner_user_id: Optional[str] = None
     site_login_credential_id: Optional[str] = None
     folder_id: Optional[str] = None
     tag_ids: List[str] = Field(default_factory=list)
     last_rss_poll_at: Optional[datetime] = None
+    next_poll_at: Optional[datetime] = None
+    health_status: str = "healthy"
+    consecutive_failures: int = 0
+    last_success_at: Optional[datetime] = None
+    last_error_class: Optional[str] = None
+    last_error_at: Optional[datetime] = None
 
     @field_validator("tag_ids", mode="before")
     @classmethod
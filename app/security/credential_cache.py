@@ -0,0 +1,168 @@
+"""Short-lived in-process cache of decrypted credentials.
+
+Publishing and polling resolve the same Instapaper and site-login
+credentials for every bookmark they handle, and each lookup loaded the row
+and ran AES-GCM decryption again.  Lookups by ``(id, owner)`` and by
+``(kind, owner)`` are kept for ``CREDENTIAL_CACHE_TTL`` seconds (default 60,
+``0`` disables the cache).  An id that loads no row is not cached: under
+row-level security the row may only be hidden from the current user.  The
+credential routers drop affected entries after every create, update and
+delete, so the TTL only bounds staleness for writes made by other processes.
+"""
+
+from __future__ import annotations
+
+import copy
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from ..observability.metrics import increment_credential_cache_request
+from .crypto import decrypt_dict
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_TTL = 60.0
+
+
+@dataclass(frozen=True)
+class CredentialSnapshot:
+    id: str
+    kind: str
+    owner_user_id: Optional[str]
+    site_config_id: Optional[str]
+    data: Dict[str, Any] = field(default_factory=dict)
+
+
+_entries: Dict[Hashable, Tuple[float, Optional[CredentialSnapshot]]] = {}
+_lock = threading.Lock()
+
+
+def credential_cache_ttl() -> float:
+    raw = os.getenv("CREDENTIAL_CACHE_TTL")
+    if raw is None or not raw.strip():
+        return _DEFAULT_TTL
+    try:
+        return max(float(raw), 0.0)
+    except ValueError:
+        logger.warning("Invalid CREDENTIAL_CACHE_TTL value %r", raw)
+        return _DEFAULT_TTL
+
+
+def snapshot_credential(record) -> CredentialSnapshot:
+    """Decrypt ``record`` into a snapshot; undecryptable data becomes ``{}``."""
+
+    try:
+        data = decrypt_dict(record.data or {})
+    except Exception:
+        data = {}
+    return CredentialSnapshot(
+        id=record.id,
+        kind=record.kind,
+        owner_user_id=record.owner_user_id,
+        site_config_id=record.site_config_id,
+        data=data,
+    )
+
+
+def _copy(snapshot: Optional[CredentialSnapshot]) -> Optional[CredentialSnapshot]:
+    if snapshot is None:
+        return None
+    return replace(snapshot, data=copy.deepcopy(snapshot.data))
+
+
+def _lookup(
+    key: Hashable,
+    loader: Callable[[], Optional[CredentialSnapshot]],
+    *,
+    cache_misses: bool = True,
+) -> Optional[CredentialSnapshot]:
+    ttl = credential_cache_ttl()
+    if ttl <= 0:
+        return loader()
+    now = time.monotonic()
+    with _lock:
+        cached = _entries.get(key)
+    if cached is not None and cached[0] > now:
+        increment_credential_cache_request("hit")
+        return _copy(cached[1])
+    increment_credential_cache_request("miss")
+    snapshot = loader()
+    if snapshot is None and not cache_misses:
+        return None
+    with _lock:
+        _entries[key] = (now + ttl, snapshot)
+    return _copy(snapshot)
+
+
+def get_credential_by_id(
+    credential_id: str,
+    owner_user_id: Optional[str],
+    loader: Callable[[], Optional[CredentialSnapshot]],
+) -> Optional[CredentialSnapshot]:
+    """Return the credential ``credential_id`` as loaded for ``owner_user_id``.
+
+    ``loader`` runs on a miss.  Entries are kept per requesting owner and
+    ids that load nothing are not cached, so a lookup made in another user's
+    context cannot hide the credential from its owner.  The caller still
+    checks the snapshot's ``owner_user_id``.
+    """
+
+    return _lookup(("id", credential_id, owner_user_id), loader, cache_misses=False)
+
+
+def get_credential_by_kind(
+    kind: str,
+    owner_user_id: Optional[str],
+    loader: Callable[[], Optional[CredentialSnapshot]],
+) -> Optional[CredentialSnapshot]:
+    """Return the credential ``loader`` resolves for ``kind`` and ``owner_user_id``.
+
+    Misses are cached as well, so an owner without a credential of ``kind``
+    is not looked up again until the TTL expires or one is created.
+    """
+
+    return _lookup(("kind", kind, owner_user_id), loader)
+
+
+def invalidate_credential(
+    credential_id: Optional[str] = None, *, kind: Optional[str] = None
+) -> None:
+    """Drop entries for ``credential_id`` and every by-kind entry of ``kind``.
+
+    By-kind entries resolved to ``credential_id`` are dropped too, so a
+    credential whose kind changed is not served under its old kind.
+    """
+
+    with _lock:
+        for key in list(_entries):
+            snapshot = _entries[key][1]
+            if (
+                (credential_id is not None and key[0] == "id" and key[1] == credential_id)
+                or (kind is not None and key[0] == "kind" and key[1] == kind)
+                or (
+                    credential_id is not None
+                    and snapshot is not None
+                    and snapshot.id == credential_id
+                )
+            ):
+                del _entries[key]
+
+
+def clear_credential_cache() -> None:
+    with _lock:
+        _entries.clear()
+
+
+__all__ = [
+    "CredentialSnapshot",
+    "clear_credential_cache",
+    "credential_cache_ttl",
+    "get_credential_by_id",
+    "get_credential_by_kind",
+    "invalidate_credential",
+    "snapshot_credential",
+]
@@ -1,7 +1,8 @@
 import os
 import json
 import base64
-from typing import Any, Dict, Optional
+import threading
+from typing import Any, Dict, Optional, Tuple
 
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 
@@ -17,13 +18,29 @@ def _get_key() -> bytes:
         raise RuntimeError("CREDENTIALS_ENC_KEY must be a base64-urlsafe encoded 32-byte key.") from e
 
 
+# The cipher is rebuilt only when CREDENTIALS_ENC_KEY changes.
+_cipher: Optional[Tuple[str, AESGCM]] = None
+_cipher_lock = threading.Lock()
+
+
+def _get_cipher() -> AESGCM:
+    global _cipher
+    key_b64 = os.getenv("CREDENTIALS_ENC_KEY") or ""
+    cached = _cipher
+    if cached is not None and cached[0] == key_b64:
+        return cached[1]
+    aesgcm = AESGCM(_get_key())
+    with _cipher_lock:
+        _cipher = (key_b64, aesgcm)
+    return aesgcm
+
+
 def is_encrypted(data: Dict[str, Any]) -> bool:
     return isinstance(data, dict) and data.get("_enc") is True and data.get("alg") == "AESGCM"
 
 
 def encrypt_dict(plain: Dict[str, Any]) -> Dict[str, Any]:
-    key = _get_key()
-    aesgcm = AESGCM(key)
+    aesgcm = _get_cipher()
     nonce = os.urandom(12)
     pt = json.dumps(plain).encode("utf-8")
     ct = aesgcm.encrypt(nonce, pt, associated_data=None)
@@ -39,8 +56,7 @@ def decrypt_dict(data: Dict[str, Any]) -> Dict[str, Any]:
     if not is_encrypted(data):
         # Treat as plaintext credentials (backward-compatible)
         return data
-    key = _get_key()
-    aesgcm = AESGCM(key)
+    aesgcm = _get_cipher()
     nonce = base64.urlsafe_b64decode(data["n"])  # type: ignore[index]
     ct = base64.urlsafe_b64decode(data["ct"])  # type: ignore[index]
     pt = aesgcm.decrypt(nonce, ct, associated_data=None)
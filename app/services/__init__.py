@@ -5,4 +5,10 @@ __all__ = [
     "subpaperflux_login",
     "subpaperflux_miniflux",
     "subpaperflux_rss",
+    "rss_fast_parser",
+    "feed_fetch_hints",
+    "feed_fetch_cache",
+    "paywall_detection",
+    "html_sanitization",
+    "content_extraction",
 ]
@@ -0,0 +1,201 @@
+"""Readability-style extraction of the main article from a fetched page.
+
+Paywalled articles are fetched as whole pages: navigation, footers, scripts,
+share bars and comment widgets often outweigh the article itself.  When a
+site config or feed enables ``extract_main_content`` the page is reduced to
+its article body plus a small ``<head>`` carrying the title and descriptive
+metadata before it is stored or published.
+
+The body is located from semantic markup (``<article>``, ``<main>``,
+``itemprop="articleBody"``) and otherwise by scoring blocks on the amount of
+paragraph text they contain.  When no convincing body is found the page is
+left unchanged.
+"""
+
+from __future__ import annotations
+
+import html as html_lib
+import logging
+import re
+from typing import Dict, Optional
+
+from bs4 import BeautifulSoup, Tag
+
+from .html_sanitization import html_parser_backend
+
+MIN_ARTICLE_TEXT_LENGTH = 250
+
+_SEMANTIC_SELECTORS = (
+    '[itemprop="articleBody"]',
+    "article",
+    "main",
+    '[role="main"]',
+)
+
+_REMOVED_TAGS = (
+    "script",
+    "style",
+    "noscript",
+    "template",
+    "iframe",
+    "form",
+    "button",
+    "nav",
+    "aside",
+    "footer",
+    "svg",
+)
+
+_BOILERPLATE_PATTERN = re.compile(
+    r"comment|share|social|related|recommend|newsletter|subscribe|promo|sponsor"
+    r"|sidebar|footer|breadcrumb|advert|\bad-|\bads\b|cookie|popup|modal",
+    re.IGNORECASE,
+)
+_CONTENT_PATTERN = re.compile(
+    r"article|body|content|entry|main|post|story|text", re.IGNORECASE
+)
+
+_METADATA_SOURCES = (
+    ("description", ("description", "og:description", "twitter:description")),
+    ("author", ("author", "article:author")),
+    ("article:published_time", ("article:published_time", "date", "pubdate")),
+    ("og:image", ("og:image",)),
+)
+
+
+def _meta_content(soup: BeautifulSoup, names) -> Optional[str]:
+    for name in names:
+        tag = soup.find("meta", attrs={"property": name}) or soup.find(
+            "meta", attrs={"name": name}
+        )
+        if isinstance(tag, Tag):
+            value = (tag.get("content") or "").strip()
+            if value:
+                return value
+    return None
+
+
+def _extract_metadata(soup: BeautifulSoup) -> Dict[str, str]:
+    metadata: Dict[str, str] = {}
+    title = _meta_content(soup, ("og:title", "twitter:title"))
+    if not title and soup.title and soup.title.string:
+        title = soup.title.string.strip()
+    if title:
+        metadata["title"] = title
+    for key, names in _METADATA_SOURCES:
+        value = _meta_content(soup, names)
+        if value:
+            metadata[key] = value
+    canonical = soup.find("link", rel="canonical")
+    if isinstance(canonical, Tag) and canonical.get("href"):
+        metadata["canonical"] = canonical["href"].strip()
+    root = soup.find("html")
+    if isinstance(root, Tag) and root.get("lang"):
+        metadata["lang"] = str(root["lang"]).strip()
+    return metadata
+
+
+def _is_boilerplate(element: Tag) -> bool:
+    if element.attrs is None:
+        return False
+    markers = " ".join(element.get("class") or []) + " " + (element.get("id") or "")
+    return bool(markers.strip()) and bool(_BOILERPLATE_PATTERN.search(markers))
+
+
+def _text_length(element: Tag) -> int:
+    return len(element.get_text(" ", strip=True))
+
+
+def _score_candidates(soup: BeautifulSoup) -> Optional[Tag]:
+    scores: Dict[int, float] = {}
+    nodes: Dict[int, Tag] = {}
+    for paragraph in soup.find_all(("p", "pre", "blockquote")):
+        length = _text_length(paragraph)
+        if length < 25:
+            continue
+        score = 1 + min(length / 100, 3) + paragraph.get_text().count(",")
+        parent = paragraph.parent
+        for weight in (1.0, 0.5):
+            if not isinstance(parent, Tag) or parent.name in ("html", "[document]"):
+                break
+            key = id(parent)
+            if key not in scores:
+                markers = " ".join(parent.get("class") or []) + " " + (parent.get("id") or "")
+                bonus = 25 if _CONTENT_PATTERN.search(markers) else 0
+                scores[key] = bonus - (25 if _is_boilerplate(parent) else 0)
+                nodes[key] = parent
+            scores[key] += score * weight
+            parent = parent.parent
+    if not scores:
+        return None
+    return nodes[max(scores, key=scores.get)]
+
+
+def _find_article(soup: BeautifulSoup) -> Optional[Tag]:
+    for selector in _SEMANTIC_SELECTORS:
+        candidates = [
+            element
+            for element in soup.select(selector)
+            if _text_length(element) >= MIN_ARTICLE_TEXT_LENGTH
+        ]
+        if candidates:
+            return max(candidates, key=_text_length)
+    return _score_candidates(soup)
+
+
+def _clean(article: Tag) -> None:
+    for element in article.find_all(_REMOVED_TAGS):
+        element.decompose()
+    for element in article.find_all(True):
+        if element.decomposed:
+            continue
+        if _is_boilerplate(element) and _text_length(element) < MIN_ARTICLE_TEXT_LENGTH:
+            element.decompose()
+
+
+def _render(metadata: Dict[str, str], body: str) -> str:
+    head = ['<meta charset="utf-8">']
+    if metadata.get("title"):
+        head.append(f"<title>{html_lib.escape(metadata['title'])}</title>")
+    for key in ("description", "author", "article:published_time", "og:image"):
+        if metadata.get(key):
+            attribute = "property" if ":" in key else "name"
+            head.append(
+                f'<meta {attribute}="{key}" content="{html_lib.escape(metadata[key])}">'
+            )
+    if metadata.get("canonical"):
+        head.append(f'<link rel="canonical" href="{html_lib.escape(metadata["canonical"])}">')
+    lang = f' lang="{html_lib.escape(metadata["lang"])}"' if metadata.get("lang") else ""
+    return (
+        f"<!DOCTYPE html><html{lang}><head>{''.join(head)}</head>"
+        f"<body><article>{body}</article></body></html>"
+    )
+
+
+def extract_main_content(html: Optional[str]) -> Optional[str]:
+    """Return ``html`` reduced to its main article, or ``None`` to keep it as is."""
+
+    if not html:
+        return None
+    try:
+        soup = BeautifulSoup(html, html_parser_backend())
+        metadata = _extract_metadata(soup)
+        article = _find_article(soup)
+        if article is None:
+            return None
+        _clean(article)
+        if _text_length(article) < MIN_ARTICLE_TEXT_LENGTH:
+            return None
+        extracted = _render(metadata, article.decode_contents().strip())
+    except Exception as exc:  # noqa: BLE001
+        logging.warning("Main content extraction failed: %s", exc)
+        return None
+    if len(extracted) >= len(html):
+        return None
+    logging.info(
+        "Extracted main content: %s -> %s characters", len(html), len(extracted)
+    )
+    return extracted
+
+
+__all__ = ["MIN_ARTICLE_TEXT_LENGTH", "extract_main_content"]
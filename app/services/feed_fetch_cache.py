@@ -0,0 +1,220 @@
+"""Short-lived, process-wide cache of public feed fetches.
+
+Many users subscribe to the same public feeds.  Without sharing, every
+``Feed`` row downloads and parses an identical document.  This cache keys
+responses by normalised URL and authentication context so one fetch (and,
+for repeat consumers, one full parse) serves every subscriber polled within
+a short freshness window.  Concurrent callers for the same key wait for the
+in-flight fetch instead of issuing their own.
+
+Only public fetches are cached; responses obtained with cookies or other
+credentials must never be shared between users.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+import feedparser
+
+PUBLIC_AUTH_CONTEXT = "public"
+
+_DEFAULT_TTL_SECONDS = 60.0
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+_MAX_ENTRIES = 2048
+
+
+def shared_fetch_ttl() -> float:
+    """Freshness window in seconds; ``0`` disables the shared cache."""
+
+    raw = os.getenv("RSS_SHARED_FETCH_TTL")
+    if raw is None or not raw.strip():
+        return _DEFAULT_TTL_SECONDS
+    try:
+        return max(float(raw), 0.0)
+    except ValueError:
+        return _DEFAULT_TTL_SECONDS
+
+
+def normalize_feed_url(url: str) -> str:
+    """Return a canonical form of ``url`` for cache keys.
+
+    Scheme and host are lower-cased, default ports and fragments dropped and
+    an empty path becomes ``/``.  The query string is preserved verbatim.
+    """
+
+    parts = urlsplit((url or "").strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    port = parts.port
+    netloc = host
+    if parts.username or parts.password:
+        credentials = parts.username or ""
+        if parts.password:
+            credentials = f"{credentials}:{parts.password}"
+        netloc = f"{credentials}@{netloc}"
+    if port and _DEFAULT_PORTS.get(scheme) != port:
+        netloc = f"{netloc}:{port}"
+    return urlunsplit((scheme, netloc, parts.path or "/", parts.query, ""))
+
+
+@dataclass
+class CachedFeedFetch:
+    """A feed response shared between subscribers of the same URL."""
+
+    status_code: int
+    content: str
+    headers: Dict[str, str]
+    request_validators: Dict[str, str]
+    stored_at: float
+    _parsed: Any = field(default=None, repr=False)
+    _consumers: int = field(default=0, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def is_not_modified_for(self, validators: Mapping[str, str]) -> bool:
+        """Whether this response is unchanged for a caller's validators."""
+
+        if self.status_code == 304:
+            return True
+        etag = self.headers.get("ETag") or self.headers.get("etag")
+        if etag and validators.get("If-None-Match") == etag:
+            return True
+        last_modified = self.headers.get("Last-Modified") or self.headers.get(
+            "last-modified"
+        )
+        return bool(
+            last_modified
+            and not etag
+            and validators.get("If-Modified-Since") == last_modified
+        )
+
+    def claim_first_parse(self) -> bool:
+        """Return ``True`` for the first consumer of this response.
+
+        The first consumer takes the incremental fast path with its own
+        cutoff; later consumers share :meth:`full_parse` and filter entries
+        against their own cutoffs.
+        """
+
+        with self._lock:
+            self._consumers += 1
+            return self._consumers == 1
+
+    def full_parse(self):
+        with self._lock:
+            if self._parsed is None:
+                self._parsed = feedparser.parse(self.content)
+            return self._parsed
+
+
+class SharedFeedFetchCache:
+    def __init__(self) -> None:
+        self._entries: Dict[Tuple[str, str], CachedFeedFetch] = {}
+        self._inflight: Dict[Tuple[str, str], threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._inflight.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def _usable(
+        self,
+        entry: Optional[CachedFeedFetch],
+        validators: Mapping[str, str],
+        ttl: float,
+    ) -> bool:
+        if entry is None or time.monotonic() - entry.stored_at > ttl:
+            return False
+        # A 304 only answers callers that sent the same validators.
+        return entry.status_code != 304 or dict(validators) == entry.request_validators
+
+    def fetch(
+        self,
+        url: str,
+        *,
+        fetcher: Callable[[Dict[str, str]], Any],
+        conditional_headers: Optional[Mapping[str, str]] = None,
+        auth_context: str = PUBLIC_AUTH_CONTEXT,
+        ttl: Optional[float] = None,
+    ) -> Tuple[CachedFeedFetch, bool]:
+        """Return ``(response, cache_hit)`` for ``url``.
+
+        ``fetcher`` performs the HTTP request given the conditional headers
+        to send and must return a ``requests``-style response.  HTTP errors
+        propagate to the caller and are never cached.
+        """
+
+        effective_ttl = shared_fetch_ttl() if ttl is None else ttl
+        validators = dict(conditional_headers or {})
+        key = (normalize_feed_url(url), auth_context)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if self._usable(entry, validators, effective_ttl):
+                self.hits += 1
+                return entry, True
+            key_lock = self._inflight.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+                if self._usable(entry, validators, effective_ttl):
+                    self.hits += 1
+                    return entry, True
+                self.misses += 1
+
+            try:
+                response = fetcher(validators)
+                response.raise_for_status()
+                entry = CachedFeedFetch(
+                    status_code=int(getattr(response, "status_code", 200) or 200),
+                    content=response.text or "",
+                    headers=dict(getattr(response, "headers", None) or {}),
+                    request_validators=validators,
+                    stored_at=time.monotonic(),
+                )
+                with self._lock:
+                    if len(self._entries) >= _MAX_ENTRIES:
+                        self._evict_expired(effective_ttl)
+                    self._entries[key] = entry
+            finally:
+                # Failed fetches must not leave their lock behind either.
+                with self._lock:
+                    self._inflight.pop(key, None)
+            logging.debug("Shared feed cache stored %s (%s)", key[0], entry.status_code)
+            return entry, False
+
+    def _evict_expired(self, ttl: float) -> None:
+        now = time.monotonic()
+        for key in [k for k, v in self._entries.items() if now - v.stored_at > ttl]:
+            del self._entries[key]
+        while len(self._entries) >= _MAX_ENTRIES:
+            self._entries.pop(next(iter(self._entries)))
+
+
+_shared_cache = SharedFeedFetchCache()
+
+
+def get_shared_feed_cache() -> SharedFeedFetchCache:
+    return _shared_cache
+
+
+__all__ = [
+    "CachedFeedFetch",
+    "PUBLIC_AUTH_CONTEXT",
+    "SharedFeedFetchCache",
+    "get_shared_feed_cache",
+    "normalize_feed_url",
+    "shared_fetch_ttl",
+]
@@ -0,0 +1,247 @@
+"""Freshness hints published by feed servers.
+
+Feeds advertise when they are worth fetching again through HTTP caching
+headers (``Cache-Control: max-age``, ``Expires``, ``ETag``/``Last-Modified``)
+and RSS channel elements (``<ttl>``, ``<skipHours>``, ``<skipDays>``).  The
+helpers here capture those hints at fetch time as a JSON-friendly dict and
+answer when the next fetch can be useful.
+"""
+
+from __future__ import annotations
+
+import re
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
+
+_MAX_AGE_PATTERN = re.compile(r"(?:^|,)\s*(?:s-maxage|max-age)\s*=\s*\"?(\d+)", re.I)
+_NO_CACHE_PATTERN = re.compile(r"(?:^|,)\s*(?:no-cache|no-store)\b", re.I)
+_TTL_PATTERN = re.compile(r"<ttl>\s*(\d+)\s*</ttl>", re.I)
+_SKIP_HOURS_PATTERN = re.compile(r"<skipHours>(.*?)</skipHours>", re.I | re.S)
+_SKIP_DAYS_PATTERN = re.compile(r"<skipDays>(.*?)</skipDays>", re.I | re.S)
+_HOUR_PATTERN = re.compile(r"<hour>\s*(\d{1,2})\s*</hour>", re.I)
+_DAY_PATTERN = re.compile(r"<day>\s*([A-Za-z]+)\s*</day>", re.I)
+_FIRST_ENTRY_PATTERN = re.compile(r"<(?:\w+:)?(?:item|entry)[\s>]", re.I)
+
+_DAY_NAMES = (
+    "monday",
+    "tuesday",
+    "wednesday",
+    "thursday",
+    "friday",
+    "saturday",
+    "sunday",
+)
+
+
+def _header(headers: Optional[Mapping[str, Any]], name: str) -> Optional[str]:
+    if not headers:
+        return None
+    value = headers.get(name)
+    if value is None:
+        lowered = name.lower()
+        for key, candidate in headers.items():
+            if str(key).lower() == lowered:
+                value = candidate
+                break
+    if value is None:
+        return None
+    text = str(value).strip()
+    return text or None
+
+
+def _parse_http_date(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if parsed is None:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def _parse_iso(value: Any) -> Optional[datetime]:
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def _channel_header(content: Union[str, bytes, None]) -> str:
+    if not content:
+        return ""
+    if isinstance(content, bytes):
+        content = content.decode("utf-8", errors="ignore")
+    # Channel-level elements precede the entries; never look inside items.
+    match = _FIRST_ENTRY_PATTERN.search(content)
+    return content[: match.start()] if match else content
+
+
+def _http_expiry(headers: Optional[Mapping[str, Any]], fetched_at: datetime) -> Optional[datetime]:
+    cache_control = _header(headers, "Cache-Control") or ""
+    if _NO_CACHE_PATTERN.search(cache_control):
+        return None
+    match = _MAX_AGE_PATTERN.search(cache_control)
+    if match:
+        max_age = int(match.group(1))
+        age = _header(headers, "Age")
+        if age and age.isdigit():
+            max_age -= int(age)
+        if max_age <= 0:
+            return None
+        return fetched_at + timedelta(seconds=max_age)
+    expires = _parse_http_date(_header(headers, "Expires"))
+    if expires is None:
+        return None
+    # Expires is relative to the server clock; measure it against Date.
+    server_date = _parse_http_date(_header(headers, "Date")) or fetched_at
+    lifetime = (expires - server_date).total_seconds()
+    if lifetime <= 0:
+        return None
+    return fetched_at + timedelta(seconds=lifetime)
+
+
+def build_fetch_hints(
+    headers: Optional[Mapping[str, Any]],
+    content: Union[str, bytes, None],
+    *,
+    fetched_at: datetime,
+    previous: Optional[Mapping[str, Any]] = None,
+    not_modified: bool = False,
+) -> Dict[str, Any]:
+    """Return the freshness hints for a feed response.
+
+    ``not_modified`` responses carry no body, so channel-level hints and any
+    validators the server omitted are carried over from ``previous``.
+    """
+
+    hints: Dict[str, Any] = {"fetched_at": fetched_at.isoformat()}
+    previous = dict(previous or {})
+
+    expires_at = _http_expiry(headers, fetched_at)
+    if expires_at is not None:
+        hints["expires_at"] = expires_at.isoformat()
+
+    etag = _header(headers, "ETag")
+    last_modified = _header(headers, "Last-Modified")
+    if not_modified:
+        etag = etag or previous.get("etag")
+        last_modified = last_modified or previous.get("last_modified")
+    if etag:
+        hints["etag"] = etag
+    if last_modified:
+        hints["last_modified"] = last_modified
+
+    if not_modified:
+        for key in ("ttl_minutes", "skip_hours", "skip_days"):
+            if key in previous:
+                hints[key] = previous[key]
+        return hints
+
+    channel = _channel_header(content)
+    ttl_match = _TTL_PATTERN.search(channel)
+    if ttl_match and int(ttl_match.group(1)) > 0:
+        hints["ttl_minutes"] = int(ttl_match.group(1))
+    skip_hours_match = _SKIP_HOURS_PATTERN.search(channel)
+    if skip_hours_match:
+        hours = sorted(
+            {
+                int(value) % 24
+                for value in _HOUR_PATTERN.findall(skip_hours_match.group(1))
+                if int(value) <= 24
+            }
+        )
+        # A feed that skips every hour would never be polled again.
+        if hours and len(hours) < 24:
+            hints["skip_hours"] = hours
+    skip_days_match = _SKIP_DAYS_PATTERN.search(channel)
+    if skip_days_match:
+        days = sorted(
+            {
+                value.lower()
+                for value in _DAY_PATTERN.findall(skip_days_match.group(1))
+                if value.lower() in _DAY_NAMES
+            },
+            key=_DAY_NAMES.index,
+        )
+        if days and len(days) < len(_DAY_NAMES):
+            hints["skip_days"] = days
+    return hints
+
+
+def conditional_request_headers(hints: Optional[Mapping[str, Any]]) -> Dict[str, str]:
+    """Return ``If-None-Match``/``If-Modified-Since`` headers for a refetch."""
+
+    headers: Dict[str, str] = {}
+    if not hints:
+        return headers
+    if hints.get("etag"):
+        headers["If-None-Match"] = str(hints["etag"])
+    if hints.get("last_modified"):
+        headers["If-Modified-Since"] = str(hints["last_modified"])
+    return headers
+
+
+def _is_skipped(moment: datetime, hours: List[int], days: List[str]) -> bool:
+    return moment.hour in hours or _DAY_NAMES[moment.weekday()] in days
+
+
+def next_useful_fetch(
+    hints: Optional[Mapping[str, Any]],
+    *,
+    now: datetime,
+    max_delay: Optional[timedelta] = None,
+) -> Optional[Tuple[datetime, str]]:
+    """Return ``(not_before, reason)`` when fetching at ``now`` is pointless.
+
+    ``max_delay`` caps how far cache lifetimes can push the next fetch out,
+    measured from the previous fetch.
+    """
+
+    if not hints:
+        return None
+    now = now.astimezone(timezone.utc)
+    fetched_at = _parse_iso(hints.get("fetched_at"))
+    ceiling = fetched_at + max_delay if fetched_at and max_delay else None
+
+    candidates: List[Tuple[datetime, str]] = []
+    expires_at = _parse_iso(hints.get("expires_at"))
+    if expires_at is not None:
+        candidates.append((expires_at, "http_cache"))
+    ttl_minutes = hints.get("ttl_minutes")
+    if fetched_at is not None and isinstance(ttl_minutes, int) and ttl_minutes > 0:
+        candidates.append((fetched_at + timedelta(minutes=ttl_minutes), "rss_ttl"))
+    for not_before, reason in sorted(candidates, key=lambda item: item[0], reverse=True):
+        if ceiling is not None and not_before > ceiling:
+            not_before = ceiling
+        if not_before > now:
+            return not_before, reason
+
+    # RSS skipHours/skipDays are expressed in GMT.
+    hours = [value for value in hints.get("skip_hours") or [] if isinstance(value, int)]
+    days = [value for value in hints.get("skip_days") or [] if isinstance(value, str)]
+    if not (hours or days) or not _is_skipped(now, hours, days):
+        return None
+    reason = "rss_skip_days" if _DAY_NAMES[now.weekday()] in days else "rss_skip_hours"
+    resume = now.replace(minute=0, second=0, microsecond=0)
+    for _ in range(24 * 7):
+        resume += timedelta(hours=1)
+        if not _is_skipped(resume, hours, days):
+            break
+    return resume, reason
+
+
+__all__ = [
+    "build_fetch_hints",
+    "conditional_request_headers",
+    "next_useful_fetch",
+]
@@ -0,0 +1,320 @@
+"""HTML sanitization rules for published and previewed article content.
+
+Two variants are derived from a stored article body: the *publish* variant
+sent to Instapaper (selected elements removed) and the *preview* variant
+served by the bookmarks API (reduced to an allowlist of tags, attributes and
+URL schemes).  Each rule set has a version string so derived variants can be
+persisted and recomputed only when the rules that produced them change.
+
+Documents are parsed once, with the tree builder named by
+``HTML_SANITIZER_PARSER``: libxml2 through ``lxml`` by default, or Python's
+``html.parser``.  Fragments are serialized without the ``<html>``/``<body>``
+wrapper lxml adds, so both parsers give the same output for the markup
+covered by ``tests/fixtures/html_sanitization``; the parser is still part of
+the rules version because they can repair broken markup differently.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+from functools import lru_cache
+from typing import Any, List, Optional, Sequence, Tuple
+
+import soupsieve
+from bs4 import BeautifulSoup, NavigableString, Tag
+from bs4.element import CData, Comment, Declaration, Doctype, ProcessingInstruction
+
+try:  # pragma: no cover - lxml is a declared dependency
+    import lxml  # noqa: F401
+
+    _LXML_AVAILABLE = True
+except ImportError:  # pragma: no cover - exercised when lxml is absent
+    _LXML_AVAILABLE = False
+
+# Bump when the output of the corresponding sanitizer changes for the same
+# input and rules, so persisted variants are rebuilt.
+PUBLISH_SANITIZER_VERSION = 2
+PREVIEW_SANITIZER_VERSION = 2
+
+DEFAULT_SANITIZING_CRITERIA = ("img",)
+
+_ALLOWED_PREVIEW_TAGS = {
+    "a",
+    "abbr",
+    "b",
+    "blockquote",
+    "br",
+    "code",
+    "div",
+    "em",
+    "figcaption",
+    "figure",
+    "h1",
+    "h2",
+    "h3",
+    "h4",
+    "h5",
+    "h6",
+    "hr",
+    "i",
+    "img",
+    "li",
+    "ol",
+    "p",
+    "pre",
+    "section",
+    "small",
+    "span",
+    "strong",
+    "sub",
+    "sup",
+    "table",
+    "tbody",
+    "td",
+    "th",
+    "thead",
+    "tr",
+    "ul",
+}
+
+_ALLOWED_PREVIEW_ATTRS = {
+    "a": ["href", "title"],
+    "abbr": ["title"],
+    "img": ["alt", "title", "src"],
+    "td": ["colspan", "rowspan"],
+    "th": ["colspan", "rowspan", "scope"],
+}
+
+_ALLOWED_PREVIEW_PROTOCOLS = ["http", "https", "mailto", "tel"]
+_URL_ATTRIBUTES = {"href", "src"}
+
+# Dropped from previews together with their content; other tags outside the
+# allowlist are unwrapped so their text is kept.
+_DROPPED_PREVIEW_TAGS = {
+    "applet",
+    "embed",
+    "form",
+    "frame",
+    "frameset",
+    "head",
+    "iframe",
+    "math",
+    "noscript",
+    "object",
+    "script",
+    "select",
+    "style",
+    "svg",
+    "template",
+    "textarea",
+    "title",
+}
+
+_URL_SCHEME = re.compile(r"^([a-zA-Z][a-zA-Z0-9+.-]*):")
+_URL_IGNORED_CHARS = re.compile(r"[\x00-\x20\x7f]+")
+_WRAPPER_TAGS = {
+    name: re.compile(rf"<{name}[\s/>]", re.IGNORECASE)
+    for name in ("html", "head", "body")
+}
+
+
+DEFAULT_HTML_PARSER = "lxml" if _LXML_AVAILABLE else "html.parser"
+_SUPPORTED_PARSERS = ("html.parser", "lxml")
+
+
+def html_parser_backend() -> str:
+    """Tree builder used for sanitization (``HTML_SANITIZER_PARSER``).
+
+    Defaults to ``lxml``; ``html.parser`` is used when configured or when
+    lxml cannot be imported.
+    """
+
+    configured = (os.getenv("HTML_SANITIZER_PARSER") or "").strip().lower()
+    if configured not in _SUPPORTED_PARSERS:
+        return DEFAULT_HTML_PARSER
+    if configured == "lxml" and not _LXML_AVAILABLE:
+        return "html.parser"
+    return configured
+
+
+def _parse(html: str) -> BeautifulSoup:
+    return BeautifulSoup(html, html_parser_backend())
+
+
+def _serialize(soup: BeautifulSoup, html: str) -> str:
+    """Serialize ``soup`` in the shape of its input.
+
+    lxml adds ``<html>``, ``<head>`` and ``<body>`` to documents that lack
+    them; wrappers missing from the input are unwrapped again so fragments
+    come back as fragments.  Whitespace ahead of the first element, which
+    only ``html.parser`` keeps, is dropped.
+    """
+
+    if soup.builder.NAME == "lxml":
+        for name in ("html", "head", "body"):
+            wrapper = soup.find(name)
+            if wrapper is not None and not _WRAPPER_TAGS[name].search(html):
+                wrapper.unwrap()
+    for node in list(soup.contents):
+        if isinstance(node, Tag):
+            break
+        if type(node) is NavigableString and not node.strip():
+            node.extract()
+    return str(soup)
+
+
+@lru_cache(maxsize=256)
+def _compile_selectors(selectors: Tuple[str, ...]) -> Tuple[Tuple[str, Any], ...]:
+    return tuple((selector, soupsieve.compile(selector)) for selector in selectors)
+
+
+def _rules_digest(payload: Any) -> str:
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+def publish_rules_version(criteria: Optional[Sequence[str]]) -> str:
+    selectors = list(criteria) if criteria else list(DEFAULT_SANITIZING_CRITERIA)
+    return _rules_digest(
+        {
+            "version": PUBLISH_SANITIZER_VERSION,
+            "selectors": selectors,
+            "parser": html_parser_backend(),
+        }
+    )
+
+
+def preview_rules_version() -> str:
+    return _rules_digest(
+        {
+            "version": PREVIEW_SANITIZER_VERSION,
+            "tags": sorted(_ALLOWED_PREVIEW_TAGS),
+            "attributes": _ALLOWED_PREVIEW_ATTRS,
+            "protocols": _ALLOWED_PREVIEW_PROTOCOLS,
+            "parser": html_parser_backend(),
+        }
+    )
+
+
+def resolve_sanitizing_criteria(
+    instapaper_ini_config: Any, site_config: Optional[dict]
+) -> List[str]:
+    """Return the selectors to strip before publishing.
+
+    INI ``custom_sanitizing_criteria`` override the site configuration's
+    ``sanitizing_criteria``; without either, images are removed.
+    """
+
+    ini_custom_criteria = (
+        instapaper_ini_config.get("custom_sanitizing_criteria")
+        if instapaper_ini_config
+        else None
+    )
+    site_custom_criteria = site_config.get("sanitizing_criteria") if site_config else None
+
+    if ini_custom_criteria:
+        logging.info(
+            "Using custom sanitizing criteria from INI file. This overrides any site configuration."
+        )
+        if isinstance(ini_custom_criteria, str):
+            return [s.strip() for s in ini_custom_criteria.split(",") if s.strip()]
+        return list(ini_custom_criteria)
+    if site_custom_criteria:
+        logging.info("Using custom sanitizing criteria from site configuration.")
+        return [s.strip() for s in site_custom_criteria if s.strip()]
+    logging.info("Using default sanitizing criteria: removing img tags.")
+    return list(DEFAULT_SANITIZING_CRITERIA)
+
+
+def sanitize_html_content(
+    html_content: Optional[str], sanitizing_criteria: Optional[List[str]]
+) -> Optional[str]:
+    """Remove elements matching ``sanitizing_criteria`` CSS selectors."""
+
+    selectors = sanitizing_criteria if sanitizing_criteria else ["img"]
+    if not html_content or not selectors:
+        return html_content
+    try:
+        compiled = _compile_selectors(tuple(selectors))
+        soup = _parse(html_content)
+        removed_count = 0
+        debug = logging.getLogger().isEnabledFor(logging.DEBUG)
+        for selector, matcher in compiled:
+            for element in matcher.select(soup):
+                if debug:
+                    logging.debug(
+                        "Removing element with selector '%s': %s...",
+                        selector,
+                        element.prettify()[:100],
+                    )
+                element.decompose()
+                removed_count += 1
+        logging.info(
+            "Sanitization complete. Removed %s elements based on criteria: %s",
+            removed_count,
+            selectors,
+        )
+        return _serialize(soup, html_content)
+    except Exception as exc:  # noqa: BLE001
+        logging.error("Failed to sanitize HTML content: %s", exc)
+        return html_content
+
+
+def _allowed_url(value: str) -> bool:
+    match = _URL_SCHEME.match(_URL_IGNORED_CHARS.sub("", value))
+    return match is None or match.group(1).lower() in _ALLOWED_PREVIEW_PROTOCOLS
+
+
+def _clean_preview_tag(tag: Tag) -> None:
+    if tag.name in _DROPPED_PREVIEW_TAGS:
+        tag.decompose()
+        return
+    if tag.name not in _ALLOWED_PREVIEW_TAGS:
+        tag.unwrap()
+        return
+    allowed = _ALLOWED_PREVIEW_ATTRS.get(tag.name, ())
+    for name in list(tag.attrs):
+        value = tag.attrs[name]
+        if name not in allowed or not isinstance(value, str):
+            del tag.attrs[name]
+        elif name in _URL_ATTRIBUTES and not _allowed_url(value):
+            del tag.attrs[name]
+
+
+def sanitize_for_preview(html: Optional[str]) -> str:
+    """Return the allowlisted body fragment of ``html`` for safe display."""
+
+    if not html:
+        return ""
+    soup = _parse(html)
+    root = soup.body or soup
+    for node in root.find_all(
+        string=lambda text: isinstance(
+            text, (CData, Comment, Declaration, Doctype, ProcessingInstruction)
+        )
+    ):
+        node.extract()
+    for tag in root.find_all(True):
+        if not tag.decomposed:
+            _clean_preview_tag(tag)
+    if root is soup:
+        return soup.decode().strip()
+    return root.decode_contents().strip()
+
+
+__all__ = [
+    "DEFAULT_HTML_PARSER",
+    "DEFAULT_SANITIZING_CRITERIA",
+    "PREVIEW_SANITIZER_VERSION",
+    "PUBLISH_SANITIZER_VERSION",
+    "html_parser_backend",
+    "preview_rules_version",
+    "publish_rules_version",
+    "resolve_sanitizing_criteria",
+    "sanitize_for_preview",
+    "sanitize_html_content",
+]
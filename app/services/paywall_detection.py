@@ -0,0 +1,132 @@
+"""Detect paywall and login interstitials in fetched article HTML.
+
+All indicators are compiled into one case-insensitive alternation so a body
+is scanned once, without building a lower-cased copy.  Paywall markup sits
+in overlays near the top of the document or in notices near the end, so only
+a bounded prefix and suffix of large bodies are inspected.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterable, Optional, Sequence, Tuple
+
+DEFAULT_PAYWALL_INDICATORS: Tuple[str, ...] = (
+    "<div class=\"paywall\"",
+    "data-paywall",
+    "subscribe to read",
+    "please log in",
+    "<h2>Log in or subscribe to read more</h2>",
+    '<div class="post-access-notice"',
+    'data-testid="paywall-overlay"',
+    "this post is for paid subscribers",
+    "this post is for subscribers only",
+    "only paid subscribers can read this post",
+    "only members can read this post",
+)
+
+_DEFAULT_SCAN_WINDOW = 128 * 1024
+
+
+def paywall_scan_window() -> int:
+    """Characters inspected at each end of a body (``PAYWALL_SCAN_WINDOW``).
+
+    ``0`` scans the whole body.
+    """
+
+    raw = os.getenv("PAYWALL_SCAN_WINDOW")
+    if raw is None or not raw.strip():
+        return _DEFAULT_SCAN_WINDOW
+    try:
+        return max(int(raw), 0)
+    except ValueError:
+        return _DEFAULT_SCAN_WINDOW
+
+
+@dataclass(frozen=True)
+class PaywallMatch:
+    indicator: str
+    source: str
+    position: int
+
+
+class PaywallDetector:
+    """Single-pass matcher over a fixed set of literal indicators."""
+
+    def __init__(self, rules: Sequence[Tuple[str, str]]):
+        self._rules = tuple(rules)
+        self._pattern = (
+            re.compile(
+                "|".join(
+                    f"(?P<r{index}>{re.escape(indicator)})"
+                    for index, (indicator, _) in enumerate(self._rules)
+                ),
+                re.IGNORECASE,
+            )
+            if self._rules
+            else None
+        )
+
+    @property
+    def indicators(self) -> Tuple[str, ...]:
+        return tuple(indicator for indicator, _ in self._rules)
+
+    def _match(self, text: str, start: int, end: int) -> Optional[PaywallMatch]:
+        found = self._pattern.search(text, start, end)
+        if found is None:
+            return None
+        indicator, source = self._rules[int(found.lastgroup[1:])]
+        return PaywallMatch(indicator=indicator, source=source, position=found.start())
+
+    def find(self, text: Optional[str], *, window: Optional[int] = None) -> Optional[PaywallMatch]:
+        """Return the first indicator found in ``text`` or ``None``."""
+
+        if not text or self._pattern is None:
+            return None
+        window = paywall_scan_window() if window is None else window
+        if not window or len(text) <= 2 * window:
+            return self._match(text, 0, len(text))
+        # Overlap the tail by the longest indicator so nothing straddling the
+        # boundary of the suffix window is missed.
+        overlap = max(len(indicator) for indicator, _ in self._rules)
+        return self._match(text, 0, window) or self._match(
+            text, len(text) - window - overlap, len(text)
+        )
+
+
+@lru_cache(maxsize=128)
+def _build_detector(site_indicators: Tuple[str, ...]) -> PaywallDetector:
+    rules = []
+    seen = set()
+    for indicator, source in [(value, "site_config") for value in site_indicators] + [
+        (value, "default") for value in DEFAULT_PAYWALL_INDICATORS
+    ]:
+        key = indicator.lower()
+        if key in seen:
+            continue
+        seen.add(key)
+        rules.append((indicator, source))
+    return PaywallDetector(rules)
+
+
+def get_paywall_detector(site_indicators: Optional[Iterable[str]] = None) -> PaywallDetector:
+    """Return the compiled detector for the defaults plus ``site_indicators``."""
+
+    cleaned = tuple(
+        value.strip()
+        for value in (site_indicators or ())
+        if isinstance(value, str) and value.strip()
+    )
+    return _build_detector(cleaned)
+
+
+__all__ = [
+    "DEFAULT_PAYWALL_INDICATORS",
+    "PaywallDetector",
+    "PaywallMatch",
+    "get_paywall_detector",
+    "paywall_scan_window",
+]
@@ -0,0 +1,274 @@
+"""Incremental fast path for parsing RSS 2.0 and Atom feeds.
+
+``feedparser.parse`` builds a full, normalised object tree for every entry in
+a document even though polling only needs the entries published after the
+previous poll.  This module scans the raw document with expat, drops the
+entries that are provably older than the cutoff and hands only the remaining
+markup to feedparser, so normalisation (sanitising, relative URL resolution,
+date handling) stays byte-for-byte identical to a full parse.  Anything the
+scanner does not understand falls back to a plain ``feedparser.parse`` call.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple, Union
+from xml.parsers import expat
+
+import feedparser
+
+try:  # pragma: no cover - exercised implicitly when feedparser is installed
+    from feedparser.datetimes import _parse_date as _feedparser_parse_date
+except ImportError:  # pragma: no cover - defensive for unexpected releases
+    _feedparser_parse_date = None
+
+_FEED_ROOTS = {"rss", "feed", "rdf"}
+_ENTRY_TAGS = {"item", "entry"}
+# Element names feedparser maps onto ``published``/``updated`` for entries.
+_DATE_TAGS = {"pubdate", "published", "issued", "updated", "modified", "date"}
+_CHUNK_SIZE = 64 * 1024
+
+
+def _stale_run_limit() -> int:
+    """Number of consecutive stale entries that ends a scan early.
+
+    ``0`` disables early termination so the whole document is always scanned.
+    """
+
+    raw = os.getenv("RSS_FASTPATH_STALE_RUN", "3")
+    try:
+        value = int(raw)
+    except (TypeError, ValueError):
+        return 3
+    return max(value, 0)
+
+
+def is_fast_path_enabled() -> bool:
+    value = os.getenv("RSS_FASTPATH_ENABLED")
+    if value is None or not value.strip():
+        return True
+    return value.strip().lower() in {"1", "true", "yes", "on"}
+
+
+class _StopScan(Exception):
+    """Raised from expat callbacks to end a scan once the cutoff is reached."""
+
+
+class _FallbackRequired(Exception):
+    """Raised when the document is not a feed shape the scanner handles."""
+
+
+def _local_name(name: str) -> str:
+    return name.rsplit(":", 1)[-1].lower()
+
+
+def _parse_entry_date(value: str) -> Optional[datetime]:
+    if _feedparser_parse_date is None:
+        return None
+    text = (value or "").strip()
+    if not text:
+        return None
+    try:
+        parsed = _feedparser_parse_date(text)
+    except Exception:  # noqa: BLE001
+        return None
+    if not parsed:
+        return None
+    return datetime(*parsed[:6], tzinfo=timezone.utc)
+
+
+@dataclass
+class FeedScan:
+    """Outcome of scanning a feed document for entries newer than a cutoff."""
+
+    entries_seen: int = 0
+    fresh_entries: int = 0
+    stopped_early: bool = False
+    stale_spans: List[Tuple[int, int]] = field(default_factory=list)
+    truncate_at: Optional[int] = None
+    closing_tags: List[str] = field(default_factory=list)
+
+
+class _FeedScanner:
+    def __init__(self, cutoff_dt: datetime, *, stale_run_limit: int):
+        self.cutoff_dt = cutoff_dt
+        self.stale_run_limit = stale_run_limit
+        self.parser = expat.ParserCreate(encoding="utf-8")
+        self.parser.buffer_text = True
+        self.parser.StartElementHandler = self._start
+        self.parser.EndElementHandler = self._end
+        self.parser.CharacterDataHandler = self._text
+        self.data = b""
+        self.stack: List[str] = []
+        self.result = FeedScan()
+        self._entry_depth: Optional[int] = None
+        self._entry_start = 0
+        self._entry_dates: List[Optional[datetime]] = []
+        self._date_text: Optional[List[str]] = None
+        self._stale_run = 0
+        self._previous_ts: Optional[datetime] = None
+        self._ordered = True
+
+    def scan(self, data: bytes) -> FeedScan:
+        self.data = data
+        try:
+            for offset in range(0, len(data), _CHUNK_SIZE):
+                self.parser.Parse(data[offset : offset + _CHUNK_SIZE], False)
+            self.parser.Parse(b"", True)
+        except _StopScan:
+            self.result.stopped_early = True
+        return self.result
+
+    def _end_of_tag(self, index: int) -> int:
+        close = self.data.find(b">", index)
+        if close < 0:
+            raise _FallbackRequired("unterminated tag")
+        return close + 1
+
+    def _start(self, name: str, attrs) -> None:  # noqa: ANN001
+        local = _local_name(name)
+        if not self.stack and local not in _FEED_ROOTS:
+            raise _FallbackRequired(f"unsupported root element {name!r}")
+        if self._entry_depth is None and local in _ENTRY_TAGS:
+            self._entry_depth = len(self.stack)
+            self._entry_start = self.parser.CurrentByteIndex
+            self._entry_dates = []
+        elif self._entry_depth is not None and local in _DATE_TAGS:
+            self._date_text = []
+        self.stack.append(name)
+
+    def _text(self, data: str) -> None:
+        if self._date_text is not None:
+            self._date_text.append(data)
+
+    def _end(self, name: str) -> None:
+        self.stack.pop()
+        if self._date_text is not None and _local_name(name) in _DATE_TAGS:
+            self._entry_dates.append(_parse_entry_date("".join(self._date_text)))
+            self._date_text = None
+            return
+        if self._entry_depth is None or len(self.stack) != self._entry_depth:
+            return
+
+        end = self._end_of_tag(self.parser.CurrentByteIndex)
+        self._entry_depth = None
+        self.result.entries_seen += 1
+
+        dates = self._entry_dates
+        newest: Optional[datetime] = None
+        if dates and all(value is not None for value in dates):
+            newest = max(value for value in dates if value is not None)
+
+        if newest is not None and newest <= self.cutoff_dt:
+            self.result.stale_spans.append((self._entry_start, end))
+            self._stale_run += 1
+        else:
+            self.result.fresh_entries += 1
+            self._stale_run = 0
+
+        # Early termination is only safe for reverse-chronological feeds, so
+        # every scanned entry must carry a parseable date in descending order.
+        if newest is None or (
+            self._previous_ts is not None and newest > self._previous_ts
+        ):
+            self._ordered = False
+        self._previous_ts = newest
+
+        if (
+            self.stale_run_limit
+            and self._ordered
+            and self._stale_run >= self.stale_run_limit
+        ):
+            self.result.truncate_at = end
+            self.result.closing_tags = list(reversed(self.stack))
+            raise _StopScan()
+
+
+def scan_feed(
+    content: Union[str, bytes],
+    cutoff_dt: datetime,
+    *,
+    stale_run_limit: Optional[int] = None,
+) -> Optional[FeedScan]:
+    """Locate entries older than ``cutoff_dt`` without building entry objects.
+
+    Returns ``None`` when the document is malformed or is not an RSS/Atom feed,
+    signalling that the caller should use feedparser directly.
+    """
+
+    data = content.encode("utf-8") if isinstance(content, str) else bytes(content)
+    if not data.strip():
+        return None
+    limit = _stale_run_limit() if stale_run_limit is None else max(stale_run_limit, 0)
+    scanner = _FeedScanner(cutoff_dt, stale_run_limit=limit)
+    try:
+        return scanner.scan(data)
+    except (expat.ExpatError, _FallbackRequired) as exc:
+        logging.debug("RSS fast path unavailable, falling back to feedparser: %s", exc)
+        return None
+
+
+def _trim_document(data: bytes, scan: FeedScan) -> bytes:
+    end_of_data = scan.truncate_at if scan.truncate_at is not None else len(data)
+    parts: List[bytes] = []
+    cursor = 0
+    for start, end in scan.stale_spans:
+        if start >= end_of_data:
+            break
+        parts.append(data[cursor:start])
+        cursor = end
+    parts.append(data[cursor:end_of_data])
+    if scan.truncate_at is not None:
+        parts.extend(f"</{name}>".encode("utf-8") for name in scan.closing_tags)
+    return b"".join(parts)
+
+
+def _empty_result() -> feedparser.FeedParserDict:
+    return feedparser.FeedParserDict(
+        feed=feedparser.FeedParserDict(),
+        entries=[],
+        bozo=False,
+    )
+
+
+def parse_feed_since(
+    content: Union[str, bytes],
+    cutoff_dt: datetime,
+    *,
+    stale_run_limit: Optional[int] = None,
+):
+    """Parse ``content`` with feedparser, skipping entries older than ``cutoff_dt``.
+
+    Entries that cannot be dated reliably are always kept, so the caller's own
+    cutoff filtering sees exactly the fresh entries a full parse would yield.
+    """
+
+    if not is_fast_path_enabled():
+        return feedparser.parse(content)
+
+    scan = scan_feed(content, cutoff_dt, stale_run_limit=stale_run_limit)
+    if scan is None or scan.entries_seen == 0:
+        return feedparser.parse(content)
+
+    logging.debug(
+        "RSS fast path scanned %s entries (%s fresh, stopped_early=%s)",
+        scan.entries_seen,
+        scan.fresh_entries,
+        scan.stopped_early,
+    )
+    if scan.fresh_entries == 0:
+        return _empty_result()
+    if not scan.stale_spans and scan.truncate_at is None:
+        return feedparser.parse(content)
+
+    data = content.encode("utf-8") if isinstance(content, str) else bytes(content)
+    trimmed = _trim_document(data, scan)
+    if isinstance(content, str):
+        return feedparser.parse(trimmed.decode("utf-8"))
+    return feedparser.parse(trimmed)
+
+
+__all__ = ["FeedScan", "is_fast_path_enabled", "parse_feed_since", "scan_feed"]
@@ -4,11 +4,11 @@ from __future__ import annotations
 
 import json
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 from requests_oauthlib import OAuth1Session
 
-from .subpaperflux_rss import sanitize_html_content
+from .html_sanitization import resolve_sanitizing_criteria, sanitize_html_content
 
 INSTAPAPER_ADD_URL = "https://www.instapaper.com/api/1.1/bookmarks/add"
 
@@ -24,7 +24,17 @@ def publish_to_instapaper(
     site_config: Optional[Dict[str, Any]],
     *,
     resolve_final_url: bool = True,
+    sanitizer: Optional[Callable[[str, List[str]], Optional[str]]] = None,
+    oauth_factory: Optional[Callable[[], OAuth1Session]] = None,
 ) -> Optional[Dict[str, Any]]:
+    """Add ``url`` to Instapaper, optionally with its article HTML.
+
+    ``sanitizer`` replaces :func:`sanitize_html_content` so callers can serve
+    a precomputed publish variant for the resolved sanitizing criteria.
+    ``oauth_factory`` returns a client to reuse instead of creating one for
+    this request.
+    """
+
     try:
         consumer_key = app_creds.get("consumer_key")
         consumer_secret = app_creds.get("consumer_secret")
@@ -35,12 +45,15 @@ def publish_to_instapaper(
             logging.error("Incomplete Instapaper credentials. Cannot publish.")
             return None
 
-        oauth = OAuth1Session(
-            consumer_key,
-            client_secret=consumer_secret,
-            resource_owner_key=oauth_token,
-            resource_owner_secret=oauth_token_secret,
-        )
+        if oauth_factory is not None:
+            oauth = oauth_factory()
+        else:
+            oauth = OAuth1Session(
+                consumer_key,
+                client_secret=consumer_secret,
+                resource_owner_key=oauth_token,
+                resource_owner_secret=oauth_token_secret,
+            )
 
         payload = {
             "url": url,
@@ -55,41 +68,10 @@ def publish_to_instapaper(
         if raw_html_content:
             if sanitize_content_flag:
                 logging.debug("Content sanitization is explicitly ENABLED.")
-                sanitizing_criteria: list[str] = []
-
-                ini_custom_criteria = instapaper_ini_config.get(
-                    "custom_sanitizing_criteria"
+                sanitizing_criteria = resolve_sanitizing_criteria(
+                    instapaper_ini_config, site_config
                 )
-                site_custom_criteria = (
-                    site_config.get("sanitizing_criteria") if site_config else None
-                )
-
-                if ini_custom_criteria:
-                    logging.info(
-                        "Using custom sanitizing criteria from INI file. This overrides any site configuration."
-                    )
-                    if isinstance(ini_custom_criteria, str):
-                        sanitizing_criteria = [
-                            s.strip()
-                            for s in ini_custom_criteria.split(",")
-                            if s.strip()
-                        ]
-                    else:
-                        sanitizing_criteria = list(ini_custom_criteria)
-                elif site_custom_criteria:
-                    logging.info(
-                        "Using custom sanitizing criteria from site configuration."
-                    )
-                    sanitizing_criteria = [
-                        s.strip() for s in site_custom_criteria if s.strip()
-                    ]
-                else:
-                    logging.info(
-                        "Using default sanitizing criteria: removing img tags."
-                    )
-                    sanitizing_criteria = ["img"]
-
-                processed_content = sanitize_html_content(
+                processed_content = (sanitizer or sanitize_html_content)(
                     raw_html_content, sanitizing_criteria
                 )
             else:
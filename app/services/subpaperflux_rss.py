@@ -4,21 +4,38 @@ from __future__ import annotations
 
 import json
 import logging
+import os
 import re
 from datetime import datetime, timedelta, timezone
-from typing import Any, Callable, Dict, Iterable, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 from urllib.parse import urlparse
 
 import feedparser
 import requests
 from bs4 import BeautifulSoup
 
+from .feed_fetch_cache import CachedFeedFetch, get_shared_feed_cache, shared_fetch_ttl
+from .feed_fetch_hints import build_fetch_hints, conditional_request_headers
+from .content_extraction import extract_main_content
+from .html_sanitization import sanitize_html_content  # noqa: F401 - re-exported
+from .paywall_detection import (
+    PaywallDetector,
+    PaywallMatch,
+    get_paywall_detector,
+    paywall_scan_window,
+)
+from .rss_fast_parser import parse_feed_since
+
 _DEFAULT_USER_AGENT = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
     "AppleWebKit/537.36 (KHTML, like Gecko) "
     "Chrome/127.0.0.0 Safari/537.36"
 )
 
+_DEFAULT_ARTICLE_MAX_BYTES = 5 * 1024 * 1024
+_DEFAULT_ARTICLE_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+_ARTICLE_CHUNK_SIZE = 64 * 1024
+
 HEADER_OVERRIDE_KEYS = (
     "article_headers",
     "content_headers",
@@ -102,15 +119,37 @@ def merge_header_overrides(*candidates: Any) -> Dict[str, str]:
 class PaywalledContentError(RuntimeError):
     """Raised when a fetched article response indicates paywalled content."""
 
-    def __init__(self, url: str, *, indicator: Optional[str] = None):
+    def __init__(
+        self,
+        url: str,
+        *,
+        indicator: Optional[str] = None,
+        rule_source: Optional[str] = None,
+    ):
         self.url = url
         self.indicator = indicator
+        self.rule_source = rule_source
         message = "Fetched content appears to be paywalled"
         if indicator:
-            message = f"{message} (indicator={indicator})"
+            message = f"{message} (indicator={indicator}"
+            if rule_source:
+                message = f"{message}, source={rule_source}"
+            message = f"{message})"
         super().__init__(f"{message}: {url}")
 
 
+class FeedParseError(ValueError):
+    """Raised when a feed URL returns content that is not a parseable feed."""
+
+    def __init__(self, url: str, *, reason: Optional[str] = None):
+        self.url = url
+        self.reason = reason
+        message = f"Feed content could not be parsed: {url}"
+        if reason:
+            message = f"{message} ({reason})"
+        super().__init__(message)
+
+
 def _summarize_cookie_metadata(cookies: Iterable[Dict[str, Any]]) -> List[str]:
     summaries: List[str] = []
     for cookie in cookies or []:
@@ -336,12 +375,155 @@ def _serialize_requests_cookie(cookie: Any) -> Dict[str, Any]:
     return payload
 
 
+def _session_cookie_dicts(session: Any) -> List[Dict[str, Any]]:
+    cookie_dicts: List[Dict[str, Any]] = []
+    cookie_jar = getattr(session, "cookies", None)
+    if not cookie_jar:
+        return cookie_dicts
+    try:
+        iterator = iter(cookie_jar)
+    except TypeError:
+        return cookie_dicts
+    for cookie in iterator:
+        if cookie is None:
+            continue
+        try:
+            cookie_dicts.append(_serialize_requests_cookie(cookie))
+        except AttributeError:
+            continue
+    return cookie_dicts
+
+
+def _changed_session_cookies(
+    before: Iterable[Dict[str, Any]], after: Iterable[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """Return cookies in ``after`` that are new or carry a new value or expiry."""
+
+    previous = {
+        (cookie["name"], cookie.get("domain"), cookie.get("path")): (
+            cookie.get("value"),
+            cookie.get("expiry"),
+        )
+        for cookie in before
+    }
+    return [
+        cookie
+        for cookie in after
+        if previous.get((cookie["name"], cookie.get("domain"), cookie.get("path")))
+        != (cookie.get("value"), cookie.get("expiry"))
+    ]
+
+
+def article_max_bytes() -> int:
+    """Largest article body downloaded, from ``ARTICLE_MAX_BYTES`` (``0`` disables)."""
+
+    raw = os.getenv("ARTICLE_MAX_BYTES")
+    if raw is None or not raw.strip():
+        return _DEFAULT_ARTICLE_MAX_BYTES
+    try:
+        return max(int(raw), 0)
+    except ValueError:
+        return _DEFAULT_ARTICLE_MAX_BYTES
+
+
+def article_allowed_content_types() -> Tuple[str, ...]:
+    raw = os.getenv("ARTICLE_ALLOWED_CONTENT_TYPES")
+    if raw is None or not raw.strip():
+        return _DEFAULT_ARTICLE_CONTENT_TYPES
+    return tuple(part.strip().lower() for part in raw.split(",") if part.strip())
+
+
+def _read_article_body(
+    response: requests.Response,
+    *,
+    url: str,
+    detector: PaywallDetector,
+) -> Tuple[Optional[str], Optional[PaywallMatch]]:
+    """Download an article body within the configured limits.
+
+    Returns ``(None, None)`` when the response is rejected by content type or
+    size.  A paywall marker in the leading window stops the download early
+    and is returned with the text read so far.
+    """
+
+    headers = getattr(response, "headers", None) or {}
+    content_type = str(headers.get("Content-Type") or "").split(";", 1)[0].strip().lower()
+    allowed_types = article_allowed_content_types()
+    if content_type and allowed_types and content_type not in allowed_types:
+        logging.warning(
+            "Skipping article body from %s with unsupported content type %s.",
+            url,
+            content_type,
+        )
+        return None, None
+
+    max_bytes = article_max_bytes()
+    declared_length = str(headers.get("Content-Length") or "").strip()
+    if max_bytes and declared_length.isdigit() and int(declared_length) > max_bytes:
+        logging.warning(
+            "Skipping article body from %s: Content-Length %s exceeds limit of %s bytes.",
+            url,
+            declared_length,
+            max_bytes,
+        )
+        return None, None
+
+    if getattr(response, "raw", None) is None:
+        # Body already materialised (e.g. a prepared response); apply the cap.
+        if max_bytes and len(response.content or b"") > max_bytes:
+            logging.warning(
+                "Skipping article body from %s larger than %s bytes.", url, max_bytes
+            )
+            return None, None
+        return response.text, None
+
+    encoding = response.encoding or "utf-8"
+    head_window = paywall_scan_window()
+    chunks: List[bytes] = []
+    received = 0
+    head_checked = not head_window
+    for chunk in response.iter_content(chunk_size=_ARTICLE_CHUNK_SIZE):
+        if not chunk:
+            continue
+        received += len(chunk)
+        if max_bytes and received > max_bytes:
+            logging.warning(
+                "Aborted article download from %s after exceeding %s bytes.",
+                url,
+                max_bytes,
+            )
+            return None, None
+        chunks.append(chunk)
+        if not head_checked and received >= head_window:
+            head_checked = True
+            partial = b"".join(chunks).decode(encoding, errors="replace")
+            match = detector.find(partial[:head_window], window=0)
+            if match is not None:
+                logging.debug(
+                    "Stopped article download from %s after %s bytes: paywall marker found.",
+                    url,
+                    received,
+                )
+                return partial, match
+    return b"".join(chunks).decode(encoding, errors="replace"), None
+
+
 def get_article_html_with_cookies(
     url: str,
     cookies: List[Dict[str, Any]],
     *,
     header_overrides: Optional[Dict[str, Any]] = None,
+    paywall_indicators: Optional[List[str]] = None,
+    cookie_sink: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
 ) -> Optional[str]:
+    """Fetch ``url`` with ``cookies`` and return the article HTML.
+
+    Raises :class:`PaywalledContentError` naming the matching rule when the
+    body contains a default or site-configured ``paywall_indicators`` entry.
+    After a successful fetch ``cookie_sink`` receives the cookies the site
+    set or rotated in its responses.
+    """
+
     if not cookies:
         logging.debug("No cookies provided. Cannot fetch full article HTML.")
         return None
@@ -375,8 +557,11 @@ def get_article_html_with_cookies(
             ", ".join(session_cookie_summaries),
         )
 
+    applied_cookies = _session_cookie_dicts(session)
+    detector = get_paywall_detector(paywall_indicators)
+    response = None
     try:
-        response = session.get(url, timeout=30)
+        response = session.get(url, timeout=30, stream=True)
         response.raise_for_status()
 
         history_chain = [resp.url for resp in response.history if getattr(resp, "url", None)]
@@ -408,14 +593,8 @@ def get_article_html_with_cookies(
             _extract_key_response_headers(response),
         )
 
-        response_text = response.text
-        response_text_lower = response_text.lower()
-
-        logging.debug(
-            "Article fetch response preview (sanitized): %s",
-            _sanitize_body_preview(response_text),
-        )
-
+        # Redirects to a login page are known from the URL chain alone; never
+        # download their body.
         candidate_urls = [resp.url for resp in response.history if getattr(resp, "url", None)]
         candidate_urls.append(getattr(response, "url", ""))
 
@@ -434,85 +613,61 @@ def get_article_html_with_cookies(
                     url,
                     candidate,
                 )
-                logging.warning(
-                    "Login redirect response preview (sanitized): %s",
-                    _sanitize_body_preview(response_text),
-                )
                 logging.warning(
                     "Login redirect key headers: %s",
                     _extract_key_response_headers(response),
                 )
                 return None
 
-        paywall_indicators = [
-            "<div class=\"paywall\"",
-            "data-paywall",
-            "subscribe to read",
-            "please log in",
-            "<h2>Log in or subscribe to read more</h2>",
-            '<div class="post-access-notice"',
-            'data-testid="paywall-overlay"',
-            "this post is for paid subscribers",
-            "this post is for subscribers only",
-            "only paid subscribers can read this post",
-            "only members can read this post",
-        ]
-
-        for indicator in paywall_indicators:
-            if indicator.lower() in response_text_lower:
-                logging.warning(
-                    "Fetched content from %s appears to be a paywall or login page (indicator=%s).",
-                    url,
-                    indicator,
-                )
-                logging.warning(
-                    "Paywall response preview (sanitized): %s",
-                    _sanitize_body_preview(response_text),
-                )
-                logging.warning(
-                    "Paywall key headers: %s",
-                    _extract_key_response_headers(response),
-                )
-                raise PaywalledContentError(url, indicator=indicator)
+        response_text, paywall_match = _read_article_body(response, url=url, detector=detector)
+        if response_text is None:
+            return None
+
+        logging.debug(
+            "Article fetch response preview (sanitized): %s",
+            _sanitize_body_preview(response_text),
+        )
+
+        if paywall_match is None:
+            paywall_match = detector.find(response_text)
+        if paywall_match is not None:
+            logging.warning(
+                "Fetched content from %s appears to be a paywall or login page (indicator=%s, source=%s).",
+                url,
+                paywall_match.indicator,
+                paywall_match.source,
+            )
+            logging.warning(
+                "Paywall response preview (sanitized): %s",
+                _sanitize_body_preview(response_text),
+            )
+            logging.warning(
+                "Paywall key headers: %s",
+                _extract_key_response_headers(response),
+            )
+            raise PaywalledContentError(
+                url,
+                indicator=paywall_match.indicator,
+                rule_source=paywall_match.source,
+            )
 
         logging.debug("Successfully fetched article content from %s.", url)
+        if cookie_sink is not None:
+            refreshed = _changed_session_cookies(
+                applied_cookies, _session_cookie_dicts(session)
+            )
+            if refreshed:
+                cookie_sink(refreshed)
         return response_text
     except requests.exceptions.RequestException as exc:
         logging.error("Error fetching article content with cookies from %s: %s", url, exc)
-        if "response" in locals():
+        if response is not None:
             logging.debug("HTTP status code: %s", response.status_code)
-            logging.debug("Response body: %s...", response.text[:200])
         return None
-
-
-def sanitize_html_content(html_content: Optional[str], sanitizing_criteria: Optional[List[str]]) -> Optional[str]:
-    selectors = sanitizing_criteria if sanitizing_criteria else ["img"]
-    if not html_content or not selectors:
-        return html_content
-    try:
-        soup = BeautifulSoup(html_content, "html.parser")
-        removed_count = 0
-        for selector in selectors:
-            elements = soup.select(selector)
-            if not elements:
-                continue
-            for element in elements:
-                logging.debug(
-                    "Removing element with selector '%s': %s...",
-                    selector,
-                    element.prettify()[:100],
-                )
-                element.decompose()
-                removed_count += 1
-        logging.info(
-            "Sanitization complete. Removed %s elements based on criteria: %s",
-            removed_count,
-            selectors,
-        )
-        return str(soup)
-    except Exception as exc:  # noqa: BLE001
-        logging.error("Failed to sanitize HTML content: %s", exc)
-        return html_content
+    finally:
+        # Release the connection even when the body was not fully read.
+        if response is not None and getattr(response, "raw", None) is not None:
+            response.close()
 
 
 def extract_prefixed_headers(section: Any, prefix: str = "article_header") -> Dict[str, str]:
@@ -560,9 +715,39 @@ def get_new_rss_entries(
     site_config: Optional[Dict[str, Any]],
     header_overrides: Optional[Dict[str, Any]] = None,
     cookie_invalidator: Optional[Callable[[PaywalledContentError], None]] = None,
+    http_session: Optional[requests.Session] = None,
+    cookie_updater: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
 ) -> List[Dict[str, Any]]:
+    """Fetch ``feed_url`` and return entries newer than the state's cutoff.
+
+    ``http_session`` is used for public feed fetches so callers polling many
+    feeds can share one connection pool; authenticated fetches always use a
+    private session so cookies never leak between feeds.  Public fetches go
+    through the shared fetch cache so subscribers of the same feed polled
+    within ``RSS_SHARED_FETCH_TTL`` seconds reuse one download and parse.
+
+    Cookies set or rotated by the authenticated feed and article responses
+    are passed once to ``cookie_updater`` at the end of the poll, unless a
+    paywall was detected.
+    """
+
     last_run_dt: datetime = state["last_rss_timestamp"]
     new_entries: List[Dict[str, Any]] = []
+    refreshed_cookies: List[Dict[str, Any]] = []
+    paywall_detected = False
+
+    def _persist_refreshed_cookies() -> None:
+        if cookie_updater is None or paywall_detected or not refreshed_cookies:
+            return
+        try:
+            cookie_updater(_merge_cookie_dicts([], refreshed_cookies))
+        except Exception:  # noqa: BLE001
+            logging.exception("Failed to persist refreshed cookies for %s", feed_url)
+
+    def _absorb_article_cookies(refreshed: List[Dict[str, Any]]) -> None:
+        nonlocal cookies
+        cookies = _merge_cookie_dicts(cookies, refreshed)
+        refreshed_cookies.extend(refreshed)
 
     logging.debug("Last RSS entry timestamp from state: %s", last_run_dt.isoformat())
 
@@ -592,7 +777,11 @@ def get_new_rss_entries(
         has_cookies = bool(cookies)
 
         site_header_candidates: List[Any] = []
+        site_paywall_indicators: List[str] = []
+        extract_main = False
         if isinstance(site_config, dict):
+            site_paywall_indicators = list(site_config.get("paywall_indicators") or [])
+            extract_main = bool(site_config.get("extract_main_content"))
             for key in HEADER_OVERRIDE_KEYS:
                 if key in site_config:
                     site_header_candidates.append(site_config.get(key))
@@ -604,6 +793,9 @@ def get_new_rss_entries(
 
         feed_header_candidates: List[Any] = []
         if rss_feed_config:
+            extract_main = rss_feed_config.getboolean(
+                "extract_main_content", fallback=extract_main
+            )
             for key in HEADER_OVERRIDE_KEYS:
                 value = rss_feed_config.get(key)
                 if value:
@@ -618,6 +810,10 @@ def get_new_rss_entries(
             *feed_header_candidates,
         )
 
+        previous_hints = state.get("fetch_hints") or {}
+        conditional_headers = conditional_request_headers(previous_hints)
+        shared_fetch: Optional[CachedFeedFetch] = None
+
         if requires_authenticated_access and not has_cookies:
             logging.error(
                 "Feed or content is marked as private/paywalled but no cookies are available.",
@@ -644,6 +840,8 @@ def get_new_rss_entries(
                     "Authenticated feed session cookies: %s",
                     ", ".join(session_cookie_summaries),
                 )
+            session.headers.update(conditional_headers)
+            applied_cookies = _session_cookie_dicts(session)
             feed_response = session.get(feed_url, timeout=30)
 
             existing_cookie_dicts = list(cookies or [])
@@ -653,22 +851,10 @@ def get_new_rss_entries(
                 if isinstance(cookie, dict) and cookie.get("name")
             }
 
-            session_cookie_dicts: List[Dict[str, Any]] = []
-            session_cookie_jar = getattr(session, "cookies", None)
-            if session_cookie_jar:
-                try:
-                    iterator = iter(session_cookie_jar)
-                except TypeError:
-                    iterator = []
-                for cookie in iterator:
-                    if cookie is None:
-                        continue
-                    try:
-                        serialized = _serialize_requests_cookie(cookie)
-                    except AttributeError:
-                        continue
-                    session_cookie_dicts.append(serialized)
-
+            session_cookie_dicts = _session_cookie_dicts(session)
+            refreshed_cookies.extend(
+                _changed_session_cookies(applied_cookies, session_cookie_dicts)
+            )
             cookies = _merge_cookie_dicts(existing_cookie_dicts, session_cookie_dicts)
             has_cookies = bool(cookies)
 
@@ -701,14 +887,66 @@ def get_new_rss_entries(
                     ", ".join(prepared_cookie_summaries),
                 )
 
+            raise_for_status = getattr(feed_response, "raise_for_status", None)
+            if callable(raise_for_status):
+                raise_for_status()
             feed_content = feed_response.text
+            response_headers = getattr(feed_response, "headers", None)
+            response_status = getattr(feed_response, "status_code", None)
         else:
             logging.info("Fetching public RSS feed from %s", feed_url)
-            response = requests.get(feed_url, timeout=30)
-            response.raise_for_status()
-            feed_content = response.text
+            fetch = http_session.get if http_session is not None else requests.get
+
+            def _fetch_public(request_headers: Dict[str, str]):
+                if request_headers:
+                    return fetch(feed_url, headers=request_headers, timeout=30)
+                return fetch(feed_url, timeout=30)
+
+            if shared_fetch_ttl() > 0:
+                shared_fetch, cache_hit = get_shared_feed_cache().fetch(
+                    feed_url,
+                    fetcher=_fetch_public,
+                    conditional_headers=conditional_headers,
+                )
+                if cache_hit:
+                    logging.debug("Reusing shared fetch of RSS feed %s", feed_url)
+                feed_content = shared_fetch.content
+                response_headers = shared_fetch.headers
+                response_status = shared_fetch.status_code
+                if cache_hit and shared_fetch.is_not_modified_for(conditional_headers):
+                    response_status = 304
+            else:
+                response = _fetch_public(conditional_headers)
+                response.raise_for_status()
+                feed_content = response.text
+                response_headers = getattr(response, "headers", None)
+                response_status = getattr(response, "status_code", None)
+
+        not_modified = response_status == 304
+        state["fetch_hints"] = build_fetch_hints(
+            response_headers,
+            None if not_modified else feed_content,
+            fetched_at=datetime.now(timezone.utc),
+            previous=previous_hints,
+            not_modified=not_modified,
+        )
+        if not_modified:
+            logging.info("RSS feed %s not modified since the last poll.", feed_url)
+            _persist_refreshed_cookies()
+            return new_entries
 
-        feed = feedparser.parse(feed_content)
+        if shared_fetch is None or shared_fetch.claim_first_parse():
+            feed = parse_feed_since(feed_content, cutoff_dt)
+        else:
+            feed = shared_fetch.full_parse()
+        if (
+            getattr(feed, "bozo", False)
+            and not getattr(feed, "entries", None)
+            and not getattr(feed, "version", None)
+        ):
+            raise FeedParseError(
+                feed_url, reason=str(getattr(feed, "bozo_exception", "") or "") or None
+            )
         for entry in getattr(feed, "entries", []):
             entry_published = getattr(entry, "published_parsed", None)
             entry_updated = getattr(entry, "updated_parsed", None)
@@ -814,10 +1052,18 @@ def get_new_rss_entries(
                     "Article is paywalled. Attempting to fetch full HTML body with cookies.",
                 )
                 try:
+                    article_fetch_kwargs: Dict[str, Any] = {
+                        "header_overrides": article_header_overrides,
+                    }
+                    if site_paywall_indicators:
+                        article_fetch_kwargs["paywall_indicators"] = site_paywall_indicators
+                    if cookie_updater is not None:
+                        article_fetch_kwargs["cookie_sink"] = _absorb_article_cookies
                     raw_html_content = get_article_html_with_cookies(
-                        url, cookies, header_overrides=article_header_overrides
+                        url, cookies, **article_fetch_kwargs
                     )
                 except PaywalledContentError as exc:
+                    paywall_detected = True
                     logging.warning(
                         "Detected paywall while fetching %s; marking cookies for refresh.",
                         url,
@@ -831,6 +1077,8 @@ def get_new_rss_entries(
                                 url,
                             )
                     raw_html_content = None
+                if raw_html_content and extract_main:
+                    raw_html_content = extract_main_content(raw_html_content) or raw_html_content
             else:
                 logging.info(
                     "Article is not paywalled. Sending URL-only request to Instapaper.",
@@ -864,6 +1112,7 @@ def get_new_rss_entries(
                 )
 
         logging.info("Found %s new entries from this feed.", len(new_entries))
+        _persist_refreshed_cookies()
 
     except requests.exceptions.RequestException as exc:
         logging.error("Error fetching RSS feed: %s", exc)
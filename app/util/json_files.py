@@ -0,0 +1,57 @@
+"""Process-wide cache of legacy JSON config files.
+
+``credentials.json``, ``instapaper_app_creds.json`` and ``site_configs.json``
+are read for every bookmark a publish job handles.  Parsed contents are kept
+per path and reused while the file's modification time and size are
+unchanged, so an unchanged file costs one ``stat`` per lookup.  Callers get a
+private copy and may mutate it freely.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+_cache: Dict[str, Tuple[Tuple[int, int], Any]] = {}
+_lock = threading.Lock()
+
+
+def load_json_file(path: str) -> Any:
+    """Return the parsed contents of ``path`` or ``{}`` when it does not exist.
+
+    Decoding errors propagate and are not cached.
+    """
+
+    key = os.path.abspath(path)
+    try:
+        stat = os.stat(key)
+    except FileNotFoundError:
+        with _lock:
+            _cache.pop(key, None)
+        return {}
+    signature = (stat.st_mtime_ns, stat.st_size)
+    with _lock:
+        cached = _cache.get(key)
+    if cached is None or cached[0] != signature:
+        with open(key, "r", encoding="utf-8") as fp:
+            parsed = json.load(fp)
+        cached = (signature, parsed)
+        with _lock:
+            _cache[key] = cached
+    return copy.deepcopy(cached[1])
+
+
+def invalidate_json_file_cache(path: Optional[str] = None) -> None:
+    """Forget the cached contents of ``path``, or of every file when omitted."""
+
+    with _lock:
+        if path is None:
+            _cache.clear()
+        else:
+            _cache.pop(os.path.abspath(path), None)
+
+
+__all__ = ["invalidate_json_file_cache", "load_json_file"]
@@ -1,25 +1,38 @@
 import os
+import threading
 import time
 from typing import Dict
 
 
 class RateLimiter:
+    """Spaces calls sharing a key by at least the key's interval.
+
+    Keys may be scoped as ``"<service>:<id>"``; a scoped key uses the
+    interval configured for its service.  Safe to share between threads:
+    concurrent callers are given consecutive slots.
+    """
+
     def __init__(self, default_interval: float = 0.2):
         self.default_interval = default_interval
         self._last: Dict[str, float] = {}
         self._overrides: Dict[str, float] = {}
+        self._lock = threading.Lock()
 
     def set_interval(self, key: str, interval: float) -> None:
         self._overrides[key] = interval
 
+    def _interval(self, key: str) -> float:
+        if key in self._overrides:
+            return self._overrides[key]
+        return self._overrides.get(key.split(":", 1)[0], self.default_interval)
+
     def wait(self, key: str) -> None:
-        interval = self._overrides.get(key, self.default_interval)
-        now = time.time()
-        last = self._last.get(key, 0)
-        delta = now - last
-        if delta < interval:
-            time.sleep(interval - delta)
-        self._last[key] = time.time()
+        with self._lock:
+            now = time.time()
+            slot = max(now, self._last.get(key, 0) + self._interval(key))
+            self._last[key] = slot
+        if slot > now:
+            time.sleep(slot - now)
 
 
 limiter = RateLimiter(default_interval=float(os.getenv("RL_DEFAULT_INTERVAL", "0.2")))
@@ -14,7 +14,14 @@ from .db import (
     set_current_user_id,
 )
 from .models import Job, JobSchedule
-from .jobs import get_handler  # import registry
+from .jobs import NonRetryableJobError, get_handler  # import registry
+from .jobs.cookie_refresh import enqueue_cookie_refresh_logins, is_cookie_refresh_enabled
+from .jobs.feed_polling import (
+    FEED_DRIVEN_JOB_TYPES,
+    enqueue_due_feed_polls,
+    is_feed_driven_scheduling_enabled,
+)
+from .jobs.ledger import clear_job_items
 from .jobs.scheduler import enqueue_due_schedules
 from .observability.logging import bind_job_id
 from .observability.metrics import JOB_COUNTER, JOB_DURATION
@@ -78,7 +85,13 @@ def enqueue_due_schedules_once() -> None:
     with session_ctx() as session:
         jobs = []
         try:
-            jobs = enqueue_due_schedules(session)
+            # Feed-driven scheduling takes over the RSS poll schedules.
+            jobs = enqueue_due_schedules(
+                session,
+                exclude_job_types=(
+                    FEED_DRIVEN_JOB_TYPES if is_feed_driven_scheduling_enabled() else ()
+                ),
+            )
             session.commit()
         except Exception:  # noqa: BLE001
             logging.exception("Failed to enqueue scheduled jobs")
@@ -91,6 +104,44 @@ def enqueue_due_schedules_once() -> None:
             )
 
 
+def enqueue_due_feed_polls_once() -> None:
+    if not is_feed_driven_scheduling_enabled():
+        return
+    with session_ctx() as session:
+        jobs = []
+        try:
+            jobs = enqueue_due_feed_polls(session)
+            session.commit()
+        except Exception:  # noqa: BLE001
+            logging.exception("Failed to enqueue due feed polls")
+            session.rollback()
+            return
+        if jobs:
+            logging.info(
+                "Enqueued feed poll batches",
+                extra={"event": "feed_polls_enqueued", "count": len(jobs)},
+            )
+
+
+def enqueue_cookie_refreshes_once() -> None:
+    if not is_cookie_refresh_enabled():
+        return
+    with session_ctx() as session:
+        jobs = []
+        try:
+            jobs = enqueue_cookie_refresh_logins(session)
+            session.commit()
+        except Exception:  # noqa: BLE001
+            logging.exception("Failed to enqueue cookie refresh logins")
+            session.rollback()
+            return
+        if jobs:
+            logging.info(
+                "Enqueued proactive cookie refresh logins",
+                extra={"event": "cookie_refresh_enqueued", "count": len(jobs)},
+            )
+
+
 def fetch_next_job() -> Optional[Job]:
     with session_ctx() as session:
         now = time.time()
@@ -141,12 +192,13 @@ def mark_done(job: Job, details: Dict[str, Any] | None = None) -> None:
                 existing_details.update(details)
                 db_job.details = existing_details
             session.add(db_job)
+            clear_job_items(session, db_job.id)
             _update_schedule_for_job(session, db_job, error=None)
             session.commit()
     logging.info("Job done", extra={"event": "job_done", "job_id": job.id, "type": job.type})
 
 
-def mark_failed(job: Job, error: str) -> None:
+def mark_failed(job: Job, error: str, *, retryable: bool = True) -> None:
     with session_ctx() as session:
         db_job = session.get(Job, job.id)
         if db_job:
@@ -154,7 +206,7 @@ def mark_failed(job: Job, error: str) -> None:
             truncated_error = error[:500]
             db_job.last_error = truncated_error
             max_attempts = _max_attempts(db_job.type or "")
-            if db_job.attempts < max_attempts:
+            if retryable and db_job.attempts < max_attempts:
                 # Exponential backoff
                 base = _backoff_base(db_job.type or "")
                 delay = base * (2 ** (db_job.attempts - 1))
@@ -163,6 +215,7 @@ def mark_failed(job: Job, error: str) -> None:
             else:
                 db_job.status = "failed"
                 db_job.available_at = None
+                clear_job_items(session, db_job.id)
             session.add(db_job)
             _update_schedule_for_job(session, db_job, error=truncated_error)
             session.commit()
@@ -200,6 +253,8 @@ def run_forever():
     try:
         while True:
             enqueue_due_schedules_once()
+            enqueue_due_feed_polls_once()
+            enqueue_cookie_refreshes_once()
             job = fetch_next_job()
             if not job:
                 time.sleep(POLL_INTERVAL)
@@ -210,7 +265,11 @@ def run_forever():
                     mark_done(job, details)
                 except Exception as e:  # noqa: BLE001
                     logging.exception("Job %s failed: %s", job.id, e)
-                    mark_failed(job, str(e))
+                    mark_failed(
+                        job,
+                        str(e),
+                        retryable=not isinstance(e, NonRetryableJobError),
+                    )
     except KeyboardInterrupt:
         logging.info("Worker stopped by user")
 
@@ -0,0 +1,77 @@
+"""Compare full feedparser parsing with the incremental RSS fast path.
+
+Usage: ``python -m scripts.benchmark_rss_fast_parser [--items 500] [--fresh 10]``
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import feedparser
+
+from app.services.rss_fast_parser import parse_feed_since
+
+
+def _build_feed(items: int, base: datetime) -> str:
+    entries = []
+    for index in range(items):
+        published = format_datetime(base - timedelta(hours=index))
+        entries.append(
+            "<item>"
+            f"<title>Story {index}</title>"
+            f"<link>https://example.com/articles/{index}</link>"
+            f"<guid>https://example.com/articles/{index}</guid>"
+            f"<description>&lt;p&gt;Summary for story {index} with "
+            "&lt;a href=&quot;/more&quot;&gt;a link&lt;/a&gt;.&lt;/p&gt;</description>"
+            f"<pubDate>{published}</pubDate>"
+            "<category>news</category>"
+            "</item>"
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<rss version="2.0"><channel><title>Benchmark</title>'
+        "<link>https://example.com/</link><language>en</language>"
+        f"{''.join(entries)}</channel></rss>"
+    )
+
+
+def _time(label: str, func, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"{label:<24} {elapsed * 1000:9.2f} ms/parse")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--fresh", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    base = datetime.now(timezone.utc)
+    document = _build_feed(args.items, base)
+    cutoff = base - timedelta(hours=args.fresh, minutes=-30)
+
+    print(f"{args.items} items, {args.fresh} newer than cutoff, {len(document)} bytes")
+    full = _time("feedparser.parse", lambda: feedparser.parse(document), args.repeat)
+    fast = _time(
+        "parse_feed_since",
+        lambda: parse_feed_since(document, cutoff),
+        args.repeat,
+    )
+    exhaustive = _time(
+        "parse_feed_since (no stop)",
+        lambda: parse_feed_since(document, cutoff, stale_run_limit=0),
+        args.repeat,
+    )
+    print(f"speedup: {full / fast:.1f}x (early stop), {full / exhaustive:.1f}x (full scan)")
+
+
+if __name__ == "__main__":
+    main()
@@ -350,7 +350,6 @@ export interface GetRoleV1AdminRolesRoleIdGetRequest {
 
 export interface GetSiteConfigV1V1SiteConfigsConfigIdGetRequest {
     configId: any;
-    credentialId?: any;
 }
 
 export interface GetTokenV1MeTokensTokenIdGetRequest {
@@ -462,6 +461,7 @@ export interface ListCredentialsV1V1CredentialsGetRequest {
 
 export interface ListFeedsV1V1FeedsGetRequest {
     ownerUserIds?: any;
+    healthStatus?: any;
     page?: any;
     size?: any;
 }
@@ -582,6 +582,7 @@ export interface TestMinifluxV1IntegrationsMinifluxTestPostRequest {
 
 export interface TestSiteConfigV1SiteConfigsConfigIdTestPostRequest {
     configId: any;
+    credentialId?: any;
 }
 
 export interface ToggleJobScheduleV1JobSchedulesScheduleIdTogglePostRequest {
@@ -2332,10 +2333,6 @@ export class V1Api extends runtime.BaseAPI {
 
         const queryParameters: any = {};
 
-        if (requestParameters.credentialId !== undefined) {
-            queryParameters['credential_id'] = requestParameters.credentialId;
-        }
-
         const headerParameters: runtime.HTTPHeaders = {};
 
         if (this.configuration && this.configuration.accessToken) {
@@ -3107,6 +3104,10 @@ export class V1Api extends runtime.BaseAPI {
             queryParameters['owner_user_ids'] = requestParameters.ownerUserIds;
         }
 
+        if (requestParameters.healthStatus !== undefined) {
+            queryParameters['health_status'] = requestParameters.healthStatus;
+        }
+
         if (requestParameters.page !== undefined) {
             queryParameters['page'] = requestParameters.page;
         }
@@ -4222,6 +4223,10 @@ export class V1Api extends runtime.BaseAPI {
 
         const queryParameters: any = {};
 
+        if (requestParameters.credentialId !== undefined) {
+            queryParameters['credential_id'] = requestParameters.credentialId;
+        }
+
         const headerParameters: runtime.HTTPHeaders = {};
 
         if (this.configuration && this.configuration.accessToken) {
@@ -55,6 +55,12 @@ export interface Feed {
      * @memberof Feed
      */
     rssRequiresAuth?: any | null;
+    /**
+     * 
+     * @type {any}
+     * @memberof Feed
+     */
+    extractMainContent?: any | null;
     /**
      * 
      * @type {any}
@@ -119,6 +125,7 @@ export function FeedFromJSONTyped(json: any, ignoreDiscriminator: boolean): Feed
         'initialLookbackPeriod': !exists(json, 'initial_lookback_period') ? undefined : json['initial_lookback_period'],
         'isPaywalled': !exists(json, 'is_paywalled') ? undefined : json['is_paywalled'],
         'rssRequiresAuth': !exists(json, 'rss_requires_auth') ? undefined : json['rss_requires_auth'],
+        'extractMainContent': !exists(json, 'extract_main_content') ? undefined : json['extract_main_content'],
         'siteConfigId': !exists(json, 'site_config_id') ? undefined : json['site_config_id'],
         'ownerUserId': !exists(json, 'owner_user_id') ? undefined : json['owner_user_id'],
         'siteLoginCredentialId': !exists(json, 'site_login_credential_id') ? undefined : json['site_login_credential_id'],
@@ -143,6 +150,7 @@ export function FeedToJSON(value?: Feed | null): any {
         'initial_lookback_period': value.initialLookbackPeriod,
         'is_paywalled': value.isPaywalled,
         'rss_requires_auth': value.rssRequiresAuth,
+        'extract_main_content': value.extractMainContent,
         'site_config_id': value.siteConfigId,
         'owner_user_id': value.ownerUserId,
         'site_login_credential_id': value.siteLoginCredentialId,
@@ -55,6 +55,12 @@ export interface FeedOut {
      * @memberof FeedOut
      */
     rssRequiresAuth?: any | null;
+    /**
+     * 
+     * @type {any}
+     * @memberof FeedOut
+     */
+    extractMainContent?: any | null;
     /**
      * 
      * @type {any}
@@ -91,6 +97,42 @@ export interface FeedOut {
      * @memberof FeedOut
      */
     lastRssPollAt?: any | null;
+    /**
+     * 
+     * @type {any}
+     * @memberof FeedOut
+     */
+    nextPollAt?: any | null;
+    /**
+     * 
+     * @type {any}
+     * @memberof FeedOut
+     */
+    healthStatus?: any | null;
+    /**
+     * 
+     * @type {any}
+     * @memberof FeedOut
+     */
+    consecutiveFailures?: any | null;
+    /**
+     * 
+     * @type {any}
+     * @memberof FeedOut
+     */
+    lastSuccessAt?: any | null;
+    /**
+     * 
+     * @type {any}
+     * @memberof FeedOut
+     */
+    lastErrorClass?: any | null;
+    /**
+     * 
+     * @type {any}
+     * @memberof FeedOut
+     */
+    lastErrorAt?: any | null;
 }
 
 /**
@@ -121,12 +163,19 @@ export function FeedOutFromJSONTyped(json: any, ignoreDiscriminator: boolean): F
         'initialLookbackPeriod': !exists(json, 'initial_lookback_period') ? undefined : json['initial_lookback_period'],
         'isPaywalled': !exists(json, 'is_paywalled') ? undefined : json['is_paywalled'],
         'rssRequiresAuth': !exists(json, 'rss_requires_auth') ? undefined : json['rss_requires_auth'],
+        'extractMainContent': !exists(json, 'extract_main_content') ? undefined : json['extract_main_content'],
         'siteConfigId': !exists(json, 'site_config_id') ? undefined : json['site_config_id'],
         'ownerUserId': !exists(json, 'owner_user_id') ? undefined : json['owner_user_id'],
         'siteLoginCredentialId': !exists(json, 'site_login_credential_id') ? undefined : json['site_login_credential_id'],
         'folderId': !exists(json, 'folder_id') ? undefined : json['folder_id'],
         'tagIds': !exists(json, 'tag_ids') ? undefined : json['tag_ids'],
         'lastRssPollAt': !exists(json, 'last_rss_poll_at') ? undefined : json['last_rss_poll_at'],
+        'nextPollAt': !exists(json, 'next_poll_at') ? undefined : json['next_poll_at'],
+        'healthStatus': !exists(json, 'health_status') ? undefined : json['health_status'],
+        'consecutiveFailures': !exists(json, 'consecutive_failures') ? undefined : json['consecutive_failures'],
+        'lastSuccessAt': !exists(json, 'last_success_at') ? undefined : json['last_success_at'],
+        'lastErrorClass': !exists(json, 'last_error_class') ? undefined : json['last_error_class'],
+        'lastErrorAt': !exists(json, 'last_error_at') ? undefined : json['last_error_at'],
     };
 }
 
@@ -145,12 +194,19 @@ export function FeedOutToJSON(value?: FeedOut | null): any {
         'initial_lookback_period': value.initialLookbackPeriod,
         'is_paywalled': value.isPaywalled,
         'rss_requires_auth': value.rssRequiresAuth,
+        'extract_main_content': value.extractMainContent,
         'site_config_id': value.siteConfigId,
         'owner_user_id': value.ownerUserId,
         'site_login_credential_id': value.siteLoginCredentialId,
         'folder_id': value.folderId,
         'tag_ids': value.tagIds,
         'last_rss_poll_at': value.lastRssPollAt,
+        'next_poll_at': value.nextPollAt,
+        'health_status': value.healthStatus,
+        'consecutive_failures': value.consecutiveFailures,
+        'last_success_at': value.lastSuccessAt,
+        'last_error_class': value.lastErrorClass,
+        'last_error_at': value.lastErrorAt,
     };
 }
 
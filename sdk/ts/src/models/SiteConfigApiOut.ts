@@ -62,6 +62,18 @@ export interface SiteConfigApiOut {
      * @memberof SiteConfigApiOut
      */
     requiredCookies?: any | null;
+    /**
+     * 
+     * @type {any}
+     * @memberof SiteConfigApiOut
+     */
+    paywallIndicators?: any | null;
+    /**
+     * 
+     * @type {any}
+     * @memberof SiteConfigApiOut
+     */
+    extractMainContent?: any | null;
     /**
      * 
      * @type {any}
@@ -112,6 +124,8 @@ export function SiteConfigApiOutFromJSONTyped(json: any, ignoreDiscriminator: bo
         'successTextClass': !exists(json, 'success_text_class') ? undefined : json['success_text_class'],
         'expectedSuccessText': !exists(json, 'expected_success_text') ? undefined : json['expected_success_text'],
         'requiredCookies': !exists(json, 'required_cookies') ? undefined : json['required_cookies'],
+        'paywallIndicators': !exists(json, 'paywall_indicators') ? undefined : json['paywall_indicators'],
+        'extractMainContent': !exists(json, 'extract_main_content') ? undefined : json['extract_main_content'],
         'id': json['id'],
         'loginType': !exists(json, 'login_type') ? undefined : json['login_type'],
         'apiConfig': ApiConfigFromJSON(json['api_config']),
@@ -133,6 +147,8 @@ export function SiteConfigApiOutToJSON(value?: SiteConfigApiOut | null): any {
         'success_text_class': value.successTextClass,
         'expected_success_text': value.expectedSuccessText,
         'required_cookies': value.requiredCookies,
+        'paywall_indicators': value.paywallIndicators,
+        'extract_main_content': value.extractMainContent,
         'id': value.id,
         'login_type': value.loginType,
         'api_config': ApiConfigToJSON(value.apiConfig),
@@ -62,6 +62,18 @@ export interface SiteConfigSelenium {
      * @memberof SiteConfigSelenium
      */
     requiredCookies?: any | null;
+    /**
+     * 
+     * @type {any}
+     * @memberof SiteConfigSelenium
+     */
+    paywallIndicators?: any | null;
+    /**
+     * 
+     * @type {any}
+     * @memberof SiteConfigSelenium
+     */
+    extractMainContent?: any | null;
     /**
      * 
      * @type {any}
@@ -110,6 +122,8 @@ export function SiteConfigSeleniumFromJSONTyped(json: any, ignoreDiscriminator:
         'successTextClass': !exists(json, 'success_text_class') ? undefined : json['success_text_class'],
         'expectedSuccessText': !exists(json, 'expected_success_text') ? undefined : json['expected_success_text'],
         'requiredCookies': !exists(json, 'required_cookies') ? undefined : json['required_cookies'],
+        'paywallIndicators': !exists(json, 'paywall_indicators') ? undefined : json['paywall_indicators'],
+        'extractMainContent': !exists(json, 'extract_main_content') ? undefined : json['extract_main_content'],
         'id': !exists(json, 'id') ? undefined : json['id'],
         'loginType': !exists(json, 'login_type') ? undefined : json['login_type'],
         'seleniumConfig': SeleniumConfigFromJSON(json['selenium_config']),
@@ -131,6 +145,8 @@ export function SiteConfigSeleniumToJSON(value?: SiteConfigSelenium | null): any
         'success_text_class': value.successTextClass,
         'expected_success_text': value.expectedSuccessText,
         'required_cookies': value.requiredCookies,
+        'paywall_indicators': value.paywallIndicators,
+        'extract_main_content': value.extractMainContent,
         'id': value.id,
         'login_type': value.loginType,
         'selenium_config': SeleniumConfigToJSON(value.seleniumConfig),
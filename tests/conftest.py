@@ -3,6 +3,32 @@ from __future__ import annotations
 import sys
 from pathlib import Path
 
+import pytest
+
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
+
+
+@pytest.fixture(autouse=True)
+def _clear_shared_feed_cache():
+    # Feed fetches are shared process-wide; keep tests from seeing each other's.
+    from app.services.feed_fetch_cache import get_shared_feed_cache
+
+    get_shared_feed_cache().clear()
+    yield
+    get_shared_feed_cache().clear()
+
+
+@pytest.fixture(autouse=True)
+def _clear_credential_cache():
+    # Decrypted credentials and stored cookies are cached per process and keyed
+    # by id; databases are recreated per test, so entries must not outlive one.
+    from app.jobs.util_subpaperflux import invalidate_cookie_cache
+    from app.security.credential_cache import clear_credential_cache
+
+    clear_credential_cache()
+    invalidate_cookie_cache()
+    yield
+    clear_credential_cache()
+    invalidate_cookie_cache()
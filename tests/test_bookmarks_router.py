@@ -441,7 +441,7 @@ def test_bulk_publish_stream_success(monkeypatch):
     assert any(event["id"] == "two" and event["status"] == "pending" for event in item_events)
     assert any(event["id"] == "two" and event["status"] == "success" for event in item_events)
     assert raw_events[-1]["success"] == 2 and raw_events[-1]["failed"] == 0
-    assert published_urls == ["https://example.com/one", "https://example.com/two"]
+    assert sorted(published_urls) == ["https://example.com/one", "https://example.com/two"]
 
 
 def test_bulk_publish_derives_tags_and_folder(monkeypatch):
@@ -577,7 +577,74 @@ def test_bulk_publish_stream_failure(monkeypatch):
     complete = events[-1]
     assert complete["type"] == "complete"
     assert complete["success"] == 1 and complete["failed"] == 1
-    assert processed == ["https://example.com/one", "https://example.com/two"]
+    assert sorted(processed) == ["https://example.com/one", "https://example.com/two"]
+
+
+def test_bulk_publish_runs_items_concurrently_and_streams_completions(monkeypatch):
+    import threading
+
+    from app.content_store import store_article_html
+    from app.db import get_session
+    from app.models import Bookmark
+    from app.routers import bookmarks as bookmarks_router
+
+    app, cred_id = _create_app_with_credential()
+    with next(get_session()) as session:
+        stored = Bookmark(
+            owner_user_id="u1",
+            url="https://example.com/stored",
+            title="Stored",
+            content_hash=store_article_html(session, "<p>Stored body</p>"),
+        )
+        foreign = Bookmark(owner_user_id="u2", url="https://example.com/foreign")
+        session.add(stored)
+        session.add(foreign)
+        session.commit()
+        stored_id, foreign_id = stored.id, foreign.id
+
+    slow_released = threading.Event()
+    calls: dict[str, dict] = {}
+
+    def fake_publish(instapaper_id: str, url: str, **kwargs):
+        calls[url] = kwargs
+        if url.endswith("/slow"):
+            assert slow_released.wait(timeout=5)
+            time.sleep(0.1)
+        else:
+            slow_released.set()
+        return {"bookmark_id": url.rsplit("/", 1)[-1]}
+
+    monkeypatch.setattr(bookmarks_router, "publish_url", fake_publish)
+
+    client = TestClient(app)
+    body = {
+        "instapaper_cred_id": cred_id,
+        "concurrency": 2,
+        "items": [
+            {"id": "slow", "url": "https://example.com/slow"},
+            {"id": "stored", "bookmark_id": stored_id},
+            {"id": "foreign", "bookmark_id": foreign_id},
+        ],
+    }
+    with client.stream("POST", "/v1/bookmarks/bulk-publish", json=body) as response:
+        events = [
+            json.loads(chunk if isinstance(chunk, str) else chunk.decode())
+            for chunk in response.iter_lines()
+            if chunk
+        ]
+
+    outcomes = [
+        (event["id"], event["status"])
+        for event in events
+        if event["type"] == "item" and event["status"] != "pending"
+    ]
+    assert outcomes.index(("stored", "success")) < outcomes.index(("slow", "success"))
+    assert ("foreign", "failure") in outcomes
+    assert events[-1] == {"type": "complete", "success": 2, "failed": 1}
+    stored_kwargs = calls["https://example.com/stored"]
+    assert stored_kwargs["title"] == "Stored"
+    assert stored_kwargs["raw_html_content"] == "<p>Stored body</p>"
+    assert stored_kwargs["sanitizer"] is not None
 
 
 def test_bulk_publish_stream_cancellation(monkeypatch):
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import configparser
+from datetime import datetime, timezone
+
+import pytest
+
+from app.services import subpaperflux_rss
+from app.services.content_extraction import extract_main_content
+
+PARAGRAPH = "<p>The committee met on Tuesday, and after a long debate, agreed on the plan.</p>"
+
+PAGE = (
+    '<!DOCTYPE html><html lang="en"><head><title>Site | Big Story</title>'
+    '<meta property="og:title" content="Big Story">'
+    '<meta name="description" content="What happened">'
+    '<link rel="canonical" href="https://example.com/big-story">'
+    "<script>window.tracker = {};</script><style>body{}</style></head><body>"
+    '<header><nav><a href="/">Home</a><a href="/world">World</a></nav></header>'
+    '<div class="layout"><div class="story-body"><h1>Big Story</h1>'
+    + PARAGRAPH * 8
+    + '<div class="share-tools">Share this</div></div>'
+    '<aside class="sidebar"><ul><li>Most read</li></ul></aside></div>'
+    '<div id="comments"><p>First! This comment is long enough to be a paragraph.</p></div>'
+    "<footer>Copyright Example</footer></body></html>"
+)
+
+
+def test_extracts_article_body_and_metadata():
+    extracted = extract_main_content(PAGE)
+
+    assert extracted is not None and len(extracted) < len(PAGE)
+    assert "<title>Big Story</title>" in extracted
+    assert 'content="What happened"' in extracted
+    assert 'href="https://example.com/big-story"' in extracted
+    assert extracted.count("agreed on the plan") == 8
+    for chrome in ("World", "Share this", "Most read", "First!", "Copyright", "tracker"):
+        assert chrome not in extracted
+
+
+@pytest.mark.parametrize(
+    "html",
+    [None, "", "<html><body><p>Too short to be an article.</p></body></html>"],
+)
+def test_pages_without_article_are_left_unchanged(html):
+    assert extract_main_content(html) is None
+
+
+def _poll(monkeypatch, site_config, feed_override=None):
+    class FakeFeedResponse:
+        status_code = 200
+        headers = {}
+        text = "<rss></rss>"
+
+        def raise_for_status(self):
+            return None
+
+    class FakeEntry:
+        title = "Big Story"
+        link = "https://example.com/big-story"
+        summary = ""
+        tags = []
+        enclosures = []
+        published_parsed = datetime(2024, 1, 2, tzinfo=timezone.utc).timetuple()
+
+    class FakeFeed:
+        feed = type("FeedMeta", (), {"title": "Example", "link": "", "language": "en"})()
+        entries = [FakeEntry()]
+
+    monkeypatch.setattr(
+        "app.services.subpaperflux_rss.requests.get",
+        lambda url, headers=None, timeout=30: FakeFeedResponse(),
+    )
+    monkeypatch.setattr("app.services.subpaperflux_rss.feedparser.parse", lambda _: FakeFeed())
+    monkeypatch.setattr(
+        "app.services.subpaperflux_rss.get_article_html_with_cookies",
+        lambda url, cookies, header_overrides=None: PAGE,
+    )
+
+    config = configparser.ConfigParser()
+    config.add_section("RSS_FEED_CONFIG")
+    config.set("RSS_FEED_CONFIG", "is_paywalled", "true")
+    if feed_override is not None:
+        config.set("RSS_FEED_CONFIG", "extract_main_content", feed_override)
+    cutoff = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    entries = subpaperflux_rss.get_new_rss_entries(
+        config_file="/tmp/config.ini",
+        feed_url="https://example.com/rss.xml",
+        instapaper_config={},
+        app_creds={},
+        rss_feed_config=config["RSS_FEED_CONFIG"],
+        instapaper_ini_config={},
+        cookies=[{"name": "sessionid", "value": "abc", "domain": "example.com"}],
+        state={"last_rss_timestamp": cutoff, "bookmarks": {}},
+        site_config=site_config,
+    )
+    assert len(entries) == 1
+    return entries[0]["raw_html_content"]
+
+
+def test_ingest_extracts_when_site_config_enables_it(monkeypatch):
+    assert _poll(monkeypatch, {"extract_main_content": True}) == extract_main_content(PAGE)
+    assert _poll(monkeypatch, {}) == PAGE
+
+
+def test_feed_setting_overrides_site_config(monkeypatch):
+    assert _poll(monkeypatch, {"extract_main_content": True}, feed_override="false") == PAGE
+    assert _poll(monkeypatch, {}, feed_override="true") == extract_main_content(PAGE)
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import base64
+import os
+
+import pytest
+from sqlmodel import select
+
+from app.models import ArticleContent, Bookmark
+
+
+@pytest.fixture(autouse=True)
+def _env(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "sqlite://")
+    monkeypatch.setenv("SQLMODEL_CREATE_ALL", "1")
+    monkeypatch.setenv(
+        "CREDENTIALS_ENC_KEY",
+        base64.urlsafe_b64encode(os.urandom(32)).decode(),
+    )
+    from app import db as dbmod
+
+    dbmod._engine = None
+    dbmod._engine_url = None
+    yield
+
+
+def test_identical_articles_are_stored_once_and_compressed():
+    from app.content_store import load_article_html_many, set_bookmark_html
+    from app.db import get_session, init_db
+
+    init_db()
+    html = "<html><body>" + "<p>Shared paragraph.</p>" * 200 + "</body></html>"
+
+    with next(get_session()) as session:
+        bookmarks = [Bookmark(owner_user_id=f"user-{index}") for index in range(3)]
+        for bookmark in bookmarks:
+            assert set_bookmark_html(session, bookmark, html) is True
+            session.add(bookmark)
+        session.commit()
+
+        records = session.exec(select(ArticleContent)).all()
+        assert len(records) == 1
+        assert records[0].original_size == len(html)
+        assert records[0].stored_size < records[0].original_size // 4
+        assert {bookmark.content_hash for bookmark in bookmarks} == {records[0].content_hash}
+        assert all(bookmark.raw_html_content is None for bookmark in bookmarks)
+        assert set_bookmark_html(session, bookmarks[0], html) is False
+        assert load_article_html_many(session, [records[0].content_hash]) == {
+            records[0].content_hash: html
+        }
+
+
+def test_get_bookmark_html_falls_back_to_legacy_inline_content(monkeypatch):
+    from app.content_store import get_bookmark_html, store_article_html
+    from app.db import get_session, init_db
+
+    monkeypatch.setenv("ARTICLE_CONTENT_COMPRESSION", "none")
+    init_db()
+
+    with next(get_session()) as session:
+        legacy = Bookmark(owner_user_id="u1", raw_html_content="<p>inline</p>")
+        stored = Bookmark(
+            owner_user_id="u1",
+            content_hash=store_article_html(session, "<p>stored</p>"),
+        )
+        session.add_all([legacy, stored])
+        session.commit()
+
+        assert get_bookmark_html(session, legacy) == "<p>inline</p>"
+        assert get_bookmark_html(session, stored) == "<p>stored</p>"
+        assert session.get(ArticleContent, stored.content_hash).compression == "none"
+
+
+def test_sanitized_variants_are_built_once_per_rules_version(monkeypatch):
+    from app import content_store
+    from app.db import get_session, init_db
+    from app.models import ArticleContentVariant
+
+    init_db()
+    calls = []
+    original = content_store.sanitize_html_content
+
+    def counting(html, criteria):
+        calls.append(list(criteria))
+        return original(html, criteria)
+
+    monkeypatch.setattr(content_store, "sanitize_html_content", counting)
+    html = '<html><body><p>Text</p><img src="a.png"><aside>Ad</aside></body></html>'
+
+    with next(get_session()) as session:
+        bookmark = Bookmark(owner_user_id="u1")
+        content_store.set_bookmark_html(session, bookmark, html)
+        content_store.precompute_article_variants(session, bookmark.content_hash)
+        session.add(bookmark)
+        session.commit()
+        assert calls == [["img"]]
+
+        sanitizer = content_store.bookmark_publish_sanitizer(session, bookmark)
+        published = sanitizer(html, ["img"])
+        assert "<img" not in published and "Ad" in published
+        assert calls == [["img"]]
+
+        narrowed = sanitizer(html, ["aside"])
+        assert "<img" in narrowed and "Ad" not in narrowed
+        assert calls == [["img"], ["aside"]]
+        session.commit()
+
+        preview = content_store.get_bookmark_preview_html(session, bookmark)
+        assert preview.startswith("<p>Text</p>")
+        variants = session.exec(select(ArticleContentVariant)).all()
+        assert sorted(v.variant for v in variants) == ["preview", "publish", "publish"]
+
+
+def test_unreferenced_content_and_variants_are_purged():
+    from app import content_store
+    from app.db import get_session, init_db
+    from app.models import ArticleContentVariant
+
+    init_db()
+    shared_html = "<html><body><p>Shared</p><img src='a.png'></body></html>"
+    own_html = "<html><body><p>Own</p><img src='b.png'></body></html>"
+
+    with next(get_session()) as session:
+        first, second, own = (Bookmark(owner_user_id="u1") for _ in range(3))
+        for bookmark, html in ((first, shared_html), (second, shared_html), (own, own_html)):
+            content_store.set_bookmark_html(session, bookmark, html)
+            content_store.precompute_article_variants(session, bookmark.content_hash)
+            session.add(bookmark)
+        session.commit()
+        shared_hash, own_hash = first.content_hash, own.content_hash
+        assert len(session.exec(select(ArticleContent)).all()) == 6
+
+        # Content still used by another bookmark is kept.
+        session.delete(first)
+        assert content_store.purge_unreferenced_article_content(session, [shared_hash]) == 0
+        session.commit()
+
+        session.delete(own)
+        assert content_store.purge_unreferenced_article_content(session, [own_hash]) == 3
+        session.commit()
+        assert session.get(ArticleContent, own_hash) is None
+        assert session.get(ArticleContent, shared_hash) is not None
+        variants = session.exec(select(ArticleContentVariant)).all()
+        assert {variant.source_hash for variant in variants} == {shared_hash}
+
+        # Replacing a bookmark's content releases the previous article.
+        content_store.set_bookmark_html(session, second, own_html)
+        session.commit()
+        assert session.get(ArticleContent, shared_hash) is None
+        assert session.exec(select(ArticleContentVariant)).all() == []
+        assert {record.content_hash for record in session.exec(select(ArticleContent))} == {
+            second.content_hash
+        }
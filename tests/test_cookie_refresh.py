@@ -0,0 +1,140 @@
+import base64
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _env(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "sqlite://")
+    monkeypatch.setenv("SQLMODEL_CREATE_ALL", "1")
+    monkeypatch.setenv("CREDENTIALS_ENC_KEY", base64.urlsafe_b64encode(os.urandom(32)).decode())
+    monkeypatch.delenv("COOKIE_REFRESH_OFF_PEAK_HOURS", raising=False)
+    from app import db as dbmod
+
+    dbmod._engine = None
+    dbmod._engine_url = None
+    yield
+
+
+NOW = datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _cookie(name, expires_in, **extra):
+    from app.models import Cookie
+
+    return Cookie(
+        credential_id=f"cred_{name}",
+        site_config_id=f"sc_{name}",
+        owner_user_id="alice",
+        encrypted_cookies="{}",
+        expiry_hint=(NOW + expires_in).timestamp(),
+        **extra,
+    )
+
+
+def test_enqueues_logins_for_cookies_expiring_within_horizon():
+    from sqlmodel import select
+
+    from app.db import get_session, init_db
+    from app.jobs.cookie_refresh import enqueue_cookie_refresh_logins
+    from app.models import Job
+
+    init_db()
+    with next(get_session()) as session:
+        session.add_all(
+            [
+                _cookie("soon", timedelta(hours=2)),
+                _cookie("expired", -timedelta(hours=1)),
+                _cookie("later", timedelta(days=3)),
+                _cookie(
+                    "fresh",
+                    timedelta(minutes=30),
+                    last_refresh=(NOW - timedelta(minutes=10)).isoformat(),
+                ),
+                _cookie("pending", timedelta(hours=1)),
+                Job(type="login", payload={"site_login_pair": "cred_pending::sc_pending"}),
+            ]
+        )
+        session.commit()
+
+        jobs = enqueue_cookie_refresh_logins(session, now=NOW)
+        session.commit()
+        assert enqueue_cookie_refresh_logins(session, now=NOW) == []
+
+        by_pair = {job.payload["site_login_pair"]: job for job in jobs}
+        assert set(by_pair) == {"cred_soon::sc_soon", "cred_expired::sc_expired"}
+        assert by_pair["cred_expired::sc_expired"].available_at == NOW.timestamp()
+        soon = by_pair["cred_soon::sc_soon"]
+        assert NOW.timestamp() <= soon.available_at <= (NOW + timedelta(hours=2)).timestamp()
+        assert soon.owner_user_id == "alice"
+        assert soon.details["proactive_refresh"] is True
+        assert len(session.exec(select(Job).where(Job.type == "login")).all()) == 3
+
+
+def test_failed_login_is_not_reenqueued_within_min_interval():
+    from app.db import get_session, init_db
+    from app.jobs.cookie_refresh import enqueue_cookie_refresh_logins
+
+    init_db()
+    with next(get_session()) as session:
+        session.add(_cookie("broken", timedelta(hours=1)))
+        session.commit()
+
+        (job,) = enqueue_cookie_refresh_logins(session, now=NOW)
+        job.status = "failed"
+        job.run_at = NOW
+        session.add(job)
+        session.commit()
+
+        later = NOW + timedelta(minutes=5)
+        assert enqueue_cookie_refresh_logins(session, now=later) == []
+
+        # Once the interval has passed, the pair is tried again.
+        retry = enqueue_cookie_refresh_logins(session, now=NOW + timedelta(hours=2))
+        assert [j.payload["site_login_pair"] for j in retry] == ["cred_broken::sc_broken"]
+
+
+def test_backed_off_pairs_do_not_use_up_the_login_quota(monkeypatch):
+    from app.db import get_session, init_db
+    from app.jobs.cookie_refresh import enqueue_cookie_refresh_logins
+    from app.models import Job
+
+    monkeypatch.setenv("COOKIE_REFRESH_MAX_LOGINS", "2")
+    init_db()
+    with next(get_session()) as session:
+        # The earliest-expiring pairs all failed a login moments ago.
+        for index in range(5):
+            name = f"failing{index}"
+            session.add(_cookie(name, timedelta(minutes=30 + index)))
+            session.add(
+                Job(
+                    type="login",
+                    payload={"site_login_pair": f"cred_{name}::sc_{name}"},
+                    status="failed",
+                    run_at=NOW - timedelta(minutes=5),
+                )
+            )
+        for index in range(3):
+            session.add(_cookie(f"healthy{index}", timedelta(hours=2 + index)))
+        session.commit()
+
+        jobs = enqueue_cookie_refresh_logins(session, now=NOW)
+
+        assert [job.payload["site_login_pair"] for job in jobs] == [
+            "cred_healthy0::sc_healthy0",
+            "cred_healthy1::sc_healthy1",
+        ]
+
+
+def test_refresh_prefers_off_peak_window_before_expiry(monkeypatch):
+    from app.jobs.cookie_refresh import plan_refresh_time
+
+    monkeypatch.setenv("COOKIE_REFRESH_OFF_PEAK_HOURS", "22-4")
+    run_at = plan_refresh_time("cred::sc", NOW + timedelta(hours=20), now=NOW)
+    assert NOW.replace(hour=22) <= run_at <= NOW.replace(hour=22) + timedelta(hours=6)
+
+    # No off-peak window before expiry: spread between now and expiry instead.
+    run_at = plan_refresh_time("cred::sc", NOW + timedelta(hours=3), now=NOW)
+    assert NOW <= run_at <= NOW + timedelta(hours=3)
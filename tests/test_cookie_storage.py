@@ -16,8 +16,10 @@ from app.jobs.util_subpaperflux import (
     CookieAuthenticationError,
     format_site_login_pair_id,
     get_cookies_for_site_login_pair,
+    invalidate_cookies_for_site_login_pair,
     perform_login_and_save_cookies,
     poll_rss_and_publish,
+    update_cookies_for_site_login_pair,
 )
 from app.models import Cookie, Credential, Feed, SiteConfig, SiteLoginType
 from app.security.crypto import decrypt_dict, encrypt_dict
@@ -677,6 +679,177 @@ def test_get_cookies_for_site_login_pair_rejects_blank_values(monkeypatch, tmp_p
     assert "session" in message
 
 
+def test_update_cookies_merges_refreshed_values_and_expiry(monkeypatch, tmp_path):
+    _setup_env(monkeypatch, tmp_path)
+    now = datetime.now(timezone.utc)
+    stale_expiry = (now + timedelta(minutes=5)).timestamp()
+    fresh_expiry = (now + timedelta(days=7)).timestamp()
+    stored = [
+        {"name": "session", "value": "old", "domain": "example.com", "expiry": stale_expiry},
+        {"name": "prefs", "value": "dark", "domain": "example.com"},
+    ]
+    with get_session_ctx() as session:
+        session.add(
+            SiteConfig(
+                id="sc_refresh",
+                name="Refresh Site",
+                site_url="https://example.com",
+                owner_user_id="user-1",
+                selenium_config={"cookies_to_store": ["session", "csrf"]},
+            )
+        )
+        session.add(
+            Cookie(
+                credential_id="cred_refresh",
+                site_config_id="sc_refresh",
+                owner_user_id="user-1",
+                encrypted_cookies=json.dumps(encrypt_dict({"cookies": stored})),
+                expiry_hint=stale_expiry,
+            )
+        )
+        session.commit()
+
+    pair_id = format_site_login_pair_id("cred_refresh", "sc_refresh")
+    refreshed = [
+        {"name": "session", "value": "new", "domain": ".example.com", "path": "/", "expiry": fresh_expiry},
+        {"name": "csrf", "value": "t0k", "domain": ".example.com", "path": "/"},
+        {"name": "_tracker", "value": "x", "domain": ".example.com", "expiry": stale_expiry},
+    ]
+
+    assert update_cookies_for_site_login_pair(pair_id, "user-2", refreshed) is False
+
+    from sqlalchemy import event
+    from sqlalchemy.orm import Session as OrmSession
+
+    cookie_selects = []
+
+    def _capture(state):
+        if state.is_select and Cookie.__table__ in state.statement.get_final_froms():
+            cookie_selects.append(state.statement._for_update_arg is not None)
+
+    event.listen(OrmSession, "do_orm_execute", _capture)
+    try:
+        assert update_cookies_for_site_login_pair(pair_id, "user-1", refreshed) is True
+    finally:
+        event.remove(OrmSession, "do_orm_execute", _capture)
+    # The row is read with SELECT ... FOR UPDATE before merging.
+    assert cookie_selects == [True]
+
+    with get_session_ctx() as session:
+        record = session.exec(select(Cookie)).one()
+        cookies = decrypt_dict(json.loads(record.encrypted_cookies))["cookies"]
+        assert record.expiry_hint == pytest.approx(fresh_expiry)
+        assert record.last_refresh is not None
+    by_name = {cookie["name"]: cookie for cookie in cookies}
+    assert [cookie["name"] for cookie in cookies] == ["session", "prefs", "csrf"]
+    assert by_name["session"]["value"] == "new"
+    assert by_name["session"]["domain"] == "example.com"
+    assert by_name["prefs"]["value"] == "dark"
+
+
+def test_stored_cookies_are_cached_until_written(monkeypatch, tmp_path):
+    _setup_env(monkeypatch, tmp_path)
+    expiry = (datetime.now(timezone.utc) + timedelta(days=1)).timestamp()
+    with get_session_ctx() as session:
+        session.add(
+            Credential(
+                id="cred_cached",
+                kind="site_login",
+                description="Cached cookies",
+                data={"username": "alice", "password": "wonder"},
+                owner_user_id="user-1",
+                site_config_id="sc_cached",
+            )
+        )
+        session.add(
+            Cookie(
+                credential_id="cred_cached",
+                site_config_id="sc_cached",
+                owner_user_id="user-1",
+                encrypted_cookies=json.dumps(
+                    encrypt_dict({"cookies": [{"name": "session", "value": "one", "expiry": expiry}]})
+                ),
+            )
+        )
+        session.commit()
+    pair_id = format_site_login_pair_id("cred_cached", "sc_cached")
+
+    def _values():
+        return [cookie["value"] for cookie in get_cookies_for_site_login_pair(pair_id, "user-1")]
+
+    assert _values() == ["one"]
+    with get_session_ctx() as session:
+        record = session.exec(select(Cookie)).one()
+        record.encrypted_cookies = json.dumps(
+            encrypt_dict({"cookies": [{"name": "session", "value": "external", "expiry": expiry}]})
+        )
+        session.add(record)
+        session.commit()
+    assert _values() == ["one"]
+
+    # Another process logging in bumps last_refresh, which a cache hit checks.
+    with get_session_ctx() as session:
+        record = session.exec(select(Cookie)).one()
+        record.last_refresh = datetime.now(timezone.utc).isoformat()
+        session.add(record)
+        session.commit()
+    assert _values() == ["external"]
+
+    update_cookies_for_site_login_pair(pair_id, "user-1", [{"name": "session", "value": "two"}])
+    assert _values() == ["two"]
+
+    with get_session_ctx() as session:
+        session.delete(session.exec(select(Cookie)).one())
+        session.commit()
+    assert _values() == []
+
+
+def test_invalidation_keeps_cookies_refreshed_after_they_were_loaded(monkeypatch, tmp_path):
+    _setup_env(monkeypatch, tmp_path)
+    loaded_at = datetime.now(timezone.utc) - timedelta(minutes=5)
+    with get_session_ctx() as session:
+        session.add(
+            Credential(
+                id="cred_stale",
+                kind="site_login",
+                description="Stale cookies",
+                data={"username": "alice", "password": "wonder"},
+                owner_user_id="user-1",
+                site_config_id="sc_stale",
+            )
+        )
+        session.add(
+            Cookie(
+                credential_id="cred_stale",
+                site_config_id="sc_stale",
+                owner_user_id="user-1",
+                encrypted_cookies=json.dumps(
+                    encrypt_dict({"cookies": [{"name": "session", "value": "new"}]})
+                ),
+                last_refresh=datetime.now(timezone.utc).isoformat(),
+            )
+        )
+        session.commit()
+    pair_id = format_site_login_pair_id("cred_stale", "sc_stale")
+
+    assert (
+        invalidate_cookies_for_site_login_pair(
+            pair_id, "user-1", loaded_version=loaded_at.isoformat()
+        )
+        is False
+    )
+    with get_session_ctx() as session:
+        record = session.exec(select(Cookie)).one()
+        current = record.last_refresh
+
+    assert (
+        invalidate_cookies_for_site_login_pair(pair_id, "user-1", loaded_version=current)
+        is True
+    )
+    with get_session_ctx() as session:
+        assert session.exec(select(Cookie)).first() is None
+
+
 def test_poll_rss_invalidates_cookies_on_paywall(monkeypatch, tmp_path):
     _setup_env(monkeypatch, tmp_path)
 
@@ -775,7 +948,7 @@ def test_poll_rss_invalidates_cookies_on_paywall(monkeypatch, tmp_path):
 
     fetch_calls = []
 
-    def fake_fetch(url, cookies, header_overrides=None):
+    def fake_fetch(url, cookies, header_overrides=None, cookie_sink=None):
         fetch_calls.append((url, cookies))
         raise subpaperflux_rss.PaywalledContentError(url, indicator="simulated")
 
@@ -0,0 +1,130 @@
+import base64
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture(autouse=True)
+def _env(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "sqlite://")
+    monkeypatch.setenv(
+        "CREDENTIALS_ENC_KEY", base64.urlsafe_b64encode(os.urandom(32)).decode()
+    )
+    monkeypatch.setenv("SQLMODEL_CREATE_ALL", "1")
+    monkeypatch.setenv("USER_MGMT_CORE", "1")
+    from app.config import is_user_mgmt_core_enabled
+
+    is_user_mgmt_core_enabled.cache_clear()
+
+
+@pytest.fixture()
+def client():
+    from app.auth import ADMIN_ROLE_NAME, ensure_admin_role, grant_role
+    from app.auth.oidc import get_current_user
+    from app.db import get_session, init_db
+    from app.main import create_app
+    from app.models import User
+
+    init_db()
+    identity = {"sub": "u1", "groups": ["admin"], "email": "admin@example.com"}
+
+    app = create_app()
+    app.dependency_overrides[get_current_user] = lambda: identity
+    client = TestClient(app)
+    with next(get_session()) as session:
+        ensure_admin_role(session)
+        session.add(User(id="u1", email=identity["email"], full_name="Admin User"))
+        session.commit()
+        grant_role(session, "u1", ADMIN_ROLE_NAME, granted_by_user_id="u1")
+        session.commit()
+    return client
+
+
+def _cache_requests(result: str) -> float:
+    from app.observability.metrics import CREDENTIAL_CACHE_COUNTER
+
+    return CREDENTIAL_CACHE_COUNTER.labels(result=result)._value.get()
+
+
+def _payload(data, cred_id=None):
+    payload = {
+        "kind": "miniflux",
+        "description": "Reader",
+        "data": data,
+        "owner_user_id": "u1",
+    }
+    if cred_id:
+        payload["id"] = cred_id
+    return payload
+
+
+def test_lookups_are_cached_until_the_routers_write(client):
+    from app.jobs.util_subpaperflux import _get_db_credential, _get_db_credential_by_kind
+
+    assert _get_db_credential_by_kind("miniflux", "u1") is None
+
+    created = client.post("/v1/credentials", json=_payload({"api_key": "one"}))
+    assert created.status_code == 201
+    cred_id = created.json()["id"]
+    assert _get_db_credential_by_kind("miniflux", "u1") == {"api_key": "one"}
+
+    hits, misses = _cache_requests("hit"), _cache_requests("miss")
+    first = _get_db_credential(cred_id, "u1")
+    first["api_key"] = "mutated"
+    assert _get_db_credential(cred_id, "u1") == {"api_key": "one"}
+    assert _get_db_credential(cred_id, "someone-else") is None
+    assert _get_db_credential(cred_id, "u1") == {"api_key": "one"}
+    assert _cache_requests("miss") == misses + 2
+    assert _cache_requests("hit") == hits + 2
+
+    updated = client.put(
+        f"/v1/credentials/{cred_id}", json=_payload({"api_key": "two"}, cred_id)
+    )
+    assert updated.status_code == 200
+    assert _get_db_credential(cred_id, "u1") == {"api_key": "two"}
+    assert _get_db_credential_by_kind("miniflux", "u1") == {"api_key": "two"}
+
+    assert client.delete(f"/v1/credentials/{cred_id}").status_code == 204
+    assert _get_db_credential(cred_id, "u1") is None
+    assert _get_db_credential_by_kind("miniflux", "u1") is None
+
+
+def test_hidden_credential_is_not_cached_for_its_owner(client):
+    from app.jobs.util_subpaperflux import _get_db_credential
+    from app.security.credential_cache import get_credential_by_id
+
+    cred_id = client.post("/v1/credentials", json=_payload({"api_key": "one"})).json()["id"]
+
+    # A lookup that cannot see the row (e.g. another user's RLS context)
+    # is neither cached nor shared with the owner's lookups.
+    assert get_credential_by_id(cred_id, "intruder", lambda: None) is None
+    misses = _cache_requests("miss")
+    assert get_credential_by_id(cred_id, "intruder", lambda: None) is None
+    assert _cache_requests("miss") == misses + 1
+    assert _get_db_credential(cred_id, "u1") == {"api_key": "one"}
+
+
+def test_zero_ttl_disables_the_cache(client, monkeypatch):
+    from app.jobs.util_subpaperflux import _get_db_credential
+
+    monkeypatch.setenv("CREDENTIAL_CACHE_TTL", "0")
+    cred_id = client.post("/v1/credentials", json=_payload({"api_key": "one"})).json()["id"]
+    hits = _cache_requests("hit")
+    assert _get_db_credential(cred_id, "u1") == {"api_key": "one"}
+    assert _get_db_credential(cred_id, "u1") == {"api_key": "one"}
+    assert _cache_requests("hit") == hits
+
+
+def test_cipher_is_reused_until_the_key_changes(monkeypatch):
+    from app.security import crypto
+
+    encrypted = crypto.encrypt_dict({"secret": 1})
+    cipher = crypto._get_cipher()
+    assert crypto._get_cipher() is cipher
+    assert crypto.decrypt_dict(encrypted) == {"secret": 1}
+
+    monkeypatch.setenv(
+        "CREDENTIALS_ENC_KEY", base64.urlsafe_b64encode(os.urandom(32)).decode()
+    )
+    assert crypto._get_cipher() is not cipher
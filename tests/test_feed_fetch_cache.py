@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import configparser
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+import requests
+
+from app.services import subpaperflux_rss
+from app.services.feed_fetch_cache import (
+    SharedFeedFetchCache,
+    get_shared_feed_cache,
+    normalize_feed_url,
+)
+
+
+NOW = datetime.now(timezone.utc)
+
+
+def _document():
+    items = "".join(
+        "<item>"
+        f"<title>Story {index}</title>"
+        f"<link>https://example.com/{index}</link>"
+        f"<pubDate>{format_datetime(NOW - timedelta(hours=index))}</pubDate>"
+        "</item>"
+        for index in range(4)
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+        f"<title>Example</title>{items}</channel></rss>"
+    )
+
+
+def _feed_config(**values):
+    parser = configparser.ConfigParser()
+    defaults = {"rss_requires_auth": "false", "is_paywalled": "false"}
+    defaults.update(values)
+    parser.read_dict({"rss": defaults})
+    return parser["rss"]
+
+
+def _poll(url, *, hours_ago, cookies=(), fetch_hints=None, **config):
+    state = {"last_rss_timestamp": NOW - timedelta(hours=hours_ago, minutes=30)}
+    if fetch_hints:
+        state["fetch_hints"] = fetch_hints
+    entries = subpaperflux_rss.get_new_rss_entries(
+        config_file="adhoc.ini",
+        feed_url=url,
+        instapaper_config={},
+        app_creds={},
+        rss_feed_config=_feed_config(**config),
+        instapaper_ini_config={},
+        cookies=list(cookies),
+        state=state,
+        site_config=None,
+    )
+    return entries, state
+
+
+@pytest.fixture
+def fake_get(monkeypatch):
+    calls = []
+
+    def _get(url, headers=None, timeout=30):
+        calls.append(url)
+        response = requests.Response()
+        response.status_code = 200
+        response._content = _document().encode()
+        response.headers["ETag"] = '"v1"'
+        return response
+
+    monkeypatch.setattr("app.services.subpaperflux_rss.requests.get", _get)
+    return calls
+
+
+def test_normalize_feed_url_canonicalises_host_port_and_fragment():
+    assert normalize_feed_url("HTTPS://Example.COM:443/feed?b=1#top") == (
+        "https://example.com/feed?b=1"
+    )
+    assert normalize_feed_url("http://example.com") == "http://example.com/"
+    assert normalize_feed_url("http://example.com:8080/x") == "http://example.com:8080/x"
+
+
+def test_public_feed_is_fetched_once_for_all_subscribers(fake_get):
+    first, _ = _poll("https://example.com/feed", hours_ago=1)
+    second, _ = _poll("https://EXAMPLE.com/feed#latest", hours_ago=3)
+
+    assert fake_get == ["https://example.com/feed"]
+    assert [entry["url"] for entry in first] == [
+        "https://example.com/0",
+        "https://example.com/1",
+    ]
+    assert [entry["url"] for entry in second] == [
+        f"https://example.com/{index}" for index in range(4)
+    ]
+    assert get_shared_feed_cache().hits == 1
+
+
+def test_shared_response_counts_as_not_modified_for_matching_validators(fake_get):
+    _poll("https://example.com/feed", hours_ago=1)
+    entries, state = _poll(
+        "https://example.com/feed", hours_ago=3, fetch_hints={"etag": '"v1"'}
+    )
+
+    assert entries == []
+    assert state["fetch_hints"]["etag"] == '"v1"'
+    assert len(fake_get) == 1
+
+
+def test_shared_cache_can_be_disabled(fake_get, monkeypatch):
+    monkeypatch.setenv("RSS_SHARED_FETCH_TTL", "0")
+
+    _poll("https://example.com/feed", hours_ago=1)
+    _poll("https://example.com/feed", hours_ago=1)
+
+    assert len(fake_get) == 2
+
+
+def test_failed_fetch_releases_its_inflight_lock():
+    cache = SharedFeedFetchCache()
+
+    def _failing(validators):
+        response = requests.Response()
+        response.status_code = 503
+        response.url = "https://example.com/feed.xml"
+        return response
+
+    with pytest.raises(requests.HTTPError):
+        cache.fetch("https://example.com/feed.xml", fetcher=_failing, ttl=60)
+    def _raising(validators):
+        raise requests.ConnectionError("boom")
+
+    with pytest.raises(requests.ConnectionError):
+        cache.fetch("https://example.com/other.xml", fetcher=_raising, ttl=60)
+    assert cache._inflight == {}
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import configparser
+from datetime import datetime, timedelta, timezone
+
+import requests
+
+from app.services import feed_fetch_hints, subpaperflux_rss
+
+
+FETCHED = datetime(2024, 1, 1, 10, 30, tzinfo=timezone.utc)  # a Monday
+
+CHANNEL = (
+    '<?xml version="1.0"?><rss version="2.0"><channel><title>Example</title>'
+    "<ttl>90</ttl>"
+    "<skipHours><hour>0</hour><hour>1</hour><hour>2</hour></skipHours>"
+    "<skipDays><day>Sunday</day></skipDays>"
+    "<item><title>Story</title><ttl>5</ttl></item>"
+    "</channel></rss>"
+)
+
+
+def test_build_fetch_hints_reads_headers_and_channel_elements():
+    hints = feed_fetch_hints.build_fetch_hints(
+        {
+            "cache-control": "public, max-age=600",
+            "Age": "100",
+            "ETag": '"abc"',
+            "Last-Modified": "Mon, 01 Jan 2024 09:00:00 GMT",
+        },
+        CHANNEL,
+        fetched_at=FETCHED,
+    )
+
+    assert hints["expires_at"] == (FETCHED + timedelta(seconds=500)).isoformat()
+    assert hints["ttl_minutes"] == 90
+    assert hints["skip_hours"] == [0, 1, 2]
+    assert hints["skip_days"] == ["sunday"]
+    assert feed_fetch_hints.conditional_request_headers(hints) == {
+        "If-None-Match": '"abc"',
+        "If-Modified-Since": "Mon, 01 Jan 2024 09:00:00 GMT",
+    }
+
+
+def test_expires_header_is_measured_against_server_date_and_no_cache_wins():
+    hints = feed_fetch_hints.build_fetch_hints(
+        {
+            "Date": "Mon, 01 Jan 2024 08:00:00 GMT",
+            "Expires": "Mon, 01 Jan 2024 08:15:00 GMT",
+        },
+        "",
+        fetched_at=FETCHED,
+    )
+    assert hints["expires_at"] == (FETCHED + timedelta(minutes=15)).isoformat()
+
+    uncached = feed_fetch_hints.build_fetch_hints(
+        {"Cache-Control": "no-cache, max-age=600"}, "", fetched_at=FETCHED
+    )
+    assert "expires_at" not in uncached
+
+
+def test_next_useful_fetch_reports_reason_and_resume_time():
+    hints = feed_fetch_hints.build_fetch_hints(
+        {"Cache-Control": "max-age=3600"}, CHANNEL, fetched_at=FETCHED
+    )
+
+    assert feed_fetch_hints.next_useful_fetch(hints, now=FETCHED + timedelta(minutes=30)) == (
+        FETCHED + timedelta(minutes=90),
+        "rss_ttl",
+    )
+    # Cache lifetimes are capped, RSS skipHours/skipDays are not.
+    assert feed_fetch_hints.next_useful_fetch(
+        hints, now=FETCHED + timedelta(minutes=30), max_delay=timedelta(minutes=45)
+    ) == (FETCHED + timedelta(minutes=45), "rss_ttl")
+    assert feed_fetch_hints.next_useful_fetch(hints, now=FETCHED + timedelta(hours=2)) is None
+
+    saturday_late = datetime(2024, 1, 6, 23, 10, tzinfo=timezone.utc)
+    assert feed_fetch_hints.next_useful_fetch(hints, now=saturday_late + timedelta(hours=1)) == (
+        datetime(2024, 1, 8, 3, 0, tzinfo=timezone.utc),
+        "rss_skip_days",
+    )
+
+
+def test_get_new_rss_entries_sends_validators_and_handles_not_modified(monkeypatch):
+    seen_headers = []
+
+    def fake_get(url, headers=None, timeout=30):
+        seen_headers.append(headers)
+        response = requests.Response()
+        response.status_code = 304
+        response._content = b""
+        response.headers["Cache-Control"] = "max-age=120"
+        return response
+
+    def fail_parse(*_args, **_kwargs):
+        raise AssertionError("feed should not be parsed for 304 responses")
+
+    monkeypatch.setattr("app.services.subpaperflux_rss.requests.get", fake_get)
+    monkeypatch.setattr("app.services.subpaperflux_rss.parse_feed_since", fail_parse)
+
+    parser = configparser.ConfigParser()
+    parser.read_dict({"rss": {"rss_requires_auth": "false", "is_paywalled": "false"}})
+    state = {
+        "last_rss_timestamp": FETCHED,
+        "fetch_hints": {"etag": '"abc"', "ttl_minutes": 30},
+    }
+    entries = subpaperflux_rss.get_new_rss_entries(
+        config_file="adhoc.ini",
+        feed_url="https://example.com/feed",
+        instapaper_config={},
+        app_creds={},
+        rss_feed_config=parser["rss"],
+        instapaper_ini_config={},
+        cookies=[],
+        state=state,
+        site_config=None,
+    )
+
+    assert entries == []
+    assert seen_headers == [{"If-None-Match": '"abc"'}]
+    assert state["fetch_hints"]["etag"] == '"abc"'
+    assert state["fetch_hints"]["ttl_minutes"] == 30
+    assert "expires_at" in state["fetch_hints"]
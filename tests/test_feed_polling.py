@@ -0,0 +1,386 @@
+import base64
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _env(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "sqlite://")
+    monkeypatch.setenv("SQLMODEL_CREATE_ALL", "1")
+    monkeypatch.setenv("CREDENTIALS_ENC_KEY", base64.urlsafe_b64encode(os.urandom(32)).decode())
+    monkeypatch.delenv("RSS_ADAPTIVE_POLLING", raising=False)
+    monkeypatch.setenv("RSS_POLL_MIN_INTERVAL", "5m")
+    monkeypatch.setenv("RSS_POLL_MAX_INTERVAL", "1d")
+    yield
+
+
+NOW = datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def test_empty_polls_back_off_up_to_max_interval():
+    from app.jobs.feed_polling import record_poll_observation
+    from app.models import Feed
+
+    feed = Feed(url="https://example.com/feed", poll_frequency="1h")
+    intervals = []
+    for index in range(12):
+        stats = record_poll_observation(
+            feed,
+            new_items=0,
+            entry_times=[],
+            polled_at=NOW + timedelta(days=index),
+        )
+        intervals.append(stats["interval_seconds"])
+
+    assert intervals[0] == 5400
+    assert intervals == sorted(intervals)
+    assert intervals[-1] == 86400
+    assert feed.next_poll_at == NOW + timedelta(days=11, seconds=86400)
+
+
+def test_busy_feed_tightens_interval_towards_publish_cadence():
+    from app.jobs.feed_polling import record_poll_observation
+    from app.models import Feed
+
+    feed = Feed(url="https://example.com/feed", poll_frequency="1h")
+    entry_times = [NOW - timedelta(minutes=10 * offset) for offset in range(6)]
+
+    stats = record_poll_observation(
+        feed, new_items=6, entry_times=entry_times, polled_at=NOW
+    )
+
+    assert stats["interarrival_seconds"] == 600.0
+    assert stats["interval_seconds"] == 600
+    assert stats["last_entry_at"] == NOW.isoformat()
+
+    # A quiet poll backs off, but not past the observed gap between entries.
+    stats = record_poll_observation(
+        feed, new_items=0, entry_times=[], polled_at=NOW + timedelta(minutes=10)
+    )
+    assert stats["interval_seconds"] == 600
+    assert stats["empty_polls"] == 1
+
+
+def test_adaptive_polling_disabled_uses_feed_frequency(monkeypatch):
+    from app.jobs.feed_polling import record_poll_observation, scheduled_poll_skip_details
+    from app.models import Feed
+
+    monkeypatch.setenv("RSS_ADAPTIVE_POLLING", "0")
+    feed = Feed(url="https://example.com/feed", poll_frequency="2h")
+    stats = record_poll_observation(feed, new_items=0, entry_times=[], polled_at=NOW)
+
+    assert stats["interval_seconds"] == 7200
+    assert scheduled_poll_skip_details(feed, now=NOW) is None
+
+
+def test_scheduled_rss_poll_skips_until_feed_is_due(monkeypatch):
+    from app.db import get_session, init_db
+    from app.jobs import rss as rss_module
+    from app.models import Feed, Job, JobSchedule
+
+    init_db()
+
+    future = datetime.now(timezone.utc) + timedelta(hours=3)
+    with next(get_session()) as session:
+        feed = Feed(
+            url="https://example.com/feed",
+            owner_user_id="owner",
+            next_poll_at=future,
+            poll_stats={"interval_seconds": 4 * 3600},
+        )
+        schedule = JobSchedule(
+            schedule_name="rss",
+            job_type="rss_poll",
+            payload={"feed_id": "placeholder"},
+            frequency="1h",
+            owner_user_id="owner",
+        )
+        session.add(feed)
+        session.add(schedule)
+        session.commit()
+        scheduled_job = Job(
+            type="rss_poll",
+            payload={"feed_id": feed.id},
+            owner_user_id="owner",
+            details={"schedule_id": schedule.id},
+        )
+        manual_job = Job(type="rss_poll", payload={"feed_id": feed.id}, owner_user_id="owner")
+        session.add(scheduled_job)
+        session.add(manual_job)
+        session.commit()
+        feed_id, scheduled_job_id, manual_job_id = feed.id, scheduled_job.id, manual_job.id
+
+    calls = []
+
+    def fake_poll(**kwargs):
+        calls.append(kwargs)
+        return {"stored": 0, "duplicates": 0, "total": 0}
+
+    monkeypatch.setattr(rss_module, "poll_rss_and_publish", fake_poll)
+
+    skipped = rss_module.handle_rss_poll(
+        job_id=scheduled_job_id, owner_user_id="owner", payload={"feed_id": feed_id}
+    )
+    assert skipped["skipped"] is True
+    assert skipped["reason"] == "adaptive_interval"
+    assert skipped["feed_id"] == feed_id
+    assert calls == []
+
+    result = rss_module.handle_rss_poll(
+        job_id=manual_job_id, owner_user_id="owner", payload={"feed_id": feed_id}
+    )
+    assert result == {"stored": 0, "duplicates": 0, "total": 0}
+    assert len(calls) == 1
+
+
+def test_pull_schedule_forward_only_moves_earlier():
+    from app.db import get_session, init_db
+    from app.jobs.feed_polling import pull_schedule_forward
+    from app.models import JobSchedule
+
+    init_db()
+
+    with next(get_session()) as session:
+        schedule = JobSchedule(
+            schedule_name="rss",
+            job_type="rss_poll",
+            payload={"feed_id": "feed"},
+            frequency="1h",
+            next_run_at=NOW + timedelta(hours=1),
+            owner_user_id="owner",
+        )
+        session.add(schedule)
+        session.commit()
+
+        assert pull_schedule_forward(session, schedule.id, NOW + timedelta(hours=2)) is False
+        assert pull_schedule_forward(session, schedule.id, NOW + timedelta(minutes=20)) is True
+        session.commit()
+        session.refresh(schedule)
+        assert schedule.next_run_at.replace(tzinfo=timezone.utc) == NOW + timedelta(minutes=20)
+
+
+def test_fetch_hints_take_precedence_over_adaptive_interval(monkeypatch):
+    from app.jobs.feed_polling import scheduled_poll_skip_details
+    from app.models import Feed
+
+    feed = Feed(
+        url="https://example.com/feed",
+        fetch_hints={
+            "fetched_at": NOW.isoformat(),
+            "expires_at": (NOW + timedelta(hours=2)).isoformat(),
+        },
+    )
+
+    skip = scheduled_poll_skip_details(feed, now=NOW + timedelta(minutes=30))
+    assert skip["reason"] == "http_cache"
+    assert skip["next_poll_at"] == (NOW + timedelta(hours=2)).isoformat()
+
+    monkeypatch.setenv("RSS_HONOR_FETCH_HINTS", "0")
+    assert scheduled_poll_skip_details(feed, now=NOW + timedelta(minutes=30)) is None
+
+
+def test_failures_back_off_exponentially_then_suspend(monkeypatch):
+    import requests
+
+    from app.jobs.feed_polling import record_poll_failure, record_poll_success, scheduled_poll_skip_details
+    from app.models import Feed
+
+    monkeypatch.setenv("RSS_FEED_SUSPEND_AFTER", "4")
+    feed = Feed(url="https://example.com/feed", poll_frequency="1h")
+    response = requests.Response()
+    response.status_code = 503
+    error = requests.HTTPError("unavailable", response=response)
+
+    delays = []
+    for _ in range(3):
+        assert record_poll_failure(feed, error, failed_at=NOW) == "http_server"
+        delays.append((feed.next_poll_at - NOW).total_seconds())
+    assert delays == [3600, 7200, 14400]
+    assert feed.health_status == "degraded"
+
+    skip = scheduled_poll_skip_details(feed, now=NOW + timedelta(hours=1))
+    assert skip["reason"] == "failure_backoff"
+    assert skip["consecutive_failures"] == 3
+
+    record_poll_failure(feed, error, failed_at=NOW, count_failure=False)
+    assert feed.consecutive_failures == 3
+    record_poll_failure(feed, error, failed_at=NOW)
+    assert feed.health_status == "suspended"
+    assert scheduled_poll_skip_details(feed, now=NOW + timedelta(days=30))["reason"] == "suspended"
+
+    record_poll_success(feed, polled_at=NOW)
+    assert feed.health_status == "healthy"
+    assert feed.consecutive_failures == 0
+
+
+def test_rss_poll_gone_feed_is_not_retried(monkeypatch):
+    import requests
+
+    from app.db import get_session, init_db
+    from app.jobs import NonRetryableJobError
+    from app.jobs import rss as rss_module
+    from app.models import Feed, Job
+
+    init_db()
+
+    with next(get_session()) as session:
+        feed = Feed(url="https://example.com/feed", owner_user_id="owner")
+        session.add(feed)
+        session.commit()
+        job = Job(type="rss_poll", payload={"feed_id": feed.id}, owner_user_id="owner")
+        session.add(job)
+        session.commit()
+        feed_id, job_id = feed.id, job.id
+
+    def fake_poll(**_kwargs):
+        response = requests.Response()
+        response.status_code = 410
+        raise requests.HTTPError("gone", response=response)
+
+    monkeypatch.setattr(rss_module, "poll_rss_and_publish", fake_poll)
+
+    with pytest.raises(NonRetryableJobError):
+        rss_module.handle_rss_poll(
+            job_id=job_id, owner_user_id="owner", payload={"feed_id": feed_id}
+        )
+
+    with next(get_session()) as session:
+        feed = session.get(Feed, feed_id)
+        assert feed.health_status == "degraded"
+        assert feed.consecutive_failures == 1
+        assert feed.last_error_class == "http_gone"
+        assert feed.next_poll_at is not None
+
+
+def test_enqueue_due_feed_polls_groups_due_feeds_by_owner(monkeypatch):
+    from sqlmodel import select
+
+    from app.db import get_session, init_db
+    from app.jobs.feed_polling import enqueue_due_feed_polls
+    from app.models import Feed, Job
+
+    monkeypatch.setenv("RSS_FEED_DRIVEN_BATCH_SIZE", "2")
+    init_db()
+
+    with next(get_session()) as session:
+        due = [
+            Feed(url=f"https://example.com/{index}", owner_user_id="alice")
+            for index in range(3)
+        ]
+        due.append(
+            Feed(
+                url="https://example.com/bob",
+                owner_user_id="bob",
+                next_poll_at=NOW - timedelta(minutes=1),
+            )
+        )
+        later = Feed(
+            url="https://example.com/later",
+            owner_user_id="alice",
+            next_poll_at=NOW + timedelta(hours=1),
+        )
+        suspended = Feed(
+            url="https://example.com/suspended",
+            owner_user_id="alice",
+            health_status="suspended",
+        )
+        cached = Feed(
+            url="https://example.com/cached",
+            owner_user_id="bob",
+            next_poll_at=NOW - timedelta(minutes=1),
+            fetch_hints={
+                "fetched_at": (NOW - timedelta(minutes=5)).isoformat(),
+                "expires_at": (NOW + timedelta(minutes=30)).isoformat(),
+            },
+        )
+        session.add_all([*due, later, suspended, cached])
+        session.commit()
+        cached_id = cached.id
+
+        jobs = enqueue_due_feed_polls(session, now=NOW)
+        session.commit()
+
+        batches = sorted(
+            (job.owner_user_id, len(job.payload["feed_ids"])) for job in jobs
+        )
+        assert batches == [("alice", 1), ("alice", 2), ("bob", 1)]
+        assert all(job.type == "rss_poll_batch" for job in jobs)
+        assert all(job.details == {"feed_driven": True} for job in jobs)
+
+        dispatched = {feed_id for job in jobs for feed_id in job.payload["feed_ids"]}
+        assert dispatched == {feed.id for feed in due}
+        cached_feed = session.get(Feed, cached_id)
+        assert cached_feed.next_poll_at.replace(tzinfo=timezone.utc) == NOW + timedelta(minutes=30)
+
+        # Leased feeds are not dispatched again on the next tick.
+        assert enqueue_due_feed_polls(session, now=NOW + timedelta(seconds=5)) == []
+        assert len(session.exec(select(Job)).all()) == 3
+
+
+def test_enqueue_due_feed_polls_respects_schedules_and_pending_batches():
+    from app.db import get_session, init_db
+    from app.jobs.feed_polling import FEED_DRIVEN_JOB_TYPES, enqueue_due_feed_polls
+    from app.jobs.scheduler import enqueue_due_schedules
+    from app.models import Feed, Job, JobSchedule
+
+    init_db()
+
+    with next(get_session()) as session:
+        scheduled = Feed(url="https://example.com/scheduled", owner_user_id="alice")
+        paused = Feed(url="https://example.com/paused", owner_user_id="alice")
+        unscheduled = Feed(url="https://example.com/plain", owner_user_id="alice")
+        session.add_all([scheduled, paused, unscheduled])
+        session.commit()
+        session.add_all(
+            [
+                JobSchedule(
+                    schedule_name="scheduled",
+                    job_type="rss_poll",
+                    owner_user_id="alice",
+                    payload={"feed_id": scheduled.id, "instapaper_id": "cred-1"},
+                    frequency="1h",
+                    next_run_at=NOW - timedelta(minutes=1),
+                ),
+                JobSchedule(
+                    schedule_name="paused",
+                    job_type="rss_poll",
+                    owner_user_id="alice",
+                    payload={"feed_id": paused.id, "instapaper_id": "cred-1"},
+                    frequency="1h",
+                    next_run_at=NOW - timedelta(minutes=1),
+                    is_active=False,
+                ),
+            ]
+        )
+        session.commit()
+
+        # RSS poll schedules are left to feed-driven scheduling.
+        assert enqueue_due_schedules(
+            session, now=NOW, exclude_job_types=FEED_DRIVEN_JOB_TYPES
+        ) == []
+
+        jobs = enqueue_due_feed_polls(session, now=NOW)
+        session.commit()
+        payloads = sorted(
+            (job.payload for job in jobs), key=lambda payload: "instapaper_id" in payload
+        )
+        assert payloads == [
+            {"feed_ids": [unscheduled.id]},
+            {"feed_ids": [scheduled.id], "instapaper_id": "cred-1"},
+        ]
+
+        # A batch still queued after its lease expired is not duplicated.
+        later = NOW + timedelta(hours=2)
+        assert enqueue_due_feed_polls(session, now=later) == []
+        session.commit()
+
+        for job in jobs:
+            job.status = "done"
+            session.add(job)
+        session.commit()
+        redispatched = enqueue_due_feed_polls(session, now=later + timedelta(hours=1))
+        assert sorted(
+            feed_id for job in redispatched for feed_id in job.payload["feed_ids"]
+        ) == sorted([scheduled.id, unscheduled.id])
@@ -224,3 +224,72 @@ def test_feed_folder_and_tags_persist_in_order(client):
             .order_by(FeedTagLink.position)
         ).all()
         assert [link.tag_id for link in links] == [tag_c_id, tag_a_id]
+
+
+def test_list_feeds_surfaces_health_and_filters_by_status(client):
+    from app.db import get_session
+    from app.models import Feed
+
+    with next(get_session()) as session:
+        feed = session.exec(select(Feed).where(Feed.owner_user_id == "primary")).first()
+        feed.health_status = "suspended"
+        feed.consecutive_failures = 10
+        feed.last_error_class = "http_gone"
+        session.add(feed)
+        session.commit()
+
+    resp = client.get("/v1/feeds", params={"health_status": "suspended"})
+    assert resp.status_code == 200
+    payload = resp.json()
+    assert payload["total"] == 1
+    item = payload["items"][0]
+    assert item["health_status"] == "suspended"
+    assert item["consecutive_failures"] == 10
+    assert item["last_error_class"] == "http_gone"
+
+    healthy = client.get("/v1/feeds", params={"health_status": "healthy"})
+    assert healthy.json()["total"] == 0
+
+
+def test_create_feed_ignores_server_managed_health_fields(client):
+    from app.db import get_session
+    from app.models import Feed
+
+    resp = client.post(
+        "/v1/feeds",
+        json={
+            "url": "https://example.com/health.xml",
+            "health_status": "suspended",
+            "consecutive_failures": 99,
+            "last_error_class": "http_gone",
+        },
+    )
+    assert resp.status_code == 201
+    created = resp.json()
+    assert created["health_status"] == "healthy"
+    assert created["consecutive_failures"] == 0
+    assert created["last_error_class"] is None
+
+    with next(get_session()) as session:
+        feed = session.get(Feed, created["id"])
+        assert feed.health_status == "healthy"
+        assert feed.consecutive_failures == 0
+
+
+def test_create_feed_ignores_client_next_poll_at(client):
+    from app.db import get_session
+    from app.models import Feed
+
+    resp = client.post(
+        "/v1/feeds",
+        json={
+            "url": "https://example.com/later.xml",
+            "next_poll_at": "2999-01-01T00:00:00Z",
+        },
+    )
+    assert resp.status_code == 201
+    created = resp.json()
+    assert created["next_poll_at"] is None
+
+    with next(get_session()) as session:
+        assert session.get(Feed, created["id"]).next_poll_at is None
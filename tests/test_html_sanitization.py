@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+
+import pytest
+from bs4 import BeautifulSoup
+
+from app.services import html_sanitization
+from app.services.html_sanitization import (
+    preview_rules_version,
+    publish_rules_version,
+    sanitize_for_preview,
+    sanitize_html_content,
+)
+
+SAMPLES = [
+    "<!DOCTYPE html><html><head><title>T</title></head><body>"
+    "<p>Intro &amp; more</p><img src='a.png'><figure><img src=b.png>"
+    "<figcaption>Cap</figcaption></figure><aside class=ad>Buy</aside></body></html>",
+    "<div><p>Fragment <br> with <b>unclosed <i>tags</p><img alt=x></div>",
+    "<p>No images here &nbsp; &copy; <a href='javascript:alert(1)'>x</a></p>"
+    "<script>alert(1)</script><!-- comment -->",
+    "<html><body><table><tr><td colspan=2><img src=c.png></td></tr></table>"
+    "<section><div class='share'><span>Share</span></div></section></body></html>",
+]
+
+
+FIXTURES = Path(__file__).parent / "fixtures" / "html_sanitization"
+FIXTURE_CRITERIA = ["img", "aside", "div.share"]
+
+
+def _reference_publish(html, criteria):
+    soup = BeautifulSoup(html, "html.parser")
+    for selector in criteria:
+        for element in soup.select(selector):
+            element.decompose()
+    return str(soup)
+
+
+@pytest.mark.parametrize("html", SAMPLES)
+@pytest.mark.parametrize("criteria", [["img"], ["aside", "div.share"], ["figure", "img"]])
+def test_publish_output_matches_reference_parser(html, criteria, caplog):
+    caplog.set_level(logging.DEBUG)
+    assert sanitize_html_content(html, criteria) == _reference_publish(html, criteria)
+
+
+@pytest.mark.parametrize("html", SAMPLES)
+def test_preview_output_is_allowlisted_fragment(html):
+    preview = sanitize_for_preview(html)
+    assert "<script" not in preview and "DOCTYPE" not in preview
+    assert "<html" not in preview and "<body" not in preview
+
+
+def test_invalid_selector_returns_content_unchanged():
+    assert sanitize_html_content(SAMPLES[0], ["p["]) == SAMPLES[0]
+
+
+@pytest.mark.parametrize("parser", ["html.parser", "lxml"])
+@pytest.mark.parametrize(
+    "fixture", sorted(path.name[: -len(".input.html")] for path in FIXTURES.glob("*.input.html"))
+)
+def test_fixture_output_is_identical_for_both_parsers(fixture, parser, monkeypatch):
+    if parser == "lxml":
+        pytest.importorskip("lxml")
+    monkeypatch.setenv("HTML_SANITIZER_PARSER", parser)
+    html = (FIXTURES / f"{fixture}.input.html").read_text(encoding="utf-8")
+
+    publish = sanitize_html_content(html, FIXTURE_CRITERIA)
+    preview = sanitize_for_preview(html)
+
+    assert publish.encode("utf-8") == (FIXTURES / f"{fixture}.publish.html").read_bytes()
+    assert preview.encode("utf-8") == (FIXTURES / f"{fixture}.preview.html").read_bytes()
+
+
+def test_lxml_is_the_default_backend_and_part_of_rules_version(monkeypatch):
+    pytest.importorskip("lxml")
+    assert html_sanitization.html_parser_backend() == "lxml"
+    default_publish = publish_rules_version(["img"])
+    default_preview = preview_rules_version()
+    monkeypatch.setenv("HTML_SANITIZER_PARSER", "html.parser")
+
+    assert html_sanitization.html_parser_backend() == "html.parser"
+    assert publish_rules_version(["img"]) != default_publish
+    assert preview_rules_version() != default_preview
+    assert "<img" not in sanitize_html_content(SAMPLES[0], ["img"])
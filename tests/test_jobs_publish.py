@@ -6,6 +6,7 @@ from datetime import datetime, timezone, timedelta
 import pytest
 from sqlmodel import select
 
+from app.jobs.util_subpaperflux import sync_publication_outbox
 from app.models import Bookmark, Feed, FeedTagLink, Folder, Job, JobSchedule, Tag
 
 
@@ -74,6 +75,8 @@ def _create_pending_bookmarks(session, feed_id: str, *, credential_id: str):
     session.add(first)
     session.add(second)
     session.add(already_published)
+    for bookmark in (first, second, already_published):
+        sync_publication_outbox(session, bookmark)
     session.commit()
     session.refresh(first)
     session.refresh(second)
@@ -188,6 +191,7 @@ def test_handle_publish_publishes_across_all_feeds_when_unscoped(monkeypatch):
                 publication_statuses={"instapaper": {"status": "pending"}},
             )
             session.add(bookmark)
+            sync_publication_outbox(session, bookmark)
             session.flush()
             session.refresh(bookmark)
             return bookmark
@@ -276,6 +280,7 @@ def test_handle_publish_scopes_to_requested_feed(monkeypatch):
                 publication_statuses={"instapaper": {"status": "pending"}},
             )
             session.add(bookmark)
+            sync_publication_outbox(session, bookmark)
             session.flush()
             session.refresh(bookmark)
             return bookmark
@@ -565,3 +570,280 @@ def test_handle_publish_after_rss_poll_without_credentials(monkeypatch, tmp_path
         flags = bookmark.publication_flags.get("instapaper") or {}
         assert flags.get("credential_id") == "insta-1"
 
+
+
+def test_publish_context_reuses_client_and_prefetches_dedupe(monkeypatch):
+    from app.db import get_session, init_db
+    from app.jobs import util_subpaperflux
+    from app.models import Credential
+    from app.security.crypto import encrypt_dict
+    from app.util.ratelimit import limiter
+
+    init_db()
+    monkeypatch.setitem(limiter._overrides, "instapaper", 0)
+    with next(get_session()) as session:
+        session.add(
+            Credential(
+                id="insta-1",
+                kind="instapaper",
+                description="Instapaper",
+                owner_user_id="user-1",
+                data=encrypt_dict({"oauth_token": "tok", "oauth_token_secret": "sec"}),
+            )
+        )
+        session.add(
+            Credential(
+                id="insta-app",
+                kind="instapaper_app",
+                description="Instapaper app",
+                owner_user_id=None,
+                data=encrypt_dict({"consumer_key": "ck", "consumer_secret": "cs"}),
+            )
+        )
+        session.add(
+            Bookmark(
+                owner_user_id="user-1",
+                url="https://example.com/seen",
+                instapaper_bookmark_id="ip-seen",
+            )
+        )
+        session.commit()
+
+    clients = []
+
+    class DummyResponse:
+        status_code = 200
+        headers = {}
+        text = "[]"
+
+        def raise_for_status(self):
+            return None
+
+        def json(self):
+            return [{"type": "bookmark", "bookmark_id": 1}]
+
+    def fake_post(self, url, data=None, **kwargs):
+        clients.append(id(self))
+        return DummyResponse()
+
+    monkeypatch.setattr("requests_oauthlib.OAuth1Session.post", fake_post)
+
+    context = util_subpaperflux.build_publish_context("insta-1", "user-1")
+    context.prefetch_dedupe(["https://example.com/seen", "https://example.com/new"])
+
+    def _no_query(*args, **kwargs):
+        raise AssertionError("dedupe should be answered from the prefetch")
+
+    monkeypatch.setattr(util_subpaperflux, "_recent_bookmarks_by_url", _no_query)
+    seen = util_subpaperflux.publish_url(
+        "insta-1", "https://example.com/seen", owner_user_id="user-1", context=context
+    )
+    assert seen["deduped"] is True and seen["bookmark_id"] == "ip-seen"
+    for _ in range(2):
+        result = util_subpaperflux.publish_url(
+            "insta-1", "https://example.com/new", owner_user_id="user-1", context=context
+        )
+        assert result["deduped"] is False
+    context.close()
+
+    assert len(clients) == 2
+    assert len(set(clients)) == 1
+
+
+def test_publication_outbox_tracks_pending_bookmarks(monkeypatch):
+    from app.db import get_session, init_db
+    from app.jobs import publish as publish_module
+    from app.jobs.util_subpaperflux import (
+        count_pending_instapaper_bookmarks,
+        iter_pending_instapaper_bookmarks,
+    )
+    from app.models import PublicationOutbox
+
+    init_db()
+    with next(get_session()) as session:
+        feed = Feed(owner_user_id="user-1", url="https://example.com/rss.xml", poll_frequency="1h")
+        session.add(feed)
+        session.commit()
+        session.refresh(feed)
+        feed_id = feed.id
+        first, second, published = _create_pending_bookmarks(
+            session, feed_id, credential_id="insta-1"
+        )
+        first_id = first.id
+
+        assert session.get(PublicationOutbox, published.id).status == "published"
+        scope = {"owner_user_id": "user-1", "instapaper_id": "insta-1", "feed_id": feed_id}
+        assert count_pending_instapaper_bookmarks(session, **scope) == 2
+        assert count_pending_instapaper_bookmarks(
+            session, **{**scope, "instapaper_id": "insta-2"}
+        ) == 0
+        assert count_pending_instapaper_bookmarks(session, **scope, include_paywalled=True) == 0
+        assert len(iter_pending_instapaper_bookmarks(session, **scope, limit=1)) == 1
+
+    def fake_publish(instapaper_id: str, url: str, **kwargs):
+        if url.endswith("/two"):
+            raise RuntimeError("instapaper unavailable")
+        return {"bookmark_id": "ip-one"}
+
+    monkeypatch.setattr(publish_module, "publish_url", fake_publish)
+    result = publish_module.handle_publish(
+        job_id="job-1",
+        owner_user_id="user-1",
+        payload={"instapaper_id": "insta-1", "feed_id": feed_id},
+    )
+    assert result["remaining"] == 1
+
+    with next(get_session()) as session:
+        entries = {entry.bookmark_id: entry for entry in session.exec(select(PublicationOutbox))}
+    assert entries[first_id].status == "published"
+    assert entries[first_id].attempts == 1
+    assert entries[second.id].status == "error"
+    assert entries[second.id].last_attempt_at is not None
+
+
+def test_handle_publish_resumes_after_a_crash(monkeypatch):
+    from app.db import get_session, init_db
+    from app.jobs import publish as publish_module
+    from app.models import JobItem
+    from app.worker import mark_done
+
+    init_db()
+    monkeypatch.setenv("PUBLISH_RESULT_BATCH_SIZE", "1")
+    with next(get_session()) as session:
+        feed = Feed(owner_user_id="user-1", url="https://example.com/rss.xml", poll_frequency="1h")
+        session.add(feed)
+        job = Job(type="publish", owner_user_id="user-1", payload={"instapaper_id": "insta-1"})
+        session.add(job)
+        session.commit()
+        session.refresh(feed)
+        session.refresh(job)
+        job_id = job.id
+        first, second, _ = _create_pending_bookmarks(session, feed.id, credential_id="insta-1")
+        first_id, second_id = first.id, second.id
+
+    class WorkerCrash(BaseException):
+        pass
+
+    calls: list[str] = []
+
+    def crashing_publish(instapaper_id: str, url: str, **kwargs):
+        if calls:
+            raise WorkerCrash()
+        calls.append(url)
+        return {"bookmark_id": "ip-" + url.rsplit("/", 1)[-1]}
+
+    closed: list[bool] = []
+    build_context = publish_module.build_publish_context
+
+    def tracking_build_context(*args, **kwargs):
+        context = build_context(*args, **kwargs)
+        close = context.close
+
+        def tracking_close():
+            closed.append(True)
+            close()
+
+        context.close = tracking_close
+        return context
+
+    monkeypatch.setattr(publish_module, "build_publish_context", tracking_build_context)
+    monkeypatch.setattr(publish_module, "publish_url", crashing_publish)
+    with pytest.raises(WorkerCrash):
+        publish_module.handle_publish(
+            job_id=job_id, owner_user_id="user-1", payload={"instapaper_id": "insta-1"}
+        )
+    assert closed == [True]
+
+    def fake_publish(instapaper_id: str, url: str, **kwargs):
+        calls.append(url)
+        return {"bookmark_id": "ip-" + url.rsplit("/", 1)[-1]}
+
+    monkeypatch.setattr(publish_module, "publish_url", fake_publish)
+    result = publish_module.handle_publish(
+        job_id=job_id, owner_user_id="user-1", payload={"instapaper_id": "insta-1"}
+    )
+
+    assert sorted(calls) == ["https://example.com/one", "https://example.com/two"]
+    assert result["attempted"] == 2
+    ids_by_url = {"https://example.com/one": first_id, "https://example.com/two": second_id}
+    assert [entry["bookmark_id"] for entry in result["published"]] == [
+        ids_by_url[url] for url in calls
+    ]
+    assert result["remaining"] == 0
+
+    with next(get_session()) as session:
+        assert len(session.exec(select(JobItem).where(JobItem.job_id == job_id)).all()) == 2
+        job = session.get(Job, job_id)
+    mark_done(job, result)
+    with next(get_session()) as session:
+        assert session.exec(select(JobItem).where(JobItem.job_id == job_id)).all() == []
+
+
+def test_instapaper_folder_map_is_stored_until_stale_or_invalidated(monkeypatch):
+    from app.db import get_session, init_db
+    from app.jobs import util_subpaperflux
+    from app.models import InstapaperFolderMap
+
+    init_db()
+    calls: list[str] = []
+
+    class FakeResponse:
+        def __init__(self, payload):
+            self._payload = payload
+
+        def raise_for_status(self):
+            return None
+
+        def json(self):
+            return self._payload
+
+    remote_folders = [{"folder_id": 10, "title": "Reading"}]
+
+    class FakeOAuth:
+        def post(self, url, data=None, timeout=None):
+            calls.append(url.rsplit("/", 1)[-1])
+            if url == util_subpaperflux.INSTAPAPER_FOLDERS_ADD_URL:
+                remote_folders.append({"folder_id": 900 + len(calls), "title": data["title"]})
+                return FakeResponse(remote_folders[-1:])
+            return FakeResponse(list(remote_folders))
+
+    monkeypatch.setattr(
+        util_subpaperflux,
+        "get_instapaper_oauth_session_for_credential",
+        lambda *args, **kwargs: FakeOAuth(),
+    )
+
+    def sync(session, **kwargs):
+        mapping = util_subpaperflux.sync_instapaper_folders(
+            session, instapaper_credential_id="insta-1", owner_user_id="user-1", **kwargs
+        )
+        session.commit()
+        return mapping
+
+    with next(get_session()) as session:
+        reading = Folder(owner_user_id="user-1", name="Reading")
+        session.add(reading)
+        session.commit()
+        session.refresh(reading)
+
+        assert sync(session) == {reading.id: "10"}
+        assert sync(session, required_folder_ids=[reading.id]) == {reading.id: "10"}
+        assert calls == ["list"]
+
+        later = Folder(owner_user_id="user-1", name="Later")
+        session.add(later)
+        session.commit()
+        session.refresh(later)
+        mapping = sync(session, required_folder_ids=[later.id])
+        assert calls == ["list", "list", "add"]
+        assert mapping == {reading.id: "10", later.id: "903"}
+        assert session.get(InstapaperFolderMap, "insta-1").mapping == mapping
+
+        util_subpaperflux.invalidate_instapaper_folder_maps(session, "user-1")
+        session.commit()
+        sync(session)
+        assert calls[-1] == "list" and len(calls) == 4
+
+        monkeypatch.setenv("INSTAPAPER_FOLDER_MAP_TTL", "0")
+        sync(session)
+        assert len(calls) == 5
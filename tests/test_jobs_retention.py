@@ -2,9 +2,14 @@ import base64
 import os
 from datetime import datetime, timedelta, timezone
 
+import threading
+import time
+
 import pytest
 from sqlmodel import select
 
+from app.jobs.util_subpaperflux import sync_publication_outbox
+
 
 @pytest.fixture(autouse=True)
 def _env(monkeypatch):
@@ -160,6 +165,15 @@ def test_handle_retention_filters_by_feed_and_publication(monkeypatch):
         session.add(other_credential)
         session.add(missing_publication)
         session.commit()
+        for bookmark in (
+            eligible,
+            recent_match,
+            other_feed,
+            other_credential,
+            missing_publication,
+        ):
+            sync_publication_outbox(session, bookmark)
+        session.commit()
         eligible_id = eligible.id
         retained_ids = {
             recent_match.id,
@@ -211,3 +225,128 @@ def test_handle_retention_filters_by_feed_and_publication(monkeypatch):
         remaining = session.exec(select(Bookmark)).all()
         remaining_ids = {bookmark.id for bookmark in remaining}
         assert retained_ids <= remaining_ids
+
+
+def test_handle_retention_purges_chunks_with_concurrent_deletes(monkeypatch):
+    from app.db import get_session, init_db
+    from app.jobs import retention as retention_module
+    from app.content_store import store_article_html
+    from app.models import (
+        ArticleContent,
+        AuditLog,
+        Bookmark,
+        Credential,
+        JobItem,
+        PublicationOutbox,
+    )
+    from app.security.crypto import encrypt_dict
+    from app.util import ratelimit
+
+    init_db()
+    monkeypatch.setenv("JOB_CHECKPOINT_SIZE", "3")
+    monkeypatch.setenv("RETENTION_CONCURRENCY", "3")
+
+    older = datetime.now(timezone.utc) - timedelta(days=40)
+
+    with next(get_session()) as session:
+        credential = Credential(
+            kind="instapaper",
+            description="Primary Instapaper",
+            data=encrypt_dict({"oauth_token": "tok", "oauth_token_secret": "secret"}),
+            owner_user_id="user-1",
+        )
+        session.add(credential)
+        session.commit()
+        credential_id = credential.id
+
+        bookmark_ids = {}
+        for index in range(8):
+            published = older + timedelta(minutes=index)
+            bookmark = Bookmark(
+                owner_user_id="user-1",
+                instapaper_bookmark_id=str(200 + index),
+                feed_id="feed-1",
+                published_at=published,
+                rss_entry={},
+                content_hash=store_article_html(session, f"<p>Article {index}</p>"),
+                publication_statuses={
+                    "instapaper": {
+                        "status": "published",
+                        "bookmark_id": str(200 + index),
+                        "published_at": published.isoformat(),
+                    }
+                },
+                publication_flags={
+                    "instapaper": {"should_publish": True, "credential_id": credential_id}
+                },
+            )
+            session.add(bookmark)
+            session.commit()
+            sync_publication_outbox(session, bookmark)
+            session.commit()
+            bookmark_ids[str(200 + index)] = bookmark.id
+
+    class DummyResponse:
+        def __init__(self, ok):
+            self.ok = ok
+
+        def raise_for_status(self):
+            if not self.ok:
+                raise RuntimeError("boom")
+
+    lock = threading.Lock()
+    active = {"now": 0, "max": 0}
+    calls = []
+
+    class DummyOAuth:
+        def post(self, url, data):
+            with lock:
+                active["now"] += 1
+                active["max"] = max(active["max"], active["now"])
+                calls.append(data["bookmark_id"])
+            time.sleep(0.05)
+            with lock:
+                active["now"] -= 1
+            return DummyResponse(data["bookmark_id"] != "204")
+
+    monkeypatch.setattr(
+        retention_module,
+        "get_instapaper_oauth_session_for_credential",
+        lambda *args, **kwargs: DummyOAuth(),
+    )
+    waits = []
+    monkeypatch.setattr(ratelimit.limiter, "wait", lambda key: waits.append(key))
+
+    result = retention_module.handle_retention(
+        job_id="job-purge",
+        owner_user_id="user-1",
+        payload={"older_than": "30d", "instapaper_credential_id": credential_id},
+    )
+
+    assert result == {"deleted_count": 7}
+    assert sorted(calls) == sorted(bookmark_ids)
+    assert 1 < active["max"] <= 3
+    assert waits == [f"instapaper:{credential_id}"] * 8
+
+    with next(get_session()) as session:
+        remaining = session.exec(select(Bookmark)).all()
+        assert [bookmark.id for bookmark in remaining] == [bookmark_ids["204"]]
+        outbox = session.exec(select(PublicationOutbox)).all()
+        assert [entry.bookmark_id for entry in outbox] == [bookmark_ids["204"]]
+        logs = session.exec(select(AuditLog).where(AuditLog.action == "delete")).all()
+        assert len(logs) == 7
+        assert all(log.details["source"] == "retention_job" for log in logs)
+        ledger = session.exec(select(JobItem).where(JobItem.job_id == "job-purge")).all()
+        assert len(ledger) == 7
+        stored = session.exec(select(ArticleContent)).all()
+        assert [record.content_hash for record in stored] == [remaining[0].content_hash]
+
+    # A retry counts the purged bookmarks and only retries the failed one.
+    calls.clear()
+    result = retention_module.handle_retention(
+        job_id="job-purge",
+        owner_user_id="user-1",
+        payload={"older_than": "30d", "instapaper_credential_id": credential_id},
+    )
+    assert result == {"deleted_count": 7}
+    assert calls == ["204"]
@@ -0,0 +1,183 @@
+import base64
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import requests
+from sqlmodel import select
+
+
+@pytest.fixture(autouse=True)
+def _env(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "sqlite://")
+    monkeypatch.setenv("SQLMODEL_CREATE_ALL", "1")
+    monkeypatch.setenv(
+        "CREDENTIALS_ENC_KEY",
+        base64.urlsafe_b64encode(os.urandom(32)).decode(),
+    )
+    monkeypatch.setenv("RSS_BATCH_CONCURRENCY", "4")
+    yield
+
+
+def _seed_feeds(count, owner="owner"):
+    from app.db import get_session
+    from app.models import Feed, Job
+
+    with next(get_session()) as session:
+        feeds = [
+            Feed(url=f"https://example.com/{index}.xml", owner_user_id=owner)
+            for index in range(count)
+        ]
+        session.add_all(feeds)
+        session.add(Feed(url="https://example.com/other.xml", owner_user_id="other"))
+        job = Job(type="rss_poll_batch", payload={}, owner_user_id=owner)
+        session.add(job)
+        session.commit()
+        return [feed.id for feed in feeds], job.id
+
+
+def test_rss_poll_batch_fetches_concurrently_and_records_outcomes(monkeypatch):
+    from app.db import get_session, init_db
+    from app.jobs import rss as rss_module
+    from app.models import Bookmark, Feed
+
+    init_db()
+    feed_ids, job_id = _seed_feeds(3)
+    gone_feed = feed_ids[2]
+    threads = set()
+    sessions = set()
+
+    def fake_fetch(plan, *, http_session=None):
+        threads.add(threading.get_ident())
+        sessions.add(id(http_session))
+        if plan.feed_id == gone_feed:
+            response = requests.Response()
+            response.status_code = 404
+            raise requests.HTTPError("not found", response=response)
+        return [
+            {
+                "url": f"{plan.feed_url}#entry",
+                "title": "Entry",
+                "published_dt": datetime.now(timezone.utc) - timedelta(minutes=5),
+                "rss_entry_metadata": {},
+            }
+        ]
+
+    monkeypatch.setattr(rss_module, "fetch_rss_poll", fake_fetch)
+
+    details = rss_module.handle_rss_poll_batch(
+        job_id=job_id, owner_user_id="owner", payload={"all_feeds": True}
+    )
+
+    assert details["feeds"] == 3
+    assert details["polled"] == 2
+    assert details["failed"] == 1
+    assert details["stored"] == 2
+    assert list(details["outcomes"]) == sorted(feed_ids)
+    assert details["outcomes"][gone_feed]["error_class"] == "http_gone"
+    assert len(sessions) == 1
+    assert threading.get_ident() not in threads
+
+    with next(get_session()) as session:
+        bookmarks = session.exec(select(Bookmark)).all()
+        assert sorted(b.feed_id for b in bookmarks) == sorted(feed_ids[:2])
+        assert session.get(Feed, gone_feed).consecutive_failures == 1
+        assert session.get(Feed, feed_ids[0]).last_rss_poll_at is not None
+
+
+def test_rss_poll_batch_rejects_foreign_feed_without_touching_health(monkeypatch):
+    from app.db import get_session, init_db
+    from app.jobs import rss as rss_module
+    from app.models import Feed
+
+    init_db()
+    feed_ids, job_id = _seed_feeds(1)
+    with next(get_session()) as session:
+        foreign_id = session.exec(
+            select(Feed.id).where(Feed.owner_user_id == "other")
+        ).first()
+
+    monkeypatch.setattr(rss_module, "fetch_rss_poll", lambda plan, **_: [])
+
+    details = rss_module.handle_rss_poll_batch(
+        job_id=job_id,
+        owner_user_id="owner",
+        payload={"feedIds": [feed_ids[0], foreign_id, feed_ids[0]]},
+    )
+
+    assert details["feeds"] == 2
+    assert details["outcomes"][feed_ids[0]] == {
+        "status": "polled",
+        "stored": 0,
+        "duplicates": 0,
+        "total": 0,
+    }
+    assert details["outcomes"][foreign_id]["status"] == "failed"
+    assert "error_class" not in details["outcomes"][foreign_id]
+    with next(get_session()) as session:
+        assert session.get(Feed, foreign_id).consecutive_failures == 0
+
+
+def test_validate_rss_poll_batch_payload():
+    from app.jobs.validation import validate_job
+
+    payload = {"feedIds": [" feed_a ", ""]}
+    assert validate_job("rss_poll_batch", payload) == {"ok": True, "missing": []}
+    assert payload == {"feed_ids": ["feed_a"]}
+
+    assert validate_job("rss_poll_batch", {"all_feeds": True})["ok"] is True
+    assert validate_job("rss_poll_batch", {"all_feeds": False}) == {
+        "ok": False,
+        "missing": ["feed_ids"],
+    }
+
+
+def test_rss_poll_batch_resumes_from_its_checkpoints(monkeypatch):
+    from app.db import get_session, init_db
+    from app.jobs import rss as rss_module
+    from app.jobs import util_subpaperflux
+    from app.models import Bookmark
+
+    init_db()
+    monkeypatch.setenv("RSS_BATCH_CONCURRENCY", "1")
+    monkeypatch.setenv("JOB_CHECKPOINT_SIZE", "1")
+    feed_ids, job_id = _seed_feeds(2)
+    feed_ids = sorted(feed_ids)
+    fetched = []
+
+    def fake_fetch(plan, *, http_session=None):
+        fetched.append(plan.feed_id)
+        return [
+            {"url": f"{plan.feed_url}#{index}", "title": "Entry", "rss_entry_metadata": {}}
+            for index in range(2)
+        ]
+
+    class WorkerCrash(BaseException):
+        pass
+
+    record_observation = util_subpaperflux.record_poll_observation
+
+    def crash_on_second_feed(feed, **kwargs):
+        if feed.id == feed_ids[1]:
+            raise WorkerCrash()
+        return record_observation(feed, **kwargs)
+
+    monkeypatch.setattr(rss_module, "fetch_rss_poll", fake_fetch)
+    monkeypatch.setattr(util_subpaperflux, "record_poll_observation", crash_on_second_feed)
+    with pytest.raises(WorkerCrash):
+        rss_module.handle_rss_poll_batch(
+            job_id=job_id, owner_user_id="owner", payload={"all_feeds": True}
+        )
+    monkeypatch.setattr(util_subpaperflux, "record_poll_observation", record_observation)
+
+    details = rss_module.handle_rss_poll_batch(
+        job_id=job_id, owner_user_id="owner", payload={"all_feeds": True}
+    )
+
+    assert fetched == [feed_ids[0], feed_ids[1], feed_ids[1]]
+    assert details["polled"] == 2
+    assert details["stored"] == 4
+    assert details["duplicates"] == 0
+    with next(get_session()) as session:
+        assert len(session.exec(select(Bookmark)).all()) == 4
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import json
+import os
+
+from app.util import json_files
+from app.util.json_files import invalidate_json_file_cache, load_json_file
+
+
+def test_json_files_are_parsed_once_until_changed(tmp_path, monkeypatch):
+    path = tmp_path / "credentials.json"
+    path.write_text(json.dumps({"cred": {"username": "alice"}}))
+    parses = []
+    real_load = json_files.json.load
+    monkeypatch.setattr(
+        json_files.json, "load", lambda fp: parses.append(fp.name) or real_load(fp)
+    )
+
+    first = load_json_file(str(path))
+    first["cred"]["username"] = "mutated"
+    assert load_json_file(str(path)) == {"cred": {"username": "alice"}}
+    assert len(parses) == 1
+
+    path.write_text(json.dumps({"cred": {"username": "bob"}}))
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert load_json_file(str(path))["cred"]["username"] == "bob"
+    assert len(parses) == 2
+
+    invalidate_json_file_cache(str(path))
+    load_json_file(str(path))
+    assert len(parses) == 3
+
+    path.unlink()
+    assert load_json_file(str(path)) == {}
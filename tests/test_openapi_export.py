@@ -0,0 +1,15 @@
+import json
+from pathlib import Path
+
+
+def test_committed_openapi_matches_app_schema():
+    """openapi.json is regenerated with ``make openapi-export`` after API changes."""
+
+    from app.main import create_app
+
+    committed = json.loads(
+        (Path(__file__).resolve().parent.parent / "openapi.json").read_text()
+    )
+    current = json.loads(json.dumps(create_app().openapi()))
+
+    assert committed == current
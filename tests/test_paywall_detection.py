@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from app.services.paywall_detection import (
+    DEFAULT_PAYWALL_INDICATORS,
+    get_paywall_detector,
+)
+
+
+def test_detector_reports_matching_rule_case_insensitively():
+    detector = get_paywall_detector(["Members-Only Wall"])
+
+    match = detector.find("<html><div>MEMBERS-only wall</div></html>")
+    assert match is not None
+    assert (match.indicator, match.source) == ("Members-Only Wall", "site_config")
+
+    match = detector.find("<p>Subscribe To Read the rest</p>")
+    assert (match.indicator, match.source) == ("subscribe to read", "default")
+
+    assert detector.find("<p>An ordinary article</p>") is None
+    assert get_paywall_detector(["Members-Only Wall"]) is detector
+    assert len(get_paywall_detector().indicators) == len(DEFAULT_PAYWALL_INDICATORS)
+
+
+def test_detector_scans_only_bounded_prefix_and_suffix():
+    detector = get_paywall_detector()
+    filler = "x" * 1000
+
+    head = "data-paywall" + filler * 3
+    tail = filler * 3 + "please log in"
+    middle = filler + "data-paywall" + filler * 2
+
+    assert detector.find(head, window=500).indicator == "data-paywall"
+    assert detector.find(tail, window=500).indicator == "please log in"
+    assert detector.find(middle, window=500) is None
+    assert detector.find(middle, window=0).indicator == "data-paywall"
+    # Indicators straddling the start of the suffix window are still found.
+    straddling = filler * 3 + "please log" + " in" + "y" * 497
+    assert detector.find(straddling, window=500).indicator == "please log in"
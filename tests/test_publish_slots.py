@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from app.jobs.publish_slots import publish_concurrency, run_publish_slots
+from app.util.ratelimit import RateLimiter
+
+
+def test_slots_run_lanes_concurrently_but_keep_lane_order():
+    items = [("a", 1), ("b", 1), ("a", 2), ("c", 1), ("b", 2), ("a", 3)]
+    lock = threading.Lock()
+    active = {"now": 0, "peak": 0}
+    started = []
+    prepared_on = set()
+
+    def prepare(item):
+        prepared_on.add(threading.get_ident())
+        return item[1]
+
+    def publish(item, prepared):
+        with lock:
+            started.append(item)
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+        time.sleep(0.02)
+        with lock:
+            active["now"] -= 1
+        if item == ("c", 1):
+            raise RuntimeError("rejected")
+        return prepared * 10
+
+    outcomes = list(
+        run_publish_slots(
+            items, lane=lambda item: item[0], prepare=prepare, publish=publish, concurrency=3
+        )
+    )
+
+    assert sorted(item for item, _, _ in outcomes) == sorted(items)
+    assert active["peak"] == 3
+    assert prepared_on == {threading.get_ident()}
+    for lane in "abc":
+        assert [item for item in started if item[0] == lane] == [
+            item for item in items if item[0] == lane
+        ]
+    errors = {item: error for item, _, error in outcomes if error is not None}
+    assert list(errors) == [("c", 1)] and str(errors[("c", 1)]) == "rejected"
+    assert {item: result for item, result, error in outcomes if error is None}[("a", 3)] == 30
+
+
+def test_single_slot_publishes_in_order_on_the_calling_thread():
+    caller = threading.get_ident()
+    seen = []
+
+    def publish(item, prepared):
+        seen.append((item, threading.get_ident()))
+
+    list(run_publish_slots([3, 1, 2], lane=str, prepare=lambda item: None, publish=publish, concurrency=1))
+    assert seen == [(3, caller), (1, caller), (2, caller)]
+
+
+@pytest.mark.parametrize(
+    "payload, env, expected",
+    [({}, None, 1), ({}, "4", 4), ({"concurrency": 2}, "4", 2), ({}, "500", 16), ({}, "x", 1)],
+)
+def test_publish_concurrency_setting(monkeypatch, payload, env, expected):
+    if env is None:
+        monkeypatch.delenv("PUBLISH_CONCURRENCY", raising=False)
+    else:
+        monkeypatch.setenv("PUBLISH_CONCURRENCY", env)
+    assert publish_concurrency(payload) == expected
+
+
+def test_rate_limiter_spaces_concurrent_callers_per_key():
+    limiter = RateLimiter(default_interval=0)
+    limiter.set_interval("instapaper", 0.05)
+    stamps = []
+
+    def call():
+        limiter.wait("instapaper:cred-1")
+        stamps.append(time.time())
+
+    threads = [threading.Thread(target=call) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stamps.sort()
+    assert all(later - earlier >= 0.045 for earlier, later in zip(stamps, stamps[1:]))
+
+    start = time.time()
+    limiter.wait("instapaper:cred-2")
+    assert time.time() - start < 0.04
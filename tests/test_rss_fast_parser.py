@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import feedparser
+
+from app.services import rss_fast_parser
+
+
+BASE = datetime(2024, 1, 10, 12, 0, tzinfo=timezone.utc)
+
+
+def _rss(hours_ago, *, undated=()):
+    items = []
+    for index, hours in enumerate(hours_ago):
+        date_xml = ""
+        if index not in undated:
+            date_xml = f"<pubDate>{format_datetime(BASE - timedelta(hours=hours))}</pubDate>"
+        items.append(
+            "<item>"
+            f"<title>Story {index} &amp; more</title>"
+            f"<link>https://example.com/{index}</link>"
+            "<description>&lt;p&gt;Body&lt;/p&gt;&lt;script&gt;x()&lt;/script&gt;</description>"
+            f"{date_xml}"
+            "</item>"
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+        "<title>Example</title><link>https://example.com/</link>"
+        f"{''.join(items)}<language>en</language></channel></rss>"
+    )
+
+
+def _fresh_entries(parsed, cutoff):
+    fresh = []
+    for entry in parsed.entries:
+        stamp = entry.get("updated_parsed") or entry.get("published_parsed")
+        if stamp and datetime(*stamp[:6], tzinfo=timezone.utc) <= cutoff:
+            continue
+        fresh.append(dict(entry))
+    return fresh, dict(parsed.feed)
+
+
+def test_parse_feed_since_matches_feedparser_for_fresh_entries():
+    document = _rss(range(20))
+    cutoff = BASE - timedelta(hours=4, minutes=30)
+
+    expected = _fresh_entries(feedparser.parse(document), cutoff)
+    actual = _fresh_entries(
+        rss_fast_parser.parse_feed_since(document, cutoff, stale_run_limit=0),
+        cutoff,
+    )
+
+    assert len(expected[0]) == 5
+    assert actual == expected
+
+
+def test_scan_stops_early_for_reverse_chronological_feed():
+    document = _rss(range(50))
+    cutoff = BASE - timedelta(hours=2, minutes=30)
+
+    scan = rss_fast_parser.scan_feed(document, cutoff, stale_run_limit=3)
+
+    assert scan is not None
+    assert scan.stopped_early is True
+    assert scan.entries_seen == 6
+    assert scan.fresh_entries == 3
+    parsed = rss_fast_parser.parse_feed_since(document, cutoff, stale_run_limit=3)
+    assert [entry.link for entry in parsed.entries] == [
+        "https://example.com/0",
+        "https://example.com/1",
+        "https://example.com/2",
+    ]
+
+
+def test_scan_keeps_unordered_and_undated_entries():
+    document = _rss([10, 12, 1, 11, 13, 14], undated={5})
+    cutoff = BASE - timedelta(hours=5)
+
+    scan = rss_fast_parser.scan_feed(document, cutoff, stale_run_limit=3)
+    assert scan is not None
+    assert scan.stopped_early is False
+
+    parsed = rss_fast_parser.parse_feed_since(document, cutoff, stale_run_limit=3)
+    assert [entry.link for entry in parsed.entries] == [
+        "https://example.com/2",
+        "https://example.com/5",
+    ]
+
+
+def test_parse_feed_since_skips_feedparser_when_nothing_is_new(monkeypatch):
+    document = _rss([5, 6, 7])
+    calls = []
+    monkeypatch.setattr(
+        rss_fast_parser.feedparser,
+        "parse",
+        lambda content: calls.append(content) or feedparser.FeedParserDict(entries=[]),
+    )
+
+    parsed = rss_fast_parser.parse_feed_since(document, BASE - timedelta(hours=1))
+
+    assert parsed.entries == []
+    assert calls == []
+
+
+def test_parse_feed_since_falls_back_for_malformed_documents(monkeypatch):
+    calls = []
+    original_parse = feedparser.parse
+
+    def recording_parse(content):
+        calls.append(content)
+        return original_parse(content)
+
+    monkeypatch.setattr(rss_fast_parser.feedparser, "parse", recording_parse)
+    malformed = "<rss><channel><item><title>Broken&nbsp;</title></channel></rss>"
+
+    assert rss_fast_parser.scan_feed(malformed, BASE) is None
+    rss_fast_parser.parse_feed_since(malformed, BASE)
+    assert calls == [malformed]
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import configparser
 import json
+import io
 import os
 import logging
 from datetime import datetime, timezone
@@ -35,7 +36,7 @@ def test_get_article_html_with_cookies_attaches_session(monkeypatch):
             self.headers = {}
             self.seen_cookie_snapshot = {}
 
-        def get(self, url, timeout=30):
+        def get(self, url, timeout=30, stream=False):
             self.seen_cookie_snapshot = requests.utils.dict_from_cookiejar(self.cookies)
             response = requests.Response()
             response.status_code = 200
@@ -66,7 +67,7 @@ def test_get_article_html_with_cookies_detects_login_redirect(monkeypatch):
             self.cookies = requests.cookies.RequestsCookieJar()
             self.headers = {}
 
-        def get(self, url, timeout=30):
+        def get(self, url, timeout=30, stream=False):
             response = requests.Response()
             response.status_code = 200
             response._content = b"<html>Please log in</html>"
@@ -93,7 +94,7 @@ def test_get_article_html_with_cookies_detects_paywall_copy(monkeypatch, caplog)
             self.cookies = requests.cookies.RequestsCookieJar()
             self.headers = {}
 
-        def get(self, url, timeout=30):
+        def get(self, url, timeout=30, stream=False):
             response = requests.Response()
             response.status_code = 200
             response._content = b"<html>This post is for paid subscribers only.</html>"
@@ -114,6 +115,7 @@ def test_get_article_html_with_cookies_detects_paywall_copy(monkeypatch, caplog)
 
     assert "paywalled" in str(exc.value).lower()
     assert exc.value.indicator == "this post is for paid subscribers"
+    assert exc.value.rule_source == "default"
     paywall_preview_logs = [
         msg for msg in caplog.messages if "Paywall response preview" in msg
     ]
@@ -125,6 +127,108 @@ def test_get_article_html_with_cookies_detects_paywall_copy(monkeypatch, caplog)
     assert "Content-Type" in header_logs[0]
 
 
+def test_get_article_html_with_cookies_uses_site_paywall_indicators(monkeypatch):
+
+    class FakeSession:
+        def __init__(self):
+            self.cookies = requests.cookies.RequestsCookieJar()
+            self.headers = {}
+
+        def get(self, url, timeout=30, stream=False):
+            response = requests.Response()
+            response.status_code = 200
+            response._content = b"<html><div class='Regwall-Gate'>Register</div></html>"
+            response.url = url
+            response.encoding = "utf-8"
+            return response
+
+    monkeypatch.setattr("app.services.subpaperflux_rss.requests.Session", lambda: FakeSession())
+    cookies = [{"name": "sessionid", "value": "abc123", "domain": "example.com"}]
+
+    assert subpaperflux_rss.get_article_html_with_cookies(
+        "https://example.com/articles/gated", cookies
+    )
+    with pytest.raises(subpaperflux_rss.PaywalledContentError) as exc:
+        subpaperflux_rss.get_article_html_with_cookies(
+            "https://example.com/articles/gated",
+            cookies,
+            paywall_indicators=["regwall-gate"],
+        )
+
+    assert exc.value.indicator == "regwall-gate"
+    assert exc.value.rule_source == "site_config"
+    assert "source=site_config" in str(exc.value)
+
+
+class _CountingStream(io.BytesIO):
+    def __init__(self, data: bytes):
+        super().__init__(data)
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        chunk = super().read(size)
+        self.bytes_read += len(chunk)
+        return chunk
+
+
+def _streaming_session(body: bytes, content_type: str = "text/html; charset=utf-8"):
+    body_stream = _CountingStream(body)
+
+    class FakeSession:
+        def __init__(self):
+            self.cookies = requests.cookies.RequestsCookieJar()
+            self.headers = {}
+
+        def get(self, url, timeout=30, stream=False):
+            assert stream is True
+            response = requests.Response()
+            response.status_code = 200
+            response.raw = body_stream
+            response.url = url
+            response.encoding = "utf-8"
+            response.headers["Content-Type"] = content_type
+            return response
+
+    return FakeSession, body_stream
+
+
+def test_get_article_html_with_cookies_streams_within_limits(monkeypatch):
+    cookies = [{"name": "sessionid", "value": "abc123", "domain": "example.com"}]
+    url = "https://example.com/articles/large"
+
+    session_cls, stream = _streaming_session(b"<html>" + b"a" * 200_000 + b"</html>")
+    monkeypatch.setattr("app.services.subpaperflux_rss.requests.Session", session_cls)
+    html = subpaperflux_rss.get_article_html_with_cookies(url, cookies)
+    assert html is not None and len(html) == 200_013
+
+    monkeypatch.setenv("ARTICLE_MAX_BYTES", "100000")
+    session_cls, stream = _streaming_session(b"<html>" + b"a" * 1_000_000 + b"</html>")
+    monkeypatch.setattr("app.services.subpaperflux_rss.requests.Session", session_cls)
+    assert subpaperflux_rss.get_article_html_with_cookies(url, cookies) is None
+    assert stream.bytes_read < 200_000
+
+    session_cls, stream = _streaming_session(b"%PDF-1.7", content_type="application/pdf")
+    monkeypatch.setattr("app.services.subpaperflux_rss.requests.Session", session_cls)
+    assert subpaperflux_rss.get_article_html_with_cookies(url, cookies) is None
+    assert stream.bytes_read == 0
+
+
+def test_get_article_html_with_cookies_stops_reading_at_paywall_marker(monkeypatch):
+    cookies = [{"name": "sessionid", "value": "abc123", "domain": "example.com"}]
+    monkeypatch.setenv("PAYWALL_SCAN_WINDOW", "1024")
+    body = b'<html><div data-testid="paywall-overlay"></div>' + b"a" * 2_000_000
+    session_cls, stream = _streaming_session(body)
+    monkeypatch.setattr("app.services.subpaperflux_rss.requests.Session", session_cls)
+
+    with pytest.raises(subpaperflux_rss.PaywalledContentError) as exc:
+        subpaperflux_rss.get_article_html_with_cookies(
+            "https://example.com/articles/paywalled", cookies
+        )
+
+    assert exc.value.indicator == 'data-testid="paywall-overlay"'
+    assert stream.bytes_read < 200_000
+
+
 def test_get_article_html_with_cookies_merges_header_overrides(monkeypatch):
 
     class FakeSession:
@@ -133,7 +237,7 @@ def test_get_article_html_with_cookies_merges_header_overrides(monkeypatch):
             self.headers = {}
             self.sent_headers = None
 
-        def get(self, url, timeout=30):
+        def get(self, url, timeout=30, stream=False):
             self.sent_headers = dict(self.headers)
             response = requests.Response()
             response.status_code = 200
@@ -269,6 +373,54 @@ def test_get_new_rss_entries_passes_header_overrides(monkeypatch):
 
 
 
+def test_get_new_rss_entries_reports_rotated_feed_cookies(monkeypatch):
+
+    class FakeSession:
+        def __init__(self):
+            self.headers = {}
+            self.cookies = requests.cookies.RequestsCookieJar()
+
+        def get(self, url, timeout=30, stream=False):
+            self.cookies.set("sessionid", "rotated", domain="example.com", path="/")
+            response = requests.Response()
+            response.status_code = 304
+            response._content = b""
+            response.url = url
+            return response
+
+    monkeypatch.setattr("app.services.subpaperflux_rss.requests.Session", FakeSession)
+
+    config = configparser.ConfigParser()
+    config.add_section("RSS_FEED_CONFIG")
+    config.set("RSS_FEED_CONFIG", "rss_requires_auth", "true")
+    persisted = []
+
+    def poll(cookies):
+        return subpaperflux_rss.get_new_rss_entries(
+            config_file="/tmp/config.ini",
+            feed_url="https://example.com/rss.xml",
+            instapaper_config={},
+            app_creds={},
+            rss_feed_config=config["RSS_FEED_CONFIG"],
+            instapaper_ini_config={},
+            cookies=cookies,
+            state={"last_rss_timestamp": datetime(2024, 1, 1, tzinfo=timezone.utc)},
+            site_config=None,
+            cookie_updater=persisted.append,
+        )
+
+    poll(
+        [
+            {"name": "sessionid", "value": "abc", "domain": "example.com"},
+            {"name": "prefs", "value": "dark", "domain": "example.com"},
+        ]
+    )
+    poll([{"name": "sessionid", "value": "rotated", "domain": "example.com"}])
+
+    assert len(persisted) == 1
+    assert [(c["name"], c["value"]) for c in persisted[0]] == [("sessionid", "rotated")]
+
+
 def test_get_new_rss_entries_merges_feed_issued_cookies(monkeypatch):
 
     published = datetime(2024, 1, 2, tzinfo=timezone.utc)
@@ -278,7 +430,7 @@ def test_get_new_rss_entries_merges_feed_issued_cookies(monkeypatch):
             self.headers = {}
             self.cookies = requests.cookies.RequestsCookieJar()
 
-        def get(self, url, timeout=30):
+        def get(self, url, timeout=30, stream=False):
             self.cookies.set(
                 "cf_clearance",
                 "fresh-token",
@@ -382,6 +534,7 @@ def test_poll_rss_stores_pending_bookmarks(tmp_path, monkeypatch):
     from app import db as dbmod
     from app.db import init_db, get_session
     from app.jobs.util_subpaperflux import poll_rss_and_publish
+    from app.content_store import get_bookmark_html
     from app.models import Feed, Bookmark
 
     original_db_url = os.environ.get("DATABASE_URL")
@@ -448,7 +601,9 @@ def test_poll_rss_stores_pending_bookmarks(tmp_path, monkeypatch):
             bookmark = bookmarks[0]
             assert bookmark.instapaper_bookmark_id is None
             assert bookmark.feed_id == feed_id
-            assert bookmark.raw_html_content == "<html>full content</html>"
+            assert bookmark.raw_html_content is None
+            assert bookmark.content_hash
+            assert get_bookmark_html(session, bookmark) == "<html>full content</html>"
             assert bookmark.publication_statuses.get("instapaper", {}).get("status") == "pending"
             flags = bookmark.publication_flags.get("instapaper", {})
             assert flags.get("should_publish") is True
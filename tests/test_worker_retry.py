@@ -37,3 +37,34 @@ def test_worker_retry_backoff(monkeypatch):
         assert dbj2.status == "failed"
         assert dbj2.attempts == 2
 
+
+
+def test_worker_non_retryable_failure_skips_backoff(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "sqlite://")
+    monkeypatch.setenv("CREDENTIALS_ENC_KEY", base64.urlsafe_b64encode(os.urandom(32)).decode())
+    monkeypatch.setenv("WORKER_MAX_ATTEMPTS", "3")
+
+    from sqlmodel import select
+
+    from app.db import init_db, get_session
+    from app.models import Job, JobItem
+    from app.worker import fetch_next_job, mark_failed
+
+    init_db()
+    with next(get_session()) as session:
+        j = Job(type="unknown", payload={}, status="queued", owner_user_id="u")
+        session.add(j)
+        session.commit()
+        job_id = j.id
+        session.add(JobItem(job_id=job_id, item_key="bm-1", status="published"))
+        session.commit()
+
+    job = fetch_next_job()
+    mark_failed(job, "gone", retryable=False)
+    with next(get_session()) as session:
+        dbj = session.get(Job, job_id)
+        assert dbj.status == "failed"
+        assert dbj.attempts == 1
+        assert dbj.available_at is None
+        # The ledger of a job that will not be retried is dropped.
+        assert session.exec(select(JobItem).where(JobItem.job_id == job_id)).all() == []